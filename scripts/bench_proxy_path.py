@@ -0,0 +1,175 @@
+# ./scripts/bench_proxy_path.py
+"""
+Offline benchmark of the proxy hot path: selection, validation, fetch, failover.
+Used to compare proxy-layer changes before/after without touching real proxies.
+Run: `python scripts/bench_proxy_path.py [--pool-size 20000] [--fetches 200] [--json]`.
+Inputs: CLI sizes plus the local SOCKS5/HTTP/target stand-ins in `tests/proxy_harness.py`.
+Outputs: per-stage throughput and p50/p95 latency table (or JSON with `--json`).
+Side effects: binds loopback ports for the duration of the run; no file writes.
+Operational notes: the process-wide host rate limiter is disabled for the run so
+loopback numbers reflect the proxy layer, not politeness throttling.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = PROJECT_ROOT / "src"
+for path in (PROJECT_ROOT, SRC_DIR):
+    if path.exists() and str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from tests.proxy_harness import (  # noqa: E402
+    HttpProxyStandIn,
+    Socks5ProxyStandIn,
+    TargetSite,
+    percentile,
+    running,
+)
+from web_scraper_toolkit.core.automation.rate_limit import set_shared_limiter  # noqa: E402
+from web_scraper_toolkit.proxie import (  # noqa: E402
+    ProxieConfig,
+    Proxy,
+    ProxyManager,
+    ProxyStatus,
+)
+from web_scraper_toolkit.scraper.aiohttp import ProxyScraper  # noqa: E402
+
+STRATEGIES = ("round_robin", "random", "health_weighted", "latency")
+
+
+def _summary(name: str, latencies_ms: List[float], wall_s: float) -> Dict[str, Any]:
+    count = len(latencies_ms)
+    return {
+        "stage": name,
+        "ops": count,
+        "ops_per_s": round(count / wall_s, 1) if wall_s else 0.0,
+        "p50_ms": round(percentile(latencies_ms, 50), 3),
+        "p95_ms": round(percentile(latencies_ms, 95), 3),
+    }
+
+
+async def bench_selection(pool_size: int) -> List[Dict[str, Any]]:
+    proxies = [
+        Proxy(
+            hostname=f"10.{i // 256}.{i % 256}.1", port=1080, status=ProxyStatus.ACTIVE
+        )
+        for i in range(pool_size)
+    ]
+    rows = []
+    for strategy in STRATEGIES:
+        manager = ProxyManager(
+            ProxieConfig(enforce_secure_ip=False, rotation_strategy=strategy), proxies
+        )
+        for with_url in (False, True):
+            latencies = []
+            started = time.perf_counter()
+            for i in range(pool_size):
+                url = f"https://site{i % 50}.example/" if with_url else None
+                t0 = time.perf_counter()
+                await manager.get_next_proxy(url)
+                latencies.append((time.perf_counter() - t0) * 1000)
+            suffix = "+url" if with_url else ""
+            rows.append(
+                _summary(
+                    f"select:{strategy}{suffix}",
+                    latencies,
+                    time.perf_counter() - started,
+                )
+            )
+    return rows
+
+
+async def bench_network(fetches: int) -> List[Dict[str, Any]]:
+    rows = []
+    async with running(
+        TargetSite(latency_ms=2, jitter_ms=1),
+        Socks5ProxyStandIn(),
+        Socks5ProxyStandIn(username="bench", password="secret"),
+        HttpProxyStandIn(),
+        HttpProxyStandIn(username="bench", password="secret"),
+        Socks5ProxyStandIn(failure_rate=1.0),
+        HttpProxyStandIn(failure_rate=1.0),
+    ) as (target, *stand_ins):
+        config = ProxieConfig(
+            enforce_secure_ip=False,
+            validation_url=target.url("/ip"),
+            timeout_seconds=5,
+            max_retries=3,
+        )
+
+        manager = ProxyManager(config, [s.as_proxy() for s in stand_ins])
+        stats = await manager.validate_all()
+        row = _summary("validate", [], stats.wall_ms / 1000)
+        row.update(
+            ops=stats.checked,
+            ops_per_s=round(stats.checked / (stats.wall_ms / 1000), 1)
+            if stats.wall_ms
+            else 0.0,
+            p50_ms=round(stats.mean_check_ms, 3),
+            p95_ms=round(stats.slowest_check_ms, 3),
+        )
+        rows.append(row)
+
+        labels = ("socks5", "socks5+auth", "http", "http+auth")
+        for label, stand_in in zip(labels, stand_ins):
+            single = ProxyManager(config, [stand_in.as_proxy(ProxyStatus.ACTIVE)])
+            scraper = ProxyScraper(single, retry_delay_seconds=0)
+            latencies = []
+            started = time.perf_counter()
+            for i in range(fetches):
+                t0 = time.perf_counter()
+                await scraper.secure_fetch(target.url(f"/page/{i}"))
+                latencies.append((time.perf_counter() - t0) * 1000)
+            rows.append(
+                _summary(f"fetch:{label}", latencies, time.perf_counter() - started)
+            )
+
+        # Two of six proxies always fail; measures the cost of routing around them.
+        pool = ProxyManager(config, [s.as_proxy(ProxyStatus.ACTIVE) for s in stand_ins])
+        scraper = ProxyScraper(pool, retry_delay_seconds=0)
+        latencies = []
+        started = time.perf_counter()
+        for i in range(fetches):
+            t0 = time.perf_counter()
+            await scraper.secure_fetch(target.url(f"/failover/{i}"))
+            latencies.append((time.perf_counter() - t0) * 1000)
+        rows.append(
+            _summary("fetch:failover", latencies, time.perf_counter() - started)
+        )
+    return rows
+
+
+async def run(pool_size: int, fetches: int) -> List[Dict[str, Any]]:
+    set_shared_limiter(None)
+    return await bench_selection(pool_size) + await bench_network(fetches)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pool-size", type=int, default=20_000)
+    parser.add_argument("--fetches", type=int, default=200)
+    parser.add_argument("--json", action="store_true", help="Emit JSON rows.")
+    args = parser.parse_args()
+
+    rows = asyncio.run(run(args.pool_size, args.fetches))
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    print(f"{'stage':<28}{'ops':>8}{'ops/s':>12}{'p50 ms':>10}{'p95 ms':>10}")
+    for row in rows:
+        print(
+            f"{row['stage']:<28}{row['ops']:>8}{row['ops_per_s']:>12}"
+            f"{row['p50_ms']:>10}{row['p95_ms']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
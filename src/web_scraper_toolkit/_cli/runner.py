@@ -252,7 +252,11 @@ async def run_main_async(
                 console.print(f"[dim]{msg}[/dim]")
 
             crawler = AutonomousCrawlerCls(playbook, proxy_manager=manager)
-            await crawler.run()
+            try:
+                await crawler.run()
+            finally:
+                if manager is not None:
+                    await manager.close()  # Persists learned proxy health
             console.print(
                 PanelCls(
                     f"[bold green]Playbook Completed![/bold green]\nResults saved to: {crawler.results_filename}",
@@ -11,12 +11,28 @@ Operational notes: final orchestration layer for split Playwright manager intern
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import TYPE_CHECKING, Any, Mapping, Optional, Tuple
+import sys
+import weakref
+from collections import deque
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Deque,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+)
 
 from playwright.async_api import Page
 
 from .constants import SerpProvider
+from ...core.automation.retry import get_circuit_breakers, is_host_failure
+from ...core.state.cache import get_cache, normalize_response_cache_mode
 from ...diagnostics.fetch_outcome import (
     normalize_fetch_attempt,
     select_preferred_outcome,
@@ -30,9 +46,226 @@ logger = logging.getLogger("web_scraper_toolkit.browser.playwright_handler")
 if TYPE_CHECKING:
     from ..playwright_handler import PlaywrightManager
 
+# Stale-while-revalidate refreshes. `_REFRESHING` holds URLs queued or in
+# flight (dedup); `_REFRESH_TASKS` the workers (held so they are not garbage
+# collected mid-run). Each event loop runs at most
+# `CacheConfig.revalidation_concurrency` workers; further refreshes wait in a
+# bounded per-loop queue and are dropped when it is full (a later stale hit
+# asks again). Workers reuse pooled private browsers, stopped once the loop
+# has no refresh left.
+_REFRESH_QUEUE_LIMIT = 64
+_REFRESHING: Set[str] = set()
+_REFRESH_TASKS: Set["asyncio.Task[Any]"] = set()
+_Loop = asyncio.AbstractEventLoop
+_RefreshJob = Tuple[Any, str, Dict[str, Any]]  # (manager, url, fetch kwargs)
+_REFRESH_PENDING: "weakref.WeakKeyDictionary[_Loop, Deque[_RefreshJob]]" = (
+    weakref.WeakKeyDictionary()
+)
+_REFRESH_BROWSERS: "weakref.WeakKeyDictionary[_Loop, List[Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _loop_refresh_workers(loop: _Loop) -> int:
+    current = asyncio.current_task()
+    return sum(1 for t in _REFRESH_TASKS if t is not current and t.get_loop() is loop)
+
+
+async def _drain_refreshes(owner: Any, url: str, fetch_kwargs: Dict[str, Any]) -> None:
+    """Run one refresh, then queued ones for this loop until the queue is empty."""
+    loop = asyncio.get_running_loop()
+    pending = _REFRESH_PENDING.setdefault(loop, deque())
+    job: Optional[_RefreshJob] = (owner, url, fetch_kwargs)
+    try:
+        while job is not None:
+            owner, url, fetch_kwargs = job
+            try:
+                await owner._refresh_cached_page(url, **fetch_kwargs)
+            except Exception as exc:
+                logger.debug("Background cache refresh failed for %s: %s", url, exc)
+            finally:
+                _REFRESHING.discard(url)
+            job = pending.popleft() if pending else None
+    finally:
+        if not _loop_refresh_workers(loop):
+            for _owner, queued_url, _kwargs in _REFRESH_PENDING.pop(loop, ()):
+                _REFRESHING.discard(queued_url)
+            for manager in _REFRESH_BROWSERS.pop(loop, []):
+                try:
+                    await manager.stop()
+                except Exception as exc:
+                    logger.debug("Stopping refresh browser failed: %s", exc)
+
+
+async def _checkout_refresh_browser(config: Any, proxy_manager: Any) -> Any:
+    """An idle refresh browser with this config, or a newly started one."""
+    from ..playwright_handler import PlaywrightManager
+
+    idle = _REFRESH_BROWSERS.setdefault(asyncio.get_running_loop(), [])
+    for manager in idle:
+        if manager.config == config and manager.proxy_manager is proxy_manager:
+            idle.remove(manager)
+            return manager
+    manager = PlaywrightManager(config=config, proxy_manager=proxy_manager)
+    await manager.start()
+    return manager
+
+
+def _cached_extraction_matches(
+    stored: Mapping[str, Any], mode: str, selector: Optional[str]
+) -> bool:
+    """Whether a cached body (full or extracted) can answer this request."""
+    if not stored.get("applied"):
+        return True  # A full document serves every extraction mode
+    if mode != "main":
+        return False
+    if stored.get("strategy") == "selector":
+        return stored.get("selector") == selector
+    return not selector
+
 
 class PlaywrightSmartFetchArtifactsMixin:
     async def smart_fetch(
+        self,
+        url: str,
+        *,
+        cache_mode: Optional[str] = None,
+        content_extraction: Optional[str] = None,
+        extract_selector: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Tuple[Optional[str], str, Optional[int]]:
+        """
+        High-level fetch with optional SERP-native strategy and baseline headed escalation.
+
+        `content_extraction="main"` extracts the main content subtree (or the
+        `extract_selector` element) in the browser and returns only that;
+        `metadata["content_extraction"]` reports whether it applied and the
+        bytes saved against the full document.
+
+        `cache_mode` ("use", "refresh", "bypass"; default from
+        `BrowserConfig.response_cache`) serves fresh pages from the shared
+        ResponseCache without navigating, and stores clean 200 responses the
+        origin allows to be cached. Pages inside their stale-while-revalidate
+        window are served at once (`cache_stale: True`) while a background
+        fetch refreshes them. Metadata carries `cached: True/False`.
+        """
+        mode = normalize_response_cache_mode(
+            cache_mode, getattr(self, "response_cache_mode", "bypass")
+        )
+        extraction = "main" if content_extraction == "main" else "full"
+        if extraction == "main":
+            kwargs["content_extraction"] = "main"
+            if extract_selector:
+                kwargs["extract_selector"] = extract_selector
+        if mode == "bypass":
+            result = await self._smart_fetch_live_reporting(url, extraction, **kwargs)
+            self._last_fetch_metadata["cached"] = False
+            return result
+
+        cache = get_cache()
+        if mode == "use":
+            entry = cache.get_entry(url, allow_stale=True)
+            stored_extraction = dict(
+                (entry.meta.get("content_extraction") or {}) if entry else {}
+            )
+            if entry is not None and _cached_extraction_matches(
+                stored_extraction, extraction, extract_selector
+            ):
+                stale = cache.is_stale(entry)
+                if stale:
+                    self._schedule_cache_refresh(url, **kwargs)
+                final_url = str(entry.meta.get("final_url") or url)
+                self._last_fetch_metadata = {
+                    "attempt_profile": "response_cache",
+                    "stealth_engine": "none",
+                    "status": 200,
+                    "final_url": final_url,
+                    "blocked_reason": "none",
+                    "elapsed_ms": 0,
+                    "cached": True,
+                    "cache_age_seconds": round(entry.age_seconds, 1),
+                    "cache_stale": stale,
+                    "skip_native_fallback": True,
+                    "skip_host_learning": True,
+                    "selection_reason": "cache_hit",
+                }
+                if extraction == "main":
+                    stored_extraction.setdefault("applied", False)
+                    stored_extraction["mode"] = "main"
+                    self._last_fetch_metadata["content_extraction"] = stored_extraction
+                return (entry.content, final_url, 200)
+
+        self._last_response_headers = {}
+        result = await self._smart_fetch_live_reporting(url, extraction, **kwargs)
+        self._last_fetch_metadata["cached"] = False
+        content, final_url, status = result
+        blocked_reason = str(self._last_fetch_metadata.get("blocked_reason", ""))
+        if status == 200 and content and blocked_reason.lower() in {"", "none"}:
+            meta: Dict[str, Any] = {"final_url": final_url}
+            report = self._last_fetch_metadata.get("content_extraction") or {}
+            if report.get("applied"):
+                meta["content_extraction"] = dict(report)
+            cache.store_response(
+                url,
+                content,
+                self._last_response_headers,
+                meta=meta,
+            )
+        return result
+
+    async def _smart_fetch_live_reporting(
+        self, url: str, extraction: str, **kwargs: Any
+    ) -> Tuple[Optional[str], str, Optional[int]]:
+        """Live fetch that attaches the in-page extraction report to metadata."""
+        self._last_content_extraction = {}
+        result = await self._smart_fetch_live(url, **kwargs)
+        if extraction == "main":
+            report = dict(getattr(self, "_last_content_extraction", {}) or {})
+            report.setdefault("mode", "main")
+            report.setdefault("applied", False)
+            self._last_fetch_metadata["content_extraction"] = report
+        return result
+
+    def _schedule_cache_refresh(self, url: str, **fetch_kwargs: Any) -> None:
+        """
+        Refresh a stale URL in the background (deduplicated), re-running the
+        original fetch options; queued behind the per-loop concurrency cap.
+        """
+        if url in _REFRESHING:
+            return
+        loop = asyncio.get_running_loop()
+        limit = max(1, int(get_cache().config.revalidation_concurrency))
+        if _loop_refresh_workers(loop) >= limit:
+            pending = _REFRESH_PENDING.setdefault(loop, deque())
+            if len(pending) < _REFRESH_QUEUE_LIMIT:
+                _REFRESHING.add(url)
+                pending.append((self, url, fetch_kwargs))
+            return
+        _REFRESHING.add(url)
+        task = loop.create_task(_drain_refreshes(self, url, fetch_kwargs))
+        _REFRESH_TASKS.add(task)
+        task.add_done_callback(_REFRESH_TASKS.discard)
+
+    async def _refresh_cached_page(self, url: str, **fetch_kwargs: Any) -> None:
+        """
+        Refetch a stale page into the cache on a pooled private browser.
+
+        A separate manager keeps the refresh alive after the caller's own
+        manager is stopped and keeps it off the caller's page/context and
+        fetch metadata. Browsers are reused across refreshes with the same
+        config and proxy manager.
+        """
+        manager = await _checkout_refresh_browser(
+            self.config, getattr(self, "proxy_manager", None)
+        )
+        try:
+            await manager.smart_fetch(url, cache_mode="refresh", **fetch_kwargs)
+        except BaseException:
+            await manager.stop()
+            raise
+        _REFRESH_BROWSERS.setdefault(asyncio.get_running_loop(), []).append(manager)
+
+    async def _smart_fetch_live(
         self,
         url: str,
         *,
@@ -43,10 +276,30 @@ class PlaywrightSmartFetchArtifactsMixin:
         strategy_overrides: Optional[Mapping[str, Any]] = None,
         **kwargs: Any,
     ) -> Tuple[Optional[str], str, Optional[int]]:
-        """
-        High-level fetch with optional SERP-native strategy and baseline headed escalation.
-        """
+        """Uncached smart fetch: circuit breaker, routing, and fallback matrix."""
         self._last_fetch_metadata = {}
+        breakers = get_circuit_breakers()
+        if not breakers.allow_request(url):
+            retry_after = breakers.retry_after(url)
+            logger.warning(
+                "SmartFetch: Circuit open for %s; retry after %.1fs.",
+                url,
+                retry_after,
+            )
+            self._last_fetch_metadata = {
+                "attempt_profile": "circuit_open",
+                "stealth_engine": "none",
+                "status": None,
+                "final_url": url,
+                "blocked_reason": "circuit_open",
+                "elapsed_ms": 0,
+                "circuit_retry_after_seconds": round(retry_after, 2),
+                "skip_native_fallback": True,
+                "skip_host_learning": True,
+                "selection_reason": "circuit_open",
+            }
+            return (None, url, None)
+
         host = normalize_host(url)
         snapshot_state = self._snapshot_routing_state()
         (
@@ -288,6 +541,18 @@ class PlaywrightSmartFetchArtifactsMixin:
             }
             return result
         finally:
+            # Feed the host breaker unless the fetch was skipped by policy or
+            # aborted by an exception (e.g. cancellation).
+            if (
+                sys.exc_info()[0] is None
+                and self._last_fetch_metadata.get("selection_reason")
+                != "document_short_circuit"
+            ):
+                if is_host_failure(result[2]):
+                    breakers.record_failure(url)
+                else:
+                    breakers.record_success(url)
+
             metadata = self._enrich_learning_metadata(host=host)
             metadata["active_host_profile_applied"] = active_profile_applied
             metadata["host_profile_match_key"] = host_profile_match.get("match_key", "")
@@ -0,0 +1,194 @@
+# ./src/web_scraper_toolkit/browser/_playwright_handler/extraction.py
+"""
+In-page main-content extraction for PlaywrightManager fetches.
+Used by `fetch_page_content` when a caller asks for `content_extraction="main"`.
+Run: imported by page operations; not a direct CLI entry point.
+Inputs: a loaded Playwright page plus an optional CSS selector.
+Outputs: a compact HTML document (main subtree plus head metadata) and byte stats.
+Side effects: evaluates a read-only script in the page; the live DOM is not changed.
+Operational notes: scoring runs in Chromium so only the useful subtree crosses
+the CDP pipe. Documents under `SMALL_DOCUMENT_CHARS` are returned whole, which
+keeps the small-page challenge checks in `fetch_page_content` unchanged.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Optional
+
+from playwright.async_api import Page
+
+logger = logging.getLogger("web_scraper_toolkit.browser.playwright_handler")
+
+# Same cut-off the Cloudflare/PerimeterX content checks use for "stub" pages.
+SMALL_DOCUMENT_CHARS = 50_000
+
+# Noise stripped from the extracted subtree matches `markdown_engine.NOISE_TAGS`.
+# Readability-style scoring: paragraphs vote for their parent (full score) and
+# grandparent (half), weighted by class/id hints and discounted by link density.
+# Explicit <main>/[role=main]/<article> wins when it holds most of the text.
+MAIN_CONTENT_SCRIPT = r"""
+(args) => {
+  const root = document.documentElement;
+  if (!root) return null;
+  const full = root.outerHTML;
+  const fullBytes = new Blob([full]).size;
+  if (full.length < args.minChars) {
+    return { applied: false, reason: "small_document", full_bytes: fullBytes };
+  }
+
+  const NOISE = "script,style,noscript,iframe,svg,meta,link,nav,footer,header,aside";
+  const POSITIVE = /article|body|content|entry|main|page|post|story|text|blog/i;
+  const NEGATIVE = /comment|combx|disqus|footer|masthead|menu|meta|nav|promo|related|share|shoutbox|sidebar|social|sponsor|widget|banner|cookie|modal|popup|ad-|ads/i;
+
+  const textLength = (el) => (el.textContent || "").replace(/\s+/g, " ").trim().length;
+  const linkDensity = (el) => {
+    const total = textLength(el);
+    if (!total) return 0;
+    let linked = 0;
+    for (const a of el.querySelectorAll("a")) linked += textLength(a);
+    return linked / total;
+  };
+  const classWeight = (el) => {
+    let weight = 0;
+    for (const hint of [el.className, el.id]) {
+      if (typeof hint !== "string" || !hint) continue;
+      if (NEGATIVE.test(hint)) weight -= 25;
+      if (POSITIVE.test(hint)) weight += 25;
+    }
+    return weight;
+  };
+  const initialScore = (el) => {
+    switch (el.tagName) {
+      case "ARTICLE": case "MAIN": return 10;
+      case "DIV": case "SECTION": return 5;
+      case "PRE": case "TD": case "BLOCKQUOTE": return 3;
+      case "OL": case "UL": case "DL": case "FORM": return -3;
+      case "H1": case "H2": case "H3": case "TH": return -5;
+      default: return 0;
+    }
+  };
+
+  const pickSemantic = (bodyText) => {
+    const found = document.querySelectorAll("main, [role=main], article");
+    let best = null;
+    let bestLength = 0;
+    for (const el of found) {
+      const length = textLength(el);
+      if (length > bestLength) { best = el; bestLength = length; }
+    }
+    return best && bestLength >= bodyText * 0.5 ? best : null;
+  };
+
+  const pickScored = () => {
+    const scores = new Map();
+    const bump = (el, amount) => {
+      if (!el || el === root) return;
+      if (!scores.has(el)) scores.set(el, initialScore(el) + classWeight(el));
+      scores.set(el, scores.get(el) + amount);
+    };
+    for (const p of document.body.querySelectorAll("p, pre, td, blockquote, li")) {
+      const text = (p.textContent || "").trim();
+      if (text.length < 25) continue;
+      const score = 1 + text.split(",").length + Math.min(Math.floor(text.length / 100), 3);
+      bump(p.parentElement, score);
+      if (p.parentElement) bump(p.parentElement.parentElement, score / 2);
+    }
+    let best = null;
+    let bestScore = 0;
+    for (const [el, score] of scores) {
+      const adjusted = score * (1 - linkDensity(el));
+      if (adjusted > bestScore) { best = el; bestScore = adjusted; }
+    }
+    return best;
+  };
+
+  let node = null;
+  let strategy = "";
+  let selectorMatched = null;
+  if (args.selector) {
+    try { node = document.querySelector(args.selector); } catch (e) { node = null; }
+    selectorMatched = Boolean(node);
+    if (node) strategy = "selector";
+  }
+  if (!node && document.body) {
+    const bodyText = textLength(document.body);
+    node = pickSemantic(bodyText);
+    strategy = node ? "semantic" : "";
+    if (!node) {
+      node = pickScored();
+      strategy = node ? "scored" : "";
+    }
+    if (node && textLength(node) < bodyText * 0.2) node = null;
+  }
+  if (!node) {
+    return {
+      applied: false,
+      reason: "no_candidate",
+      full_bytes: fullBytes,
+      selector_matched: selectorMatched,
+    };
+  }
+
+  const clone = node.cloneNode(true);
+  if (strategy !== "selector") {
+    for (const el of clone.querySelectorAll(NOISE)) el.remove();
+  }
+  const head = [];
+  const keep = [
+    "title",
+    "meta[charset]",
+    "meta[name=description]",
+    "meta[name=author]",
+    "meta[property^='og:']",
+    "meta[name^='twitter:']",
+    "link[rel=canonical]",
+    "script[type='application/ld+json']",
+  ];
+  for (const el of document.head ? document.head.querySelectorAll(keep.join(",")) : []) {
+    head.push(el.outerHTML);
+  }
+  const lang = root.getAttribute("lang");
+  const html =
+    "<!DOCTYPE html><html" + (lang ? ' lang="' + lang.replace(/"/g, "&quot;") + '"' : "") +
+    "><head>" + head.join("") + "</head><body>" + clone.outerHTML + "</body></html>";
+  return {
+    applied: true,
+    strategy: strategy,
+    html: html,
+    full_bytes: fullBytes,
+    selector_matched: selectorMatched,
+  };
+}
+"""
+
+
+async def extract_main_content(
+    page: Page,
+    selector: Optional[str] = None,
+    min_chars: int = SMALL_DOCUMENT_CHARS,
+) -> Dict[str, Any]:
+    """
+    Run the main-content script and return its report.
+
+    The report always has `applied`; when True it carries `html`, `strategy`
+    (`selector`, `semantic` or `scored`), `full_bytes`, `returned_bytes` and
+    `bytes_saved`. `selector_matched` is None when no selector was given.
+    """
+    try:
+        report = await page.evaluate(
+            MAIN_CONTENT_SCRIPT,
+            {"selector": selector or "", "minChars": int(min_chars)},
+        )
+    except Exception as exc:
+        logger.debug("In-page extraction failed on %s: %s", page.url, exc)
+        return {"applied": False, "reason": "script_error"}
+    if not isinstance(report, dict):
+        return {"applied": False, "reason": "no_document"}
+    if report.get("applied"):
+        html = str(report.get("html") or "")
+        returned = len(html.encode("utf-8"))
+        full = int(report.get("full_bytes") or 0)
+        report["returned_bytes"] = returned
+        report["bytes_saved"] = max(0, full - returned)
+    return report
@@ -16,7 +16,8 @@ from typing import TYPE_CHECKING, Any, Dict, Literal, Mapping, Optional, Union,
 
 from playwright.async_api import Browser, Playwright
 
-from ..config import BrowserConfig
+from ..config import BrowserConfig, normalize_content_extraction_mode
+from ...core.state.cache import normalize_response_cache_mode
 from ..host_profiles import HostProfileStore
 from .constants import (
     BASELINE_LAUNCH_ARGS,
@@ -209,6 +210,14 @@ class PlaywrightInitStateMixin:
                 raw_document_download_policy,
             )
         )
+        self.response_cache_mode = normalize_response_cache_mode(
+            getattr(self.config, "response_cache", "bypass")
+        )
+        self._last_response_headers: Dict[str, str] = {}
+        self.content_extraction_mode = normalize_content_extraction_mode(
+            getattr(self.config, "content_extraction", "full")
+        )
+        self._last_content_extraction: Dict[str, Any] = {}
         self.document_download_allowed_domains = tuple(
             str(item).strip().lower()
             for item in getattr(self.config, "document_download_allowed_domains", ())
@@ -115,7 +115,7 @@ class PlaywrightNativeAttemptsMixin:
 
                     if self.proxy_manager:
                         try:
-                            proxy_obj = await self.proxy_manager.get_next_proxy()
+                            proxy_obj = await self.proxy_manager.get_next_proxy(url)
                             if proxy_obj:
                                 context_options["proxy"] = (
                                     self._build_playwright_proxy_settings(proxy_obj)
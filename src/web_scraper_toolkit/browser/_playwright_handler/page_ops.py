@@ -27,6 +27,8 @@ from playwright.async_api import (
 )
 
 from .constants import COMMON_VIEWPORTS, WaitUntilState, _PX_CHALLENGE_MARKERS
+from .extraction import extract_main_content
+from ...core.automation.rate_limit import shared_host_slot
 
 try:
     from playwright_stealth import stealth_async as _legacy_stealth_async  # type: ignore[import-untyped]
@@ -194,6 +196,34 @@ class PlaywrightPageOpsMixin:
 
         return content
 
+    async def _read_page_for_extraction(
+        self,
+        page: Page,
+        content_extraction: str = "full",
+        selector: Optional[str] = None,
+    ) -> str:
+        """
+        Read the page HTML, or only its main content subtree in "main" mode.
+
+        Main mode extracts in the browser and falls back to the full document
+        when the page is small (challenge stubs stay visible to the checks in
+        `fetch_page_content`) or no candidate is found. The report lands in
+        `_last_content_extraction` for fetch metadata.
+        """
+        if content_extraction != "main":
+            return await self._read_page_document_html(page)
+        report = await extract_main_content(page, selector)
+        html = str(report.pop("html", "") or "")
+        report["mode"] = "main"
+        if selector:
+            report["selector"] = selector
+        if report.get("applied") and html.strip():
+            self._last_content_extraction = report
+            return html
+        report["applied"] = False
+        self._last_content_extraction = report
+        return await self._read_page_document_html(page)
+
     async def get_new_page(
         self,
         context_options: Optional[Dict[str, Any]] = None,
@@ -383,10 +413,16 @@ class PlaywrightPageOpsMixin:
         wait_until_state: WaitUntilState = "domcontentloaded",
         extra_headers: Optional[Dict[str, str]] = None,
         ensure_standard_headers: bool = False,
+        content_extraction: str = "full",
+        extract_selector: Optional[str] = None,
     ) -> Tuple[Optional[str], str, Optional[int]]:
         """
         Fetches content robustly.
         PATCHED: Removes manual header/UA injection to prevent Cloudflare 'Please Unblock' errors.
+
+        `content_extraction="main"` returns only the main content subtree
+        (or `extract_selector`'s element) extracted in the browser; see
+        `_read_page_for_extraction`.
         """
         current_url_val = url
         final_url_val = url
@@ -431,15 +467,19 @@ class PlaywrightPageOpsMixin:
                     current_url_val,
                 )
 
-                response: Optional[PlaywrightResponse] = await page.goto(
-                    current_url_val,
-                    timeout=effective_nav_timeout,
-                    wait_until=wait_until_state,
-                )
+                # Cross-process per-host budget (shared by MCP pool workers).
+                async with shared_host_slot(current_url_val):
+                    response: Optional[PlaywrightResponse] = await page.goto(
+                        current_url_val,
+                        timeout=effective_nav_timeout,
+                        wait_until=wait_until_state,
+                    )
 
                 final_url_val = page.url
                 if response:
                     status_code_val = response.status
+                    # Kept for response-cache freshness (Cache-Control/Expires).
+                    self._last_response_headers = dict(response.headers)
 
                 if status_code_val in [500, 502, 503, 504]:
                     logger.error(
@@ -472,7 +512,9 @@ class PlaywrightPageOpsMixin:
                     )
                     await page.wait_for_timeout(1000)
 
-                content = await self._read_page_document_html(page)
+                content = await self._read_page_for_extraction(
+                    page, content_extraction, extract_selector
+                )
                 content_lower = content.lower() if content else ""
 
                 try:
@@ -510,7 +552,9 @@ class PlaywrightPageOpsMixin:
                         )
                         await page.wait_for_timeout(5000)
 
-                        content = await self._read_page_document_html(page)
+                        content = await self._read_page_for_extraction(
+                            page, content_extraction, extract_selector
+                        )
                         final_url_val = page.url
 
                         try:
@@ -545,7 +589,9 @@ class PlaywrightPageOpsMixin:
                         )
                         await page.wait_for_timeout(3000)
 
-                        content = await self._read_page_document_html(page)
+                        content = await self._read_page_for_extraction(
+                            page, content_extraction, extract_selector
+                        )
                         final_url_val = page.url
 
                         try:
@@ -17,11 +17,14 @@ Operational notes:
 from dataclasses import asdict, dataclass
 from typing import Any, Literal, Mapping, Tuple
 
+from ..core.state.cache import ResponseCacheMode, normalize_response_cache_mode
+
 NativeFallbackPolicy = Literal["off", "on_blocked", "always"]
 BrowserContextMode = Literal["incognito", "persistent"]
 BrowserChannel = Literal["chromium", "chrome", "msedge"]
 HostLearningApplyMode = Literal["safe_subset"]
 DocumentDownloadPolicy = Literal["disallow", "allowlist", "allow_all"]
+ContentExtractionMode = Literal["full", "main"]
 
 
 def _as_bool(value: Any, default: bool) -> bool:
@@ -114,6 +117,25 @@ def _normalize_document_download_policy(
     return normalized  # type: ignore[return-value]
 
 
+def normalize_content_extraction_mode(
+    value: Any,
+    default: ContentExtractionMode = "full",
+) -> ContentExtractionMode:
+    text = str(value or "").strip().lower()
+    alias_map = {
+        "full": "full",
+        "document": "full",
+        "none": "full",
+        "off": "full",
+        "main": "main",
+        "main_content": "main",
+        "readability": "main",
+        "in_page": "main",
+    }
+    normalized = alias_map.get(text, default)
+    return normalized  # type: ignore[return-value]
+
+
 def _normalize_context_mode(
     value: Any, default: BrowserContextMode
 ) -> BrowserContextMode:
@@ -175,6 +197,10 @@ class BrowserConfig:
     proxy_aware_learning: bool = False
     proxy_tier: str = ""
     document_download_policy: DocumentDownloadPolicy = "disallow"
+    # Opt-in: "use" serves fresh cached pages, "refresh" only writes.
+    response_cache: ResponseCacheMode = "bypass"
+    # "main" ships only the in-browser extracted main content to markdown reads.
+    content_extraction: ContentExtractionMode = "full"
     document_download_allowed_domains: Tuple[str, ...] = ()
     document_download_blocked_domains: Tuple[str, ...] = ()
     document_download_extensions: Tuple[str, ...] = (
@@ -303,6 +329,14 @@ class BrowserConfig:
                 data.get("document_download_policy"),
                 "disallow",
             ),
+            response_cache=normalize_response_cache_mode(
+                data.get("response_cache"),
+                "bypass",
+            ),
+            content_extraction=normalize_content_extraction_mode(
+                data.get("content_extraction"),
+                "full",
+            ),
             document_download_allowed_domains=_normalize_string_tuple(
                 data.get("document_download_allowed_domains"),
                 (),
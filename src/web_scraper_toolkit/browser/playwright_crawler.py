@@ -12,8 +12,13 @@ Usage:
 
 Key Features:
     - Async/Await concurrency with Semaphore.
+    - Adaptive per-host limits (AIMD) so one slow host cannot absorb all workers.
+    - Per-host circuit breakers: URLs for a failing host are parked until
+      its recovery window instead of burning worker slots.
     - Smart Retries (Headless -> Headed fallback).
     - Batch processing with progress tracking.
+    - Markdown conversion and contact extraction run in the shared CPU pool,
+      so parsing scales across cores while browser I/O stays on the loop.
 """
 
 import logging
@@ -22,9 +27,9 @@ import asyncio
 from typing import List, Optional, Tuple
 
 # Import toolkit components
-from .playwright_handler import PlaywrightManager
+from .playwright_handler import PlaywrightManager, classify_bot_block
 from ..parsers.scraping_tools import (
-    read_website_markdown,
+    aread_website_markdown,
     read_website_content,
     extract_metadata,
 )
@@ -36,15 +41,20 @@ from ..core.file_utils import (
     merge_content_files,
 )
 from ..core.runtime import load_runtime_settings, resolve_worker_count
-from ..parsers.extraction.contacts import (
-    extract_emails,
-    extract_phones,
-    extract_socials,
-    extract_heuristic_names,
+from ..core.automation.concurrency import (
+    AdaptiveConcurrencyConfig,
+    AdaptiveConcurrencyController,
 )
+from ..core.automation.cpu_pool import CpuPool, get_cpu_pool
+from ..core.automation.retry import get_circuit_breakers
+from ..parsers.extraction.contacts import extract_contacts_from_html
 
 logger = logging.getLogger(__name__)
 
+# Times a URL is parked behind an open host circuit before it is attempted
+# anyway (and short-circuited by smart_fetch if the circuit is still open).
+MAX_CIRCUIT_PARKS = 3
+
 
 class WebCrawler:
     def __init__(
@@ -52,6 +62,8 @@ class WebCrawler:
         config: Optional[BrowserConfig] = None,
         workers: Optional[int] = None,
         delay: float = 0.0,
+        host_concurrency: Optional[AdaptiveConcurrencyConfig] = None,
+        cpu_pool: Optional[CpuPool] = None,
     ):
         self.config = config or BrowserConfig()
         runtime = load_runtime_settings()
@@ -72,6 +84,13 @@ class WebCrawler:
         )
         self.delay = delay
         self.semaphore = asyncio.Semaphore(self.workers)
+        # Per-host slots are taken before the global semaphore so tasks queued
+        # behind a throttled host never hold a global worker while waiting.
+        self.host_limiter = AdaptiveConcurrencyController(
+            host_concurrency, max_limit=self.workers
+        )
+        # Parse/convert/extract stages; workers start on the first large page.
+        self.cpu_pool = cpu_pool if cpu_pool is not None else get_cpu_pool()
 
     async def process_single_url(
         self,
@@ -86,10 +105,23 @@ class WebCrawler:
         extract_contacts: bool = False,
     ) -> Tuple[Optional[str], Optional[str]]:
         """Process a single URL: fetch, convert/screenshot, save."""
-        async with self.semaphore:
+        # Park (without holding any slot) while the host's circuit is open.
+        breakers = get_circuit_breakers()
+        for _ in range(MAX_CIRCUIT_PARKS):
+            retry_after = breakers.retry_after(url)
+            if retry_after <= 0:
+                break
+            logger.info(
+                f"[{index + 1}/{total}] Circuit open for {url}; "
+                f"parking for {retry_after:.1f}s"
+            )
+            await asyncio.sleep(retry_after)
+
+        async with self.host_limiter.slot(url) as host_slot, self.semaphore:
             # Rate limit delay before starting (politeness)
             if self.delay > 0:
                 await asyncio.sleep(self.delay)
+            host_slot.mark_sent()
 
             logger.info(f"[{index + 1}/{total}] Processing: {url}")
             content = None
@@ -135,8 +167,8 @@ class WebCrawler:
                     # --- DISPATCHER ---
                     if output_format == "markdown":
                         # Convert config to dict for legacy tools if needed
-                        content = await asyncio.to_thread(
-                            read_website_markdown, url, config=self.config
+                        content = await aread_website_markdown(
+                            url, config=self.config, cpu_pool=self.cpu_pool
                         )
                         if content:
                             success = True
@@ -199,6 +231,19 @@ class WebCrawler:
                                 url, output_file
                             )
 
+                    # Feed the per-host AIMD limiter with this attempt's outcome
+                    observed_status = status_code or (200 if success else None)
+                    host_slot.report(
+                        status=observed_status,
+                        block_reason=classify_bot_block(
+                            status=observed_status,
+                            final_url=url,
+                            content_html=raw_html_for_contacts
+                            or (content if isinstance(content, str) else None),
+                        ),
+                        error=not success and not status_code,
+                    )
+
                     # --- SMART FALLBACK CHECK ---
                     # If failed with 403/429/0 (Blocked) AND we are Headless, try switching to Headed
                     blocked_codes = [
@@ -235,15 +280,13 @@ class WebCrawler:
                                     )
 
                             if c_html:
-                                from bs4 import BeautifulSoup
-
-                                soup = BeautifulSoup(c_html, "lxml")
-                                c_text = soup.get_text(separator=" ", strip=True)
-
-                                emails = extract_emails(c_html, url)
-                                phones = extract_phones(c_text, url)
-                                socials = extract_socials(soup, url)
-                                names = extract_heuristic_names(soup)
+                                contacts = await self.cpu_pool.run(
+                                    extract_contacts_from_html, c_html, url
+                                )
+                                emails = contacts["emails"]
+                                phones = contacts["phones"]
+                                socials = contacts["socials"]
+                                names = contacts["names"]
 
                                 if emails or phones or socials or names:
                                     logger.info(
@@ -334,6 +377,7 @@ class WebCrawler:
                     return content, output_file if success else None
 
                 except Exception as e:
+                    host_slot.report(error=True)
                     logger.error(f"Error extracting {url} (Attempt {attempt + 1}): {e}")
                     # If critical error, maybe don't retry? Or retry?
                     # Let's retry on attempt 1 just in case
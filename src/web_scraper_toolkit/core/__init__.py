@@ -34,12 +34,37 @@ from .automation.utilities import (
     validate_url,
     detect_content_type,
     download_file,
+    validate_urls,
+    detect_content_types,
+    iter_validate_urls,
+)
+from .automation.downloads import (
+    DownloadConfig,
+    get_download_config,
+    set_download_config,
+)
+from .automation.rate_limit import (
+    SharedHostLimiter,
+    get_shared_limiter,
+    shared_host_slot,
 )
 from .automation.retry import (
     RetryConfig,
     with_retry,
     retry_operation,
     update_retry_config,
+    CircuitBreakerConfig,
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+    RetryBudget,
+    RetryBudgetConfig,
+    get_circuit_breakers,
+    get_retry_budget,
+)
+from .automation.concurrency import (
+    AdaptiveConcurrencyConfig,
+    AdaptiveConcurrencyController,
+    HostSlot,
 )
 
 # HTTP Client with connection pooling
@@ -105,11 +130,33 @@ __all__ = [
     "validate_url",
     "detect_content_type",
     "download_file",
+    "validate_urls",
+    "detect_content_types",
+    "iter_validate_urls",
+    # Automation - Downloads
+    "DownloadConfig",
+    "get_download_config",
+    "set_download_config",
     # Automation - Retry
     "RetryConfig",
     "with_retry",
     "retry_operation",
     "update_retry_config",
+    "CircuitBreakerConfig",
+    "CircuitBreakerRegistry",
+    "CircuitOpenError",
+    "RetryBudget",
+    "RetryBudgetConfig",
+    "get_circuit_breakers",
+    "get_retry_budget",
+    # Automation - Rate limiting
+    "SharedHostLimiter",
+    "get_shared_limiter",
+    "shared_host_slot",
+    # Automation - Concurrency
+    "AdaptiveConcurrencyConfig",
+    "AdaptiveConcurrencyController",
+    "HostSlot",
     # HTTP Client
     "SharedHttpClient",
     "HttpConfig",
@@ -7,8 +7,36 @@ Form filling, retry logic, and utility functions.
 """
 
 from .forms import fill_form, extract_tables, click_element
-from .utilities import health_check, validate_url, detect_content_type, download_file
-from .retry import RetryConfig, with_retry, retry_operation, update_retry_config
+from .utilities import (
+    health_check,
+    validate_url,
+    detect_content_type,
+    download_file,
+    validate_urls,
+    detect_content_types,
+    iter_validate_urls,
+)
+from .retry import (
+    RetryConfig,
+    with_retry,
+    retry_operation,
+    update_retry_config,
+    CircuitBreakerConfig,
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+    RetryBudget,
+    RetryBudgetConfig,
+    get_circuit_breakers,
+    get_retry_budget,
+)
+from .downloads import DownloadConfig, get_download_config, set_download_config
+from .rate_limit import SharedHostLimiter, get_shared_limiter, shared_host_slot
+from .cpu_pool import CpuPool, get_cpu_pool, set_cpu_pool
+from .concurrency import (
+    AdaptiveConcurrencyConfig,
+    AdaptiveConcurrencyController,
+    HostSlot,
+)
 
 __all__ = [
     # Forms
@@ -20,9 +48,35 @@ __all__ = [
     "validate_url",
     "detect_content_type",
     "download_file",
+    "validate_urls",
+    "detect_content_types",
+    "iter_validate_urls",
+    # Downloads
+    "DownloadConfig",
+    "get_download_config",
+    "set_download_config",
     # Retry
     "RetryConfig",
     "with_retry",
     "retry_operation",
     "update_retry_config",
+    "CircuitBreakerConfig",
+    "CircuitBreakerRegistry",
+    "CircuitOpenError",
+    "RetryBudget",
+    "RetryBudgetConfig",
+    "get_circuit_breakers",
+    "get_retry_budget",
+    # Rate limiting (cross-process)
+    "SharedHostLimiter",
+    "get_shared_limiter",
+    "shared_host_slot",
+    # CPU offload (process pool)
+    "CpuPool",
+    "get_cpu_pool",
+    "set_cpu_pool",
+    # Concurrency
+    "AdaptiveConcurrencyConfig",
+    "AdaptiveConcurrencyController",
+    "HostSlot",
 ]
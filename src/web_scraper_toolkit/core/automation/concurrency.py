@@ -0,0 +1,314 @@
+# ./src/web_scraper_toolkit/core/automation/concurrency.py
+"""
+Adaptive per-host concurrency control (AIMD) for batch scraping workloads.
+Used by WebCrawler and MCP batch tools so one slow or rate-limiting host cannot
+absorb every worker or get hammered into 429s.
+Run: imported as a library module; not a direct CLI entry point.
+Inputs: target URLs plus per-request outcomes (status, block reason, latency).
+Outputs: per-host slot acquisition and snapshot dictionaries of learned limits.
+Side effects: none beyond in-memory state for the controller instance.
+Operational notes: limits grow additively on fast successes and shrink
+multiplicatively on 429/503, challenge detections, or latency spikes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+THROTTLE_STATUS_CODES = frozenset({429, 503})
+
+
+@dataclass
+class AdaptiveConcurrencyConfig:
+    """Configuration for per-host AIMD concurrency limits."""
+
+    initial_limit: int = 2
+    min_limit: int = 1
+    max_limit: int = 16
+    increase_step: float = 1.0  # Added once per "window" of successes
+    decrease_factor: float = 0.5
+    latency_spike_ratio: float = 3.0  # Spike = latency > ratio * baseline
+    latency_smoothing: float = 0.2  # EWMA alpha for latency baseline
+    decrease_cooldown_seconds: float = 2.0
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AdaptiveConcurrencyConfig":
+        return cls(
+            initial_limit=int(data.get("initial_limit", 2)),
+            min_limit=int(data.get("min_limit", 1)),
+            max_limit=int(data.get("max_limit", 16)),
+            increase_step=float(data.get("increase_step", 1.0)),
+            decrease_factor=float(data.get("decrease_factor", 0.5)),
+            latency_spike_ratio=float(data.get("latency_spike_ratio", 3.0)),
+            latency_smoothing=float(data.get("latency_smoothing", 0.2)),
+            decrease_cooldown_seconds=float(data.get("decrease_cooldown_seconds", 2.0)),
+        )
+
+
+def host_key(url: str) -> str:
+    """Normalize a URL into the host key used for per-host limits."""
+    raw = str(url or "").strip().lower()
+    parsed = urlparse(raw if "://" in raw else f"https://{raw}")
+    host = (parsed.hostname or "").strip()
+    if host.startswith("www."):
+        host = host[4:]
+    return host
+
+
+class _HostState:
+    __slots__ = (
+        "limit",
+        "in_flight",
+        "waiters",
+        "latency_ewma",
+        "last_decrease",
+        "successes",
+        "throttles",
+    )
+
+    def __init__(self, limit: float) -> None:
+        self.limit = limit
+        self.in_flight = 0
+        self.waiters: Deque[asyncio.Future[None]] = deque()
+        self.latency_ewma: Optional[float] = None
+        self.last_decrease = 0.0
+        self.successes = 0
+        self.throttles = 0
+
+
+class HostSlot:
+    """Handle for one acquired host slot; reports request outcomes back."""
+
+    def __init__(self, controller: "AdaptiveConcurrencyController", host: str):
+        self._controller = controller
+        self.host = host
+        self._started = time.monotonic()
+
+    def mark_sent(self) -> None:
+        """
+        Restart the latency clock. Call right before sending the request when
+        the slot is held across other waits (a global semaphore, a politeness
+        delay), so those waits are not read as host latency.
+        """
+        self._started = time.monotonic()
+
+    def report(
+        self,
+        *,
+        status: Optional[int] = None,
+        block_reason: Optional[str] = None,
+        error: bool = False,
+        latency_seconds: Optional[float] = None,
+    ) -> None:
+        """
+        Feed one request outcome into the host's AIMD limit.
+
+        Latency defaults to time since the slot was acquired (or `mark_sent`,
+        or the last report), so retry loops inside one slot can report each
+        attempt.
+        """
+        now = time.monotonic()
+        latency = (
+            latency_seconds if latency_seconds is not None else now - self._started
+        )
+        self._started = now
+        self._controller.record_outcome(
+            self.host,
+            status=status,
+            block_reason=block_reason,
+            error=error,
+            latency_seconds=latency,
+        )
+
+
+class AdaptiveConcurrencyController:
+    """
+    Per-host concurrency limiter with additive-increase/multiplicative-decrease.
+
+    Usage:
+        controller = AdaptiveConcurrencyController(max_limit=8)
+        async with controller.slot(url) as slot, semaphore:
+            slot.mark_sent()
+            content, status = await fetch(url)
+            slot.report(status=status, block_reason=classify(...))
+    """
+
+    def __init__(
+        self,
+        config: Optional[AdaptiveConcurrencyConfig] = None,
+        *,
+        max_limit: Optional[int] = None,
+    ) -> None:
+        self.config = config or AdaptiveConcurrencyConfig()
+        cap = self.config.max_limit
+        if max_limit is not None and max_limit > 0:
+            cap = min(cap, max_limit) if cap > 0 else max_limit
+        self._min_limit = max(1, self.config.min_limit)
+        self._max_limit = max(self._min_limit, cap)
+        self._initial_limit = min(
+            self._max_limit, max(self._min_limit, self.config.initial_limit)
+        )
+        self._hosts: Dict[str, _HostState] = {}
+
+    def _state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = _HostState(float(self._initial_limit))
+            self._hosts[host] = state
+        return state
+
+    def current_limit(self, url_or_host: str) -> int:
+        """Return the effective integer limit for a URL or host."""
+        state = self._hosts.get(host_key(url_or_host))
+        if state is None:
+            return self._initial_limit
+        return int(state.limit)
+
+    async def acquire(self, url: str) -> HostSlot:
+        """Wait for a free slot on the URL's host."""
+        host = host_key(url)
+        state = self._state(host)
+        if state.in_flight < int(state.limit) and not state.waiters:
+            state.in_flight += 1
+            return HostSlot(self, host)
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        state.waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Slot was granted right before cancellation; hand it back.
+                self._release(host)
+            else:
+                try:
+                    state.waiters.remove(waiter)
+                except ValueError:
+                    pass
+            raise
+        return HostSlot(self, host)
+
+    def release(self, slot: HostSlot) -> None:
+        """Return a slot acquired via `acquire`."""
+        self._release(slot.host)
+
+    def _release(self, host: str) -> None:
+        state = self._hosts.get(host)
+        if state is None:
+            return
+        state.in_flight = max(0, state.in_flight - 1)
+        self._wake(state)
+
+    def _wake(self, state: _HostState) -> None:
+        while state.waiters and state.in_flight < int(state.limit):
+            waiter = state.waiters.popleft()
+            if waiter.done():
+                continue
+            state.in_flight += 1
+            waiter.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[HostSlot]:
+        """Async context manager around acquire/release."""
+        host_slot = await self.acquire(url)
+        try:
+            yield host_slot
+        finally:
+            self.release(host_slot)
+
+    def record_outcome(
+        self,
+        host: str,
+        *,
+        status: Optional[int] = None,
+        block_reason: Optional[str] = None,
+        error: bool = False,
+        latency_seconds: Optional[float] = None,
+    ) -> None:
+        """Adjust the host limit from one observed request outcome."""
+        state = self._state(host_key(host))
+        cfg = self.config
+
+        reason = str(block_reason or "").strip().lower()
+        throttled = reason not in {"", "none"} or status in THROTTLE_STATUS_CODES
+
+        latency_spike = False
+        if latency_seconds is not None and latency_seconds >= 0:
+            baseline = state.latency_ewma
+            if (
+                baseline is not None
+                and baseline > 0
+                and latency_seconds > baseline * cfg.latency_spike_ratio
+            ):
+                latency_spike = True
+
+        if throttled or latency_spike:
+            self._decrease(state, host, reason or str(status or "latency_spike"))
+            return
+
+        if error or (status is not None and not 200 <= status < 400):
+            # Neutral outcome: not a congestion signal, but not a reason to grow.
+            return
+
+        if latency_seconds is not None and latency_seconds >= 0:
+            if state.latency_ewma is None:
+                state.latency_ewma = latency_seconds
+            else:
+                alpha = cfg.latency_smoothing
+                state.latency_ewma = (
+                    alpha * latency_seconds + (1 - alpha) * state.latency_ewma
+                )
+
+        state.successes += 1
+        # Additive increase: roughly +increase_step per limit-worth of successes.
+        state.limit = min(
+            float(self._max_limit),
+            state.limit + cfg.increase_step / max(1.0, state.limit),
+        )
+        self._wake(state)
+
+    def _decrease(self, state: _HostState, host: str, reason: str) -> None:
+        state.throttles += 1
+        now = time.monotonic()
+        if now - state.last_decrease < self.config.decrease_cooldown_seconds:
+            return
+        previous = state.limit
+        state.limit = max(
+            float(self._min_limit), state.limit * self.config.decrease_factor
+        )
+        state.last_decrease = now
+        if int(previous) != int(state.limit):
+            logger.info(
+                "Adaptive concurrency: %s limit %s -> %s (%s)",
+                host,
+                int(previous),
+                int(state.limit),
+                reason,
+            )
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return learned per-host limits and counters for telemetry."""
+        return {
+            host: {
+                "limit": int(state.limit),
+                "in_flight": state.in_flight,
+                "waiting": len(state.waiters),
+                "latency_ewma_ms": (
+                    round(state.latency_ewma * 1000, 1)
+                    if state.latency_ewma is not None
+                    else None
+                ),
+                "successes": state.successes,
+                "throttles": state.throttles,
+            }
+            for host, state in self._hosts.items()
+        }
@@ -0,0 +1,185 @@
+# ./src/web_scraper_toolkit/core/automation/cpu_pool.py
+"""
+Process pool for CPU-bound parse/convert/extract stages in batch runs.
+Used by WebCrawler and contact batches so HTML parsing, markdown conversion,
+and phone/email extraction scale across cores instead of sharing the GIL
+with the event loop that drives browser I/O.
+Run: imported as a library module; not a direct CLI entry point.
+Inputs: a module-level (picklable) function plus the raw HTML it consumes.
+Outputs: the function's compact result (dicts/tuples/short strings).
+Side effects: starts worker processes lazily on first large payload; pages at
+or above `SHM_MIN_BYTES` are handed over in a `multiprocessing.shared_memory`
+segment that is unlinked as soon as the call finishes.
+Operational notes: small pages run inline on a thread (IPC would cost more than
+the parse). A broken pool is rebuilt on the next call and the failed call is
+retried inline, so offload never turns a parse into an error.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from functools import partial
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+from ..runtime import load_runtime_settings, resolve_worker_count
+
+logger = logging.getLogger(__name__)
+T = TypeVar("T")
+
+# Below this the payload is pickled with the call; above it goes through shm.
+SHM_MIN_BYTES = 256 * 1024
+
+PayloadRef = Tuple[str, Any, int]
+
+
+def _read_payload(ref: PayloadRef) -> str:
+    """Materialize the HTML for a worker call (inline text or shm segment)."""
+    kind, value, size = ref
+    if kind == "text":
+        return value
+    segment = shared_memory.SharedMemory(name=value)
+    try:
+        return bytes(segment.buf[:size]).decode("utf-8")
+    finally:
+        segment.close()
+
+
+def _run_task(
+    func: Callable[..., T],
+    ref: PayloadRef,
+    args: Tuple[Any, ...],
+    kwargs: Dict[str, Any],
+) -> T:
+    """Worker entry point: read the page, then call `func(html, *args)`."""
+    return func(_read_payload(ref), *args, **kwargs)
+
+
+@dataclass
+class CpuPoolStats:
+    """Counters for how pages were routed (inline, pickled, shared memory)."""
+
+    inline: int = 0
+    offloaded: int = 0
+    shm_transfers: int = 0
+    shm_bytes: int = 0
+    pool_restarts: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "inline": self.inline,
+            "offloaded": self.offloaded,
+            "shm_transfers": self.shm_transfers,
+            "shm_bytes": self.shm_bytes,
+            "pool_restarts": self.pool_restarts,
+        }
+
+
+class CpuPool:
+    """
+    Lazily started process pool for HTML-in, compact-result-out work.
+
+    Usage:
+        pool = get_cpu_pool()
+        result = await pool.run(extract_contacts_from_html, html, url)
+    """
+
+    def __init__(self, workers: int, min_offload_bytes: int = 0) -> None:
+        self.workers = max(1, int(workers))
+        self.min_offload_bytes = max(0, int(min_offload_bytes))
+        self.stats = CpuPoolStats()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _ensure_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def _discard_executor(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+                self.stats.pool_restarts += 1
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def run(
+        self, func: Callable[..., T], html: str, *args: Any, **kwargs: Any
+    ) -> T:
+        """Run `func(html, *args, **kwargs)` in a worker process (or inline)."""
+        if len(html) < self.min_offload_bytes:
+            self.stats.inline += 1
+            return await asyncio.to_thread(func, html, *args, **kwargs)
+
+        data = html.encode("utf-8")
+        segment: Optional[shared_memory.SharedMemory] = None
+        if len(data) >= SHM_MIN_BYTES:
+            segment = shared_memory.SharedMemory(create=True, size=len(data))
+            segment.buf[: len(data)] = data
+            ref: PayloadRef = ("shm", segment.name, len(data))
+            self.stats.shm_transfers += 1
+            self.stats.shm_bytes += len(data)
+        else:
+            ref = ("text", html, len(data))
+        del data
+
+        executor = self._ensure_executor()
+        loop = asyncio.get_running_loop()
+        try:
+            self.stats.offloaded += 1
+            return await loop.run_in_executor(
+                executor, partial(_run_task, func, ref, args, kwargs)
+            )
+        except BrokenProcessPool as exc:
+            logger.warning(f"CPU pool broke ({exc}); rebuilding and running inline.")
+            self._discard_executor(executor)
+            self.stats.inline += 1
+            return await asyncio.to_thread(func, html, *args, **kwargs)
+        finally:
+            if segment is not None:
+                segment.close()
+                segment.unlink()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_cpu_pool: Optional[CpuPool] = None
+_cpu_pool_lock = threading.Lock()
+
+
+def get_cpu_pool() -> CpuPool:
+    """Get the process-wide CPU pool, sized from runtime concurrency settings."""
+    global _cpu_pool
+    with _cpu_pool_lock:
+        if _cpu_pool is None:
+            concurrency = load_runtime_settings().concurrency
+            workers = resolve_worker_count(
+                concurrency.cpu_pool_workers or "auto",
+                cpu_reserve=concurrency.cpu_reserve,
+                fallback=1,
+            )
+            _cpu_pool = CpuPool(workers, concurrency.cpu_offload_min_bytes)
+        return _cpu_pool
+
+
+def set_cpu_pool(pool: Optional[CpuPool]) -> None:
+    """Install (or clear) the process-wide pool; the previous one is shut down."""
+    global _cpu_pool
+    with _cpu_pool_lock:
+        previous, _cpu_pool = _cpu_pool, pool
+    if previous is not None and previous is not pool:
+        previous.shutdown()
+
+
+atexit.register(lambda: set_cpu_pool(None))
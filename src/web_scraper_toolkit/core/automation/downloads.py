@@ -0,0 +1,500 @@
+# ./src/web_scraper_toolkit/core/automation/downloads.py
+"""
+Parallel, ranged, and resumable file download engine.
+Used by `download_file` (core utilities and the MCP download tool) for large
+document and archive harvesting.
+Run: imported as a library module; not a direct CLI entry point.
+Inputs: target URL, destination path, and optional DownloadConfig tuning.
+Outputs: result dictionaries describing the saved file and transfer stats.
+Side effects: writes `<path>.part` plus a `<path>.part.json` sidecar while a
+download is in progress; both are replaced/removed on success.
+Operational notes: requests go through the shared aiohttp pool; disk writes
+run on a background thread so the event loop never blocks on file I/O.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiohttp
+
+from ..http_client import SharedHttpClient
+from ..user_agents import get_stealth_headers
+
+logger = logging.getLogger(__name__)
+
+STATE_VERSION = 1
+_CONTENT_RANGE_RE = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+|\*)", re.IGNORECASE)
+_UNSATISFIED_RANGE_RE = re.compile(r"bytes\s+\*/(\d+)", re.IGNORECASE)
+
+
+@dataclass
+class DownloadConfig:
+    """Tuning for the ranged download engine."""
+
+    parallel_segments: int = 4
+    min_segment_bytes: int = 8 * 1024 * 1024  # Files smaller than 2x stay single
+    buffer_bytes: int = 1024 * 1024  # Coalesce network chunks before writing
+    max_pending_writes: int = 16  # Buffers queued for the writer thread
+    segment_retries: int = 3
+    state_flush_bytes: int = 32 * 1024 * 1024  # Persist progress this often
+    resume: bool = True
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DownloadConfig":
+        return cls(
+            parallel_segments=int(data.get("parallel_segments", 4)),
+            min_segment_bytes=int(data.get("min_segment_bytes", 8 * 1024 * 1024)),
+            buffer_bytes=int(data.get("buffer_bytes", 1024 * 1024)),
+            max_pending_writes=int(data.get("max_pending_writes", 16)),
+            segment_retries=int(data.get("segment_retries", 3)),
+            state_flush_bytes=int(data.get("state_flush_bytes", 32 * 1024 * 1024)),
+            resume=bool(data.get("resume", True)),
+        )
+
+
+# Global download config
+_download_config: Optional[DownloadConfig] = None
+
+
+def get_download_config() -> DownloadConfig:
+    """Get global download configuration."""
+    global _download_config
+    if _download_config is None:
+        _download_config = DownloadConfig()
+    return _download_config
+
+
+def set_download_config(config: DownloadConfig) -> None:
+    """Set global download configuration."""
+    global _download_config
+    _download_config = config
+
+
+class _Segment:
+    """Inclusive byte range plus progress (bytes durably handed to disk)."""
+
+    __slots__ = ("start", "end", "written", "received")
+
+    def __init__(self, start: int, end: int, written: int = 0) -> None:
+        self.start = start
+        self.end = end  # Inclusive; -1 means "until EOF" (unknown size)
+        self.written = written
+        self.received = written  # Bytes handed to the writer (>= written)
+
+    @property
+    def done(self) -> bool:
+        return self.end >= 0 and self.start + self.received > self.end
+
+
+class _DownloadState:
+    """Sidecar JSON describing a partially downloaded file."""
+
+    def __init__(
+        self,
+        path: str,
+        url: str,
+        total_size: int,
+        validator: str,
+        segments: List[_Segment],
+    ) -> None:
+        self.path = path
+        self.url = url
+        self.total_size = total_size
+        self.validator = validator
+        self.segments = segments
+
+    @classmethod
+    def load(cls, path: str) -> Optional["_DownloadState"]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != STATE_VERSION:
+                return None
+            segments = [
+                _Segment(int(s), int(e), int(w)) for s, e, w in data["segments"]
+            ]
+            return cls(
+                path,
+                str(data["url"]),
+                int(data["total_size"]),
+                str(data.get("validator", "")),
+                segments,
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self) -> None:
+        payload = {
+            "version": STATE_VERSION,
+            "url": self.url,
+            "total_size": self.total_size,
+            "validator": self.validator,
+            "segments": [[s.start, s.end, s.written] for s in self.segments],
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, self.path)
+
+    def remove(self) -> None:
+        for candidate in (self.path, f"{self.path}.tmp"):
+            try:
+                os.remove(candidate)
+            except FileNotFoundError:
+                pass
+
+
+class _BackgroundWriter:
+    """
+    Positional writer thread fed by an in-memory queue.
+
+    Producers await a bounded number of in-flight buffers (backpressure);
+    the thread writes each buffer at its offset, then advances the owning
+    segment's `written` counter and periodically persists the sidecar.
+    """
+
+    def __init__(
+        self,
+        part_path: str,
+        state: Optional[_DownloadState],
+        config: DownloadConfig,
+    ) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._queue: "queue.Queue[Optional[Tuple[_Segment, int, bytes]]]" = (
+            queue.Queue()
+        )
+        self._slots = asyncio.Semaphore(max(1, config.max_pending_writes))
+        self._state = state
+        self._flush_every = max(1, config.state_flush_bytes)
+        self._error: Optional[BaseException] = None
+        self._file = open(part_path, "r+b" if os.path.exists(part_path) else "w+b")
+        self.bytes_written = 0
+        self._thread = threading.Thread(
+            target=self._run, name="download-writer", daemon=True
+        )
+        self._thread.start()
+
+    def preallocate(self, size: int) -> None:
+        if size > 0 and os.fstat(self._file.fileno()).st_size != size:
+            self._file.truncate(size)
+
+    async def write(self, segment: _Segment, offset: int, data: bytes) -> None:
+        if self._error is not None:
+            raise OSError(f"Download writer failed: {self._error}")
+        await self._slots.acquire()
+        self._queue.put((segment, offset, data))
+
+    def _run(self) -> None:
+        since_flush = 0
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            segment, offset, data = item
+            try:
+                if self._error is None:
+                    self._file.seek(offset)
+                    self._file.write(data)
+                    segment.written += len(data)
+                    self.bytes_written += len(data)
+                    since_flush += len(data)
+                    if self._state is not None and since_flush >= self._flush_every:
+                        self._persist()
+                        since_flush = 0
+            except BaseException as exc:  # Surface to producers on next write
+                self._error = exc
+            finally:
+                self._loop.call_soon_threadsafe(self._slots.release)
+
+    def _persist(self) -> None:
+        # Data must reach disk before the sidecar claims it was written.
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        if self._state is not None:
+            self._state.save()
+
+    def _finish(self) -> None:
+        self._thread.join()
+        try:
+            if self._error is None:
+                self._persist()
+        finally:
+            self._file.close()
+
+    async def close(self) -> None:
+        """Drain pending writes, persist progress, and close the file."""
+        self._queue.put(None)
+        await asyncio.to_thread(self._finish)
+        if self._error is not None:
+            raise OSError(f"Download writer failed: {self._error}")
+
+
+def _request_headers(extra: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    # Ranges address the raw entity, so disable transfer compression.
+    headers = get_stealth_headers({"Accept-Encoding": "identity", "Accept": "*/*"})
+    if extra:
+        headers.update(extra)
+    return headers
+
+
+def _validator(headers: Any) -> str:
+    return str(headers.get("ETag") or headers.get("Last-Modified") or "")
+
+
+def _plan_segments(total_size: int, config: DownloadConfig) -> List[_Segment]:
+    count = 1
+    if total_size >= 2 * config.min_segment_bytes:
+        count = min(
+            max(1, config.parallel_segments),
+            total_size // max(1, config.min_segment_bytes),
+        )
+    step = -(-total_size // count)  # Ceiling division
+    return [
+        _Segment(start, min(total_size, start + step) - 1)
+        for start in range(0, total_size, step)
+    ]
+
+
+async def _stream_into(
+    response: aiohttp.ClientResponse,
+    segment: _Segment,
+    writer: _BackgroundWriter,
+    config: DownloadConfig,
+    chunk_size: int,
+) -> None:
+    """Copy a response body into the segment, coalescing into large buffers."""
+    buffer = bytearray()
+    buffer_offset = segment.start + segment.received
+    limit = (segment.end - segment.start + 1) if segment.end >= 0 else None
+
+    async for chunk in response.content.iter_chunked(chunk_size):
+        if limit is not None:
+            remaining = limit - segment.received - len(buffer)
+            if remaining <= 0:
+                break
+            chunk = chunk[:remaining]
+        buffer += chunk
+        if len(buffer) >= config.buffer_bytes:
+            data = bytes(buffer)
+            buffer.clear()
+            await writer.write(segment, buffer_offset, data)
+            segment.received += len(data)
+            buffer_offset += len(data)
+    if buffer:
+        data = bytes(buffer)
+        await writer.write(segment, buffer_offset, data)
+        segment.received += len(data)
+
+
+async def _download_segment(
+    session: aiohttp.ClientSession,
+    url: str,
+    segment: _Segment,
+    writer: _BackgroundWriter,
+    config: DownloadConfig,
+    timeout: aiohttp.ClientTimeout,
+    chunk_size: int,
+) -> None:
+    attempt = 0
+    while not segment.done:
+        range_start = segment.start + segment.received
+        try:
+            async with session.get(
+                url,
+                headers=_request_headers(
+                    {"Range": f"bytes={range_start}-{segment.end}"}
+                ),
+                timeout=timeout,
+            ) as response:
+                if response.status != 206:
+                    # A 200 here would restart from byte 0 and corrupt the file.
+                    raise aiohttp.ClientResponseError(
+                        response.request_info,
+                        response.history,
+                        status=response.status,
+                        message="Server ignored Range request",
+                    )
+                await _stream_into(response, segment, writer, config, chunk_size)
+            if not segment.done:
+                raise aiohttp.ClientPayloadError("Range response ended early")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            attempt += 1
+            if attempt > config.segment_retries:
+                raise
+            logger.warning(
+                f"Segment {segment.start}-{segment.end} interrupted at "
+                f"{segment.start + segment.received}: {e}. "
+                f"Resuming ({attempt}/{config.segment_retries})..."
+            )
+            await asyncio.sleep(min(2**attempt, 10))
+
+
+async def _run_segments(coros: List[Any]) -> None:
+    """Run segment downloads; on the first failure cancel the rest and re-raise."""
+    tasks = [asyncio.ensure_future(coro) for coro in coros]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+async def download_ranged(
+    url: str,
+    save_path: str,
+    timeout: int = 60,
+    chunk_size: int = 64 * 1024,
+    config: Optional[DownloadConfig] = None,
+) -> Dict[str, Any]:
+    """
+    Download a file, splitting it into parallel byte ranges when supported.
+
+    Args:
+        url: URL to download
+        save_path: Local path to save file
+        timeout: Connect/read inactivity timeout in seconds (not a total cap,
+            so multi-GB transfers are not cut off)
+        chunk_size: Network read size; reads are coalesced before writing
+        config: Optional engine tuning (defaults to the global DownloadConfig)
+
+    Returns:
+        Dict with save status, path, file info, and transfer stats.
+    """
+    config = config or get_download_config()
+    started = time.monotonic()
+    part_path = f"{save_path}.part"
+    state_path = f"{part_path}.json"
+    Path(save_path).parent.mkdir(parents=True, exist_ok=True)
+
+    session = await SharedHttpClient.get_session()
+    request_timeout = aiohttp.ClientTimeout(
+        total=None, sock_connect=timeout, sock_read=timeout
+    )
+
+    # Probe with a one-byte range: 206 reveals size + range support in one trip.
+    probe = await session.get(
+        url, headers=_request_headers({"Range": "bytes=0-0"}), timeout=request_timeout
+    )
+    try:
+        empty = False
+        if probe.status == 416:
+            # Even byte 0 is unsatisfiable: a zero-length resource.
+            unsatisfied = _UNSATISFIED_RANGE_RE.search(
+                probe.headers.get("Content-Range", "")
+            )
+            empty = unsatisfied is None or unsatisfied.group(1) == "0"
+        match = _CONTENT_RANGE_RE.search(probe.headers.get("Content-Range", ""))
+        ranged = probe.status == 206 and match is not None and match.group(3) != "*"
+        total_size = int(match.group(3)) if ranged and match else -1
+        if not empty and not ranged and probe.status in (206, 416):
+            # The probe body is not the whole file: fetch it without a range.
+            probe.release()
+            probe = await session.get(
+                url, headers=_request_headers(), timeout=request_timeout
+            )
+        if probe.status >= 400 and not empty:
+            return {
+                "saved": False,
+                "error": f"HTTP {probe.status}",
+                "status_code": probe.status,
+            }
+        content_type = probe.headers.get("Content-Type", "unknown")
+        validator = _validator(probe.headers)
+
+        state: Optional[_DownloadState] = None
+        resumed_bytes = 0
+        if ranged:
+            previous = _DownloadState.load(state_path) if config.resume else None
+            if (
+                previous is not None
+                and previous.url == url
+                and previous.total_size == total_size
+                and previous.validator == validator
+                and os.path.exists(part_path)
+            ):
+                state = previous
+                resumed_bytes = sum(s.written for s in state.segments)
+                logger.info(
+                    f"Resuming {url}: {resumed_bytes}/{total_size} bytes on disk"
+                )
+            else:
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+                state = _DownloadState(
+                    state_path,
+                    url,
+                    total_size,
+                    validator,
+                    _plan_segments(total_size, config),
+                )
+        else:
+            # No ranges: a stale partial cannot be reused.
+            _DownloadState(state_path, url, -1, "", []).remove()
+            if os.path.exists(part_path):
+                os.remove(part_path)
+
+        writer = _BackgroundWriter(part_path, state if config.resume else None, config)
+        try:
+            if state is not None:
+                writer.preallocate(total_size)
+                if config.resume:
+                    state.save()
+                probe.release()
+                await _run_segments(
+                    [
+                        _download_segment(
+                            session,
+                            url,
+                            segment,
+                            writer,
+                            config,
+                            request_timeout,
+                            chunk_size,
+                        )
+                        for segment in state.segments
+                        if not segment.done
+                    ]
+                )
+            elif not empty:
+                # Server returned the full body (200): stream it sequentially.
+                segment = _Segment(0, -1)
+                await _stream_into(probe, segment, writer, config, chunk_size)
+        finally:
+            await writer.close()
+    except BaseException:
+        if not os.path.exists(state_path) and os.path.exists(part_path):
+            os.remove(part_path)  # Nothing to resume from
+        raise
+    finally:
+        probe.release()
+
+    os.replace(part_path, save_path)
+    if state is not None:
+        state.remove()
+    size = os.path.getsize(save_path)
+    elapsed = max(1e-6, time.monotonic() - started)
+    return {
+        "saved": True,
+        "path": os.path.abspath(save_path),
+        "size_bytes": size,
+        "content_type": content_type,
+        "url": url,
+        "ranged": ranged,
+        "segments": len(state.segments) if state is not None else 1,
+        "resumed_bytes": resumed_bytes,
+        "elapsed_ms": int(elapsed * 1000),
+        "throughput_mbps": round((size - resumed_bytes) * 8 / elapsed / 1e6, 2),
+    }
@@ -0,0 +1,266 @@
+# ./src/web_scraper_toolkit/core/automation/rate_limit.py
+"""
+Cross-process, host-keyed rate limiting and concurrency store.
+Used by the MCP server process pool so every worker draws from the same
+per-host token buckets and in-flight caps instead of per-process copies.
+Run: imported as a library module; installed into pool workers via
+`install_shared_limiter` as the ProcessPoolExecutor initializer.
+Inputs: target URLs plus requests-per-second, burst, and in-flight limits.
+Outputs: acquire/release gating before each outbound fetch.
+Side effects: allocates a `multiprocessing.shared_memory` segment in the
+creating process (unlinked on close/exit) and attaches to it in workers.
+Operational notes: fixed-size open-addressing table keyed by a stable host
+hash; when a probe window is full the least recently used idle host is evicted.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import hashlib
+import logging
+import multiprocessing
+import random
+import struct
+import time
+from contextlib import asynccontextmanager
+from multiprocessing import shared_memory
+from typing import Any, AsyncIterator, Optional, Tuple
+
+from .concurrency import host_key
+
+logger = logging.getLogger(__name__)
+
+# Slot layout: host hash, tokens, last update (monotonic), in-flight count.
+_SLOT = struct.Struct("<Qddq")
+_PROBE_WINDOW = 16
+_INFLIGHT_POLL_SECONDS = 0.05
+
+SharedLimiterHandle = Tuple[str, Any, float, int, int, int]
+
+
+def _host_hash(url_or_host: str) -> int:
+    digest = hashlib.blake2b(
+        host_key(url_or_host).encode("utf-8"), digest_size=8
+    ).digest()
+    return int.from_bytes(digest, "little") or 1  # 0 marks an empty slot
+
+
+class SharedHostLimiter:
+    """
+    Per-host token buckets and in-flight counters in shared memory.
+
+    Usage:
+        limiter = SharedHostLimiter.create(requests_per_second=2, burst=4)
+        executor = ProcessPoolExecutor(
+            initializer=install_shared_limiter, initargs=(limiter.handle(),)
+        )
+        # In any process:
+        async with shared_host_slot(url):
+            await fetch(url)
+    """
+
+    def __init__(
+        self,
+        shm: shared_memory.SharedMemory,
+        lock: Any,
+        requests_per_second: float,
+        burst: int,
+        max_inflight: int,
+        slots: int,
+        owner: bool = False,
+    ) -> None:
+        self._shm = shm
+        self._lock = lock
+        self.requests_per_second = max(0.0, float(requests_per_second))
+        self.burst = max(1, int(burst))
+        self.max_inflight = max(0, int(max_inflight))
+        self.slots = slots
+        self._owner = owner
+        self._closed = False
+
+    @classmethod
+    def create(
+        cls,
+        requests_per_second: float = 2.0,
+        burst: int = 4,
+        max_inflight: int = 4,
+        slots: int = 1024,
+    ) -> "SharedHostLimiter":
+        """Allocate a new shared segment (call once, in the parent process)."""
+        slots = max(_PROBE_WINDOW, int(slots))
+        shm = shared_memory.SharedMemory(create=True, size=slots * _SLOT.size)
+        shm.buf[: slots * _SLOT.size] = bytes(slots * _SLOT.size)
+        limiter = cls(
+            shm,
+            multiprocessing.Lock(),
+            requests_per_second,
+            burst,
+            max_inflight,
+            slots,
+            owner=True,
+        )
+        atexit.register(limiter.close)
+        return limiter
+
+    @classmethod
+    def attach(cls, handle: SharedLimiterHandle) -> "SharedHostLimiter":
+        """Attach to a segment created elsewhere (e.g. in a pool worker)."""
+        name, lock, rps, burst, max_inflight, slots = handle
+        shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, lock, rps, burst, max_inflight, slots)
+
+    def handle(self) -> SharedLimiterHandle:
+        """Picklable description passed to pool workers via initargs."""
+        return (
+            self._shm.name,
+            self._lock,
+            self.requests_per_second,
+            self.burst,
+            self.max_inflight,
+            self.slots,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.requests_per_second > 0 or self.max_inflight > 0
+
+    def _find_slot(self, key: int, create: bool) -> Optional[int]:
+        """Return the byte offset for `key` (caller holds the lock)."""
+        buf = self._shm.buf
+        start = key % self.slots
+        empty: Optional[int] = None
+        victim: Optional[int] = None
+        victim_age = float("inf")
+        for step in range(_PROBE_WINDOW):
+            offset = ((start + step) % self.slots) * _SLOT.size
+            slot_key, _, updated, inflight = _SLOT.unpack_from(buf, offset)
+            if slot_key == key:
+                return offset
+            if slot_key == 0:
+                if empty is None:
+                    empty = offset
+            elif inflight <= 0 and updated < victim_age:
+                victim, victim_age = offset, updated
+        if not create:
+            return None
+        offset = empty if empty is not None else victim
+        if offset is not None:
+            _SLOT.pack_into(buf, offset, key, float(self.burst), time.monotonic(), 0)
+        return offset
+
+    def try_acquire(self, url: str) -> float:
+        """
+        Take one token and one in-flight slot for the URL's host.
+
+        Returns 0.0 on success, otherwise the seconds to wait before retrying
+        (nothing is taken in that case).
+        """
+        if not self.enabled or self._closed:
+            return 0.0
+        key = _host_hash(url)
+        now = time.monotonic()
+        with self._lock:
+            offset = self._find_slot(key, create=True)
+            if offset is None:
+                return 0.0  # Table window saturated by busy hosts; fail open
+            _, tokens, updated, inflight = _SLOT.unpack_from(self._shm.buf, offset)
+            if self.requests_per_second > 0:
+                tokens = min(
+                    float(self.burst),
+                    tokens + max(0.0, now - updated) * self.requests_per_second,
+                )
+            if self.max_inflight > 0 and inflight >= self.max_inflight:
+                _SLOT.pack_into(self._shm.buf, offset, key, tokens, now, inflight)
+                return _INFLIGHT_POLL_SECONDS
+            if self.requests_per_second > 0 and tokens < 1.0:
+                _SLOT.pack_into(self._shm.buf, offset, key, tokens, now, inflight)
+                return (1.0 - tokens) / self.requests_per_second
+            _SLOT.pack_into(self._shm.buf, offset, key, tokens - 1.0, now, inflight + 1)
+            return 0.0
+
+    def release(self, url: str) -> None:
+        """Return the in-flight slot taken by a successful try_acquire."""
+        if not self.enabled or self._closed:
+            return
+        key = _host_hash(url)
+        with self._lock:
+            offset = self._find_slot(key, create=False)
+            if offset is None:
+                return
+            slot_key, tokens, updated, inflight = _SLOT.unpack_from(
+                self._shm.buf, offset
+            )
+            _SLOT.pack_into(
+                self._shm.buf, offset, slot_key, tokens, updated, max(0, inflight - 1)
+            )
+
+    async def acquire(self, url: str) -> None:
+        """Wait until the host has a token and a free in-flight slot."""
+        while True:
+            wait = self.try_acquire(url)
+            if wait <= 0:
+                return
+            # Jitter so workers woken together do not stampede the lock.
+            await asyncio.sleep(min(wait, 1.0) * random.uniform(1.0, 1.2))
+
+    def inflight(self, url: str) -> int:
+        """Current cross-process in-flight count for the URL's host."""
+        with self._lock:
+            offset = self._find_slot(_host_hash(url), create=False)
+            if offset is None:
+                return 0
+            return int(_SLOT.unpack_from(self._shm.buf, offset)[3])
+
+    def close(self) -> None:
+        """Detach; the creating process also unlinks the segment."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._shm.close()
+            if self._owner:
+                self._shm.unlink()
+        except (FileNotFoundError, BufferError):
+            pass
+
+
+# Limiter installed in this process (parent or pool worker)
+_shared_limiter: Optional[SharedHostLimiter] = None
+
+
+def get_shared_limiter() -> Optional[SharedHostLimiter]:
+    """Get the limiter installed in this process, if any."""
+    return _shared_limiter
+
+
+def set_shared_limiter(limiter: Optional[SharedHostLimiter]) -> None:
+    """Install (or clear) the limiter used by shared_host_slot in this process."""
+    global _shared_limiter
+    _shared_limiter = limiter
+
+
+def install_shared_limiter(handle: Optional[SharedLimiterHandle]) -> None:
+    """ProcessPoolExecutor initializer: attach the worker to the shared store."""
+    if handle is None:
+        set_shared_limiter(None)
+        return
+    try:
+        set_shared_limiter(SharedHostLimiter.attach(handle))
+    except Exception as e:  # Never let limiter setup kill the worker
+        logger.warning(f"Shared rate limiter unavailable in worker: {e}")
+        set_shared_limiter(None)
+
+
+@asynccontextmanager
+async def shared_host_slot(url: str) -> AsyncIterator[None]:
+    """Gate one outbound request on the shared limiter (no-op if none)."""
+    limiter = _shared_limiter
+    if limiter is None or not limiter.enabled:
+        yield
+        return
+    await limiter.acquire(url)
+    try:
+        yield
+    finally:
+        limiter.release(url)
@@ -11,19 +11,28 @@ Usage:
     async def scrape(url):
         ...
 
+    # Per-host circuit breaking keyed by URL argument
+    await retry_operation(fetch, url, circuit_key=url)
+
 Key Features:
     - Exponential backoff
     - Configurable max attempts
     - Jitter for distributed systems
     - Retry-able exception filtering
+    - Per-host circuit breakers (closed/open/half-open)
+    - Global retry budget capped as a fraction of total requests
 """
 
 import asyncio
 import functools
 import logging
 import random
+import threading
+import time
 from dataclasses import dataclass
-from typing import Dict, Any, Optional, Callable, Type, Tuple
+from typing import Dict, Any, Optional, Callable, Type, Tuple, Union
+
+from .concurrency import host_key
 
 logger = logging.getLogger(__name__)
 
@@ -92,6 +101,294 @@ def update_retry_config(
     }
 
 
+@dataclass
+class CircuitBreakerConfig:
+    """Configuration for per-host circuit breakers."""
+
+    failure_threshold: int = 5  # Consecutive failures before opening
+    recovery_timeout_seconds: float = 30.0
+    max_recovery_timeout_seconds: float = 300.0  # Cap for repeated re-opens
+    half_open_max_calls: int = 1
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CircuitBreakerConfig":
+        return cls(
+            failure_threshold=data.get("failure_threshold", 5),
+            recovery_timeout_seconds=data.get("recovery_timeout_seconds", 30.0),
+            max_recovery_timeout_seconds=data.get(
+                "max_recovery_timeout_seconds", 300.0
+            ),
+            half_open_max_calls=data.get("half_open_max_calls", 1),
+        )
+
+
+@dataclass
+class RetryBudgetConfig:
+    """Configuration for the global retry budget."""
+
+    retry_ratio: float = 0.2  # Retries allowed per original request
+    min_retries_per_second: float = 1.0  # Floor so low traffic can still retry
+    max_balance: float = 100.0
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RetryBudgetConfig":
+        return cls(
+            retry_ratio=data.get("retry_ratio", 0.2),
+            min_retries_per_second=data.get("min_retries_per_second", 1.0),
+            max_balance=data.get("max_balance", 100.0),
+        )
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is short-circuited because its host breaker is open."""
+
+    def __init__(self, host: str, retry_after: float):
+        self.host = host
+        self.retry_after = retry_after
+        super().__init__(f"Circuit open for {host}; retry after {retry_after:.1f}s")
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open breaker for a single host.
+
+    Closed: requests flow; consecutive failures are counted.
+    Open: requests are rejected until the recovery timeout elapses.
+    Half-open: a limited number of trial requests decide whether to close
+    again or re-open with a longer recovery timeout.
+    """
+
+    def __init__(self, config: CircuitBreakerConfig):
+        self.config = config
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.recovery_timeout = config.recovery_timeout_seconds
+        self._trial_calls = 0
+        self._last_trial_at = 0.0
+
+    def retry_after(self, now: Optional[float] = None) -> float:
+        """Seconds until a request would be allowed (0.0 if allowed now)."""
+        now = time.monotonic() if now is None else now
+        if self.state == "closed":
+            return 0.0
+        if self.state == "open":
+            return max(0.0, self.opened_at + self.recovery_timeout - now)
+        if self._trial_calls < max(1, self.config.half_open_max_calls):
+            return 0.0
+        # Trial slots are taken; reclaim them if the trial never reported back.
+        return max(0.0, self._last_trial_at + self.recovery_timeout - now)
+
+    def allow_request(self, now: Optional[float] = None) -> bool:
+        """Check and claim permission for one request."""
+        now = time.monotonic() if now is None else now
+        if self.state == "open":
+            if now - self.opened_at < self.recovery_timeout:
+                return False
+            self.state = "half_open"
+            self._trial_calls = 0
+        if self.state == "half_open":
+            if self.retry_after(now) > 0:
+                return False
+            if self._trial_calls >= max(1, self.config.half_open_max_calls):
+                self._trial_calls = 0  # Stale trials expired
+            self._trial_calls += 1
+            self._last_trial_at = now
+        return True
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.recovery_timeout = self.config.recovery_timeout_seconds
+        self._trial_calls = 0
+
+    def release_trial(self) -> None:
+        """Give back a half-open trial slot without judging the host."""
+        if self.state == "half_open" and self._trial_calls > 0:
+            self._trial_calls -= 1
+
+    def record_failure(self, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        self.consecutive_failures += 1
+        if self.state == "half_open":
+            # Failed trial: back off harder before the next probe.
+            self.recovery_timeout = min(
+                self.config.max_recovery_timeout_seconds,
+                self.recovery_timeout * 2,
+            )
+            self._open(now)
+        elif (
+            self.state == "closed"
+            and self.consecutive_failures >= self.config.failure_threshold
+        ):
+            self._open(now)
+
+    def _open(self, now: float) -> None:
+        self.state = "open"
+        self.opened_at = now
+        self._trial_calls = 0
+
+
+class CircuitBreakerRegistry:
+    """Thread-safe host-keyed collection of circuit breakers."""
+
+    def __init__(self, config: Optional[CircuitBreakerConfig] = None):
+        self.config = config or CircuitBreakerConfig()
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, url_or_host: str) -> CircuitBreaker:
+        key = host_key(url_or_host)
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(self.config)
+            self._breakers[key] = breaker
+        return breaker
+
+    def state(self, url_or_host: str) -> str:
+        with self._lock:
+            return self._get(url_or_host).state
+
+    def retry_after(self, url_or_host: str) -> float:
+        with self._lock:
+            return self._get(url_or_host).retry_after()
+
+    def allow_request(self, url_or_host: str) -> bool:
+        with self._lock:
+            return self._get(url_or_host).allow_request()
+
+    def record_success(self, url_or_host: str) -> None:
+        with self._lock:
+            self._get(url_or_host).record_success()
+
+    def release_trial(self, url_or_host: str) -> None:
+        with self._lock:
+            self._get(url_or_host).release_trial()
+
+    def record_failure(self, url_or_host: str) -> None:
+        with self._lock:
+            breaker = self._get(url_or_host)
+            was_open = breaker.state == "open"
+            breaker.record_failure()
+            if breaker.state == "open" and not was_open:
+                logger.warning(
+                    f"Circuit opened for {host_key(url_or_host)} after "
+                    f"{breaker.consecutive_failures} failures "
+                    f"(recovery in {breaker.recovery_timeout:.0f}s)"
+                )
+
+    def reset(self) -> None:
+        with self._lock:
+            self._breakers.clear()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                host: {
+                    "state": breaker.state,
+                    "consecutive_failures": breaker.consecutive_failures,
+                    "retry_after_seconds": round(breaker.retry_after(), 2),
+                }
+                for host, breaker in self._breakers.items()
+                if breaker.state != "closed" or breaker.consecutive_failures
+            }
+
+
+class RetryBudget:
+    """
+    Global token bucket limiting retries to a fraction of total requests.
+
+    Every original request deposits `retry_ratio` tokens and time deposits
+    `min_retries_per_second`; every retry withdraws one token. When a host
+    goes down, retries stop once the budget is spent instead of every queued
+    URL burning its full schedule.
+    """
+
+    def __init__(self, config: Optional[RetryBudgetConfig] = None):
+        self.config = config or RetryBudgetConfig()
+        self._balance = min(self.config.max_balance, 10.0)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.rejected = 0
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._last_refill)
+        self._last_refill = now
+        self._balance = min(
+            self.config.max_balance,
+            self._balance + elapsed * self.config.min_retries_per_second,
+        )
+
+    def record_request(self) -> None:
+        """Account for one original (non-retry) request."""
+        with self._lock:
+            self.requests += 1
+            self._refill(time.monotonic())
+            self._balance = min(
+                self.config.max_balance, self._balance + self.config.retry_ratio
+            )
+
+    def try_acquire(self) -> bool:
+        """Withdraw one retry token; False when the budget is exhausted."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._balance >= 1.0:
+                self._balance -= 1.0
+                self.retries += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "retries": self.retries,
+                "rejected": self.rejected,
+                "balance": round(self._balance, 2),
+            }
+
+
+# Global breaker registry and retry budget
+_circuit_breakers: Optional[CircuitBreakerRegistry] = None
+_retry_budget: Optional[RetryBudget] = None
+
+
+def get_circuit_breakers() -> CircuitBreakerRegistry:
+    """Get the global per-host circuit breaker registry."""
+    global _circuit_breakers
+    if _circuit_breakers is None:
+        _circuit_breakers = CircuitBreakerRegistry()
+    return _circuit_breakers
+
+
+def set_circuit_breakers(registry: CircuitBreakerRegistry) -> None:
+    """Replace the global circuit breaker registry."""
+    global _circuit_breakers
+    _circuit_breakers = registry
+
+
+def get_retry_budget() -> RetryBudget:
+    """Get the global retry budget."""
+    global _retry_budget
+    if _retry_budget is None:
+        _retry_budget = RetryBudget()
+    return _retry_budget
+
+
+def set_retry_budget(budget: RetryBudget) -> None:
+    """Replace the global retry budget."""
+    global _retry_budget
+    _retry_budget = budget
+
+
+def is_host_failure(status: Optional[int]) -> bool:
+    """Return True when a status indicates the host itself is failing."""
+    return status is None or status >= 500
+
+
 def calculate_delay(
     attempt: int,
     config: RetryConfig,
@@ -108,10 +405,32 @@ def calculate_delay(
     return max(0, delay)
 
 
+def _admit_attempt(circuit_key: Optional[str], attempt: int) -> None:
+    """Check breaker and budget before an attempt; raise if it must not run."""
+    if circuit_key:
+        breakers = get_circuit_breakers()
+        if not breakers.allow_request(circuit_key):
+            raise CircuitOpenError(
+                host_key(circuit_key), breakers.retry_after(circuit_key)
+            )
+    if attempt == 0:
+        get_retry_budget().record_request()
+
+
+def _record_attempt(circuit_key: Optional[str], success: bool) -> None:
+    if not circuit_key:
+        return
+    if success:
+        get_circuit_breakers().record_success(circuit_key)
+    else:
+        get_circuit_breakers().record_failure(circuit_key)
+
+
 def with_retry(
     max_attempts: Optional[int] = None,
     initial_delay: Optional[float] = None,
     retryable_exceptions: Tuple[Type[Exception], ...] = (Exception,),
+    circuit_key: Optional[Union[str, Callable[..., Optional[str]]]] = None,
 ):
     """
     Decorator for adding retry logic to async functions.
@@ -120,9 +439,11 @@ def with_retry(
         max_attempts: Override max attempts
         initial_delay: Override initial delay
         retryable_exceptions: Tuple of exceptions to retry on
+        circuit_key: Host/URL (or callable deriving one from the call args)
+            used for per-host circuit breaking
 
     Usage:
-        @with_retry(max_attempts=3)
+        @with_retry(max_attempts=3, circuit_key=lambda url: url)
         async def fetch_data(url):
             ...
     """
@@ -132,16 +453,27 @@ def with_retry(
         async def wrapper(*args: Any, **kwargs: Any) -> Any:
             config = get_retry_config()
             attempts = max_attempts or config.max_attempts
+            key = circuit_key(*args, **kwargs) if callable(circuit_key) else circuit_key
 
             last_exception: Optional[Exception] = None
 
             for attempt in range(attempts):
+                _admit_attempt(key, attempt)
                 try:
-                    return await func(*args, **kwargs)
+                    result = await func(*args, **kwargs)
+                    _record_attempt(key, success=True)
+                    return result
                 except retryable_exceptions as e:
                     last_exception = e
+                    _record_attempt(key, success=False)
 
                     if attempt < attempts - 1:
+                        if not get_retry_budget().try_acquire():
+                            logger.warning(
+                                f"Attempt {attempt + 1}/{attempts} failed: {e}. "
+                                "Retry budget exhausted; not retrying."
+                            )
+                            break
                         wait_time = calculate_delay(attempt, config)
                         logger.warning(
                             f"Attempt {attempt + 1}/{attempts} failed: {e}. "
@@ -164,6 +496,7 @@ async def retry_operation(
     operation: Callable[..., Any],
     *args: Any,
     max_attempts: Optional[int] = None,
+    circuit_key: Optional[str] = None,
     **kwargs: Any,
 ) -> Any:
     """
@@ -173,10 +506,14 @@ async def retry_operation(
         operation: Async callable to execute
         *args: Arguments for operation
         max_attempts: Override max attempts
+        circuit_key: Optional host/URL for per-host circuit breaking
         **kwargs: Keyword arguments for operation
 
     Returns:
         Result of successful operation
+
+    Raises:
+        CircuitOpenError: If the host breaker is open before an attempt.
     """
     config = get_retry_config()
     attempts = max_attempts or config.max_attempts
@@ -184,12 +521,19 @@ async def retry_operation(
     last_exception: Optional[Exception] = None
 
     for attempt in range(attempts):
+        _admit_attempt(circuit_key, attempt)
         try:
-            return await operation(*args, **kwargs)
+            result = await operation(*args, **kwargs)
+            _record_attempt(circuit_key, success=True)
+            return result
         except Exception as e:
             last_exception = e
+            _record_attempt(circuit_key, success=False)
 
             if attempt < attempts - 1:
+                if not get_retry_budget().try_acquire():
+                    logger.warning(f"Retry budget exhausted after: {e}")
+                    break
                 wait_time = calculate_delay(attempt, config)
                 logger.warning(
                     f"Retry {attempt + 1}/{attempts}: {e}. Waiting {wait_time:.1f}s..."
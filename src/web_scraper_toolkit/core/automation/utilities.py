@@ -9,22 +9,30 @@ Enables agents to pre-flight check URLs before full scraping.
 Usage:
     result = await validate_url("https://example.com")
     content_type = await detect_content_type("https://example.com/file.pdf")
+    results = await validate_urls(["https://a.com", "https://b.com/doc.pdf"])
 
 Key Features:
-    - Fast HEAD requests for pre-flight checks
+    - Fast HEAD requests for pre-flight checks (ranged GET fallback)
+    - Batched, pipelined validation over the shared pool with per-host limits
     - Content type detection
     - System health monitoring
+    - Parallel ranged, resumable downloads
 """
 
 import asyncio
 import logging
-from typing import Dict, Any
+import os
+import time
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
 
 import aiohttp
 
+from ..http_client import SharedHttpClient
 from ..user_agents import get_stealth_headers
 from ..state.cache import get_cache
 from ..state.session import get_session_manager
+from .concurrency import AdaptiveConcurrencyConfig, AdaptiveConcurrencyController
+from .downloads import DownloadConfig, download_ranged
 
 logger = logging.getLogger(__name__)
 
@@ -85,69 +93,139 @@ async def health_check() -> Dict[str, Any]:
         }
 
 
-async def validate_url(url: str, timeout: int = 10) -> Dict[str, Any]:
+# HEAD statuses that usually mean "HEAD unsupported/blocked", not "GET fails".
+_HEAD_FALLBACK_STATUSES = frozenset({403, 405, 501})
+_PROBE_CACHE_MAX_ENTRIES = 4096
+
+# url -> (expires_at, result); short-lived, so a plain dict is enough.
+_probe_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+
+def _cache_get(url: str) -> Optional[Dict[str, Any]]:
+    entry = _probe_cache.get(url)
+    if entry is None:
+        return None
+    if entry[0] < time.monotonic():
+        _probe_cache.pop(url, None)
+        return None
+    return dict(entry[1])
+
+
+def _cache_put(url: str, result: Dict[str, Any], ttl: float) -> None:
+    if ttl <= 0:
+        return
+    if len(_probe_cache) >= _PROBE_CACHE_MAX_ENTRIES:
+        now = time.monotonic()
+        for key in [k for k, (exp, _) in _probe_cache.items() if exp < now]:
+            del _probe_cache[key]
+        while len(_probe_cache) >= _PROBE_CACHE_MAX_ENTRIES:
+            del _probe_cache[next(iter(_probe_cache))]  # Oldest insertion
+    _probe_cache[url] = (time.monotonic() + ttl, dict(result))
+
+
+def clear_probe_cache() -> None:
+    """Drop cached validate_url/detect_content_type results."""
+    _probe_cache.clear()
+
+
+def _probe_result(response: aiohttp.ClientResponse, method: str) -> Dict[str, Any]:
+    headers = response.headers
+    length = int(headers.get("Content-Length", 0) or 0)
+    content_range = headers.get("Content-Range", "")
+    if response.status == 206 and "/" in content_range:
+        total = content_range.rsplit("/", 1)[1].strip()
+        length = int(total) if total.isdigit() else 0
+    return {
+        "reachable": response.status < 400,
+        "status_code": response.status,
+        "content_type": headers.get("Content-Type", "unknown"),
+        "content_length": length,
+        "final_url": str(response.url),
+        "redirects": len(response.history),
+        "method": method,
+    }
+
+
+async def _probe_url(url: str, timeout: int) -> Dict[str, Any]:
+    """HEAD the URL over the shared pool, falling back to a 1-byte ranged GET."""
+    session = await SharedHttpClient.get_session()
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+    headers = get_stealth_headers()
+
+    head_result: Optional[Dict[str, Any]] = None
+    try:
+        async with session.head(
+            url,
+            headers=headers,
+            timeout=client_timeout,
+            allow_redirects=True,
+        ) as response:
+            head_result = _probe_result(response, "HEAD")
+    except aiohttp.ClientError:
+        head_result = None  # Some servers reset HEAD; try GET below
+
+    if head_result is not None and (
+        head_result["status_code"] not in _HEAD_FALLBACK_STATUSES
+    ):
+        return head_result
+
+    range_headers = dict(headers, Range="bytes=0-0")
+    range_headers["Accept-Encoding"] = "identity"
+    async with session.get(
+        url,
+        headers=range_headers,
+        timeout=client_timeout,
+        allow_redirects=True,
+    ) as response:
+        # Never read the body: a server ignoring Range would send all of it.
+        return _probe_result(response, "GET")
+
+
+def _probe_error(error: str) -> Dict[str, Any]:
+    return {
+        "reachable": False,
+        "error": error,
+        "status_code": None,
+    }
+
+
+async def validate_url(
+    url: str, timeout: int = 10, cache_ttl: float = 60.0
+) -> Dict[str, Any]:
     """
     Validate URL reachability with HEAD request.
 
+    Falls back to a 1-byte ranged GET when HEAD is rejected, and caches
+    results for `cache_ttl` seconds (0 disables caching).
+
     Args:
         url: URL to validate
         timeout: Request timeout in seconds
+        cache_ttl: Seconds to reuse a previous result for the same URL
 
     Returns:
         Dict with reachability status, content type, redirects, etc.
     """
+    cached = _cache_get(url) if cache_ttl > 0 else None
+    if cached is not None:
+        cached["cached"] = True
+        return cached
+
     try:
-        headers = get_stealth_headers()
-
-        async with aiohttp.ClientSession() as session:
-            async with session.head(
-                url,
-                headers=headers,
-                timeout=aiohttp.ClientTimeout(total=timeout),
-                allow_redirects=True,
-            ) as response:
-                return {
-                    "reachable": response.status < 400,
-                    "status_code": response.status,
-                    "content_type": response.headers.get("Content-Type", "unknown"),
-                    "content_length": int(response.headers.get("Content-Length", 0)),
-                    "final_url": str(response.url),
-                    "redirects": len(response.history),
-                }
+        result = await _probe_url(url, timeout)
     except asyncio.TimeoutError:
-        return {
-            "reachable": False,
-            "error": "timeout",
-            "status_code": None,
-        }
+        return _probe_error("timeout")
     except aiohttp.ClientError as e:
-        return {
-            "reachable": False,
-            "error": str(e),
-            "status_code": None,
-        }
+        return _probe_error(str(e))
     except Exception as e:
         logger.error(f"URL validation failed: {e}")
-        return {
-            "reachable": False,
-            "error": str(e),
-            "status_code": None,
-        }
-
-
-async def detect_content_type(url: str, timeout: int = 10) -> Dict[str, Any]:
-    """
-    Detect content type of URL without downloading full content.
+        return _probe_error(str(e))
 
-    Args:
-        url: URL to check
-        timeout: Request timeout
+    _cache_put(url, result, cache_ttl)
+    return result
 
-    Returns:
-        Dict with content type and boolean flags for common types.
-    """
-    result = await validate_url(url, timeout)
 
+def _content_type_flags(result: Dict[str, Any]) -> Dict[str, Any]:
     if not result.get("reachable"):
         return {
             "type": "unknown",
@@ -172,65 +250,148 @@ async def detect_content_type(url: str, timeout: int = 10) -> Dict[str, Any]:
     }
 
 
+async def detect_content_type(url: str, timeout: int = 10) -> Dict[str, Any]:
+    """
+    Detect content type of URL without downloading full content.
+
+    Args:
+        url: URL to check
+        timeout: Request timeout
+
+    Returns:
+        Dict with content type and boolean flags for common types.
+    """
+    return _content_type_flags(await validate_url(url, timeout))
+
+
+async def iter_validate_urls(
+    urls: Iterable[str],
+    timeout: int = 10,
+    max_concurrency: int = 32,
+    per_host_limit: int = 4,
+    cache_ttl: float = 60.0,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Validate many URLs concurrently, yielding each result as it completes.
+
+    Requests share one connection pool, are capped globally by
+    `max_concurrency`, and per host by an adaptive limit starting at
+    `per_host_limit` (backs off on 429/503). Duplicate URLs are probed once.
+
+    Yields:
+        validate_url result dicts with an added "url" key, in completion order.
+    """
+    unique = list(dict.fromkeys(u for u in urls if u))
+    if not unique:
+        return
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    host_limiter = AdaptiveConcurrencyController(
+        AdaptiveConcurrencyConfig(
+            initial_limit=per_host_limit,
+            max_limit=per_host_limit,
+            decrease_cooldown_seconds=1.0,
+        )
+    )
+
+    async def probe(url: str) -> Dict[str, Any]:
+        cached = _cache_get(url) if cache_ttl > 0 else None
+        if cached is not None:
+            return {"url": url, **cached, "cached": True}
+        async with host_limiter.slot(url) as host_slot, semaphore:
+            host_slot.mark_sent()
+            result = await validate_url(url, timeout, cache_ttl=cache_ttl)
+            host_slot.report(
+                status=result.get("status_code"),
+                error=result.get("status_code") is None,
+            )
+        return {"url": url, **result}
+
+    tasks = [asyncio.ensure_future(probe(url)) for url in unique]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def validate_urls(
+    urls: List[str],
+    timeout: int = 10,
+    max_concurrency: int = 32,
+    per_host_limit: int = 4,
+    cache_ttl: float = 60.0,
+) -> List[Dict[str, Any]]:
+    """
+    Batch variant of validate_url; results are returned in input order.
+
+    See iter_validate_urls for concurrency and caching behavior.
+    """
+    by_url: Dict[str, Dict[str, Any]] = {}
+    async for result in iter_validate_urls(
+        urls,
+        timeout=timeout,
+        max_concurrency=max_concurrency,
+        per_host_limit=per_host_limit,
+        cache_ttl=cache_ttl,
+    ):
+        by_url[result["url"]] = result
+    return [by_url[url] for url in urls if url in by_url]
+
+
+async def detect_content_types(
+    urls: List[str],
+    timeout: int = 10,
+    max_concurrency: int = 32,
+    per_host_limit: int = 4,
+) -> List[Dict[str, Any]]:
+    """Batch variant of detect_content_type; results are in input order."""
+    results = await validate_urls(
+        urls,
+        timeout=timeout,
+        max_concurrency=max_concurrency,
+        per_host_limit=per_host_limit,
+    )
+    return [{"url": r["url"], **_content_type_flags(r)} for r in results]
+
+
 async def download_file(
     url: str,
     save_path: str,
     timeout: int = 60,
-    chunk_size: int = 8192,
+    chunk_size: int = 64 * 1024,
+    config: Optional[DownloadConfig] = None,
 ) -> Dict[str, Any]:
     """
     Download file from URL.
 
+    Uses the shared connection pool, splits large files into parallel byte
+    ranges when the server supports them, and resumes interrupted downloads
+    from a `<save_path>.part.json` sidecar on the next call.
+
     Args:
         url: URL to download
         save_path: Local path to save file
-        timeout: Request timeout
-        chunk_size: Download chunk size
+        timeout: Connect/read inactivity timeout in seconds
+        chunk_size: Network read size (reads are coalesced before writing)
+        config: Optional DownloadConfig override
 
     Returns:
         Dict with save status, path, and file info.
     """
-    import os
-    from pathlib import Path
-
     try:
-        headers = get_stealth_headers()
-
-        # Ensure directory exists
-        Path(save_path).parent.mkdir(parents=True, exist_ok=True)
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                url,
-                headers=headers,
-                timeout=aiohttp.ClientTimeout(total=timeout),
-            ) as response:
-                if response.status >= 400:
-                    return {
-                        "saved": False,
-                        "error": f"HTTP {response.status}",
-                        "status_code": response.status,
-                    }
-
-                content_type = response.headers.get("Content-Type", "unknown")
-                total_size = 0
-
-                with open(save_path, "wb") as f:
-                    async for chunk in response.content.iter_chunked(chunk_size):
-                        f.write(chunk)
-                        total_size += len(chunk)
-
-                return {
-                    "saved": True,
-                    "path": os.path.abspath(save_path),
-                    "size_bytes": total_size,
-                    "content_type": content_type,
-                    "url": url,
-                }
-
+        return await download_ranged(
+            url,
+            save_path,
+            timeout=timeout,
+            chunk_size=chunk_size,
+            config=config,
+        )
     except Exception as e:
         logger.error(f"File download failed: {e}")
         return {
             "saved": False,
             "error": str(e),
+            "resumable": os.path.exists(f"{save_path}.part.json"),
         }
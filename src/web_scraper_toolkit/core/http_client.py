@@ -16,17 +16,20 @@ Key Features:
     - Connection pooling (configurable limit)
     - DNS caching (configurable TTL)
     - Automatic cleanup of closed connections
-    - Thread-safe singleton pattern
+    - One session per event loop (safe across asyncio.run calls and threads)
 """
 
 import asyncio
 import logging
+import threading
+import weakref
 from dataclasses import dataclass
-from typing import Optional, Dict, Any
+from typing import Any, Awaitable, Dict, Optional, TypeVar
 
 import aiohttp
 
 logger = logging.getLogger(__name__)
+T = TypeVar("T")
 
 
 @dataclass
@@ -68,15 +71,28 @@ def set_http_config(config: HttpConfig) -> None:
     _http_config = config
 
 
+_Loop = asyncio.AbstractEventLoop
+
+
 class SharedHttpClient:
     """
-    Singleton HTTP client with connection pooling.
-
-    Thread-safe for async usage. Session is created lazily on first request.
+    Per-event-loop HTTP client with connection pooling.
+
+    An aiohttp session is bound to the loop that created it, so each running
+    loop gets its own pooled session, created lazily on first request. Sync
+    wrappers that spin up a loop per call (`asyncio.run`) and worker threads
+    with their own loops therefore never reuse a session from a dead loop.
+    Sessions whose loop has closed are dropped on the next lookup; call
+    `close()` before a loop ends to release its connections cleanly.
     """
 
-    _session: Optional[aiohttp.ClientSession] = None
-    _lock: Optional[asyncio.Lock] = None
+    _sessions: "weakref.WeakKeyDictionary[_Loop, aiohttp.ClientSession]" = (
+        weakref.WeakKeyDictionary()
+    )
+    _locks: "weakref.WeakKeyDictionary[_Loop, asyncio.Lock]" = (
+        weakref.WeakKeyDictionary()
+    )
+    _guard = threading.Lock()
 
     # Default headers
     DEFAULT_HEADERS = {
@@ -84,6 +100,18 @@ class SharedHttpClient:
         "Accept-Language": "en-US,en;q=0.9",
     }
 
+    @classmethod
+    def _loop_lock(cls, loop: _Loop) -> asyncio.Lock:
+        with cls._guard:
+            for other in [key for key in cls._sessions if key.is_closed()]:
+                # The loop is gone, so the session cannot be closed properly;
+                # detach it so it is not reported as leaked.
+                cls._sessions.pop(other).detach()
+            lock = cls._locks.get(loop)
+            if lock is None:
+                lock = cls._locks[loop] = asyncio.Lock()
+            return lock
+
     @classmethod
     async def get_session(
         cls,
@@ -91,21 +119,19 @@ class SharedHttpClient:
         headers: Optional[Dict[str, str]] = None,
     ) -> aiohttp.ClientSession:
         """
-        Get or create the shared session with connection pooling.
+        Get or create the running loop's session with connection pooling.
 
         Args:
             timeout: Optional custom timeout (uses default if not provided)
             headers: Optional additional headers to merge with defaults
 
         Returns:
-            Shared aiohttp ClientSession
+            aiohttp ClientSession shared by callers on the current loop
         """
-        # Initialize lock if needed (thread-safe)
-        if cls._lock is None:
-            cls._lock = asyncio.Lock()
-
-        async with cls._lock:
-            if cls._session is None or cls._session.closed:
+        loop = asyncio.get_running_loop()
+        async with cls._loop_lock(loop):
+            session = cls._sessions.get(loop)
+            if session is None or session.closed:
                 config = get_http_config()
                 connector = aiohttp.TCPConnector(
                     limit=config.connection_pool_limit,
@@ -123,33 +149,33 @@ class SharedHttpClient:
                     connect=config.connect_timeout,
                 )
 
-                cls._session = aiohttp.ClientSession(
+                session = aiohttp.ClientSession(
                     connector=connector,
                     timeout=timeout or default_timeout,
                     headers=merged_headers,
                 )
+                cls._sessions[loop] = session
                 logger.info(
                     f"SharedHttpClient: Created session (pool={config.connection_pool_limit}, "
                     f"per_host={config.connection_per_host})"
                 )
 
-        return cls._session
+        return session
 
     @classmethod
     async def close(cls) -> None:
         """
-        Close the shared session.
+        Close the running loop's session.
 
-        Call this during application shutdown for clean cleanup.
+        Call this during application shutdown (or before a short-lived loop
+        ends) for clean cleanup.
         """
-        if cls._lock is None:
-            cls._lock = asyncio.Lock()
-
-        async with cls._lock:
-            if cls._session and not cls._session.closed:
-                await cls._session.close()
+        loop = asyncio.get_running_loop()
+        async with cls._loop_lock(loop):
+            session = cls._sessions.pop(loop, None)
+            if session and not session.closed:
+                await session.close()
                 logger.info("SharedHttpClient: Session closed")
-            cls._session = None
 
     @classmethod
     async def fetch(
@@ -198,3 +224,11 @@ async def get_shared_session() -> aiohttp.ClientSession:
 async def close_shared_session() -> None:
     """Close the shared HTTP session."""
     await SharedHttpClient.close()
+
+
+async def closing_shared_session(coro: Awaitable[T]) -> T:
+    """Await `coro`, then close the session it may have opened on this loop."""
+    try:
+        return await coro
+    finally:
+        await SharedHttpClient.close()
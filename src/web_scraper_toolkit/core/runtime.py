@@ -163,6 +163,13 @@ class ConcurrencySettings:
     crawler_default_workers: int = 0
     crawler_max_workers: int = 128
     cpu_reserve: int = 1
+    # Cross-process per-host limits shared by MCP pool workers (0 disables)
+    host_requests_per_second: float = 2.0
+    host_burst: int = 4
+    host_max_inflight: int = 4
+    # Process pool for parse/convert/extract (0 = auto from CPU count)
+    cpu_pool_workers: int = 0
+    cpu_offload_min_bytes: int = 32768
 
     def as_dict(self) -> Dict[str, Any]:
         return {
@@ -174,6 +181,11 @@ class ConcurrencySettings:
             "crawler_default_workers": self.crawler_default_workers,
             "crawler_max_workers": self.crawler_max_workers,
             "cpu_reserve": self.cpu_reserve,
+            "host_requests_per_second": self.host_requests_per_second,
+            "host_burst": self.host_burst,
+            "host_max_inflight": self.host_max_inflight,
+            "cpu_pool_workers": self.cpu_pool_workers,
+            "cpu_offload_min_bytes": self.cpu_offload_min_bytes,
         }
 
 
@@ -201,6 +213,22 @@ class ServerRuntimeSettings:
         }
 
 
+@dataclass(slots=True)
+class SitemapIndexSettings:
+    """Persistent sitemap index used for incremental sitemap discovery."""
+
+    enabled: bool = True
+    directory: str = "./cache"
+    max_age_days: float = 30.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "directory": self.directory,
+            "max_age_days": self.max_age_days,
+        }
+
+
 @dataclass(slots=True)
 class RuntimeSettings:
     """Top-level runtime settings object shared across CLI and MCP server."""
@@ -208,6 +236,7 @@ class RuntimeSettings:
     default_timeout_profile: str = "standard"
     concurrency: ConcurrencySettings = field(default_factory=ConcurrencySettings)
     server: ServerRuntimeSettings = field(default_factory=ServerRuntimeSettings)
+    sitemap_index: SitemapIndexSettings = field(default_factory=SitemapIndexSettings)
     timeout_profiles: Dict[str, TimeoutProfile] = field(default_factory=dict)
     safe_output_root: str = "."
     job_retention_seconds: int = 3600
@@ -228,6 +257,7 @@ class RuntimeSettings:
             "max_job_records": self.max_job_records,
             "concurrency": self.concurrency.as_dict(),
             "server": self.server.as_dict(),
+            "sitemap_index": self.sitemap_index.as_dict(),
             "timeout_profiles": {
                 name: profile.as_dict()
                 for name, profile in self.timeout_profiles.items()
@@ -272,6 +302,11 @@ def _default_runtime_dict() -> Dict[str, Any]:
                 "crawler_default_workers": 0,
                 "crawler_max_workers": 128,
                 "cpu_reserve": 1,
+                "host_requests_per_second": 2.0,
+                "host_burst": 4,
+                "host_max_inflight": 4,
+                "cpu_pool_workers": 0,
+                "cpu_offload_min_bytes": 32768,
             },
             "server": {
                 "transport": "stdio",
@@ -309,6 +344,19 @@ def _apply_env(runtime: Dict[str, Any]) -> None:
         ),
         "WST_CRAWLER_MAX_WORKERS": ("runtime", "concurrency", "crawler_max_workers"),
         "WST_CPU_RESERVE": ("runtime", "concurrency", "cpu_reserve"),
+        "WST_HOST_REQUESTS_PER_SECOND": (
+            "runtime",
+            "concurrency",
+            "host_requests_per_second",
+        ),
+        "WST_HOST_BURST": ("runtime", "concurrency", "host_burst"),
+        "WST_HOST_MAX_INFLIGHT": ("runtime", "concurrency", "host_max_inflight"),
+        "WST_CPU_POOL_WORKERS": ("runtime", "concurrency", "cpu_pool_workers"),
+        "WST_CPU_OFFLOAD_MIN_BYTES": (
+            "runtime",
+            "concurrency",
+            "cpu_offload_min_bytes",
+        ),
         "WST_SERVER_TRANSPORT": ("runtime", "server", "transport"),
         "WST_SERVER_HOST": ("runtime", "server", "host"),
         "WST_SERVER_PORT": ("runtime", "server", "port"),
@@ -316,6 +364,9 @@ def _apply_env(runtime: Dict[str, Any]) -> None:
         "WST_SERVER_REQUIRE_API_KEY": ("runtime", "server", "require_api_key"),
         "WST_SERVER_API_KEY_ENV": ("runtime", "server", "api_key_env"),
         "WST_SERVER_SHOW_BANNER": ("runtime", "server", "expose_server_banner"),
+        "WST_SITEMAP_INDEX_ENABLED": ("runtime", "sitemap_index", "enabled"),
+        "WST_SITEMAP_INDEX_DIRECTORY": ("runtime", "sitemap_index", "directory"),
+        "WST_SITEMAP_INDEX_MAX_AGE_DAYS": ("runtime", "sitemap_index", "max_age_days"),
     }
 
     for env_name, key_path in env_map.items():
@@ -380,6 +431,13 @@ def _to_runtime_settings(merged: Dict[str, Any]) -> RuntimeSettings:
     if not isinstance(server_cfg, dict):
         server_cfg = {}
 
+    # config.json keeps it under `sitemap.index`; cfg/env layer `sitemap_index`.
+    sitemap_cfg = merged.get("sitemap", {})
+    index_cfg = sitemap_cfg.get("index", {}) if isinstance(sitemap_cfg, dict) else {}
+    index_cfg = dict(index_cfg) if isinstance(index_cfg, dict) else {}
+    if isinstance(runtime.get("sitemap_index"), dict):
+        index_cfg.update(runtime["sitemap_index"])
+
     settings = RuntimeSettings(
         default_timeout_profile=str(runtime.get("default_timeout_profile", "standard"))
         .strip()
@@ -423,6 +481,31 @@ def _to_runtime_settings(merged: Dict[str, Any]) -> RuntimeSettings:
                 default=1,
                 min_value=0,
             ),
+            host_requests_per_second=_as_float(
+                concurrency_cfg.get("host_requests_per_second", 2.0),
+                default=2.0,
+                min_value=0.0,
+            ),
+            host_burst=_as_int(
+                concurrency_cfg.get("host_burst", 4),
+                default=4,
+                min_value=1,
+            ),
+            host_max_inflight=_as_int(
+                concurrency_cfg.get("host_max_inflight", 4),
+                default=4,
+                min_value=0,
+            ),
+            cpu_pool_workers=_as_int(
+                concurrency_cfg.get("cpu_pool_workers", 0),
+                default=0,
+                min_value=0,
+            ),
+            cpu_offload_min_bytes=_as_int(
+                concurrency_cfg.get("cpu_offload_min_bytes", 32768),
+                default=32768,
+                min_value=0,
+            ),
         ),
         server=ServerRuntimeSettings(
             transport=str(server_cfg.get("transport", "stdio")).strip().lower(),
@@ -438,6 +521,13 @@ def _to_runtime_settings(merged: Dict[str, Any]) -> RuntimeSettings:
                 server_cfg.get("expose_server_banner", True), default=True
             ),
         ),
+        sitemap_index=SitemapIndexSettings(
+            enabled=_as_bool(index_cfg.get("enabled", True), default=True),
+            directory=str(index_cfg.get("directory", "./cache")).strip() or "./cache",
+            max_age_days=_as_float(
+                index_cfg.get("max_age_days", 30.0), default=30.0, min_value=0.0
+            ),
+        ),
         timeout_profiles=timeout_profiles,
         safe_output_root=str(runtime.get("safe_output_root", ".")).strip() or ".",
         job_retention_seconds=_as_int(
@@ -4,7 +4,7 @@ Response Cache
 ==============
 
 TTL-based caching for scraped content to avoid redundant fetches.
-Supports both in-memory and disk persistence.
+Supports both in-memory and disk persistence, each with a hard size bound.
 
 Usage:
     cache = ResponseCache(config)
@@ -14,23 +14,39 @@ Usage:
         cache.set(url, content)
 
 Key Features:
-    - Configurable TTL (time-to-live)
-    - Disk persistence for long sessions
-    - Memory-first with disk fallback
+    - Per-entry freshness from Cache-Control/Expires/Age, with per-host overrides
+    - Stale-while-revalidate: expired entries stay servable for a grace window
+      while callers refresh them (ETag/Last-Modified kept for conditional GETs)
+    - Background expiry sweeper
+    - Byte-accounted in-memory LRU capped at `max_memory_mb`
+    - Disk tier in one SQLite file: compressed, content-addressed (deduplicated)
+      bodies capped at `max_size_mb`, evicting least recently used entries
+    - Incremental counters so `get_stats` never scans the disk tier
     - URL normalization for consistent keys
 """
 
 import hashlib
-import json
 import logging
+import sys
+import threading
 import time
-from dataclasses import dataclass
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Optional, Any
+from typing import Dict, Literal, Mapping, Optional, Tuple, Any
 from urllib.parse import urlparse, urlencode, parse_qs
 
+from .cache_store import SqliteCacheStore
+
 logger = logging.getLogger(__name__)
 
+_MB = 1024 * 1024
+
+# "use" serves fresh entries and stores misses, "refresh" only stores,
+# "bypass" neither reads nor writes.
+ResponseCacheMode = Literal["bypass", "use", "refresh"]
+
 
 @dataclass
 class CacheConfig:
@@ -39,7 +55,16 @@ class CacheConfig:
     enabled: bool = True
     ttl_seconds: int = 300  # 5 minutes default
     directory: str = "./cache"
-    max_size_mb: int = 100
+    max_size_mb: int = 100  # Disk tier bound
+    max_memory_mb: int = 32  # In-memory tier bound
+    sweep_interval_seconds: float = 60.0  # 0 disables the background sweeper
+    stale_while_revalidate_seconds: float = 0.0  # Serve-stale window after TTL
+    revalidation_concurrency: int = 1  # Background refreshes in flight at once
+    honor_cache_headers: bool = True  # Derive per-entry TTL from the response
+    max_ttl_seconds: float = 86400.0  # Cap on header-derived freshness
+    # host -> {"ttl_seconds", "stale_seconds", "honor_cache_headers"}; a key
+    # also covers its subdomains.
+    host_overrides: Dict[str, Dict[str, Any]] = field(default_factory=dict)
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "CacheConfig":
@@ -48,8 +73,35 @@ class CacheConfig:
             ttl_seconds=data.get("ttl_seconds", 300),
             directory=data.get("directory", "./cache"),
             max_size_mb=data.get("max_size_mb", 100),
+            max_memory_mb=data.get("max_memory_mb", 32),
+            sweep_interval_seconds=data.get("sweep_interval_seconds", 60.0),
+            stale_while_revalidate_seconds=data.get(
+                "stale_while_revalidate_seconds", 0.0
+            ),
+            revalidation_concurrency=data.get("revalidation_concurrency", 1),
+            honor_cache_headers=data.get("honor_cache_headers", True),
+            max_ttl_seconds=data.get("max_ttl_seconds", 86400.0),
+            host_overrides={
+                str(host).lower(): dict(rules)
+                for host, rules in (data.get("host_overrides") or {}).items()
+            },
         )
 
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "ttl_seconds": self.ttl_seconds,
+            "directory": self.directory,
+            "max_size_mb": self.max_size_mb,
+            "max_memory_mb": self.max_memory_mb,
+            "sweep_interval_seconds": self.sweep_interval_seconds,
+            "stale_while_revalidate_seconds": self.stale_while_revalidate_seconds,
+            "revalidation_concurrency": self.revalidation_concurrency,
+            "honor_cache_headers": self.honor_cache_headers,
+            "max_ttl_seconds": self.max_ttl_seconds,
+            "host_overrides": {h: dict(r) for h, r in self.host_overrides.items()},
+        }
+
 
 @dataclass
 class CacheEntry:
@@ -59,24 +111,71 @@ class CacheEntry:
     timestamp: float
     url: str
     content_type: str = "text/html"
+    ttl_seconds: Optional[float] = None  # None -> CacheConfig.ttl_seconds
+    stale_seconds: float = 0.0  # Servable-while-revalidating window after TTL
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def age_seconds(self) -> float:
+        return max(0.0, time.time() - self.timestamp)
+
+    @property
+    def size_bytes(self) -> int:
+        """Approximate resident size (string objects dominate)."""
+        return sys.getsizeof(self.content) + sys.getsizeof(self.url) + 64
+
+
+def _sweep_loop(
+    cache_ref: "weakref.ReferenceType[ResponseCache]",
+    stop: threading.Event,
+    interval: float,
+) -> None:
+    # Holds only a weak reference so an abandoned cache can still be collected.
+    while not stop.wait(interval):
+        cache = cache_ref()
+        if cache is None:
+            return
+        try:
+            cache.sweep_expired()
+        except Exception as e:
+            logger.warning(f"Cache sweep failed: {e}")
+        del cache
 
 
 class ResponseCache:
     """
-    TTL-based response cache with disk persistence.
+    TTL-based response cache with bounded memory and disk tiers.
 
-    Thread-safe for async usage. Uses URL hash as cache key.
+    Thread-safe: a single lock guards both tiers and their byte counters.
+    Uses URL hash as cache key.
     """
 
     def __init__(self, config: Optional[CacheConfig] = None):
         self.config = config or CacheConfig()
-        self._memory_cache: Dict[str, CacheEntry] = {}
+        self._memory_cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._memory_bytes = 0
+        self._store: Optional[SqliteCacheStore] = None
         self._hits = 0
         self._misses = 0
+        self._evictions = 0
+        self._expired = 0
+        self._stale_hits = 0
+        self._lock = threading.RLock()
+        self._sweep_stop = threading.Event()
+        self._sweeper: Optional[threading.Thread] = None
 
-        # Ensure cache directory exists
         if self.config.enabled:
             Path(self.config.directory).mkdir(parents=True, exist_ok=True)
+            self._open_store()
+            self._start_sweeper()
+
+    @property
+    def _memory_limit(self) -> int:
+        return int(self.config.max_memory_mb * _MB)
+
+    @property
+    def _disk_limit(self) -> int:
+        return int(self.config.max_size_mb * _MB)
 
     def _normalize_url(self, url: str) -> str:
         """Normalize URL for consistent caching."""
@@ -95,13 +194,123 @@ class ResponseCache:
         normalized = self._normalize_url(url)
         return hashlib.sha256(normalized.encode()).hexdigest()[:16]
 
-    def _get_disk_path(self, key: str) -> Path:
-        """Get disk cache file path."""
-        return Path(self.config.directory) / f"{key}.json"
+    def _ttl(self, entry: CacheEntry) -> float:
+        if entry.ttl_seconds is None:
+            return float(self.config.ttl_seconds)
+        return entry.ttl_seconds
+
+    def _expires_at(self, entry: CacheEntry) -> float:
+        return entry.timestamp + self._ttl(entry) + entry.stale_seconds
 
     def _is_expired(self, entry: CacheEntry) -> bool:
-        """Check if cache entry has expired."""
-        return (time.time() - entry.timestamp) > self.config.ttl_seconds
+        """Past freshness and the stale window: no longer servable at all."""
+        return time.time() > self._expires_at(entry)
+
+    def is_stale(self, entry: CacheEntry) -> bool:
+        """Past freshness (but possibly still inside its stale window)."""
+        return (time.time() - entry.timestamp) > self._ttl(entry)
+
+    def _open_store(self) -> None:
+        try:
+            self._store = SqliteCacheStore(self.config.directory)
+        except Exception as e:
+            # Degrade to a memory-only cache rather than failing the caller.
+            logger.warning(f"Disk cache unavailable, using memory only: {e}")
+            self._store = None
+            return
+        self._evict_disk()
+
+    def _start_sweeper(self) -> None:
+        interval = float(self.config.sweep_interval_seconds or 0)
+        if interval <= 0:
+            return
+        self._sweeper = threading.Thread(
+            target=_sweep_loop,
+            args=(weakref.ref(self), self._sweep_stop, interval),
+            name="response-cache-sweeper",
+            daemon=True,
+        )
+        self._sweeper.start()
+
+    # --- memory tier -------------------------------------------------------
+
+    def _memory_put(self, key: str, entry: CacheEntry) -> None:
+        self._memory_drop(key)
+        size = entry.size_bytes
+        if size > self._memory_limit:
+            return  # Would evict everything else; serve it from disk instead
+        self._memory_cache[key] = entry
+        self._memory_bytes += size
+        while self._memory_bytes > self._memory_limit and self._memory_cache:
+            _, evicted = self._memory_cache.popitem(last=False)
+            self._memory_bytes -= evicted.size_bytes
+            self._evictions += 1
+
+    def _memory_drop(self, key: str) -> None:
+        entry = self._memory_cache.pop(key, None)
+        if entry is not None:
+            self._memory_bytes -= entry.size_bytes
+
+    # --- disk tier ---------------------------------------------------------
+
+    def _disk_drop(self, key: str) -> None:
+        if self._store is None:
+            return
+        try:
+            self._store.delete(key)
+        except Exception as e:
+            logger.warning(f"Failed to delete disk cache entry {key}: {e}")
+
+    def _evict_disk(self) -> None:
+        if self._store is not None:
+            self._evictions += len(self._store.evict_to(self._disk_limit))
+
+    def _disk_read(self, key: str) -> Optional[CacheEntry]:
+        if self._store is None:
+            return None
+        try:
+            stored = self._store.get(key)
+        except Exception as e:
+            logger.warning(f"Failed to read disk cache: {e}")
+            return None
+        if stored is None:
+            return None
+        meta = dict(stored.meta)
+        ttl_seconds = meta.pop("ttl_seconds", None)
+        stale_seconds = meta.pop("stale_seconds", 0.0)
+        return CacheEntry(
+            content=stored.content,
+            timestamp=stored.timestamp,
+            url=stored.url,
+            content_type=stored.content_type,
+            ttl_seconds=ttl_seconds,
+            stale_seconds=stale_seconds,
+            meta=meta,
+        )
+
+    def _disk_meta(self, entry: CacheEntry) -> Dict[str, Any]:
+        meta = dict(entry.meta)
+        if entry.ttl_seconds is not None:
+            meta["ttl_seconds"] = entry.ttl_seconds
+        if entry.stale_seconds:
+            meta["stale_seconds"] = entry.stale_seconds
+        return meta
+
+    def _disk_write(self, key: str, entry: CacheEntry) -> None:
+        if self._store is None:
+            return
+        self._store.put(
+            key,
+            entry.url,
+            entry.content,
+            entry.content_type,
+            entry.timestamp,
+            self._disk_meta(entry),
+            self._expires_at(entry),
+        )
+        self._evict_disk()
+
+    # --- public API --------------------------------------------------------
 
     def get(self, url: str) -> Optional[str]:
         """
@@ -109,55 +318,70 @@ class ResponseCache:
 
         Returns None if not cached or expired.
         """
+        entry = self.get_entry(url)
+        return entry.content if entry is not None else None
+
+    def get_entry(self, url: str, allow_stale: bool = False) -> Optional[CacheEntry]:
+        """
+        Like `get`, but returns the entry with its timestamp and metadata.
+
+        With `allow_stale`, entries past their TTL but inside their stale
+        window are returned too (check `is_stale`) so the caller can serve
+        them immediately and refresh in the background.
+        """
         if not self.config.enabled:
             return None
 
         key = self._get_cache_key(url)
-
-        # 1. Check memory cache
-        if key in self._memory_cache:
-            entry = self._memory_cache[key]
-            if not self._is_expired(entry):
-                self._hits += 1
-                logger.debug(f"Cache HIT (memory): {url[:50]}...")
-                return entry.content
-            else:
-                # Expired, remove from memory
-                del self._memory_cache[key]
-
-        # 2. Check disk cache
-        disk_path = self._get_disk_path(key)
-        if disk_path.exists():
-            try:
-                with open(disk_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    entry = CacheEntry(
-                        content=data["content"],
-                        timestamp=data["timestamp"],
-                        url=data["url"],
-                        content_type=data.get("content_type", "text/html"),
-                    )
-                    if not self._is_expired(entry):
-                        # Promote to memory cache
-                        self._memory_cache[key] = entry
+        with self._lock:
+            # 1. Check memory cache
+            entry = self._memory_cache.get(key)
+            tier = "memory"
+            if entry is None:
+                # 2. Check disk cache
+                entry = self._disk_read(key)
+                tier = "disk"
+            if entry is not None:
+                if self._is_expired(entry):
+                    self._memory_drop(key)
+                    self._disk_drop(key)
+                    self._expired += 1
+                else:
+                    stale = self.is_stale(entry)
+                    if not stale or allow_stale:
+                        if tier == "memory":
+                            self._memory_cache.move_to_end(key)
+                        else:
+                            self._memory_put(key, entry)  # Promote
                         self._hits += 1
-                        logger.debug(f"Cache HIT (disk): {url[:50]}...")
-                        return entry.content
-                    else:
-                        # Expired, delete from disk
-                        disk_path.unlink()
-            except Exception as e:
-                logger.warning(f"Failed to read disk cache: {e}")
-
-        self._misses += 1
+                        self._stale_hits += stale
+                        logger.debug(
+                            f"Cache HIT ({tier}{', stale' if stale else ''}): "
+                            f"{url[:50]}..."
+                        )
+                        return entry
+
+            self._misses += 1
         logger.debug(f"Cache MISS: {url[:50]}...")
         return None
 
-    def set(self, url: str, content: str, content_type: str = "text/html") -> None:
+    def set(
+        self,
+        url: str,
+        content: str,
+        content_type: str = "text/html",
+        *,
+        ttl_seconds: Optional[float] = None,
+        stale_seconds: float = 0.0,
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> None:
         """
         Cache content for URL.
 
-        Stores in both memory and disk for persistence.
+        Stores in both memory and disk for persistence; either tier evicts
+        least recently used entries to stay within its size bound.
+        `ttl_seconds` overrides the configured TTL for this entry only and
+        `stale_seconds` keeps it servable-while-revalidating after that.
         """
         if not self.config.enabled:
             return
@@ -168,27 +392,167 @@ class ResponseCache:
             timestamp=time.time(),
             url=url,
             content_type=content_type,
+            ttl_seconds=ttl_seconds,
+            stale_seconds=max(0.0, float(stale_seconds)),
+            meta=dict(meta or {}),
         )
 
-        # 1. Store in memory
-        self._memory_cache[key] = entry
+        with self._lock:
+            # 1. Store in memory
+            self._memory_put(key, entry)
 
-        # 2. Store on disk
-        try:
-            disk_path = self._get_disk_path(key)
-            with open(disk_path, "w", encoding="utf-8") as f:
-                json.dump(
-                    {
-                        "content": content,
-                        "timestamp": entry.timestamp,
-                        "url": url,
-                        "content_type": content_type,
-                    },
-                    f,
-                )
-            logger.debug(f"Cached: {url[:50]}...")
-        except Exception as e:
-            logger.warning(f"Failed to write disk cache: {e}")
+            # 2. Store on disk
+            try:
+                self._disk_write(key, entry)
+                logger.debug(f"Cached: {url[:50]}...")
+            except Exception as e:
+                logger.warning(f"Failed to write disk cache: {e}")
+
+    def sweep_expired(self) -> int:
+        """Drop entries past their stale window; returns the number removed."""
+        with self._lock:
+            expired = {k for k, e in self._memory_cache.items() if self._is_expired(e)}
+            for key in expired:
+                self._memory_drop(key)
+            if self._store is not None:
+                gone = self._store.expired_keys(time.time())
+                for key in gone:
+                    self._memory_drop(key)
+                self._store.delete_many(gone)
+                expired.update(gone)
+            removed = len(expired)
+            self._expired += removed
+        if removed:
+            logger.debug(f"Cache sweep removed {removed} expired entries")
+        return removed
+
+    # --- HTTP semantics ----------------------------------------------------
+
+    def _host_override(self, url: str) -> Dict[str, Any]:
+        overrides = self.config.host_overrides
+        if not overrides:
+            return {}
+        host = (urlparse(url).hostname or "").lower()
+        labels = host.split(".")
+        for i in range(len(labels)):
+            rules = overrides.get(".".join(labels[i:]))
+            if rules is not None:
+                return rules
+        return {}
+
+    def freshness_for(
+        self, url: str, headers: Optional[Mapping[str, str]] = None
+    ) -> Optional[Tuple[float, float]]:
+        """
+        (ttl_seconds, stale_seconds) for a response, or None if not storable.
+
+        Host overrides win, then the response's caching headers (when
+        honored), then the configured defaults. Only `no-store` refuses;
+        `no-cache` and `max-age=0` give a ttl of 0 (stale on arrival) that
+        keeps the stale window, so the entry is served stale and revalidated
+        with its validators.
+        """
+        override = self._host_override(url)
+        stale = float(
+            override.get("stale_seconds", self.config.stale_while_revalidate_seconds)
+        )
+        if "ttl_seconds" in override:
+            return float(override["ttl_seconds"]), stale
+        if not override.get("honor_cache_headers", self.config.honor_cache_headers):
+            return float(self.config.ttl_seconds), stale
+
+        directives = parse_cache_control(headers)
+        if "no-store" in directives:
+            return None
+        allowed = header_ttl(headers)
+        if "stale_seconds" not in override:
+            if "must-revalidate" in directives or "proxy-revalidate" in directives:
+                stale = 0.0
+            elif directives.get("stale-while-revalidate"):
+                try:
+                    stale = float(directives["stale-while-revalidate"] or 0)
+                except ValueError:
+                    pass
+        if allowed is None:
+            return float(self.config.ttl_seconds), stale
+        return max(0.0, min(allowed, float(self.config.max_ttl_seconds))), stale
+
+    def store_response(
+        self,
+        url: str,
+        content: str,
+        headers: Optional[Mapping[str, str]] = None,
+        *,
+        content_type: str = "text/html",
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """Cache a fetched response under its HTTP freshness; False if refused."""
+        policy = self.freshness_for(url, headers)
+        if policy is None:
+            return False
+        ttl, stale = policy
+        if ttl <= 0 and stale <= 0:
+            return False  # Stale on arrival with no window to serve it in
+        merged = dict(meta or {})
+        merged.update(_validators(headers))
+        self.set(
+            url,
+            content,
+            content_type,
+            ttl_seconds=ttl,
+            stale_seconds=stale,
+            meta=merged,
+        )
+        return True
+
+    def touch(
+        self, url: str, headers: Optional[Mapping[str, str]] = None
+    ) -> Optional[CacheEntry]:
+        """
+        Mark an entry revalidated (e.g. after a 304) without rewriting its body.
+
+        Freshness is recomputed from `headers` when given. Returns the entry,
+        or None if it is gone or the new headers forbid storing it.
+        """
+        entry = self.get_entry(url, allow_stale=True)
+        if entry is None:
+            return None
+        key = self._get_cache_key(url)
+        with self._lock:
+            if headers:
+                policy = self.freshness_for(url, headers)
+                if policy is None:
+                    self._memory_drop(key)
+                    self._disk_drop(key)
+                    return None
+                entry.ttl_seconds, entry.stale_seconds = policy
+                entry.meta.update(_validators(headers))
+            entry.timestamp = time.time()
+            if self._store is not None:
+                try:
+                    self._store.update_meta(
+                        key,
+                        entry.timestamp,
+                        self._disk_meta(entry),
+                        self._expires_at(entry),
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to refresh disk cache entry: {e}")
+        return entry
+
+    def close(self) -> None:
+        """Stop the background sweeper and close the disk store."""
+        self._sweep_stop.set()
+        if (
+            self._sweeper is not None
+            and self._sweeper is not threading.current_thread()
+        ):
+            self._sweeper.join(timeout=1.0)
+        self._sweeper = None
+        with self._lock:
+            if self._store is not None:
+                self._store.close()
+                self._store = None
 
     def clear(self) -> dict:
         """
@@ -196,25 +560,24 @@ class ResponseCache:
 
         Returns stats about cleared entries.
         """
-        memory_count = len(self._memory_cache)
-        disk_count = 0
+        with self._lock:
+            memory_count = len(self._memory_cache)
+            disk_count = 0
 
-        # Clear memory
-        self._memory_cache.clear()
+            # Clear memory
+            self._memory_cache.clear()
+            self._memory_bytes = 0
 
-        # Clear disk
-        cache_dir = Path(self.config.directory)
-        if cache_dir.exists():
-            for f in cache_dir.glob("*.json"):
-                try:
-                    f.unlink()
-                    disk_count += 1
-                except Exception as e:
-                    logger.warning(f"Failed to delete cache file {f}: {e}")
+            # Clear disk
+            if self._store is not None:
+                disk_count = self._store.clear()
 
-        # Reset stats
-        self._hits = 0
-        self._misses = 0
+            # Reset stats
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+            self._expired = 0
+            self._stale_hits = 0
 
         logger.info(f"Cache cleared: {memory_count} memory, {disk_count} disk entries")
         return {
@@ -223,29 +586,139 @@ class ResponseCache:
         }
 
     def get_stats(self) -> dict:
-        """Get cache statistics."""
-        cache_dir = Path(self.config.directory)
-        disk_size = 0
-        disk_count = 0
-
-        if cache_dir.exists():
-            for f in cache_dir.glob("*.json"):
-                disk_size += f.stat().st_size
-                disk_count += 1
+        """Get cache statistics (O(1); served from maintained counters)."""
+        with self._lock:
+            store = self._store
+            total_requests = self._hits + self._misses
+            hit_rate = (self._hits / total_requests * 100) if total_requests > 0 else 0
+
+            return {
+                "enabled": self.config.enabled,
+                "ttl_seconds": self.config.ttl_seconds,
+                "memory_entries": len(self._memory_cache),
+                "memory_size_mb": round(self._memory_bytes / _MB, 2),
+                "max_memory_mb": self.config.max_memory_mb,
+                "disk_entries": store.entries if store else 0,
+                "disk_size_mb": round(store.bytes / _MB, 2) if store else 0.0,
+                "disk_unique_bodies": store.unique_blobs if store else 0,
+                "disk_uncompressed_mb": (
+                    round(store.raw_bytes / _MB, 2) if store else 0.0
+                ),
+                "max_size_mb": self.config.max_size_mb,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate_percent": round(hit_rate, 1),
+                "stale_hits": self._stale_hits,
+                "evictions": self._evictions,
+                "expired": self._expired,
+            }
+
+
+def normalize_response_cache_mode(
+    value: Any,
+    default: ResponseCacheMode = "bypass",
+) -> ResponseCacheMode:
+    """Map cache-mode spellings (incl. booleans) onto bypass/use/refresh."""
+    if isinstance(value, bool):
+        return "use" if value else "bypass"
+    text = str(value or "").strip().lower()
+    alias_map = {
+        "bypass": "bypass",
+        "off": "bypass",
+        "none": "bypass",
+        "disabled": "bypass",
+        "false": "bypass",
+        "use": "use",
+        "on": "use",
+        "enabled": "use",
+        "true": "use",
+        "refresh": "refresh",
+        "reload": "refresh",
+    }
+    normalized = alias_map.get(text, default)
+    return normalized  # type: ignore[return-value]
+
+
+def parse_cache_control(
+    headers: Optional[Mapping[str, str]],
+) -> Dict[str, Optional[str]]:
+    """Cache-Control directives as {name: value-or-None} (names lowercased)."""
+    if not headers:
+        return {}
+    value = ""
+    for name, raw in headers.items():
+        if str(name).lower() == "cache-control":
+            value = str(raw)
+            break
+    directives: Dict[str, Optional[str]] = {}
+    for part in value.split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip().strip('"') or None
+    return directives
+
+
+def _header(headers: Optional[Mapping[str, str]], name: str) -> Optional[str]:
+    if not headers:
+        return None
+    for key, value in headers.items():
+        if str(key).lower() == name:
+            return str(value)
+    return None
+
+
+def _validators(headers: Optional[Mapping[str, str]]) -> Dict[str, str]:
+    """ETag/Last-Modified worth keeping for conditional revalidation."""
+    found = {}
+    etag = _header(headers, "etag")
+    if etag:
+        found["etag"] = etag
+    last_modified = _header(headers, "last-modified")
+    if last_modified:
+        found["last_modified"] = last_modified
+    return found
+
+
+def conditional_headers(entry: CacheEntry) -> Dict[str, str]:
+    """If-None-Match / If-Modified-Since request headers for a cached entry."""
+    headers = {}
+    if entry.meta.get("etag"):
+        headers["If-None-Match"] = str(entry.meta["etag"])
+    if entry.meta.get("last_modified"):
+        headers["If-Modified-Since"] = str(entry.meta["last_modified"])
+    return headers
+
+
+def header_ttl(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """
+    Remaining freshness lifetime a response's caching headers allow, in seconds.
 
-        total_requests = self._hits + self._misses
-        hit_rate = (self._hits / total_requests * 100) if total_requests > 0 else 0
+    Returns None when the headers say nothing (use the configured TTL) and
+    0 when the response is stale on arrival (`no-store`, `no-cache`,
+    `max-age=0`, or an `Expires` in the past). `Age` is subtracted from
+    `max-age`/`s-maxage`.
+    """
+    directives = parse_cache_control(headers)
+    if "no-store" in directives or "no-cache" in directives:
+        return 0.0
+    for name in ("s-maxage", "max-age"):
+        if name in directives:
+            try:
+                lifetime = float(directives[name] or 0)
+                age = float(_header(headers, "age") or 0)
+            except ValueError:
+                return 0.0
+            return max(0.0, lifetime - age)
+    expires = _header(headers, "expires")
+    if expires:
+        from email.utils import parsedate_to_datetime
 
-        return {
-            "enabled": self.config.enabled,
-            "ttl_seconds": self.config.ttl_seconds,
-            "memory_entries": len(self._memory_cache),
-            "disk_entries": disk_count,
-            "disk_size_mb": round(disk_size / 1024 / 1024, 2),
-            "hits": self._hits,
-            "misses": self._misses,
-            "hit_rate_percent": round(hit_rate, 1),
-        }
+        try:
+            expires_at = parsedate_to_datetime(expires).timestamp()
+        except (TypeError, ValueError, IndexError):
+            return 0.0  # Invalid Expires means "already expired" (RFC 9111)
+        return max(0.0, expires_at - time.time())
+    return None
 
 
 # Global cache instance (initialized lazily)
@@ -0,0 +1,338 @@
+# ./src/web_scraper_toolkit/core/state/cache_store.py
+"""
+Single-file, content-addressed disk store backing the ResponseCache disk tier.
+Used by `core/state/cache.py`; not intended to be driven directly by tools.
+Run: imported as a library module; not a direct CLI entry point.
+Inputs: cache keys plus entry metadata and body text from ResponseCache.
+Outputs: stored entries, byte/entry counters, and LRU eviction/expiry sweeps.
+Side effects: reads/writes one SQLite database file (WAL mode) under the cache
+directory.
+Operational notes: bodies are stored once per SHA-256 digest and reference
+counted, so identical pages (error pages, soft-404s, mirrors) cost one blob.
+Blobs are zstd-compressed when `zstandard` is installed, zlib otherwise; the
+codec is recorded per blob so either build can read the other's data. Reads
+go through SQLite's memory-mapped I/O. Callers serialize access. Counter
+changes are applied only after their transaction commits, and the counters are
+re-read from the database every `_RESYNC_SECONDS` so writes from other
+processes sharing the file are picked up.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import zstandard as _zstd
+except ImportError:  # pragma: no cover - optional dependency
+    _zstd = None
+
+logger = logging.getLogger(__name__)
+
+DB_FILENAME = "cache.sqlite3"
+_MMAP_BYTES = 256 * 1024 * 1024
+# Fixed per-entry overhead (row + index) added to blob bytes for size bounds.
+_ENTRY_OVERHEAD_BYTES = 256
+_EVICT_BATCH = 64
+# How often the incremental counters are re-read from the database.
+_RESYNC_SECONDS = 60.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY,
+    codec TEXT NOT NULL,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    raw_size INTEGER NOT NULL,
+    refs INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    digest TEXT NOT NULL REFERENCES blobs(digest),
+    content_type TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    last_access REAL NOT NULL,
+    meta TEXT NOT NULL DEFAULT '{}',
+    expires_at REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS entries_last_access ON entries(last_access);
+"""
+
+
+def _compress(raw: bytes) -> Tuple[str, bytes]:
+    if _zstd is not None:
+        return "zstd", _zstd.ZstdCompressor(level=3).compress(raw)
+    return "zlib", zlib.compress(raw, 6)
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    if codec == "zstd":
+        if _zstd is None:
+            raise RuntimeError("Cache blob is zstd-compressed but zstandard is missing")
+        return _zstd.ZstdDecompressor().decompress(data)
+    if codec == "zlib":
+        return zlib.decompress(data)
+    return data
+
+
+@dataclass
+class _CounterDelta:
+    """Counter changes made inside one transaction, applied after commit."""
+
+    entries: int = 0
+    bytes: int = 0
+    unique_blobs: int = 0
+    raw_bytes: int = 0
+
+
+@dataclass
+class StoredEntry:
+    """One cache entry as read back from the store."""
+
+    url: str
+    content: str
+    content_type: str
+    timestamp: float
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+
+class SqliteCacheStore:
+    """
+    Content-addressed SQLite store with reference-counted compressed blobs.
+
+    Byte and entry counters are maintained incrementally, so size checks and
+    stats rarely scan the database; they are resynced every `_RESYNC_SECONDS`.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.path = Path(directory) / DB_FILENAME
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.path), check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"PRAGMA mmap_size={_MMAP_BYTES}")
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(entries)")}
+        if "expires_at" not in columns:
+            # Pre-expiry stores: existing rows are swept on the next pass.
+            self._conn.execute(
+                "ALTER TABLE entries ADD COLUMN expires_at REAL NOT NULL DEFAULT 0"
+            )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS entries_expires_at ON entries(expires_at)"
+        )
+        self.entries = 0
+        self.bytes = 0
+        self.unique_blobs = 0
+        self.raw_bytes = 0
+        self._synced_at = 0.0
+        self._refresh_counters()
+
+    def _refresh_counters(self) -> None:
+        self._synced_at = time.monotonic()
+        self.entries = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        blobs, size, raw = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(raw_size), 0) "
+            "FROM blobs"
+        ).fetchone()
+        self.unique_blobs = blobs
+        self.raw_bytes = raw
+        self.bytes = size + self.entries * _ENTRY_OVERHEAD_BYTES
+
+    def _maybe_resync(self) -> None:
+        if time.monotonic() - self._synced_at >= _RESYNC_SECONDS:
+            self._refresh_counters()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[_CounterDelta]:
+        """Write transaction whose counter delta is applied only on commit."""
+        delta = _CounterDelta()
+        with self._conn:
+            self._conn.execute("BEGIN")
+            yield delta
+        self.entries += delta.entries
+        self.bytes += delta.bytes
+        self.unique_blobs += delta.unique_blobs
+        self.raw_bytes += delta.raw_bytes
+        self._maybe_resync()
+
+    def get(self, key: str, touch: bool = True) -> Optional[StoredEntry]:
+        row = self._conn.execute(
+            "SELECT e.url, e.content_type, e.timestamp, e.meta, b.codec, b.data "
+            "FROM entries e JOIN blobs b ON b.digest = e.digest WHERE e.key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+        url, content_type, timestamp, meta, codec, data = row
+        try:
+            content = _decompress(codec, data).decode("utf-8")
+        except Exception as e:
+            logger.warning(f"Dropping unreadable cache entry {key}: {e}")
+            self.delete(key)
+            return None
+        if touch:
+            self._conn.execute(
+                "UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+        return StoredEntry(
+            url=url,
+            content=content,
+            content_type=content_type,
+            timestamp=timestamp,
+            meta=json.loads(meta) if meta else {},
+        )
+
+    def put(
+        self,
+        key: str,
+        url: str,
+        content: str,
+        content_type: str,
+        timestamp: float,
+        meta: Optional[Dict[str, Any]] = None,
+        expires_at: float = 0.0,
+    ) -> None:
+        """Insert or replace one entry; `expires_at` is its hard removal time."""
+        raw = content.encode("utf-8")
+        digest = hashlib.sha256(raw).hexdigest()
+        with self._transaction() as delta:
+            self._release(key, delta)
+            updated = self._conn.execute(
+                "UPDATE blobs SET refs = refs + 1 WHERE digest = ?", (digest,)
+            ).rowcount
+            if not updated:
+                codec, data = _compress(raw)
+                self._conn.execute(
+                    "INSERT INTO blobs (digest, codec, data, size, raw_size, refs) "
+                    "VALUES (?, ?, ?, ?, ?, 1)",
+                    (digest, codec, data, len(data), len(raw)),
+                )
+                delta.unique_blobs += 1
+                delta.raw_bytes += len(raw)
+                delta.bytes += len(data)
+            self._conn.execute(
+                "INSERT INTO entries (key, url, digest, content_type, "
+                "timestamp, last_access, meta, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    url,
+                    digest,
+                    content_type,
+                    timestamp,
+                    time.time(),
+                    json.dumps(meta or {}, separators=(",", ":")),
+                    expires_at,
+                ),
+            )
+            delta.entries += 1
+            delta.bytes += _ENTRY_OVERHEAD_BYTES
+
+    def update_meta(
+        self, key: str, timestamp: float, meta: Dict[str, Any], expires_at: float
+    ) -> bool:
+        """Refresh an entry's timestamp/metadata without rewriting its body."""
+        return bool(
+            self._conn.execute(
+                "UPDATE entries SET timestamp = ?, meta = ?, expires_at = ? "
+                "WHERE key = ?",
+                (timestamp, json.dumps(meta, separators=(",", ":")), expires_at, key),
+            ).rowcount
+        )
+
+    def _release(self, key: str, delta: _CounterDelta) -> bool:
+        """Delete one entry row and drop its blob reference (inside a txn)."""
+        row = self._conn.execute(
+            "SELECT digest FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return False
+        digest = row[0]
+        self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+        delta.entries -= 1
+        delta.bytes -= _ENTRY_OVERHEAD_BYTES
+        self._conn.execute(
+            "UPDATE blobs SET refs = refs - 1 WHERE digest = ?", (digest,)
+        )
+        freed = self._conn.execute(
+            "SELECT size, raw_size FROM blobs WHERE digest = ? AND refs <= 0",
+            (digest,),
+        ).fetchone()
+        if freed is not None:
+            self._conn.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+            delta.unique_blobs -= 1
+            delta.bytes -= freed[0]
+            delta.raw_bytes -= freed[1]
+        return True
+
+    def delete(self, key: str) -> bool:
+        with self._transaction() as delta:
+            return self._release(key, delta)
+
+    def _delete_keys(self, keys: List[str]) -> int:
+        removed = 0
+        with self._transaction() as delta:
+            for key in keys:
+                removed += self._release(key, delta)
+        return removed
+
+    def evict_to(self, max_bytes: int) -> List[str]:
+        """Remove least recently accessed entries until under `max_bytes`."""
+        evicted: List[str] = []
+        self._maybe_resync()
+        while self.bytes > max_bytes and self.entries:
+            keys = [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT key FROM entries ORDER BY last_access LIMIT ?",
+                    (_EVICT_BATCH,),
+                )
+            ]
+            if not keys:
+                # Counters are stale (another process emptied the file).
+                self._refresh_counters()
+                break
+            for key in keys:
+                if self.bytes <= max_bytes:
+                    break
+                if self.delete(key):
+                    evicted.append(key)
+        return evicted
+
+    def expired_keys(self, now: float) -> List[str]:
+        """Keys whose hard expiry (freshness plus stale window) has passed."""
+        return [
+            row[0]
+            for row in self._conn.execute(
+                "SELECT key FROM entries WHERE expires_at < ?", (now,)
+            )
+        ]
+
+    def delete_many(self, keys: List[str]) -> int:
+        return self._delete_keys(keys) if keys else 0
+
+    def clear(self) -> int:
+        with self._conn:
+            self._conn.execute("BEGIN")
+            count = self._conn.execute("DELETE FROM entries").rowcount
+            self._conn.execute("DELETE FROM blobs")
+        self._refresh_counters()
+        return count
+
+    def close(self) -> None:
+        try:
+            self._conn.close()
+        except sqlite3.Error:
+            pass
@@ -9,6 +9,7 @@ Integrates:
 -   Playbook (Rules & Policies)
 -   SitemapHandler (Seeding)
 -   Frontier (Queue)
+-   Circuit Breakers (park URLs for failing hosts)
 """
 
 import asyncio
@@ -24,6 +25,8 @@ from ..browser.playwright_handler import PlaywrightManager
 from ..browser.config import BrowserConfig
 from ..playbook.models import Playbook
 from ..parsers.sitemap import parse_sitemap_urls
+from ..parsers.extraction.links import extract_links_from_html
+from ..core.automation.retry import get_circuit_breakers
 from .frontier import Frontier
 from .politeness import PolitenessManager
 from .state import StateManager
@@ -32,6 +35,9 @@ from .config import CrawlerConfig
 
 logger = logging.getLogger(__name__)
 
+# Max times a URL is parked behind an open host circuit before being attempted
+MAX_CIRCUIT_PARKS = 3
+
 
 class AutonomousCrawler:
     def __init__(
@@ -60,6 +66,7 @@ class AutonomousCrawler:
         self.fast_scraper = ProxyScraper(manager=self.proxy_manager)
 
         self.frontier = Frontier()
+        self.circuit_breakers = get_circuit_breakers()
         self.state = StateManager(state_file)
 
         # Politeness Logic: Global Config overrides Playbook
@@ -115,12 +122,26 @@ class AutonomousCrawler:
         while not self.frontier.is_empty():
             item = await self.frontier.get_next()
             if not item:
-                break
+                # Only parked items remain; wait for the earliest one.
+                wait = self.frontier.next_ready_in()
+                if wait is None:
+                    break
+                await asyncio.sleep(wait)
+                continue
 
             url = item.url
             if self.state.is_seen(url):
                 continue
 
+            # Circuit Breaker: park URLs for hosts that are currently failing
+            retry_after = self.circuit_breakers.retry_after(url)
+            parks = int(item.meta.get("circuit_parks", 0))
+            if retry_after > 0 and parks < MAX_CIRCUIT_PARKS:
+                item.meta["circuit_parks"] = parks + 1
+                logger.info(f"Circuit open, parking {url} for {retry_after:.1f}s")
+                await self.frontier.park(item, retry_after)
+                continue
+
             # Politeness Check
             if not await self.politeness.can_fetch(url):
                 logger.warning(f"Politeness Blocked: {url}")
@@ -241,10 +262,12 @@ class AutonomousCrawler:
 
         # 2. Apply Traversal Rules (if depth allows)
         if depth < self.playbook.settings.max_depth:
+            links: Optional[List[str]] = None
             for rule in self.playbook.rules:
                 if rule.rule_type == "follow":
                     # If global follow rule (no regex) or matches
-                    links = self._extract_links(soup)
+                    if links is None:  # One link pass shared by all rules
+                        links = self._extract_links(content, url)
                     for link in links:
                         if self._matches(link, rule):
                             await self.frontier.add_url(link, depth + 1)
@@ -289,11 +312,14 @@ class AutonomousCrawler:
             # Usually 'follow' without regex means follow everything
         return bool(re.search(pattern, text))
 
-    def _extract_links(self, soup) -> List[str]:
+    def _extract_links(self, html: str, base_url: str) -> List[str]:
+        # Document order (not the sorted `links` set) so the frontier and
+        # `max_pages` see links as the page lists them.
+        result = extract_links_from_html(html, base_url, include_anchors=True)
         return [
-            a["href"]
-            for a in soup.find_all("a", href=True)
-            if a["href"].startswith("http")
+            link
+            for link in dict.fromkeys(result["anchors"]["url"])
+            if link.startswith("http")
         ]
 
     def _extract_field(self, soup, field) -> Optional[str]:
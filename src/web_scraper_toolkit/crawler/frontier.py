@@ -8,10 +8,12 @@ Features:
 -   Priority Management
 -   De-duplication (Seen URLs)
 -   Depth Tracking
+-   Parking (delayed re-queue, e.g. while a host circuit is open)
 """
 
 import asyncio
-from typing import Any, Dict, Optional, Set
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
 from dataclasses import dataclass, field
 import heapq
 
@@ -31,6 +33,9 @@ class Frontier:
         self._seen: Set[str] = set()
         self._lock = asyncio.Lock()
         self._count = 0  # Push counter specifically for stable sorting if needed (heapq is not stable)
+        self._parked: List[
+            Tuple[float, int, FrontierItem]
+        ] = []  # (ready_at, seq, item)
 
     async def add_url(
         self,
@@ -48,15 +53,36 @@ class Frontier:
             # Use heapq for priority queue
             heapq.heappush(self._queue, FrontierItem(priority, url, depth, meta or {}))
 
+    async def park(self, item: FrontierItem, delay: float) -> None:
+        """Re-queues an already-seen item once `delay` seconds have passed."""
+        async with self._lock:
+            self._count += 1
+            heapq.heappush(
+                self._parked, (time.monotonic() + max(0.0, delay), self._count, item)
+            )
+
+    def _promote_ready(self) -> None:
+        now = time.monotonic()
+        while self._parked and self._parked[0][0] <= now:
+            _, _, item = heapq.heappop(self._parked)
+            heapq.heappush(self._queue, item)
+
     async def get_next(self) -> Optional[FrontierItem]:
-        """Pops the highest priority (lowest number) item."""
+        """Pops the highest priority (lowest number) ready item."""
         async with self._lock:
+            self._promote_ready()
             if not self._queue:
                 return None
             return heapq.heappop(self._queue)
 
+    def next_ready_in(self) -> Optional[float]:
+        """Seconds until the next parked item is ready (None if none parked)."""
+        if not self._parked:
+            return None
+        return max(0.0, self._parked[0][0] - time.monotonic())
+
     def is_empty(self) -> bool:
-        return len(self._queue) == 0
+        return len(self._queue) == 0 and len(self._parked) == 0
 
     def __len__(self):
-        return len(self._queue)
+        return len(self._queue) + len(self._parked)
@@ -18,11 +18,14 @@ from bs4 import BeautifulSoup
 
 from .html_to_markdown import MarkdownConverter
 from .config import ParserConfig
-from ..browser.config import BrowserConfig
+from ..browser.config import BrowserConfig, normalize_content_extraction_mode
+from ..core.automation.cpu_pool import CpuPool
 
 logger = logging.getLogger(__name__)
 T = TypeVar("T")
 
+_EMAIL_RE = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")
+
 
 @dataclass(frozen=True)
 class FetchResult:
@@ -122,13 +125,18 @@ async def _arun_scrape(
                 if any(keyword in text for keyword in leadership_keywords):
                     leadership_mentions.append(text[:200])
 
-            # Look for contact information
-            email_pattern = r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b"
-            emails = re.findall(email_pattern, str(soup))
-            contact_info = emails[:5]
-
             # Get main content
             main_content = soup.get_text(separator=" ", strip=True)
+
+            # Look for contact information: visible text plus mailto: links,
+            # without serializing the DOM back to a string.
+            mailto = " ".join(
+                a["href"][7:]
+                for a in soup.select('a[href^="mailto:"]')
+                if isinstance(a.get("href"), str)
+            )
+            emails = _EMAIL_RE.findall(f"{main_content} {mailto}")
+            contact_info = list(dict.fromkeys(emails))[:5]
             trimmed_main_content = main_content[:15000]
 
             # Format output
@@ -227,6 +235,9 @@ async def aread_website_markdown_result(
     selector: Optional[str] = None,
     max_length: Optional[int] = None,
     playwright_manager: Optional[Any] = None,
+    cache_mode: Optional[str] = None,
+    content_extraction: Optional[str] = None,
+    cpu_pool: Optional[CpuPool] = None,
 ) -> FetchResult:
     """Async version of read_website_markdown.
 
@@ -240,6 +251,15 @@ async def aread_website_markdown_result(
         playwright_manager: Optional pre-started PlaywrightManager instance
             for browser session reuse. When provided, the caller owns the
             lifecycle — this function will NOT start or stop the manager.
+        cache_mode: Optional response-cache override ("use", "refresh",
+            "bypass"); defaults to the browser config's `response_cache`.
+            `metadata["cached"]` reports whether the page came from cache.
+        content_extraction: Optional override ("full", "main") of the browser
+            config's `content_extraction`. "main" extracts the main content
+            (and applies `selector`) in the browser so only that subtree is
+            transferred; `metadata["content_extraction"]` reports bytes saved.
+        cpu_pool: Optional CpuPool; when given, the markdown conversion runs
+            in a worker process instead of on this thread.
     """
     owns_manager = playwright_manager is None
     manager = playwright_manager
@@ -258,7 +278,20 @@ async def aread_website_markdown_result(
             await manager.start()
 
         # Use Smart Fetch for robustness
-        content, final_url, status_code = await manager.smart_fetch(url=website_url)
+        fetch_kwargs: Dict[str, Any] = {}
+        if cache_mode is not None:
+            fetch_kwargs["cache_mode"] = cache_mode
+        extraction_mode = normalize_content_extraction_mode(
+            content_extraction,
+            getattr(manager, "content_extraction_mode", browser_cfg.content_extraction),
+        )
+        if extraction_mode == "main":
+            fetch_kwargs["content_extraction"] = "main"
+            if selector:
+                fetch_kwargs["extract_selector"] = selector
+        content, final_url, status_code = await manager.smart_fetch(
+            url=website_url, **fetch_kwargs
+        )
         fetch_metadata = (
             manager.get_last_fetch_metadata()
             if hasattr(manager, "get_last_fetch_metadata")
@@ -274,33 +307,46 @@ async def aread_website_markdown_result(
         challenge_detected = blocked_reason.lower() not in {"", "none"}
 
         if status_code == 200 and content:
-            # Selector filtering (BeautifulSoup)
-            if selector:
+            # Selector filtering: in-page when extraction ran it, else soup.
+            extraction = fetch_metadata.get("content_extraction") or {}
+            selector_matched = (
+                extraction.get("selector_matched")
+                if extraction.get("applied") and extraction.get("selector") == selector
+                else None
+            )
+            if selector and selector_matched is None:
                 soup = BeautifulSoup(content, "lxml")
                 selected_tag = soup.select_one(selector)
+                selector_matched = selected_tag is not None
                 if selected_tag:
                     content = str(selected_tag)
-                else:
-                    return FetchResult(
-                        markdown=f"Error: Selector '{selector}' not found on {website_url}",
-                        final_url=final_url,
-                        status_code=status_code,
-                        route_selected=route_selected,
-                        host_profile_applied=host_profile_applied,
-                        challenge_detected=challenge_detected,
-                        blocked_reason=blocked_reason,
-                        artifact_paths=_extract_artifact_paths(fetch_metadata),
-                        metadata=fetch_metadata,
-                    )
-
-            # Convert to Markdown
-            markdown = MarkdownConverter.to_markdown(content, base_url=final_url)
-
-            # Max Length Truncation
-            if max_length and len(markdown) > max_length:
-                markdown = (
-                    markdown[:max_length] + "\n\n... [Truncated due to max_length]"
+            if selector and not selector_matched:
+                return FetchResult(
+                    markdown=f"Error: Selector '{selector}' not found on {website_url}",
+                    final_url=final_url,
+                    status_code=status_code,
+                    route_selected=route_selected,
+                    host_profile_applied=host_profile_applied,
+                    challenge_detected=challenge_detected,
+                    blocked_reason=blocked_reason,
+                    artifact_paths=_extract_artifact_paths(fetch_metadata),
+                    metadata=fetch_metadata,
+                )
+
+            # Convert to Markdown, stopping once max_length is filled
+            if cpu_pool is not None:
+                markdown, truncated = await cpu_pool.run(
+                    MarkdownConverter.to_markdown_limited,
+                    content,
+                    base_url=final_url,
+                    max_chars=max_length or None,
+                )
+            else:
+                markdown, truncated = MarkdownConverter.to_markdown_limited(
+                    content, base_url=final_url, max_chars=max_length or None
                 )
+            if truncated:
+                markdown += "\n\n... [Truncated due to max_length]"
 
             output = f"=== SCRAPED FROM: {final_url} (MARKDOWN) ===\n\n"
             output += markdown
@@ -358,6 +404,9 @@ async def aread_website_markdown(
     selector: Optional[str] = None,
     max_length: Optional[int] = None,
     playwright_manager: Optional[Any] = None,
+    cache_mode: Optional[str] = None,
+    content_extraction: Optional[str] = None,
+    cpu_pool: Optional[CpuPool] = None,
 ) -> str:
     """Backward-compatible markdown fetch API returning only markdown text."""
     result = await aread_website_markdown_result(
@@ -366,6 +415,9 @@ async def aread_website_markdown(
         selector=selector,
         max_length=max_length,
         playwright_manager=playwright_manager,
+        cache_mode=cache_mode,
+        content_extraction=content_extraction,
+        cpu_pool=cpu_pool,
     )
     return result.markdown
 
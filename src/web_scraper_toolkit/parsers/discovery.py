@@ -14,13 +14,13 @@ Key Functions:
     - smart_discover_urls: Main entry point for discovery logic.
 
 Dependencies:
-    - web_scraper_toolkit.parsers.sitemap_handler
+    - web_scraper_toolkit.parsers.sitemap
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set
 import logging
 
-from .sitemap import find_sitemap_urls, peek_sitemap_index, extract_sitemap_tree
+from .sitemap import SitemapIndexStore, find_sitemap_urls, iter_sitemap_entries
 
 logger = logging.getLogger(__name__)
 
@@ -60,6 +60,11 @@ DEFAULT_CONTEXT_KEYWORDS = [
 ]
 
 
+def _matches_any(url: str, keywords: List[str]) -> bool:
+    lowered = url.lower()
+    return any(k in lowered for k in keywords)
+
+
 async def smart_discover_urls(
     homepage: str,
     max_priority: int = 15,
@@ -67,13 +72,18 @@ async def smart_discover_urls(
     priority_keywords: Optional[List[str]] = None,
     exclude_keywords: Optional[List[str]] = None,
     context_keywords: Optional[List[str]] = None,
+    concurrency: int = 4,
+    sitemap_index: Optional[SitemapIndexStore] = None,
 ) -> Dict[str, List[Dict[str, Any]]]:
     """
     Intelligently discovers relevant URLs from a homepage by:
     1. Finding sitemaps (standard + heuristic).
-    2. Peeking at indices to filter out noise (products, tags).
-    3. Extracting URLs from remaining 'content' sitemaps.
-    4. Categorizing final URLs into 'high_priority' and 'general'.
+    2. Skipping nested sitemaps whose URL matches an exclude keyword
+       (products, tags) before they are fetched.
+    3. Streaming URLs from the remaining sitemaps through one bounded
+       walker (shared HTTP pool, one lazily started browser for fallbacks).
+    4. Categorizing URLs into 'high_priority' and 'general' as they arrive,
+       stopping as soon as both buckets are full.
 
     Args:
         homepage: The URL of the site to discover.
@@ -82,6 +92,9 @@ async def smart_discover_urls(
         priority_keywords: List of keywords to identify useful content.
         exclude_keywords: List of keywords to skip sitemaps/URLs.
         context_keywords: List of keywords for high-priority classification.
+        concurrency: Sitemap documents fetched in parallel.
+        sitemap_index: Persistent index; unchanged child sitemaps are read
+            from it instead of being downloaded again.
 
     Returns:
         Dict with keys: 'priority_urls', 'general_urls'
@@ -92,6 +105,7 @@ async def smart_discover_urls(
     p_keywords = priority_keywords or DEFAULT_PRIORITY_KEYWORDS
     e_keywords = exclude_keywords or DEFAULT_EXCLUDE_KEYWORDS
     c_keywords = context_keywords or DEFAULT_CONTEXT_KEYWORDS
+    rank_keywords = c_keywords + p_keywords
 
     # 1. Discover Sitemaps
     sitemaps = await find_sitemap_urls(homepage)
@@ -99,56 +113,43 @@ async def smart_discover_urls(
         logger.info("[SmartDiscover] No sitemaps found.")
         return {"priority_urls": [], "general_urls": []}
 
-    all_urls = []
-
-    for sm in sitemaps:
-        # 2. Peek at structure
-        info = await peek_sitemap_index(sm)
-
-        if info["type"] == "urlset":
-            # It's a direct list of URLs
-            all_urls.extend(info["urls"])
-
-        elif info["type"] == "index":
-            # 3. Filter Children
-            for child in info["sitemaps"]:
-                c_url = child["url"]
-                c_lower = c_url.lower()
-
-                # Exclusion Check
-                if any(k in c_lower for k in e_keywords):
-                    continue
-
-                # Extract child sitemap
-                child_urls = await extract_sitemap_tree(c_url, depth=1)
-                all_urls.extend(child_urls)
-
-    # Deduplicate
-    unique_urls = list(set(all_urls))
-    logger.info(f"[SmartDiscover] Found {len(unique_urls)} total unique URLs.")
-
-    # 4. Prioritize
-    priority_final = []
-    general_final = []
-
-    for u in unique_urls:
-        u_lower = u.lower()
-        if any(k in u_lower for k in c_keywords) or any(
-            k in u_lower for k in p_keywords
-        ):
-            priority_final.append(u)
-        else:
-            general_final.append(u)
-
-    # Truncate
-    p_results = priority_final[:max_priority]
-    g_results = general_final[:max_general]
+    # 2-4. Stream, filter and bucket
+    priority_final: List[str] = []
+    general_final: List[str] = []
+    seen: Set[str] = set()
+
+    entries = iter_sitemap_entries(
+        sitemaps,
+        concurrency=concurrency,
+        sitemap_filter=lambda url: not _matches_any(url, e_keywords),
+        index=sitemap_index,
+    )
+    try:
+        async for entry in entries:
+            if entry.loc in seen:
+                continue
+            seen.add(entry.loc)
+            if _matches_any(entry.loc, rank_keywords):
+                if len(priority_final) < max_priority:
+                    priority_final.append(entry.loc)
+            elif len(general_final) < max_general:
+                general_final.append(entry.loc)
+            if (
+                len(priority_final) >= max_priority
+                and len(general_final) >= max_general
+            ):
+                logger.info("[SmartDiscover] Quotas filled; stopping early.")
+                break
+    finally:
+        await entries.aclose()
+
+    logger.info(f"[SmartDiscover] Scanned {len(seen)} unique URLs.")
 
     return {
         "priority_urls": [
-            {"url": u, "score": 1, "type": "priority"} for u in p_results
+            {"url": u, "score": 1, "type": "priority"} for u in priority_final
         ],
         "general_urls": [
-            {"url": u, "score": 0.5, "type": "general"} for u in g_results
+            {"url": u, "score": 0.5, "type": "general"} for u in general_final
         ],
     }
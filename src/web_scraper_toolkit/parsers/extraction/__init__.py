@@ -11,8 +11,15 @@ from .contacts import (
     extract_phones,
     extract_socials,
     extract_heuristic_names,
+    extract_contacts_from_html,
+)
+from .metadata import (
+    extract_metadata,
+    extract_metadata_json,
+    fetch_page_metadata,
+    format_metadata_report,
+    parse_metadata,
 )
-from .metadata import extract_metadata
 from .media import capture_screenshot, save_as_pdf
 from .links import extract_links, extract_links_from_html, extract_links_sync
 
@@ -22,8 +29,13 @@ __all__ = [
     "extract_phones",
     "extract_socials",
     "extract_heuristic_names",
+    "extract_contacts_from_html",
     # Metadata
     "extract_metadata",
+    "extract_metadata_json",
+    "fetch_page_metadata",
+    "format_metadata_report",
+    "parse_metadata",
     # Media
     "capture_screenshot",
     "save_as_pdf",
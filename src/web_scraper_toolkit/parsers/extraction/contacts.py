@@ -6,16 +6,28 @@ Contact Extraction Tools
 Extracts emails, phone numbers, and social media links from text or HTML.
 Relies on 'emailtoolkit' and 'phonenumbers' for robust parsing.
 
+Both libraries are comparatively slow per character, so they never see a whole
+page: a precompiled prefilter pass finds candidate spans ('@' and
+`data-cfemail` windows for emails, digit-dense runs for phones) and only those
+spans are handed over. Contexts are cut from the match offsets, and
+`extract_contacts_from_html` reads socials and tel:/mailto: anchors in the
+same single lxml link pass.
+
 Usage:
     emails = extract_emails("Contact us at info@example.com", "https://example.com")
     phones = extract_phones("Call 555-0199", "https://example.com")
     socials = extract_socials(soup, "https://example.com")
+    contacts = extract_contacts_from_html(html, "https://example.com")
 
 """
 
 import logging
-from typing import Any, Dict, List
-from urllib.parse import urlparse
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+from lxml import etree
+from lxml import html as lxml_html
 
 # Optional dependencies handling is tricky with Type Checking if we enforce them.
 # But here they are required dependencies per user request.
@@ -40,69 +52,264 @@ SOCIAL_DOMAINS = {
 logger = logging.getLogger(__name__)
 
 
-def _find_context(text: str, target: str, window: int = 30) -> str:
+CONTEXT_WINDOW = 30
+
+# RFC 5321 limits: local part <= 64 chars, domain <= 255.
+_EMAIL_LOCAL_MAX = 64
+_EMAIL_DOMAIN_MAX = 255
+_EMAIL_BREAKS = " \t\r\n<>\"'(),;:[]{}|"
+_CF_MARKER = "data-cfemail"
+
+# A digit, then digits/phone punctuation, ending on a digit; wider blanks
+# (e.g. masked dates) end a run. Runs holding 7-17 digits are candidates; the
+# margin keeps "+1", "Tel." and "ext. 123". Longer runs are usually adjacent
+# numbers ("<li>(212) 555-0100</li><li>...") and are cut at whitespace into
+# overlapping windows the matcher can split.
+_PHONE_RUN_RE = re.compile(r"\+?\(?\d(?:[\d().\-/]|[ \t\u00a0]{1,3}(?![ \t\u00a0]))+\d")
+_PHONE_MIN_DIGITS = 7
+_PHONE_MAX_DIGITS = 17
+_PHONE_MARGIN = 24
+_PHONE_WINDOW = 96
+_PHONE_OVERLAP = 32
+_TOKEN_RE = re.compile(r"[^ \t\u00a0]+")
+# Windows of bare 1-2 digit cells are numeric tables, not lists of phones.
+_TABULAR_RE = re.compile(r"\d{1,2}(?:[ \t\u00a0]+\d{1,2})*")
+_DIGIT_RE = re.compile(r"\d")
+# Dates, times and currency amounts look like digit runs but never dial; they
+# are blanked (same length, so offsets hold) before runs are collected.
+_NOT_PHONE_RE = re.compile(
+    r"\b\d{4}[-/.]\d{1,2}[-/.]\d{1,2}\b"
+    r"|\b\d{1,2}[-/.]\d{1,2}[-/.]\d{4}\b"
+    r"|\b\d{1,2}:\d{2}(?::\d{2})?\b"
+    r"|[$\u20ac\u00a3\u00a5]\s?\d[\d,]*(?:\.\d+)?"
+)
+# Unformatted runs shorter than a national number are IDs, not phones.
+_BARE_MIN_DIGITS = 10
+
+# Same visible-text rules as BeautifulSoup.get_text (script/style skipped).
+_TEXT_SKIP_TAGS = ("script", "style", "template")
+
+
+def _context(text: str, start: int, end: int, window: int = CONTEXT_WINDOW) -> str:
+    """Text around an already located match."""
+    return text[max(0, start - window) : end + window].replace("\n", " ").strip()
+
+
+def _find_context(text: str, target: str, window: int = CONTEXT_WINDOW) -> str:
     """Finds text surrounding a target string."""
-    try:
-        idx = text.find(target)
-        if idx == -1:
-            return ""
-        start = max(0, idx - window)
-        end = min(len(text), idx + len(target) + window)
-        return text[start:end].replace("\n", " ").strip()
-    except Exception:
+    idx = text.find(target)
+    if idx == -1:
         return ""
+    return _context(text, idx, idx + len(target), window)
+
+
+def _merge_windows(windows: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    merged: List[List[int]] = []
+    for start, end in sorted(windows):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def _email_spans(text: str) -> List[Tuple[int, int]]:
+    """Windows around every '@' and Cloudflare-obfuscated address."""
+    windows = []
+    at = text.find("@")
+    while at != -1:
+        # Start at the token boundary so a long run is not cut into a
+        # plausible-looking local part.
+        floor = max(0, at - 4 * _EMAIL_LOCAL_MAX)
+        start = max(text.rfind(ch, floor, at) for ch in _EMAIL_BREAKS) + 1
+        windows.append((start or floor, at + _EMAIL_DOMAIN_MAX + 1))
+        at = text.find("@", at + 1)
+    marker = text.find(_CF_MARKER)
+    while marker != -1:
+        windows.append((marker, marker + len(_CF_MARKER) + 2 * _EMAIL_DOMAIN_MAX))
+        marker = text.find(_CF_MARKER, marker + 1)
+    return _merge_windows(windows)
+
+
+def _mask_non_phones(text: str) -> str:
+    return _NOT_PHONE_RE.sub(lambda m: " " * len(m.group()), text)
+
+
+def _split_run(text: str, start: int, end: int) -> List[Tuple[int, int]]:
+    """
+    Cut a run holding several numbers into windows of at most `_PHONE_WINDOW`
+    chars, ending at whitespace. Consecutive windows share `_PHONE_OVERLAP`
+    chars so a number crossing a cut is whole in one of them. Tokens longer
+    than a window are left out; shorter ones with several numbers joined by
+    "/" or "-" are kept whole for the matcher. Tabular windows are dropped.
+    """
+    tokens = [
+        (m.start(), m.end())
+        for m in _TOKEN_RE.finditer(text, start, end)
+        if m.end() - m.start() <= _PHONE_WINDOW
+    ]
+    windows = []
+    i = 0
+    while i < len(tokens):
+        j = i + 1
+        while j < len(tokens) and tokens[j][1] - tokens[i][0] <= _PHONE_WINDOW:
+            j += 1
+        window = (tokens[i][0], tokens[j - 1][1])
+        if not _TABULAR_RE.fullmatch(text, *window):
+            windows.append(window)
+        if j == len(tokens):
+            break
+        k = i + 1
+        while tokens[j - 1][1] - tokens[k][0] > _PHONE_OVERLAP:
+            k += 1
+        i = k
+    return windows
+
+
+def _phone_spans(text: str) -> List[Tuple[int, int]]:
+    """
+    Windows around digit runs dense enough to be phone numbers. `text` is
+    expected to be masked already. Windows are clipped at neighbouring runs
+    so digit-heavy tables never chain into one page-sized span.
+    """
+    runs = [(m.start(), m.end(), m.group()) for m in _PHONE_RUN_RE.finditer(text)]
+    windows = []
+    for i, (start, end, run) in enumerate(runs):
+        digits = len(_DIGIT_RE.findall(run))
+        if digits < _PHONE_MIN_DIGITS:
+            continue
+        if digits < _BARE_MIN_DIGITS and run.isdigit():
+            continue
+        floor = runs[i - 1][1] if i else 0
+        ceiling = runs[i + 1][0] if i + 1 < len(runs) else len(text)
+        pieces = [(start, end)]
+        if digits > _PHONE_MAX_DIGITS:
+            pieces = _split_run(text, start, end)
+            if not pieces:
+                continue
+        pieces[0] = (max(floor, pieces[0][0] - _PHONE_MARGIN), pieces[0][1])
+        pieces[-1] = (pieces[-1][0], min(ceiling, pieces[-1][1] + _PHONE_MARGIN))
+        windows.extend(pieces)
+    return windows
+
+
+def _last_token_start(text: str) -> int:
+    tokens = list(_TOKEN_RE.finditer(text))
+    return tokens[-1].start() if len(tokens) > 1 else 0
+
+
+def _match_phones(
+    span: str, region: str, rescan: bool = False
+) -> List[Tuple[int, int, Any]]:
+    """
+    `(start, end, number)` for every match in `span`. The matcher can swallow
+    a number sitting between two others, so with `rescan` (spans holding
+    several numbers) the gaps around matches are searched again while they
+    still hold enough digits, dropping trailing tokens (e.g. the "1" of a
+    following "1 (312) ...") until one matches.
+    """
+    found = [
+        (m.start, m.end, m.number)
+        for m in phonenumbers.PhoneNumberMatcher(span, region)
+    ]
+    if not found or not rescan:
+        return found
+    bounds = [0] + [edge for start, end, _ in found for edge in (start, end)]
+    bounds.append(len(span))
+    for gap_start, gap_end in zip(bounds[::2], bounds[1::2]):
+        gap = span[gap_start:gap_end]
+        while len(_DIGIT_RE.findall(gap)) >= _PHONE_MIN_DIGITS:
+            inner = _match_phones(gap, region, rescan)
+            if inner:
+                found.extend(
+                    (gap_start + start, gap_start + end, number)
+                    for start, end, number in inner
+                )
+                break
+            gap = gap[: _last_token_start(gap)]
+    return sorted(found, key=lambda match: match[0])
+
+
+def _email_value(em: Any) -> str:
+    return str(
+        getattr(
+            em,
+            "normalized",
+            getattr(em, "canonical", getattr(em, "original", str(em))),
+        )
+    )
 
 
 def extract_emails(text: str, source_url: str = "") -> List[Dict[str, Any]]:
     """
     Extracts emails using emailtoolkit.
     Handles standard regex and Cloudflare encryption automatically by emailtoolkit.
+    Only prefiltered spans are passed to emailtoolkit.
     """
     if not text:
         return []
 
-    try:
-        found_emails = emailtoolkit.extract(text)
-    except Exception as e:
-        logger.warning(f"emailtoolkit extract failed: {e}")
-        return []
-
-    # Convert to list of dicts with context
     results: List[Dict[str, Any]] = []
     seen = set()
 
-    for em in found_emails:
-        normalized = str(
-            getattr(
-                em,
-                "normalized",
-                getattr(em, "canonical", getattr(em, "original", str(em))),
-            )
-        )
-        if normalized in seen:
+    for span_start, span_end in _email_spans(text):
+        span = text[span_start:span_end]
+        try:
+            found_emails = emailtoolkit.extract(span)
+        except Exception as e:
+            logger.warning(f"emailtoolkit extract failed: {e}")
             continue
-        seen.add(normalized)
-        original = str(getattr(em, "original", normalized))
-
-        context = _find_context(text, original)
-
-        results.append(
-            {
-                "value": normalized,
-                "type": "email",
-                "source": source_url,
-                "context": context,
-            }
-        )
+
+        for em in found_emails:
+            normalized = _email_value(em)
+            if normalized in seen:
+                continue
+            seen.add(normalized)
+            original = str(getattr(em, "original", normalized))
+
+            offset = span.find(original)
+            if offset == -1:
+                # Decoded (e.g. Cloudflare) addresses sit at their marker.
+                offset = max(0, span.find(_CF_MARKER))
+                end = offset
+            else:
+                end = offset + len(original)
+            context = _context(text, span_start + offset, span_start + end)
+
+            results.append(
+                {
+                    "value": normalized,
+                    "type": "email",
+                    "source": source_url,
+                    "context": context,
+                }
+            )
 
     return results
 
 
+def _phone_result(
+    phone_obj: Any, text: str, start: int, end: int, source_url: str
+) -> Optional[Dict[str, Any]]:
+    if not phonenumbers.is_valid_number(phone_obj):
+        return None
+    return {
+        # Format to International or National
+        "value": phonenumbers.format_number(
+            phone_obj, phonenumbers.PhoneNumberFormat.NATIONAL
+        ),
+        "type": "phone",
+        "source": source_url,
+        "context": _context(text, start, end),
+    }
+
+
 def extract_phones(
     text: str, source_url: str = "", region: str = "US"
 ) -> List[Dict[str, Any]]:
     """
     Extracts phone numbers using Google's phonenumbers library.
+    The matcher only runs over digit-dense candidate spans.
     """
     results: List[Dict[str, Any]] = []
     seen = set()
@@ -111,37 +318,18 @@ def extract_phones(
         return []
 
     try:
-        for match in phonenumbers.PhoneNumberMatcher(text, region):
-            phone_obj = match.number
-            # Check validity
-            if not phonenumbers.is_valid_number(phone_obj):
-                continue
-
-            # Format to International or National
-            formatted = phonenumbers.format_number(
-                phone_obj, phonenumbers.PhoneNumberFormat.NATIONAL
-            )
-
-            if formatted in seen:
-                continue
-            seen.add(formatted)
-
-            # Context
-            start, end = match.start, match.end
-            context_snippet = (
-                text[max(0, start - 30) : min(len(text), end + 30)]
-                .replace("\n", " ")
-                .strip()
-            )
-
-            results.append(
-                {
-                    "value": formatted,
-                    "type": "phone",
-                    "source": source_url,
-                    "context": context_snippet,
-                }
-            )
+        masked = _mask_non_phones(text)
+        for span_start, span_end in _phone_spans(masked):
+            span = masked[span_start:span_end]
+            rescan = len(_DIGIT_RE.findall(span)) > _PHONE_MAX_DIGITS
+            for start, end, number in _match_phones(span, region, rescan):
+                result = _phone_result(
+                    number, text, span_start + start, span_start + end, source_url
+                )
+                if result is None or result["value"] in seen:
+                    continue
+                seen.add(result["value"])
+                results.append(result)
     except Exception as e:
         # e.g. if phonenumbers is not installed or errors
         logger.warning(f"Phone extraction error: {e}")
@@ -149,6 +337,22 @@ def extract_phones(
     return results
 
 
+def _social_url(href: str) -> Optional[str]:
+    """Canonical social profile URL for an href, or None."""
+    try:
+        parsed = urlparse(href)
+    except ValueError:
+        return None
+    domain = parsed.netloc.lower()
+    # Handle www.
+    if domain.startswith("www."):
+        domain = domain[4:]
+    if domain not in SOCIAL_DOMAINS:
+        return None
+    # Clean URL (remove query params usually)
+    return f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+
+
 def extract_socials(soup, source_url: str = "") -> List[Dict[str, Any]]:
     """
     Extracts social media links from a BeautifulSoup object.
@@ -164,28 +368,12 @@ def extract_socials(soup, source_url: str = "") -> List[Dict[str, Any]]:
         return []
 
     for a in soup.find_all("a", href=True):
-        href = a["href"]
-        try:
-            parsed = urlparse(href)
-            domain = parsed.netloc.lower()
-            # Handle www.
-            if domain.startswith("www."):
-                domain = domain[4:]
-
-            if domain in SOCIAL_DOMAINS:
-                # Clean URL (remove query params usually)
-                clean_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-
-                # Deduplicate
-                if clean_url in seen:
-                    continue
-                seen.add(clean_url)
-
-                results.append(
-                    {"value": clean_url, "type": "social", "source": source_url}
-                )
-        except Exception:
+        clean_url = _social_url(a["href"])
+        # Deduplicate
+        if clean_url is None or clean_url in seen:
             continue
+        seen.add(clean_url)
+        results.append({"value": clean_url, "type": "social", "source": source_url})
 
     return results
 
@@ -237,3 +425,103 @@ def extract_heuristic_names(soup) -> Dict[str, str]:
             pass
 
     return names
+
+
+def _parse_document(html: str) -> Optional[etree._Element]:
+    try:
+        return lxml_html.document_fromstring(html)
+    except ValueError:
+        # str input carrying an XML encoding declaration
+        return lxml_html.document_fromstring(html.encode("utf-8"))
+    except etree.ParserError:
+        return None
+
+
+def _names_from_tree(root: etree._Element) -> Dict[str, str]:
+    """`extract_heuristic_names` over an lxml tree."""
+    names: Dict[str, str] = {}
+    site = root.xpath("//meta[@property='og:site_name']/@content")
+    if site and site[0].strip():
+        names["business_name"] = site[0].strip()
+    author = root.xpath("//meta[@name='author']/@content")
+    if author and author[0].strip():
+        names["author_name"] = author[0].strip()
+    if "author_name" not in names:
+        for tag in ("h1", "h2"):
+            for el in root.iter(tag):
+                text = "".join(part.strip() for part in el.itertext())
+                if text.lower().startswith("meet "):
+                    candidate = text[5:].strip()
+                    if 2 < len(candidate) < 50:
+                        names["person_name_guess"] = candidate
+                        break
+            if "person_name_guess" in names:
+                break
+    return names
+
+
+def _scan_links(
+    root: etree._Element, source_url: str, region: str
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """One pass over <a href>: socials plus tel: numbers."""
+    socials: List[Dict[str, Any]] = []
+    phones: List[Dict[str, Any]] = []
+    seen = set()
+    for a in root.iter("a"):
+        href = (a.get("href") or "").strip()
+        if not href:
+            continue
+        if href[:4].lower() == "tel:":
+            number = unquote(href[4:]).split(";", 1)[0].strip()
+            try:
+                phone_obj = phonenumbers.parse(number, region)
+            except phonenumbers.NumberParseException:
+                continue
+            label = " ".join(a.text_content().split())
+            result = _phone_result(phone_obj, label, 0, len(label), source_url)
+            if result is not None:
+                phones.append(result)
+            continue
+        clean_url = _social_url(href)
+        if clean_url is not None and clean_url not in seen:
+            seen.add(clean_url)
+            socials.append({"value": clean_url, "type": "social", "source": source_url})
+    return socials, phones
+
+
+def extract_contacts_from_html(
+    html: str, source_url: str = "", region: str = "US"
+) -> Dict[str, Any]:
+    """
+    Run every contact extractor over one page and return a compact result.
+
+    Module-level and soup-free in its result so it can run in a CPU pool worker
+    (see `core.automation.cpu_pool`); only the lists/dicts travel back.
+    Emails come from the raw markup (attributes and Cloudflare payloads
+    included), phones from the visible text and tel: links.
+    """
+    empty: Dict[str, Any] = {"emails": [], "phones": [], "socials": [], "names": {}}
+    if not html:
+        return empty
+    root = _parse_document(html)
+    if root is None:
+        return empty
+
+    socials, tel_phones = _scan_links(root, source_url, region)
+    names = _names_from_tree(root)
+    etree.strip_elements(root, *_TEXT_SKIP_TAGS, etree.Comment, with_tail=False)
+    text = " ".join(s for s in (part.strip() for part in root.itertext()) if s)
+
+    phones = extract_phones(text, source_url, region)
+    known = {p["value"] for p in phones}
+    for phone in tel_phones:
+        if phone["value"] not in known:
+            known.add(phone["value"])
+            phones.append(phone)
+
+    return {
+        "emails": extract_emails(html, source_url),
+        "phones": phones,
+        "socials": socials,
+        "names": names,
+    }
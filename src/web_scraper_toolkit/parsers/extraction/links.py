@@ -11,36 +11,147 @@ Usage:
     # Returns: {"url": "...", "links": [...], "internal_count": 10, ...}
 
 Key Features:
-    - Filters internal vs external links
+    - Filters internal vs external links (by registrable domain)
     - Removes duplicates
     - Handles relative URLs
     - Optional fragment filtering
+    - Optional per-anchor table (URL, text, rel, nofollow)
+
+Anchors are read in one lxml XPath pass. Each distinct href is resolved once
+per page, with the common shapes (absolute, protocol-relative, root-relative)
+joined against a memoized split of the base URL instead of going through
+`urljoin`; registrable domains are memoized per host.
 """
 
 import logging
-from typing import Dict, List, Optional, Any
-from urllib.parse import urljoin, urlparse
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Set, Tuple
+from urllib.parse import urljoin, urlsplit
 
-from bs4 import BeautifulSoup
+from lxml import etree
 
 from ...browser.playwright_handler import PlaywrightManager
 from ...browser.config import BrowserConfig
+from ...browser.domain_identity import registrable_domain
+from ...core.automation.cpu_pool import get_cpu_pool
 
 logger = logging.getLogger(__name__)
 
-
-def _coerce_href(value: Any) -> Optional[str]:
-    """Normalize BeautifulSoup href values into a string."""
-    if value is None:
-        return None
-    if isinstance(value, str):
-        return value
-    if isinstance(value, (list, tuple)):
-        for item in value:
-            if isinstance(item, str) and item.strip():
-                return item
+_ANCHORS_XPATH = etree.XPath("//a[@href]")
+_SKIP_PREFIXES = ("javascript:", "mailto:", "tel:", "data:")
+_NETLOC_RE = re.compile(r"^[A-Za-z][A-Za-z0-9+.\-]*://([^/?#]*)")
+_HAS_HOST_RE = re.compile(r"(?:https?:)?//[^/?#]")
+# Hrefs urljoin would rewrite (dot segments, empty query/fragment markers,
+# params, stripped control characters) always take the urljoin path.
+_NEEDS_URLJOIN_RE = re.compile(r"/\.|[;\t\r\n\\]|\?#|[?#]$")
+
+
+@lru_cache(maxsize=256)
+def _split_base(base_url: str) -> Tuple[str, str, str]:
+    """(scheme, "scheme://netloc", site key) of a base URL, split once."""
+    parts = urlsplit(base_url)
+    if not (parts.scheme and parts.netloc):
+        return parts.scheme, "", ""
+    origin = f"{parts.scheme}://{parts.netloc}"
+    return parts.scheme, origin, _site_key(parts.netloc.lower())
+
+
+@lru_cache(maxsize=4096)
+def _site_key(netloc: str) -> str:
+    """Registrable domain (eTLD+1) of a netloc; "" when there is no host."""
+    host = netloc.rpartition("@")[2]
+    if not host:
+        return ""
+    return registrable_domain(host)
+
+
+def _resolve(href: str, base_url: str, scheme: str, origin: str) -> str:
+    """urljoin(base_url, href), skipping the parser for the common shapes."""
+    if not origin or _NEEDS_URLJOIN_RE.search(href):
+        return urljoin(base_url, href)
+    if _HAS_HOST_RE.match(href):
+        # urljoin returns other-scheme URLs untouched and re-serializes
+        # same-scheme ones, which is a no-op for the shapes left here.
+        return href if href[0] != "/" else f"{scheme}:{href}"
+    if href.startswith("/") and not href.startswith("//"):
+        return origin + href
+    return urljoin(base_url, href)
+
+
+def _parse_document(html: str) -> Optional[Any]:
+    # Plain etree elements: lxml.html's per-element class lookup costs more
+    # than the rest of the scan on anchor-heavy pages.
+    parser = etree.HTMLParser()
+    try:
+        return etree.fromstring(html, parser)
+    except ValueError:
+        # Unicode strings with an XML encoding declaration.
+        return etree.fromstring(html.encode("utf-8"), parser)
+    except etree.XMLSyntaxError:
         return None
-    return str(value)
+
+
+def _scan_links(
+    html: str,
+    base_url: str,
+    include_fragments: bool,
+    with_anchors: bool,
+) -> Tuple[Set[str], Set[str], Optional[Dict[str, List[Any]]]]:
+    """
+    One XPath pass over the anchors: resolve, classify by registrable
+    domain, and optionally record each kept anchor as table columns.
+    """
+    internal: Set[str] = set()
+    external: Set[str] = set()
+    table: Optional[Dict[str, List[Any]]] = (
+        {"url": [], "text": [], "rel": [], "nofollow": [], "internal": []}
+        if with_anchors
+        else None
+    )
+    root = _parse_document(html) if html else None
+    if root is None:
+        return internal, external, table
+
+    scheme, origin, base_key = _split_base(base_url)
+    resolved: Dict[str, str] = {}
+
+    for anchor in _ANCHORS_XPATH(root):
+        href = anchor.get("href").strip()
+        if not href or href.startswith(_SKIP_PREFIXES):
+            continue
+
+        full_url = resolved.get(href)
+        if full_url is None:
+            if href.startswith("#"):
+                full_url = urljoin(base_url, href) if include_fragments else ""
+            else:
+                full_url = _resolve(href, base_url, scheme, origin)
+                if not include_fragments and "#" in full_url:
+                    full_url = full_url.split("#")[0]
+                if full_url == base_url:
+                    full_url = ""
+            resolved[href] = full_url
+        if not full_url:
+            continue
+
+        if href.startswith("#"):
+            is_internal = True
+        else:
+            match = _NETLOC_RE.match(full_url)
+            netloc = match.group(1).lower() if match else ""
+            is_internal = (_site_key(netloc) if netloc else "") == base_key
+        (internal if is_internal else external).add(full_url)
+
+        if table is not None:
+            rel = anchor.get("rel") or ""
+            table["url"].append(full_url)
+            table["text"].append(" ".join("".join(anchor.itertext()).split()))
+            table["rel"].append(rel)
+            table["nofollow"].append("nofollow" in rel.lower().split())
+            table["internal"].append(is_internal)
+
+    return internal, external, table
 
 
 async def extract_links(
@@ -48,6 +159,7 @@ async def extract_links(
     filter_external: bool = False,
     include_fragments: bool = False,
     config: Optional[BrowserConfig] = None,
+    include_anchors: bool = False,
 ) -> Dict[str, Any]:
     """
     Extract all hyperlinks from a webpage.
@@ -57,6 +169,8 @@ async def extract_links(
         filter_external: If True, only return internal links (same domain)
         include_fragments: If True, include fragment-only links (#section)
         config: Optional browser config
+        include_anchors: If True, include the per-anchor `anchors` table
+            (see `extract_links_from_html`)
 
     Returns:
         Dictionary with:
@@ -85,12 +199,14 @@ async def extract_links(
                 "error": f"Failed to fetch page (status: {status})",
             }
 
-        # Parse links
-        links_data = extract_links_from_html(
+        # Parse links (large pages go to the shared CPU pool)
+        links_data = await get_cpu_pool().run(
+            extract_links_from_html,
             content,
-            base_url=final_url,
-            filter_external=filter_external,
-            include_fragments=include_fragments,
+            final_url,
+            filter_external,
+            include_fragments,
+            include_anchors,
         )
 
         links_data["url"] = final_url
@@ -108,6 +224,7 @@ def extract_links_from_html(
     base_url: str,
     filter_external: bool = False,
     include_fragments: bool = False,
+    include_anchors: bool = False,
 ) -> Dict[str, Any]:
     """
     Extract links from raw HTML content.
@@ -117,61 +234,17 @@ def extract_links_from_html(
         base_url: Base URL for resolving relative links
         filter_external: If True, only return internal links
         include_fragments: If True, include fragment-only links
+        include_anchors: If True, add an `anchors` table: parallel lists
+            `url`, `text`, `rel`, `nofollow`, `internal`, one entry per kept
+            anchor in document order (duplicates included)
 
     Returns:
-        Dictionary with link data
+        Dictionary with link data. Internal means same registrable domain
+        (eTLD+1) as `base_url`, so subdomains count as internal.
     """
-    soup = BeautifulSoup(html, "lxml")
-
-    base_domain = urlparse(base_url).netloc.lower()
-
-    internal_links = set()
-    external_links = set()
-
-    for anchor in soup.find_all("a", href=True):
-        href_value = _coerce_href(anchor.get("href"))
-        href = href_value.strip() if href_value else ""
-
-        if not href:
-            continue
-
-        # Skip javascript, mailto, tel, etc.
-        if href.startswith(("javascript:", "mailto:", "tel:", "data:")):
-            continue
-
-        # Handle fragment-only links
-        if href.startswith("#"):
-            if include_fragments:
-                internal_links.add(urljoin(base_url, href))
-            continue
-
-        # Resolve relative URLs
-        full_url = urljoin(base_url, href)
-
-        # Remove fragment if not included
-        if not include_fragments and "#" in full_url:
-            full_url = full_url.split("#")[0]
-
-        # Skip empty after cleaning
-        if not full_url or full_url == base_url:
-            continue
-
-        # Categorize as internal or external
-        parsed = urlparse(full_url)
-        link_domain = parsed.netloc.lower()
-
-        # Normalize www prefix
-        if link_domain.startswith("www."):
-            link_domain = link_domain[4:]
-        if base_domain.startswith("www."):
-            base_domain_clean = base_domain[4:]
-        else:
-            base_domain_clean = base_domain
-
-        if link_domain == base_domain_clean or link_domain == base_domain:
-            internal_links.add(full_url)
-        else:
-            external_links.add(full_url)
+    internal_links, external_links, anchors = _scan_links(
+        html, base_url, include_fragments, include_anchors
+    )
 
     # Build result
     if filter_external:
@@ -179,12 +252,21 @@ def extract_links_from_html(
     else:
         all_links = sorted(internal_links | external_links)
 
-    return {
+    result: Dict[str, Any] = {
         "links": all_links,
         "internal_count": len(internal_links),
         "external_count": len(external_links),
         "total_count": len(all_links),
     }
+    if anchors is not None:
+        if filter_external:
+            keep = anchors["internal"]
+            anchors = {
+                column: [value for value, ok in zip(values, keep) if ok]
+                for column, values in anchors.items()
+            }
+        result["anchors"] = anchors
+    return result
 
 
 def extract_links_sync(html: str, base_url: str = "") -> List[str]:
@@ -4,37 +4,63 @@ Metadata Extraction Tools
 =========================
 
 Tools for extracting semantic metadata (JSON-LD, OpenGraph, Twitter Cards) from websites.
+
+`fetch_page_metadata` streams the page over the shared HTTP pool. Only when
+the plain response has no metadata (a JS-generated head, a challenge page, a
+non-HTML reply) is a browser started. JSON-LD is decoded into Python objects.
+With the opt-in `head_only`, reading stops at `</head>` (or the first
+`<body>`) when the head already carries metadata; that is faster but misses
+JSON-LD placed in the body (common for Product/Article schema).
+
+When a `proxy_manager` is passed, the fast lane goes through `ProxyScraper`
+(proxy pool, breakers, retry budget) instead of the direct pool; a config
+with a `proxy_tier` but no manager skips the direct lane and uses the browser.
+
+Usage:
+    data = await fetch_page_metadata("https://example.com")
+    data["opengraph"]["title"], data["json_ld_types"]
+    report = extract_metadata("https://example.com")  # text report
 """
 
 import asyncio
+import json
 import logging
+import re
 from concurrent.futures import Future
 from threading import Thread
-from typing import Any, Coroutine, Dict, Optional, TypeVar, Union
+from typing import Any, AsyncIterator, Coroutine, Dict, List, Optional, TypeVar, Union
+
+import aiohttp
+from lxml import etree
+from lxml import html as lxml_html
 
-from bs4 import BeautifulSoup
 from ..config import ParserConfig
 from ...browser.config import BrowserConfig
+from ...core.http_client import SharedHttpClient, closing_shared_session
+from ...core.user_agents import get_simple_headers
 
 logger = logging.getLogger(__name__)
 T = TypeVar("T")
 
+# Stop looking for </head> after this much; read whole documents up to the cap.
+MAX_HEAD_BYTES = 512 * 1024
+MAX_DOCUMENT_BYTES = 4 * 1024 * 1024
+STREAM_CHUNK_BYTES = 16 * 1024
+_FAST_TIMEOUT = aiohttp.ClientTimeout(total=15, sock_connect=5, sock_read=10)
 
-def _coerce_attr_to_str(value: Any) -> Optional[str]:
-    if value is None:
-        return None
-    if isinstance(value, str):
-        return value
-    if isinstance(value, (list, tuple)):
-        for item in value:
-            if isinstance(item, str) and item.strip():
-                return item
-        return None
-    return str(value)
+_HEAD_END_RE = re.compile(rb"</head\s*>|<body[\s>]", re.IGNORECASE)
+_CHARSET_RE = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?([\w.:-]+)""", re.IGNORECASE)
+_JSON_LD_WRAPPER_RE = re.compile(r"^\s*(?:<!--|<!\[CDATA\[)|(?:-->|\]\]>)\s*$")
+_HTML_TYPES = ("text/html", "application/xhtml+xml")
+
+# Meta names/properties kept in the report (substring match, as before).
+_META_KEYS = ("og:", "twitter:", "description", "keywords", "author")
 
 
 def _run_coro_sync(coro: Coroutine[Any, Any, T]) -> T:
     """Run coroutine safely from sync call sites."""
+    # Each call runs on a fresh loop; release that loop's pooled session.
+    coro = closing_shared_session(coro)
     try:
         asyncio.get_running_loop()
     except RuntimeError:
@@ -54,65 +80,299 @@ def _run_coro_sync(coro: Coroutine[Any, Any, T]) -> T:
     return result.result()
 
 
-async def _arun_extract_metadata(
-    website_url: str,
-    config: Optional[Union[Dict[str, Any], ParserConfig, BrowserConfig]] = None,
-) -> str:
-    from ...browser.playwright_handler import PlaywrightManager
-
-    # Config handling
-    browser_cfg = BrowserConfig()  # default
+def _browser_config(
+    config: Optional[Union[Dict[str, Any], ParserConfig, BrowserConfig]],
+) -> BrowserConfig:
     if isinstance(config, BrowserConfig):
-        browser_cfg = config
-    elif isinstance(config, dict):
-        browser_cfg = BrowserConfig.from_dict(config)
+        return config
+    if isinstance(config, dict):
+        return BrowserConfig.from_dict(config)
+    return BrowserConfig()
+
+
+# -- parsing -------------------------------------------------------------------
+
+
+def _load_json_ld(raw: str) -> Any:
+    text = _JSON_LD_WRAPPER_RE.sub("", raw).strip()
+    if not text:
+        return None
+    # strict=False tolerates raw newlines/tabs inside strings (common in CMSes).
+    return json.loads(text, strict=False)
+
+
+def _json_ld_types(value: Any, found: List[str]) -> None:
+    if isinstance(value, list):
+        for item in value:
+            _json_ld_types(item, found)
+    elif isinstance(value, dict):
+        kind = value.get("@type")
+        for name in kind if isinstance(kind, list) else [kind]:
+            if isinstance(name, str) and name not in found:
+                found.append(name)
+        _json_ld_types(value.get("@graph"), found)
+
+
+def parse_metadata(html: str, url: str = "") -> Dict[str, Any]:
+    """
+    Structured metadata from an HTML document or just its <head>.
+
+    Returns `title`, `lang`, `canonical`, `description`, `opengraph` and
+    `twitter` (prefix stripped, first value wins), `meta` (every kept
+    name/property), `json_ld` (decoded objects; top-level arrays are
+    flattened), `json_ld_types`, and `json_ld_errors` (raw text that would
+    not decode, truncated).
+    """
+    data: Dict[str, Any] = {
+        "url": url,
+        "title": None,
+        "lang": None,
+        "canonical": None,
+        "description": None,
+        "opengraph": {},
+        "twitter": {},
+        "meta": {},
+        "json_ld": [],
+        "json_ld_types": [],
+        "json_ld_errors": [],
+    }
+    try:
+        root = lxml_html.document_fromstring(html)
+    except (etree.ParserError, ValueError):
+        return data
+
+    data["lang"] = root.get("lang") or None
+    for element in root.iter("title", "meta", "link", "script"):
+        tag = element.tag
+        if tag == "meta":
+            name = element.get("property") or element.get("name")
+            content = element.get("content")
+            if not name or content is None:
+                continue
+            name = name.strip().lower()
+            if not any(key in name for key in _META_KEYS):
+                continue
+            data["meta"].setdefault(name, content)
+            if name.startswith("og:"):
+                data["opengraph"].setdefault(name[3:], content)
+            elif name.startswith("twitter:"):
+                data["twitter"].setdefault(name[8:], content)
+            elif name == "description" and data["description"] is None:
+                data["description"] = content
+        elif tag == "title":
+            if data["title"] is None:
+                data["title"] = (element.text_content() or "").strip() or None
+        elif tag == "link":
+            rel = (element.get("rel") or "").lower().split()
+            if "canonical" in rel and data["canonical"] is None:
+                data["canonical"] = element.get("href")
+        elif (element.get("type") or "").strip().lower() == "application/ld+json":
+            raw = element.text or ""
+            try:
+                value = _load_json_ld(raw)
+            except ValueError:
+                data["json_ld_errors"].append(raw.strip()[:500])
+                continue
+            if isinstance(value, list):
+                data["json_ld"].extend(value)
+            elif value is not None:
+                data["json_ld"].append(value)
+
+    _json_ld_types(data["json_ld"], data["json_ld_types"])
+    return data
+
+
+def _has_metadata(data: Dict[str, Any]) -> bool:
+    # A <title> alone does not count: SPA shells ship one before hydration.
+    return bool(
+        data["json_ld"] or data["opengraph"] or data["twitter"] or data["description"]
+    )
+
+
+def format_metadata_report(data: Dict[str, Any]) -> str:
+    """Render `fetch_page_metadata` output as the plain-text metadata report."""
+    if data.get("error"):
+        return f"Error: {data['error']}"
+    output = f"=== METADATA REPORT: {data.get('url', '')} ===\n\n"
+
+    # 1. JSON-LD (The Gold Mine)
+    blocks = [json.dumps(obj, indent=2, ensure_ascii=False) for obj in data["json_ld"]]
+    blocks.extend(data["json_ld_errors"])
+    if blocks:
+        output += "## JSON-LD Structures found:\n"
+        for i, block in enumerate(blocks):
+            output += f"--- JSON-LD #{i + 1} ---\n{block}\n\n"
+    else:
+        output += "## No JSON-LD found.\n\n"
+
+    # 2. Meta Tags (OpenGraph / Twitter)
+    output += "## Meta Tags:\n"
+    for k, v in data["meta"].items():
+        output += f"- {k}: {v}\n"
+    return output
+
+
+# -- fetching ------------------------------------------------------------------
+
+
+async def iter_document_chunks(url: str, info: Dict[str, Any]) -> AsyncIterator[bytes]:
+    """
+    Stream an HTML response over the shared HTTP pool.
+    `info` receives `status`, `final_url` and `charset`; non-200 and non-HTML
+    responses end the stream without yielding. Network errors propagate.
+    """
+    headers = get_simple_headers()
+    headers["Accept"] = "text/html,application/xhtml+xml;q=0.9,*/*;q=0.5"
+    session = await SharedHttpClient.get_session()
+    async with session.get(url, headers=headers, timeout=_FAST_TIMEOUT) as resp:
+        info["status"] = resp.status
+        info["final_url"] = str(resp.url)
+        info["charset"] = resp.charset
+        content_type = resp.headers.get("Content-Type", "").lower()
+        if resp.status != 200 or (
+            content_type and not content_type.startswith(_HTML_TYPES)
+        ):
+            return
+        async for chunk in resp.content.iter_chunked(STREAM_CHUNK_BYTES):
+            yield chunk
 
-    manager = PlaywrightManager(config=browser_cfg)
+
+def _decode(data: bytes, charset: Optional[str]) -> str:
+    if not charset:
+        match = _CHARSET_RE.search(data, 0, 4096)
+        charset = match.group(1).decode("ascii") if match else "utf-8"
+    try:
+        return data.decode(charset, errors="replace")
+    except LookupError:
+        return data.decode("utf-8", errors="replace")
+
+
+async def _fetch_plain(url: str, head_only: bool) -> Optional[Dict[str, Any]]:
+    """
+    Fast lane: read until the head is complete, and past it only when the
+    head held no metadata (or `head_only` is off). None when plain HTTP
+    cannot serve the page.
+    """
+    info: Dict[str, Any] = {}
+    buffer = bytearray()
+    head_checked = False
+    stream = iter_document_chunks(url, info)
+    try:
+        async for chunk in stream:
+            searched = max(0, len(buffer) - 8)
+            buffer += chunk
+            if head_only and not head_checked:
+                match = _HEAD_END_RE.search(buffer, searched)
+                if match:
+                    head_checked = True
+                    head = _decode(bytes(buffer[: match.end()]), info.get("charset"))
+                    data = parse_metadata(head, info.get("final_url", url))
+                    if _has_metadata(data):
+                        data.update(source="head", bytes_read=len(buffer))
+                        return data
+                elif len(buffer) >= MAX_HEAD_BYTES:
+                    head_checked = True
+            if len(buffer) >= MAX_DOCUMENT_BYTES:
+                break
+    except Exception as e:
+        logger.debug(f"Plain metadata fetch failed for {url}: {e}")
+        return None
+    finally:
+        await stream.aclose()
+
+    if not buffer:
+        return None
+    html = _decode(bytes(buffer[:MAX_DOCUMENT_BYTES]), info.get("charset"))
+    data = parse_metadata(html, info.get("final_url", url))
+    data.update(source="document", bytes_read=len(buffer))
+    return data
+
+
+async def _fetch_proxied(url: str, proxy_manager: Any) -> Optional[Dict[str, Any]]:
+    """Fast lane through the proxy pool; reads the whole document."""
+    from ...scraper import ProxyScraper
+
+    try:
+        html = await ProxyScraper(manager=proxy_manager).secure_fetch(url)
+    except Exception as e:
+        logger.debug(f"Proxied metadata fetch failed for {url}: {e}")
+        return None
+    if not html:
+        return None
+    data = parse_metadata(html, url)
+    data.update(source="proxy", bytes_read=len(html.encode("utf-8")))
+    return data
+
+
+async def _fetch_with_browser(
+    url: str,
+    config: Optional[Union[Dict[str, Any], ParserConfig, BrowserConfig]],
+    proxy_manager: Any = None,
+) -> Optional[Dict[str, Any]]:
+    from ...browser.playwright_handler import PlaywrightManager
+
+    manager = PlaywrightManager(
+        config=_browser_config(config), proxy_manager=proxy_manager
+    )
     await manager.start()
     try:
-        content, final_url, status = await manager.smart_fetch(url=website_url)
-        if status != 200 or not content:
-            return f"Error: Could not retrieve content from {website_url}"
-
-        soup = BeautifulSoup(content, "lxml")
-        output = f"=== METADATA REPORT: {final_url} ===\n\n"
-
-        # 1. JSON-LD (The Gold Mine)
-        json_lds = soup.find_all("script", type="application/ld+json")
-        if json_lds:
-            output += "## JSON-LD Structures found:\n"
-            for i, script in enumerate(json_lds):
-                try:
-                    # Basic cleaning of script text
-                    data = script.string
-                    if data:
-                        output += f"--- JSON-LD #{i + 1} ---\n{data.strip()}\n\n"
-                except Exception:
-                    pass
-        else:
-            output += "## No JSON-LD found.\n\n"
-
-        # 2. Meta Tags (OpenGraph / Twitter)
-        output += "## Meta Tags:\n"
-        path_metadata: Dict[str, str] = {}
-        for meta in soup.find_all("meta"):
-            name = _coerce_attr_to_str(meta.get("name")) or _coerce_attr_to_str(
-                meta.get("property")
-            )
-            content = _coerce_attr_to_str(meta.get("content"))
-            if name and content:
-                if any(
-                    x in name
-                    for x in ["og:", "twitter:", "description", "keywords", "author"]
-                ):
-                    path_metadata[name] = content
-
-        for k, v in path_metadata.items():
-            output += f"- {k}: {v}\n"
-
-        return output
+        content, final_url, status = await manager.smart_fetch(url=url)
     finally:
         await manager.stop()
+    if status != 200 or not content:
+        return None
+    data = parse_metadata(content, final_url or url)
+    data.update(source="browser", bytes_read=len(content.encode("utf-8")))
+    return data
+
+
+async def fetch_page_metadata(
+    website_url: str,
+    config: Optional[Union[Dict[str, Any], ParserConfig, BrowserConfig]] = None,
+    head_only: bool = False,
+    proxy_manager: Any = None,
+) -> Dict[str, Any]:
+    """
+    Structured metadata for a URL (see `parse_metadata` for the fields).
+
+    Adds `source` ("head", "document", "proxy" or "browser") and `bytes_read`.
+    The whole document is read (up to `MAX_DOCUMENT_BYTES`). With `head_only`
+    reading stops at `</head>` whenever the head has metadata, so body-only
+    JSON-LD is then not collected. The browser is used
+    only when the plain response carries no metadata at all. With a
+    `proxy_manager` the plain request is routed through `ProxyScraper`; a
+    `proxy_tier` without one never sends a direct request. On failure the
+    result is `{"url": ..., "error": ...}`.
+    """
+    if proxy_manager is not None:
+        plain = await _fetch_proxied(website_url, proxy_manager)
+    elif _browser_config(config).proxy_tier:
+        plain = None
+    else:
+        plain = await _fetch_plain(website_url, head_only)
+    if plain is not None and _has_metadata(plain):
+        return plain
+
+    try:
+        rendered = await _fetch_with_browser(website_url, config, proxy_manager)
+    except Exception as e:
+        logger.warning(f"Browser metadata fetch failed for {website_url}: {e}")
+        rendered = None
+    if rendered is not None:
+        return rendered
+    if plain is not None:
+        return plain
+    return {
+        "url": website_url,
+        "error": f"Could not retrieve content from {website_url}",
+    }
+
+
+async def _arun_extract_metadata(
+    website_url: str,
+    config: Optional[Union[Dict[str, Any], ParserConfig, BrowserConfig]] = None,
+) -> str:
+    return format_metadata_report(await fetch_page_metadata(website_url, config))
 
 
 def extract_metadata(
@@ -125,3 +385,12 @@ def extract_metadata(
     """
     config = config or {}
     return _run_coro_sync(_arun_extract_metadata(website_url, config))
+
+
+def extract_metadata_json(
+    website_url: str,
+    config: Optional[Union[Dict[str, Any], ParserConfig, BrowserConfig]] = None,
+    head_only: bool = False,
+) -> Dict[str, Any]:
+    """Sync wrapper for `fetch_page_metadata` (structured dict, no report)."""
+    return _run_coro_sync(fetch_page_metadata(website_url, config or {}, head_only))
@@ -8,16 +8,25 @@ Specializes in handling tables, lists, and links properly.
 
 Usage:
     md = MarkdownConverter.to_markdown(html_content, base_url="...")
+    md, truncated = MarkdownConverter.to_markdown_limited(html, max_chars=50_000)
 
 Key Features:
     - Table conversion (ASCII/GD style).
     - Link resolution (absolute paths).
     - Noise removal (scripts/styles).
+    - Budgeted conversion that stops walking once a char/token budget is
+      filled, spending it on <main>/<article> content first.
+    - Linear-time iterative engine over lxml (`markdown_engine.py`); the
+      BeautifulSoup walk below is the reference it matches byte for byte
+      and the fallback for documents it declines.
 """
 
 from bs4 import BeautifulSoup, NavigableString, Tag
 import re
-from typing import Any, Optional
+from typing import Any, Optional, Tuple
+
+from ..core.content.tokens import TOKEN_RATIOS
+from .markdown_engine import html_to_markdown, html_to_markdown_limited
 
 
 class MarkdownConverter:
@@ -33,6 +42,53 @@ class MarkdownConverter:
         if not html_content:
             return ""
 
+        markdown = html_to_markdown(html_content)
+        if markdown is not None:
+            return markdown
+        return MarkdownConverter._to_markdown_soup(html_content, base_url)
+
+    @staticmethod
+    def to_markdown_limited(
+        html_content: str,
+        base_url: str = "",
+        *,
+        max_chars: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+        model: str = "default",
+    ) -> Tuple[str, bool]:
+        """
+        Converts HTML to Markdown within a character and/or token budget.
+
+        Returns (markdown, truncated). Tokens are converted to characters with
+        the heuristic ratios in `core.content.tokens`. The tree walk stops
+        once the budget is filled; pages that fit are returned exactly as
+        `to_markdown` renders them, and pages that do not lead with their
+        <main>/<article> content.
+        """
+        budget = max_chars
+        if max_tokens is not None:
+            ratio = TOKEN_RATIOS.get(model.lower(), TOKEN_RATIOS["default"])
+            token_chars = int(max_tokens * ratio)
+            budget = token_chars if budget is None else min(budget, token_chars)
+        if budget is None:
+            return MarkdownConverter.to_markdown(html_content, base_url), False
+        if not html_content:
+            return "", False
+
+        limited = html_to_markdown_limited(html_content, max(0, budget))
+        if limited is not None:
+            return limited
+        markdown = MarkdownConverter._to_markdown_soup(html_content, base_url)
+        if len(markdown) > budget:
+            return markdown[: max(0, budget)], True
+        return markdown, False
+
+    @staticmethod
+    def _to_markdown_soup(html_content: str, base_url: str = "") -> str:
+        """Recursive BeautifulSoup conversion (reference implementation)."""
+        if not html_content:
+            return ""
+
         soup = BeautifulSoup(html_content, "lxml")
 
         # 1. Cleanup Noise
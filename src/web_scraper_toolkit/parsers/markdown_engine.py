@@ -0,0 +1,578 @@
+# ./src/web_scraper_toolkit/parsers/markdown_engine.py
+"""
+Iterative, linear-time HTML to Markdown engine over the lxml tree.
+Used by `MarkdownConverter.to_markdown`; reproduces its BeautifulSoup-based
+output byte for byte without building a soup.
+Run: imported as a library module; not a direct CLI entry point.
+Inputs: raw HTML text and an optional base URL (kept for API parity).
+Outputs: Markdown text, or None when the tree cannot be rendered identically
+(no <body>, a DOCTYPE inside the document, or nesting deeper than libxml2
+keeps); callers then use the BeautifulSoup path.
+Side effects: none.
+Operational notes: the tree is walked once with an explicit stack (no recursion
+limit on deep DOMs) and output is appended to one list buffer. "Does this link
+wrap block content" is precomputed bottom-up in a single pass. Text semantics
+mirror BeautifulSoup's lxml tree builder: comments and processing instructions
+render as text, whitespace-only strings collapse outside <pre>/<textarea>, and
+get_text() skips comments and <template>/<rt>/<rp> strings.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Iterator, List, Optional, Set, Tuple
+
+from lxml import etree
+
+NOISE_TAGS = (
+    "script",
+    "style",
+    "noscript",
+    "iframe",
+    "svg",
+    "meta",
+    "link",
+    "head",
+    "nav",
+    "footer",
+    "header",
+    "aside",
+)
+BLOCK_TAGS = frozenset(
+    {
+        "div",
+        "section",
+        "article",
+        "main",
+        "header",
+        "footer",
+        "ul",
+        "ol",
+        "li",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "p",
+        "table",
+        "blockquote",
+        "pre",
+    }
+)
+# Tags whose presence anywhere below a link makes it a "block link".
+DEEP_BLOCK_TAGS = (
+    "div",
+    "p",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "ul",
+    "ol",
+    "li",
+    "table",
+)
+HEADING_TAGS = frozenset({"h1", "h2", "h3", "h4", "h5", "h6"})
+SECTION_TAGS = frozenset(
+    {"div", "section", "article", "main", "header", "footer", "body"}
+)
+_PRESERVE_WS_TAGS = frozenset({"pre", "textarea"})
+_STRING_CONTAINER_TAGS = frozenset({"rt", "rp", "template", "script", "style"})
+_ASCII_SPACES = frozenset("\x20\x0a\x09\x0c\x0d")
+# Stand-in tag for decomposed noise: empty, renders nothing, keeps its tail.
+_REMOVED = "wst-removed"
+# libxml2 silently stops nesting elements around depth 2047 (even with
+# huge_tree); a render reaching this depth may be missing content.
+_DEPTH_GUARD = 2000
+
+_WS_RE = re.compile(r"\s+")
+_DOCTYPE_RE = re.compile(r"<!doctype", re.IGNORECASE)
+_PROLOG_MARKUP_RE = re.compile(r"<!--.*?-->|<\?.*?>", re.DOTALL)
+_NEWLINES_RE = re.compile(r"\n{3,}")
+
+# Frame kinds
+_TRANSPARENT = 0
+_HEADING = 1
+_PARAGRAPH = 2
+_LIST = 3
+_LIST_ITEM = 4
+_ITEM = 5
+_QUOTE = 6
+_LINK = 7
+_EMPHASIS = 8
+_SECTION = 9
+
+
+def parse_html(html: str) -> Optional[Any]:
+    """Parse like BeautifulSoup's lxml builder does; None if lxml rejects it."""
+    if html and html[0] == "\N{BYTE ORDER MARK}":
+        html = html[1:]
+    parser = etree.HTMLParser(recover=True, huge_tree=True)
+    try:
+        parser.feed(html)
+        return parser.close()
+    except (etree.ParserError, etree.XMLSyntaxError, ValueError):
+        return None
+
+
+def strip_noise(root: Any) -> None:
+    """Empty noise elements in place, keeping their tails as separate text."""
+    for element in list(root.iter(*NOISE_TAGS)):
+        element.clear(keep_tail=True)
+        element.tag = _REMOVED
+
+
+def _is_element(node: Any) -> bool:
+    return isinstance(node.tag, str)
+
+
+def _events(element: Any) -> Iterator[Any]:
+    """An element's children in soup order: text, then each child and its tail."""
+    if element.text:
+        yield element.text
+    for child in element:
+        yield child
+        if child.tail:
+            yield child.tail
+
+
+def _node_string(node: Any) -> str:
+    """Text BeautifulSoup stores for a comment or processing instruction."""
+    if node.tag is etree.PI:
+        return f"{node.target} {node.text or ''}"
+    # An empty comment becomes a single space after BeautifulSoup's
+    # whitespace collapsing.
+    return node.text or " "
+
+
+def _soup_string(text: str, preserve: bool) -> str:
+    """Apply BeautifulSoup's collapsing of all-ASCII-whitespace strings."""
+    if preserve:
+        return text
+    for char in text:
+        if char not in _ASCII_SPACES:
+            return text
+    return "\n" if "\n" in text else " "
+
+
+def get_text(element: Any, strip: bool = False) -> str:
+    """`Tag.get_text()` / `get_text(strip=True)` semantics on an lxml element."""
+    preserve = element.tag in _PRESERVE_WS_TAGS
+    contained = element.tag in _STRING_CONTAINER_TAGS
+    for ancestor in element.iterancestors():
+        preserve = preserve or ancestor.tag in _PRESERVE_WS_TAGS
+        contained = contained or ancestor.tag in _STRING_CONTAINER_TAGS
+
+    if contained:
+        return ""
+    if not len(element):  # Leaf fast path: most table cells
+        text = element.text
+        if not text:
+            return ""
+        text = _soup_string(text, preserve)
+        return text.strip() if strip else text
+
+    out: List[str] = []
+    stack = [(_events(element), preserve, contained)]
+    while stack:
+        events, preserve, contained = stack[-1]
+        node = next(events, None)
+        if node is None:
+            stack.pop()
+        elif isinstance(node, str):
+            if contained:
+                continue
+            text = _soup_string(node, preserve)
+            if strip:
+                text = text.strip()
+                if not text:
+                    continue
+            out.append(text)
+        elif _is_element(node):
+            stack.append(
+                (
+                    _events(node),
+                    preserve or node.tag in _PRESERVE_WS_TAGS,
+                    contained or node.tag in _STRING_CONTAINER_TAGS,
+                )
+            )
+        # Comments and processing instructions are not "text" to get_text().
+    return "".join(out)
+
+
+class _Frame:
+    __slots__ = ("kind", "events", "link", "mark", "ink", "chars", "extra", "count")
+
+    def __init__(
+        self,
+        kind: int,
+        events: Iterator[Any],
+        link: Optional[str],
+        mark: int = 0,
+        ink: int = 0,
+        extra: Any = None,
+    ) -> None:
+        self.kind = kind
+        self.events = events
+        self.link = link
+        self.mark = mark
+        self.ink = ink
+        self.chars = 0
+        self.extra = extra
+        self.count = 0
+
+
+class MarkdownEngine:
+    """
+    One conversion: walks a cleaned lxml tree and renders Markdown.
+
+    `parts` is the output buffer; `ink` counts parts holding non-whitespace
+    text so "is this block empty" checks are O(1) instead of re-joining.
+
+    With a `budget`, the walk stops once more than `budget` non-whitespace
+    characters are out. Every later rendering step only appends or keeps
+    whitespace, so the text up to that point is exactly the unbudgeted
+    output's prefix and is already longer than the budget.
+    """
+
+    def __init__(
+        self, scope: Any, budget: Optional[int] = None, skip: Set[Any] = frozenset()
+    ) -> None:
+        self.parts: List[str] = []
+        self.ink = 0
+        self.chars = 0  # Non-whitespace characters emitted (budgeted only)
+        self.budget = budget
+        self.exhausted = False
+        self.too_deep = False
+        self._scope = scope
+        self._skip = skip
+        self._block_links: Optional[Set[Any]] = None
+
+    # --- buffer -------------------------------------------------------------
+
+    def _emit(self, text: str) -> None:
+        if text:
+            self.parts.append(text)
+            if not text.isspace():
+                self.ink += 1
+                if self.budget is not None:
+                    self.chars += len("".join(text.split()))
+
+    def _reserve(self) -> int:
+        """Hold a slot for a prefix decided when the element closes."""
+        self.parts.append("")
+        return len(self.parts) - 1
+
+    def _take(self, frame: _Frame) -> str:
+        """Remove and return everything a frame emitted."""
+        content = "".join(self.parts[frame.mark :])
+        del self.parts[frame.mark :]
+        self.ink = frame.ink
+        self.chars = frame.chars
+        return content
+
+    def markdown(self) -> str:
+        return _NEWLINES_RE.sub("\n\n", "".join(self.parts).strip())
+
+    # --- structure ----------------------------------------------------------
+
+    def _has_block_children(self, element: Any) -> bool:
+        if self._block_links is None:
+            # Bottom-up, once: every ancestor of a deep block tag.
+            marked: Set[Any] = set()
+            for block in self._scope.iter(*DEEP_BLOCK_TAGS):
+                parent = block.getparent()
+                while parent is not None and parent not in marked:
+                    marked.add(parent)
+                    parent = parent.getparent()
+            self._block_links = marked
+        if element in self._block_links:
+            return True
+        return any(child.tag in BLOCK_TAGS for child in element)
+
+    # --- rendering ----------------------------------------------------------
+
+    def render(self, root: Any) -> None:
+        """Append `root`'s Markdown to the buffer (until the budget runs out)."""
+        if self.exhausted:
+            return
+        budget = self.budget
+        stack = [self._open_section(root, None)]
+        while stack:
+            if budget is not None and self.chars > budget:
+                break
+            frame = stack[-1]
+            node = next(frame.events, None)
+            if node is None:
+                stack.pop()
+                self._close(frame, stack)
+            elif isinstance(node, str):
+                self._text(node, frame.link)
+            elif _is_element(node):
+                child = self._open(node, frame)
+                if child is not None:
+                    stack.append(child)
+                    if len(stack) >= _DEPTH_GUARD:
+                        self.too_deep = True
+            else:
+                self._text(_node_string(node), frame.link)
+        # Budget spent: close what is open as if it had no more children.
+        while stack:
+            frame = stack.pop()
+            self._close(frame, stack)
+        if budget is not None and self.chars > budget:
+            self.exhausted = True
+
+    def _text(self, raw: str, link: Optional[str]) -> None:
+        text = _WS_RE.sub(" ", raw)
+        if link and text != " ":
+            text = f"[{text}]({link})"
+        self._emit(text)
+
+    def _open_section(self, element: Any, link: Optional[str]) -> _Frame:
+        ink = self.ink
+        return _Frame(_SECTION, _events(element), link, self._reserve(), ink)
+
+    def _capture(self, kind: int, element: Any, link: Optional[str]) -> _Frame:
+        """A frame whose output is reformatted as a whole when it closes."""
+        frame = _Frame(kind, _events(element), link, len(self.parts), self.ink)
+        frame.chars = self.chars
+        return frame
+
+    def _open(self, element: Any, parent: _Frame) -> Optional[_Frame]:
+        tag = element.tag
+        link = parent.link
+
+        if element in self._skip:
+            return None
+
+        if parent.kind == _LIST:
+            # Only direct <li> children reach here (see the _LIST events).
+            return self._capture(_LIST_ITEM, element, link)
+
+        if tag in HEADING_TAGS:
+            self._emit(f"\n{'#' * int(tag[1])} ")
+            return _Frame(_HEADING, _events(element), link)
+
+        if tag == "p" or tag in ("strong", "b", "em", "i"):
+            ink = self.ink
+            return _Frame(
+                _PARAGRAPH if tag == "p" else _EMPHASIS,
+                _events(element),
+                link,
+                self._reserve(),
+                ink,
+                "" if tag == "p" else ("**" if tag in ("strong", "b") else "_"),
+            )
+
+        if tag == "br":
+            self._emit("\n")
+            return None
+
+        if tag == "hr":
+            self._emit("\n\n---\n\n")
+            return None
+
+        if tag in ("ul", "ol"):
+            self._emit("\n")
+            items = (child for child in element if child.tag == "li")
+            return _Frame(_LIST, items, link, extra=tag == "ol")
+
+        if tag == "li":
+            self._emit("- ")
+            return _Frame(_ITEM, _events(element), link)
+
+        if tag == "blockquote":
+            return self._capture(_QUOTE, element, link)
+
+        if tag == "pre":
+            code = next(element.iter("code"), None)
+            content = get_text(element if code is None else code)
+            self._emit(f"\n\n```\n{content}\n```\n\n")
+            return None
+
+        if tag == "table":
+            self._emit(f"\n\n{render_table(element)}\n\n")
+            return None
+
+        if tag == "a":
+            href = element.get("href") or ""
+            if not href or href.startswith(("#", "javascript:")):
+                return _Frame(_TRANSPARENT, _events(element), link)
+            if self._has_block_children(element):
+                # Distribute the link down onto each piece of inner text.
+                return _Frame(_TRANSPARENT, _events(element), href)
+            self._emit("[")
+            return _Frame(_LINK, _events(element), link, extra=href)
+
+        if tag == "img":
+            src = element.get("src") or ""
+            if src:
+                image = f"![{element.get('alt') or 'Image'}]({src})"
+                self._emit(f"[{image}]({link})" if link else image)
+            return None
+
+        if tag == "code":
+            parent_element = element.getparent()
+            if parent_element is None or parent_element.tag != "pre":
+                self._emit(f"`{get_text(element)}`")
+            return None
+
+        if tag in SECTION_TAGS:
+            return self._open_section(element, link)
+
+        if tag == _REMOVED:
+            return None
+
+        # span, html, and anything unknown: children pass straight through.
+        return _Frame(_TRANSPARENT, _events(element), link)
+
+    def _close(self, frame: _Frame, stack: List[_Frame]) -> None:
+        kind = frame.kind
+        if kind == _TRANSPARENT:
+            return
+        if kind == _HEADING or kind == _ITEM or kind == _LIST:
+            self._emit("\n")
+        elif kind == _LINK:
+            self._emit(f"]({frame.extra})")
+        elif kind == _PARAGRAPH or kind == _EMPHASIS:
+            if len(self.parts) > frame.mark + 1:
+                wrapper = frame.extra or "\n"
+                self.parts[frame.mark] = wrapper
+                self._emit(wrapper)
+            else:
+                del self.parts[frame.mark :]
+        elif kind == _SECTION:
+            if self.ink > frame.ink:
+                self.parts[frame.mark] = "\n"
+                self._emit("\n")
+            else:
+                del self.parts[frame.mark :]
+                self.ink = frame.ink
+        elif kind == _QUOTE:
+            lines = self._take(frame).split("\n")
+            quoted = "\n".join(f"> {line}" for line in lines if line.strip())
+            self._emit(f"\n{quoted}\n")
+        elif kind == _LIST_ITEM:
+            content = self._take(frame).strip().replace("\n", "\n  ")
+            owner = stack[-1]
+            prefix = f"{owner.count + 1}." if owner.extra else "-"
+            if owner.count:
+                self._emit("\n")
+            owner.count += 1
+            self._emit(f"{prefix} {content}")
+
+
+def render_table(table: Any) -> str:
+    """Markdown table rows, matching `MarkdownConverter._process_table`."""
+    rows = []
+    headers: List[str] = []
+    thead = next(table.iter("thead"), None)
+    if thead is not None:
+        header_row = next(thead.iter("tr"), None)
+        if header_row is not None:
+            headers = [
+                get_text(cell, strip=True) for cell in header_row.iter("th", "td")
+            ]
+    if not headers:
+        first_tr = next(table.iter("tr"), None)
+        if first_tr is not None and next(first_tr.iter("th"), None) is not None:
+            headers = [get_text(th, strip=True) for th in first_tr.iter("th")]
+
+    if headers:
+        rows.append(f"| {' | '.join(headers)} |")
+        rows.append(f"| {' | '.join(['---'] * len(headers))} |")
+
+    tbody = next(table.iter("tbody"), None)
+    container = table if tbody is None else tbody
+    for tr in container.iter("tr"):
+        cols = [get_text(cell, strip=True) for cell in tr.iter("td", "th")]
+        if cols:
+            rows.append(f"| {' | '.join(cols)} |")
+    return "\n".join(rows)
+
+
+def _late_doctype(html: str) -> bool:
+    """
+    A DOCTYPE anywhere but the document prolog: lxml drops it, BeautifulSoup
+    keeps it as body text. Rare enough to hand such pages to the soup path.
+    """
+    doctypes = list(_DOCTYPE_RE.finditer(html))
+    if not doctypes:
+        return False
+    if len(doctypes) > 1:
+        return True
+    prolog = _PROLOG_MARKUP_RE.sub("", html[: doctypes[0].start()])
+    return bool(prolog.lstrip("\N{BYTE ORDER MARK}").strip(" \t\n\r\f"))
+
+
+def _prepare(html: str) -> Optional[Any]:
+    """Parsed, noise-stripped <body>, or None if the soup path must run."""
+    if _late_doctype(html):
+        return None
+    root = parse_html(html)
+    if root is None:
+        return None
+    strip_noise(root)
+    return next(root.iter("body"), None)
+
+
+def html_to_markdown(html: str) -> Optional[str]:
+    """
+    Convert HTML to Markdown, or None if the soup path must handle it.
+
+    Output is identical to the BeautifulSoup converter it replaces.
+    """
+    body = _prepare(html)
+    if body is None:
+        return None
+    engine = MarkdownEngine(body)
+    engine.render(body)
+    if engine.too_deep:
+        return None
+    return engine.markdown()
+
+
+def priority_roots(body: Any) -> List[Any]:
+    """Main-content containers: <main>/role=main, else outermost <article>s."""
+    found = body.xpath(".//main | .//*[@role='main']") or body.xpath(".//article")
+    chosen = set(found)
+    return [
+        element
+        for element in found
+        if not any(ancestor in chosen for ancestor in element.iterancestors())
+    ]
+
+
+def html_to_markdown_limited(html: str, max_chars: int) -> Optional[Tuple[str, bool]]:
+    """
+    Markdown cut to `max_chars`, walking only as much of the tree as needed.
+
+    Returns (markdown, truncated), or None if the soup path must handle it.
+    Pages that fit come back exactly as `html_to_markdown` renders them.
+    When they do not, main content (see `priority_roots`) is rendered first
+    and the rest of the page fills whatever budget remains.
+    """
+    body = _prepare(html)
+    if body is None:
+        return None
+    engine = MarkdownEngine(body, budget=max_chars)
+    engine.render(body)
+    if engine.too_deep:
+        return None
+    if engine.exhausted:
+        roots = priority_roots(body)
+        if roots:
+            engine = MarkdownEngine(body, budget=max_chars, skip=set(roots))
+            for root in roots:
+                engine.render(root)
+                engine.parts.append("\n\n")
+            engine.render(body)
+    markdown = engine.markdown()
+    if len(markdown) > max_chars:
+        return markdown[:max_chars], True
+    return markdown, False
@@ -6,15 +6,36 @@ Sitemap Package
 Logic for extracting, discovering, and analyzing sitemaps.
 """
 
-from .parsing import parse_sitemap_urls
-from .fetching import fetch_sitemap_content, extract_sitemap_tree, peek_sitemap_index
+from .models import SitemapEntry, SitemapFetchState
+from .index_store import (
+    SitemapIndexConfig,
+    SitemapIndexStore,
+    get_sitemap_index,
+    set_sitemap_index,
+)
+from .parsing import SitemapStreamParser, parse_sitemap_entries, parse_sitemap_urls
+from .fetching import (
+    fetch_sitemap_content,
+    extract_sitemap_tree,
+    iter_sitemap_entries,
+    peek_sitemap_index,
+)
 from .detection import find_sitemap_urls
 from .tools import get_sitemap_urls
 
 __all__ = [
+    "SitemapEntry",
+    "SitemapFetchState",
+    "SitemapIndexConfig",
+    "SitemapIndexStore",
+    "get_sitemap_index",
+    "set_sitemap_index",
+    "SitemapStreamParser",
+    "parse_sitemap_entries",
     "parse_sitemap_urls",
     "fetch_sitemap_content",
     "extract_sitemap_tree",
+    "iter_sitemap_entries",
     "peek_sitemap_index",
     "find_sitemap_urls",
     "get_sitemap_urls",
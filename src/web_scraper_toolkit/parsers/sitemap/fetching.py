@@ -4,39 +4,61 @@ Sitemap Fetching
 ================
 
 Logic for downloading and recursively walking sitemaps.
+
+Sitemaps are streamed: response bytes go straight into `SitemapStreamParser`
+(gzip included) and records are yielded as they complete, so a multi-million
+URL index never exists in memory as one string. Child sitemaps of an index are
+walked by a small worker pool feeding a bounded queue.
 """
 
 import asyncio
 import logging
-import re
+import time
+import weakref
 import requests  # type: ignore[import-untyped]
-from typing import List, Optional, Dict, Any
-
-from .parsing import parse_sitemap_urls
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+import aiohttp
+
+from .index_store import SitemapIndexStore
+from .models import MAX_SITEMAP_DEPTH, SitemapEntry, SitemapFetchState
+from .parsing import SitemapStreamParser
+from ...core.http_client import SharedHttpClient
 from ...core.user_agents import get_simple_headers
 
 logger = logging.getLogger(__name__)
 
+STREAM_CHUNK_BYTES = 64 * 1024
+# Records written to the sitemap index per transaction while streaming.
+_INDEX_BATCH = 500
+# Whole-request caps are wrong for 50 MB files; bound connect and idle reads.
+_STREAM_TIMEOUT = aiohttp.ClientTimeout(total=None, sock_connect=10, sock_read=30)
 
-async def fetch_sitemap_content(url: str, manager=None) -> Optional[str]:
-    """
-    Fetch sitemap content from valid URL.
-    Tries requests first, falls back to Playwright for JS/Cloudflare.
-    If 'manager' (PlaywrightManager) is provided, it is reused for efficiency.
-    """
-    # 1. Try Requests with stealth headers
-    try:
-        headers = get_simple_headers()
-        # Run sync request in thread to avoid blocking
-        resp = await asyncio.to_thread(requests.get, url, headers=headers, timeout=15)
-        resp.raise_for_status()
-        return resp.text
-    except Exception as e:
-        logger.warning(
-            f"Simple sitemap fetch failed for {url} ({e}). Falling back to Playwright..."
-        )
+# One start lock per shared manager so racing fallbacks launch a single browser.
+_browser_start_locks: "weakref.WeakKeyDictionary[Any, asyncio.Lock]" = (
+    weakref.WeakKeyDictionary()
+)
 
-    # 2. Playwright Fallback
+
+async def _start_browser(manager) -> None:
+    lock = _browser_start_locks.setdefault(manager, asyncio.Lock())
+    async with lock:
+        await manager.start()
+
+
+async def _fetch_with_browser(url: str, manager=None) -> Optional[str]:
+    """Playwright fetch for sitemaps that block plain HTTP clients."""
     try:
         # Lazy import to avoid circular dependency issues at module level if any
         from ...browser.playwright_handler import PlaywrightManager
@@ -50,7 +72,7 @@ async def fetch_sitemap_content(url: str, manager=None) -> Optional[str]:
 
         try:
             # Ensure started (idempotent)
-            await manager.start()
+            await _start_browser(manager)
 
             content, _, status = await manager.smart_fetch(url)
             if status == 200:
@@ -67,100 +89,264 @@ async def fetch_sitemap_content(url: str, manager=None) -> Optional[str]:
         return None
 
 
-async def extract_sitemap_tree(
-    input_source: str,
-    depth: int = 0,
-    semaphore: Optional[asyncio.Semaphore] = None,
-    manager=None,
-) -> List[str]:
+async def fetch_sitemap_content(url: str, manager=None) -> Optional[str]:
     """
-    Recursively extracts all URLs from a sitemap or sitemap index.
+    Fetch sitemap content from valid URL.
+    Tries requests first, falls back to Playwright for JS/Cloudflare.
+    If 'manager' (PlaywrightManager) is provided, it is reused for efficiency.
+    """
+    # 1. Try Requests with stealth headers
+    try:
+        headers = get_simple_headers()
+        # Run sync request in thread to avoid blocking
+        resp = await asyncio.to_thread(requests.get, url, headers=headers, timeout=15)
+        resp.raise_for_status()
+        return resp.text
+    except Exception as e:
+        logger.warning(
+            f"Simple sitemap fetch failed for {url} ({e}). Falling back to Playwright..."
+        )
+
+    # 2. Playwright Fallback
+    return await _fetch_with_browser(url, manager)
+
+
+async def iter_sitemap_chunks(
+    url: str, manager=None, state: Optional[SitemapFetchState] = None
+) -> AsyncIterator[bytes]:
+    """
+    Stream a sitemap's raw bytes over the shared HTTP pool.
+    `.gz` bodies are passed through untouched (the parser inflates them).
+    Falls back to one Playwright fetch when the plain request fails before
+    any bytes arrive; a stream that breaks midway is reported and ends there.
+    With `state`, its validators make the request conditional: a 304 ends
+    the stream with no bytes and `state.status == 304`.
     """
-    if depth > 3:  # Safety break
-        logger.warning(f"Max sitemap depth reached at {input_source}")
-        return []
+    headers = get_simple_headers()
+    if state is not None:
+        if state.etag:
+            headers["If-None-Match"] = state.etag
+        if state.last_modified:
+            headers["If-Modified-Since"] = state.last_modified
+    started = False
+    try:
+        session = await SharedHttpClient.get_session()
+        async with session.get(url, headers=headers, timeout=_STREAM_TIMEOUT) as resp:
+            if state is not None:
+                state.status = resp.status
+                if resp.status == 304:
+                    return
+            resp.raise_for_status()
+            if state is not None:
+                state.etag = resp.headers.get("ETag")
+                state.last_modified = resp.headers.get("Last-Modified")
+            async for chunk in resp.content.iter_chunked(STREAM_CHUNK_BYTES):
+                started = True
+                yield chunk
+            if state is not None:
+                state.complete = True
+            return
+    except Exception as e:
+        if started:
+            logger.warning(f"Sitemap stream for {url} broke midway: {e}")
+            return
+        logger.warning(
+            f"Simple sitemap fetch failed for {url} ({e}). Falling back to Playwright..."
+        )
+
+    content = await _fetch_with_browser(url, manager)
+    if content:
+        if state is not None:
+            state.status, state.complete = 200, True
+            state.etag = state.last_modified = None
+        yield content.encode("utf-8")
 
-    # Initialize semaphore if this is the root call
-    if semaphore is None:
-        semaphore = asyncio.Semaphore(4)
 
-    # Initialize Shared Browser Manager if root and not provided
+async def _stream_document(
+    url: str,
+    parser: SitemapStreamParser,
+    manager=None,
+    state: Optional[SitemapFetchState] = None,
+) -> AsyncIterator[SitemapEntry]:
+    async for chunk in iter_sitemap_chunks(url, manager=manager, state=state):
+        for entry in parser.feed(chunk):
+            yield entry
+    for entry in parser.close():
+        yield entry
+
+
+async def iter_sitemap_entries(
+    input_source: Union[str, Iterable[str]],
+    manager=None,
+    max_depth: int = MAX_SITEMAP_DEPTH,
+    concurrency: int = 4,
+    buffer_size: int = 1024,
+    sitemap_filter: Optional[Callable[[str], bool]] = None,
+    index: Optional[SitemapIndexStore] = None,
+) -> AsyncIterator[SitemapEntry]:
+    """
+    Stream every page record reachable from one or more sitemaps/indexes.
+
+    Nested <sitemap> children are followed up to `max_depth` levels (each
+    fetched once) by `concurrency` workers; at most `buffer_size` records are
+    held between the workers and the consumer. Order follows arrival.
+    Children rejected by `sitemap_filter` are never fetched. Closing the
+    generator early (`break`/`aclose()`) cancels outstanding fetches.
+
+    With an `index`, children whose advertised <lastmod> is unchanged are
+    replayed from it without a request, other documents are fetched
+    conditionally (replayed on 304), and complete fetches are recorded.
+    """
+    roots = [input_source] if isinstance(input_source, str) else list(input_source)
+    roots = list(dict.fromkeys(roots))
+    if max_depth < 0:
+        logger.warning(f"Max sitemap depth reached at {', '.join(roots)}")
+        return
+    if not roots:
+        return
+
+    # Shared browser for fallbacks; only started if a plain fetch fails.
     local_manager_created = False
-    if depth == 0 and manager is None:
+    if manager is None:
         try:
             from ...browser.playwright_handler import PlaywrightManager
             from ...browser.config import BrowserConfig
 
             manager = PlaywrightManager(config=BrowserConfig(headless=True))
-            # We don't start it yet - let fetch_sitemap_content start it lazily if requests fails
             local_manager_created = True
         except Exception as e:
             logger.warning(f"Could not initialize shared PlaywrightManager: {e}")
 
-    try:
-        content = await fetch_sitemap_content(input_source, manager=manager)
-        if not content:
-            return []
-
-        # 1. Check for nested sitemaps (Sitemap Index)
-        # Check for <sitemap> tags which indicate an index
-        nested_sitemaps = []
-
-        # Regex for sitemap locs
-        raw_sitemap_matches = re.findall(
-            r"(?:<|&lt;)sitemap(?:>|&gt;)\s*(?:<|&lt;)loc(?:>|&gt;)(.*?)(?:<|&lt;)/loc(?:>|&gt;)",
-            content,
-            re.IGNORECASE | re.DOTALL,
-        )
-
-        for raw in raw_sitemap_matches:
-            url = raw.strip()
-            if "<![CDATA[" in url.upper():
-                url = re.sub(r"<!\[CDATA\[", "", url, flags=re.IGNORECASE)
-                url = re.sub(r"\]\]>", "", url, flags=re.IGNORECASE)
-            nested_sitemaps.append(url.strip())
+    work: "asyncio.Queue[Tuple[str, int, Optional[str]]]" = asyncio.Queue()
+    out: "asyncio.Queue[Optional[SitemapEntry]]" = asyncio.Queue(maxsize=buffer_size)
+    seen: Set[str] = set(roots)
+    for root in roots:
+        work.put_nowait((root, 0, None))
+
+    async def _replay(url: str) -> AsyncIterator[SitemapEntry]:
+        assert index is not None
+        index.touch(url)
+        for entry in index.iter_entries(url):
+            yield entry
+
+    async def _records(url: str, lastmod: Optional[str]) -> AsyncIterator[SitemapEntry]:
+        if index is None:
+            async for entry in _stream_document(
+                url, SitemapStreamParser(), manager=manager
+            ):
+                yield entry
+            return
+
+        record = index.get(url)
+        if record is not None and record.is_current(lastmod):
+            logger.debug(f"Sitemap {url} unchanged (lastmod {lastmod}); replaying.")
+            async for entry in _replay(url):
+                yield entry
+            return
+
+        state = SitemapFetchState()
+        if record is not None:
+            state.etag, state.last_modified = record.etag, record.last_modified
+        parser = SitemapStreamParser()
+        seen_at = time.time()
+        batch: List[SitemapEntry] = []
+        async for entry in _stream_document(url, parser, manager=manager, state=state):
+            batch.append(entry)
+            if len(batch) >= _INDEX_BATCH:
+                index.add_entries(url, batch, seen_at)
+                batch = []
+            yield entry
+        if state.status == 304 and record is not None:
+            logger.debug(f"Sitemap {url} not modified; replaying.")
+            async for entry in _replay(url):
+                yield entry
+            return
+        index.add_entries(url, batch, seen_at)
+        if state.complete and not parser.truncated:
+            index.finish(
+                url,
+                kind=parser.kind,
+                seen_at=seen_at,
+                etag=state.etag,
+                last_modified=state.last_modified,
+                lastmod=lastmod,
+            )
 
-        if nested_sitemaps:
+    async def _walk(url: str, depth: int, lastmod: Optional[str]) -> None:
+        children = pages = 0
+        async for entry in _records(url, lastmod):
+            if entry.kind != "sitemap":
+                pages += 1
+                await out.put(entry)
+            elif depth >= max_depth:
+                logger.warning(f"Max sitemap depth reached at {entry.loc}")
+            elif entry.loc not in seen:
+                seen.add(entry.loc)
+                if sitemap_filter is not None and not sitemap_filter(entry.loc):
+                    logger.debug(f"Skipping filtered sitemap {entry.loc}")
+                    continue
+                children += 1
+                work.put_nowait((entry.loc, depth + 1, entry.lastmod))
+        if children:
             logger.info(
-                f"Found sitemap index at {input_source} with {len(nested_sitemaps)} nested sitemaps."
+                f"Found sitemap index at {url} with {children} nested sitemaps."
             )
-
-            async def _recursive_task(url):
-                async with semaphore:
-                    return await extract_sitemap_tree(
-                        url, depth + 1, semaphore=semaphore, manager=manager
-                    )
-
-            tasks = [_recursive_task(url) for url in nested_sitemaps]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            all_urls = []
-            for i, res in enumerate(results):
-                if isinstance(res, list):
-                    if not res:
-                        logger.debug(
-                            f"Nested sitemap {nested_sitemaps[i]} returned 0 URLs."
-                        )
-                    all_urls.extend(res)
-                else:
-                    logger.error(f"Error recursing sitemap {nested_sitemaps[i]}: {res}")
-
-            if not all_urls:
-                logger.warning(
-                    f"Sitemap Index at {input_source} had {len(nested_sitemaps)} children but yielded 0 URLs. (Possible rate limit or empty sub-sitemaps)"
-                )
-
-            return all_urls
-
-        # 2. Extract standard URLs (Leaf Node)
-        return parse_sitemap_urls(content)
-
+        elif not pages:
+            logger.debug(f"Sitemap {url} returned 0 URLs.")
+
+    async def _worker() -> None:
+        while True:
+            url, depth, lastmod = await work.get()
+            try:
+                await _walk(url, depth, lastmod)
+            except Exception as e:
+                logger.error(f"Error recursing sitemap {url}: {e}")
+            finally:
+                work.task_done()
+
+    async def _finish() -> None:
+        await work.join()
+        await out.put(None)
+
+    tasks = [asyncio.create_task(_worker()) for _ in range(max(1, concurrency))]
+    tasks.append(asyncio.create_task(_finish()))
+    try:
+        while True:
+            entry = await out.get()
+            if entry is None:
+                break
+            yield entry
     finally:
-        # If we created a local manager at root, close it
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
         if local_manager_created and manager:
             await manager.stop()
 
 
+async def extract_sitemap_tree(
+    input_source: str,
+    depth: int = 0,
+    semaphore: Optional[asyncio.Semaphore] = None,
+    manager=None,
+) -> List[str]:
+    """
+    Recursively extracts all URLs from a sitemap or sitemap index.
+    `depth` is the level `input_source` sits at; `semaphore` is accepted for
+    backwards compatibility (concurrency is bounded by the streaming walker).
+    Prefer `iter_sitemap_entries` for very large indexes.
+    """
+    urls = [
+        entry.loc
+        async for entry in iter_sitemap_entries(
+            input_source, manager=manager, max_depth=MAX_SITEMAP_DEPTH - depth
+        )
+    ]
+    if not urls:
+        logger.warning(f"Sitemap at {input_source} yielded 0 URLs.")
+    return urls
+
+
 async def peek_sitemap_index(input_source: str) -> Dict[str, Any]:
     """
     Analyzes a sitemap index without deep recursion.
@@ -171,25 +357,17 @@ async def peek_sitemap_index(input_source: str) -> Dict[str, Any]:
          'urls': [str, ...],                             # If urlset
        }
     """
-    content = await fetch_sitemap_content(input_source)
-    if not content:
+    nested_sitemaps: List[str] = []
+    urls: List[str] = []
+    parser = SitemapStreamParser()
+    async for entry in _stream_document(input_source, parser):
+        if entry.kind == "sitemap":
+            nested_sitemaps.append(entry.loc)
+        else:
+            urls.append(entry.loc)
+    if not parser.bytes_in:
         return {"type": "error", "message": "Could not fetch content"}
 
-    # 1. Check for Index
-    raw_sitemap_matches = re.findall(
-        r"(?:<|&lt;)sitemap(?:>|&gt;)\s*(?:<|&lt;)loc(?:>|&gt;)(.*?)(?:<|&lt;)/loc(?:>|&gt;)",
-        content,
-        re.IGNORECASE | re.DOTALL,
-    )
-
-    nested_sitemaps = []
-    for raw in raw_sitemap_matches:
-        url = raw.strip()
-        if "<![CDATA[" in url.upper():
-            url = re.sub(r"<!\[CDATA\[", "", url, flags=re.IGNORECASE)
-            url = re.sub(r"\]\]>", "", url, flags=re.IGNORECASE)
-        nested_sitemaps.append(url.strip())
-
     if nested_sitemaps:
         # It IS an index. Let's get "Quick Counts" for each child.
         logger.info(f"Peeking at sitemap index: {len(nested_sitemaps)} children.")
@@ -199,13 +377,12 @@ async def peek_sitemap_index(input_source: str) -> Dict[str, Any]:
 
         async def _count_urls(url):
             async with local_semaphore:
-                c = await fetch_sitemap_content(url)
-                if not c:
+                child = SitemapStreamParser()
+                count = 0
+                async for _ in _stream_document(url, child):
+                    count += 1
+                if not child.bytes_in:
                     return {"url": url, "count": 0, "error": True}
-                # Quick regex count of <loc> or <link>
-                count = len(
-                    re.findall(r"(?:<|&lt;)(?:[\w]+:)?loc(?:>|&gt;)", c, re.IGNORECASE)
-                )
                 return {"url": url, "count": count}
 
         tasks = [_count_urls(u) for u in nested_sitemaps]
@@ -222,5 +399,4 @@ async def peek_sitemap_index(input_source: str) -> Dict[str, Any]:
 
     else:
         # It is a LEAF sitemap (Urlset)
-        urls = parse_sitemap_urls(content)
         return {"type": "urlset", "urls": urls}
@@ -0,0 +1,373 @@
+# ./src/web_scraper_toolkit/parsers/sitemap/index_store.py
+"""
+Persistent sitemap index for incremental discovery.
+Used by `iter_sitemap_entries(index=...)` and `smart_discover_urls` so repeat
+walks of the same site only download child sitemaps that actually changed.
+Run: imported as a library module; not a direct CLI entry point.
+Inputs: sitemap records streamed by the walker plus HTTP validators
+(ETag/Last-Modified) and the <lastmod> each parent index advertised.
+Outputs: stored sitemap/URL records, "changed since T" queries, and stats.
+Side effects: reads/writes one SQLite database file (WAL mode) under the
+configured directory.
+Operational notes: a child whose advertised <lastmod> matches the stored one
+is replayed from disk without any request; otherwise the walker sends a
+conditional GET and replays on 304. A sitemap's rows are only swapped for the
+new set once its document streamed completely, so a broken or abandoned walk
+never drops known URLs. Callers serialize access (the walker runs on one loop).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+from urllib.parse import urlsplit
+
+from .models import SitemapEntry
+
+logger = logging.getLogger(__name__)
+
+DB_FILENAME = "sitemap_index.sqlite3"
+_PAGE_ROWS = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sitemaps (
+    url TEXT PRIMARY KEY,
+    host TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    lastmod TEXT,
+    url_count INTEGER NOT NULL DEFAULT 0,
+    fetched_at REAL NOT NULL,
+    checked_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    sitemap TEXT NOT NULL,
+    loc TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    host TEXT NOT NULL,
+    lastmod TEXT,
+    lastmod_ts REAL,
+    changefreq TEXT,
+    priority REAL,
+    images TEXT,
+    first_seen REAL NOT NULL,
+    seen_at REAL NOT NULL,
+    PRIMARY KEY (sitemap, loc)
+);
+CREATE INDEX IF NOT EXISTS entries_host_lastmod ON entries(host, lastmod_ts);
+CREATE INDEX IF NOT EXISTS entries_first_seen ON entries(first_seen);
+"""
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[float]:
+    """W3C datetime (sitemaps) or RFC 2822 (RSS pubDate) to a UTC timestamp."""
+    if not value:
+        return None
+    text = value.strip()
+    try:
+        if text.endswith(("Z", "z")):
+            text = text[:-1] + "+00:00"
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError, IndexError):
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _timestamp(value: Union[float, datetime, str]) -> float:
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    if isinstance(value, str):
+        parsed = parse_lastmod(value)
+        if parsed is None:
+            raise ValueError(f"Unrecognised timestamp: {value!r}")
+        return parsed
+    return float(value)
+
+
+def _host(url: str) -> str:
+    return (urlsplit(url).hostname or "").lower()
+
+
+@dataclass
+class SitemapIndexConfig:
+    """Configuration for the persistent sitemap index."""
+
+    enabled: bool = True
+    directory: str = "./cache"
+    # Sitemaps no walk reached for this long are pruned on open; 0 keeps all.
+    max_age_days: float = 30.0
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SitemapIndexConfig":
+        return cls(
+            enabled=data.get("enabled", True),
+            directory=data.get("directory", "./cache"),
+            max_age_days=float(data.get("max_age_days", 30.0)),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "directory": self.directory,
+            "max_age_days": self.max_age_days,
+        }
+
+
+@dataclass
+class SitemapRecord:
+    """What the index knows about one sitemap document."""
+
+    url: str
+    kind: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    lastmod: Optional[str]
+    url_count: int
+    fetched_at: float
+    checked_at: float
+
+    def is_current(self, advertised_lastmod: Optional[str]) -> bool:
+        """True when the parent index still advertises the stored <lastmod>."""
+        return bool(advertised_lastmod) and advertised_lastmod == self.lastmod
+
+
+class SitemapIndexStore:
+    """
+    SQLite store of sitemap validators and the records each sitemap listed.
+
+    Usage:
+        index = get_sitemap_index()
+        async for entry in iter_sitemap_entries(url, index=index):
+            ...
+        changed = list(index.changed_since(time.time() - 86400, host="example.com"))
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.path = Path(directory) / DB_FILENAME
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.path), check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    # -- sitemap records -------------------------------------------------------
+
+    def get(self, url: str) -> Optional[SitemapRecord]:
+        row = self._conn.execute(
+            "SELECT url, kind, etag, last_modified, lastmod, url_count, "
+            "fetched_at, checked_at FROM sitemaps WHERE url = ?",
+            (url,),
+        ).fetchone()
+        return SitemapRecord(*row) if row else None
+
+    def touch(self, url: str, now: Optional[float] = None) -> None:
+        """Mark a sitemap as still reachable (replayed or 304)."""
+        self._conn.execute(
+            "UPDATE sitemaps SET checked_at = ? WHERE url = ?",
+            (now or time.time(), url),
+        )
+
+    def add_entries(
+        self, sitemap: str, entries: Iterable[SitemapEntry], seen_at: float
+    ) -> None:
+        """Upsert records from a document being streamed (first_seen is kept)."""
+        rows = [
+            (
+                sitemap,
+                entry.loc,
+                entry.kind,
+                _host(entry.loc),
+                entry.lastmod,
+                parse_lastmod(entry.lastmod),
+                entry.changefreq,
+                entry.priority,
+                json.dumps(entry.images) if entry.images else None,
+                seen_at,
+                seen_at,
+            )
+            for entry in entries
+        ]
+        if not rows:
+            return
+        with self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT INTO entries (sitemap, loc, kind, host, lastmod, "
+                "lastmod_ts, changefreq, priority, images, first_seen, seen_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(sitemap, loc) DO UPDATE SET kind = excluded.kind, "
+                "lastmod = excluded.lastmod, lastmod_ts = excluded.lastmod_ts, "
+                "changefreq = excluded.changefreq, priority = excluded.priority, "
+                "images = excluded.images, seen_at = excluded.seen_at",
+                rows,
+            )
+
+    def finish(
+        self,
+        url: str,
+        kind: str,
+        seen_at: float,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        lastmod: Optional[str] = None,
+    ) -> int:
+        """
+        Commit a completely streamed document: drop records it no longer
+        lists and store its validators. Returns the number of records kept.
+        """
+        now = time.time()
+        with self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.execute(
+                "DELETE FROM entries WHERE sitemap = ? AND seen_at < ?",
+                (url, seen_at),
+            )
+            count = self._conn.execute(
+                "SELECT COUNT(*) FROM entries WHERE sitemap = ?", (url,)
+            ).fetchone()[0]
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sitemaps (url, host, kind, etag, "
+                "last_modified, lastmod, url_count, fetched_at, checked_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, _host(url), kind, etag, last_modified, lastmod, count, now, now),
+            )
+        return count
+
+    def forget(self, url: str) -> None:
+        with self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.execute("DELETE FROM entries WHERE sitemap = ?", (url,))
+            self._conn.execute("DELETE FROM sitemaps WHERE url = ?", (url,))
+
+    def prune(self, checked_before: Union[float, datetime, str]) -> int:
+        """Forget sitemaps no walk has reached since `checked_before`."""
+        cutoff = _timestamp(checked_before)
+        stale = [
+            row[0]
+            for row in self._conn.execute(
+                "SELECT url FROM sitemaps WHERE checked_at < ?", (cutoff,)
+            )
+        ]
+        for url in stale:
+            self.forget(url)
+        return len(stale)
+
+    # -- record reads ----------------------------------------------------------
+
+    def _page(self, sql: str, params: List[Any]) -> Iterator[SitemapEntry]:
+        # Keyset pagination: no cursor stays open across the caller's awaits.
+        last_rowid = -1
+        while True:
+            rows = self._conn.execute(
+                sql + " AND rowid > ? ORDER BY rowid LIMIT ?",
+                (*params, last_rowid, _PAGE_ROWS),
+            ).fetchall()
+            for rowid, loc, kind, lastmod, changefreq, priority, images in rows:
+                last_rowid = rowid
+                yield SitemapEntry(
+                    loc=loc,
+                    kind=kind,
+                    lastmod=lastmod,
+                    changefreq=changefreq,
+                    priority=priority,
+                    images=json.loads(images) if images else [],
+                )
+            if len(rows) < _PAGE_ROWS:
+                return
+
+    _COLUMNS = "SELECT rowid, loc, kind, lastmod, changefreq, priority, images"
+
+    def iter_entries(self, sitemap: str) -> Iterator[SitemapEntry]:
+        """Replay the records stored for one sitemap, in stored order."""
+        return self._page(f"{self._COLUMNS} FROM entries WHERE sitemap = ?", [sitemap])
+
+    def changed_since(
+        self,
+        since: Union[float, datetime, str],
+        host: Optional[str] = None,
+    ) -> Iterator[SitemapEntry]:
+        """
+        Page URLs whose <lastmod> is at or after `since`, plus URLs without a
+        <lastmod> that first appeared at or after it. `host` matches exactly.
+        """
+        cutoff = _timestamp(since)
+        sql = (
+            f"{self._COLUMNS} FROM entries WHERE kind = 'url' AND "
+            "(lastmod_ts >= ? OR (lastmod_ts IS NULL AND first_seen >= ?))"
+        )
+        params: List[Any] = [cutoff, cutoff]
+        if host:
+            sql += " AND host = ?"
+            params.append(host.lower())
+        seen = set()
+        for entry in self._page(sql, params):
+            if entry.loc not in seen:
+                seen.add(entry.loc)
+                yield entry
+
+    def stats(self) -> Dict[str, int]:
+        sitemaps = self._conn.execute("SELECT COUNT(*) FROM sitemaps").fetchone()[0]
+        urls = self._conn.execute(
+            "SELECT COUNT(*) FROM entries WHERE kind = 'url'"
+        ).fetchone()[0]
+        return {"sitemaps": sitemaps, "urls": urls}
+
+    def close(self) -> None:
+        try:
+            self._conn.close()
+        except sqlite3.Error:
+            pass
+
+
+_sitemap_index: Optional[SitemapIndexStore] = None
+_sitemap_index_lock = threading.Lock()
+
+
+def get_sitemap_index(
+    config: Optional[SitemapIndexConfig] = None,
+) -> Optional[SitemapIndexStore]:
+    """
+    Get or open the process-wide index (None when disabled). Opening it
+    prunes sitemaps older than `config.max_age_days`.
+    """
+    global _sitemap_index
+    config = config or SitemapIndexConfig()
+    if not config.enabled:
+        return None
+    with _sitemap_index_lock:
+        if _sitemap_index is None:
+            _sitemap_index = SitemapIndexStore(config.directory)
+            if config.max_age_days > 0:
+                removed = _sitemap_index.prune(
+                    time.time() - config.max_age_days * 86400
+                )
+                if removed:
+                    logger.info(f"Sitemap index: pruned {removed} stale sitemaps")
+        return _sitemap_index
+
+
+def set_sitemap_index(index: Optional[SitemapIndexStore]) -> None:
+    """Install (or clear) the process-wide index; the previous one is closed."""
+    global _sitemap_index
+    with _sitemap_index_lock:
+        previous, _sitemap_index = _sitemap_index, index
+    if previous is not None and previous is not index:
+        previous.close()
@@ -4,6 +4,9 @@ Sitemap Models & Constants
 ==========================
 """
 
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
 # Common sitemap paths to probe
 COMMON_SITEMAP_PATHS = [
     "/sitemap.xml",
@@ -24,3 +27,45 @@ COMMON_SITEMAP_PATHS = [
     "/wp-sitemap-posts-post-1.xml",
     "/wp-sitemap-posts-page-1.xml",
 ]
+
+# Sitemaps protocol: at most 50,000 URLs and 50 MB (uncompressed) per file.
+# Streaming keeps memory flat regardless, so this only guards against bombs.
+MAX_SITEMAP_BYTES = 256 * 1024 * 1024
+
+# Levels of nested <sitemapindex> followed below the root document.
+MAX_SITEMAP_DEPTH = 3
+
+
+@dataclass
+class SitemapEntry:
+    """One <url> (page) or <sitemap> (nested index child) record."""
+
+    loc: str
+    kind: str = "url"  # "url" | "sitemap"
+    lastmod: Optional[str] = None
+    changefreq: Optional[str] = None
+    priority: Optional[float] = None
+    images: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "loc": self.loc,
+            "kind": self.kind,
+            "lastmod": self.lastmod,
+            "changefreq": self.changefreq,
+            "priority": self.priority,
+            "images": list(self.images),
+        }
+
+
+@dataclass
+class SitemapFetchState:
+    """
+    Conditional-request validators going in; status and the response's
+    validators coming out. `complete` is set once the body fully streamed.
+    """
+
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    status: int = 0
+    complete: bool = False
@@ -4,37 +4,295 @@ Sitemap Parsing
 ===============
 
 Logic for parsing raw sitemap content (XML/Text).
+
+`SitemapStreamParser` is an incremental, namespace-agnostic lxml pull parser:
+bytes go in as they arrive (gzip is detected and inflated on the fly) and
+completed <url>/<sitemap> records come out, each element being freed as soon
+as it has been read. Memory stays flat for 50k-URL files and multi-million URL
+indexes alike. Plain-text sitemaps (one URL per line) are handled too.
 """
 
+import logging
 import re
-from typing import List
+import zlib
+from typing import Dict, Iterator, List, Optional, Union
 
+from lxml import etree
 
-def parse_sitemap_urls(content: str) -> List[str]:
+from .models import MAX_SITEMAP_BYTES, SitemapEntry
+
+logger = logging.getLogger(__name__)
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_INFLATE_STEP = 1024 * 1024
+# Documents that parse to nothing (HTML-escaped XML from a browser viewer,
+# broken markup) get the tolerant regex pass when they are at most this big.
+_FALLBACK_BUFFER_BYTES = 8 * 1024 * 1024
+
+# Record element -> entry kind. RSS <item> carries its URL in <link>.
+_RECORD_TAGS = {"url": "url", "sitemap": "sitemap", "item": "url"}
+
+_ESCAPED_LOC_RE = re.compile(
+    r"(?:<|&lt;)(?:[\w]+:)?(?:loc|link)(?:>|&gt;)(.*?)(?:<|&lt;)/(?:[\w]+:)?(?:loc|link)(?:>|&gt;)",
+    re.IGNORECASE | re.DOTALL,
+)
+_ESCAPED_INDEX_RE = re.compile(r"(?:<|&lt;)(?:[\w]+:)?sitemapindex\b", re.IGNORECASE)
+_CDATA_RE = re.compile(r"<!\[CDATA\[|\]\]>", re.IGNORECASE)
+
+
+# Only record and root elements raise events; "{*}" matches any namespace.
+_EVENT_TAGS = [f"{{*}}{name}" for name in (*_RECORD_TAGS, "sitemapindex", "urlset")]
+
+_local_names: Dict[str, str] = {}
+
+
+def _local_name(tag: object) -> str:
+    if not isinstance(tag, str):  # Comments / processing instructions
+        return ""
+    name = _local_names.get(tag)
+    if name is None:
+        name = tag.rsplit("}", 1)[-1].rsplit(":", 1)[-1].lower()
+        if len(_local_names) < 1024:
+            _local_names[tag] = name
+    return name
+
+
+def _text(element: etree._Element) -> str:
+    return (element.text or "").strip()
+
+
+def _read_record(element: etree._Element, kind: str) -> Optional[SitemapEntry]:
+    entry = SitemapEntry(loc="", kind=kind)
+    for child in element:
+        name = _local_name(child.tag)
+        if name == "loc" or (name == "link" and kind == "url" and not entry.loc):
+            entry.loc = _text(child)
+        elif name == "lastmod" or name == "pubdate":
+            entry.lastmod = _text(child) or None
+        elif name == "changefreq":
+            entry.changefreq = _text(child).lower() or None
+        elif name == "priority":
+            try:
+                entry.priority = float(_text(child))
+            except ValueError:
+                pass
+        elif name == "image":
+            for grandchild in child:
+                if _local_name(grandchild.tag) == "loc" and _text(grandchild):
+                    entry.images.append(_text(grandchild))
+    return entry if entry.loc else None
+
+
+class SitemapStreamParser:
     """
-    Extract URLs from sitemap XML using robust regex.
-    Handles standard <loc> tags and CDATA.
+    Push-style sitemap parser.
+
+    Usage:
+        parser = SitemapStreamParser()
+        for chunk in chunks:
+            for entry in parser.feed(chunk):
+                ...
+        for entry in parser.close():
+            ...
+
+    `kind` is "index", "urlset", "text" or "unknown" (nothing recognised yet).
     """
-    # Regex to capture content inside <loc>...</loc>, ignoring namespace prefixes
-    # and handling potential CDATA usage.
 
-    # This non-greedy match finds content within loc OR link tags (for RSS sitemaps)
-    raw_matches = re.findall(
-        r"(?:<|&lt;)(?:[\w]+:)?(?:loc|link)(?:>|&gt;)(.*?)(?:<|&lt;)/(?:[\w]+:)?(?:loc|link)(?:>|&gt;)",
-        content,
-        re.IGNORECASE | re.DOTALL,
-    )
+    def __init__(self, max_bytes: int = MAX_SITEMAP_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.kind = "unknown"
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.entries = 0
+        self.truncated = False
+        self._mode: Optional[str] = None  # "xml" | "text" once sniffed
+        self._head = b""
+        self._inflater: Optional["zlib._Decompress"] = None
+        self._xml: Optional[etree.XMLPullParser] = None
+        self._line_tail = ""
+        self._fallback: Optional[List[Union[str, bytes]]] = []
+        self._fallback_size = 0
+        self._closed = False
+
+    # -- input ---------------------------------------------------------------
+
+    def feed(self, data: Union[str, bytes]) -> List[SitemapEntry]:
+        """Consume one chunk; return the records it completed."""
+        if self._closed or self.truncated or not data:
+            return []
+        if isinstance(data, str):
+            # Text input is already decoded; lxml honours it as-is.
+            return self._consume(data)
+        self.bytes_in += len(data)
+        if self._mode is None and self._inflater is None and len(self._head) < 2:
+            self._head += data
+            if len(self._head) < 2:
+                return []
+            data, self._head = self._head, b""
+            if data.startswith(_GZIP_MAGIC):
+                self._inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        if self._inflater is None:
+            return self._consume(data)
+        found: List[SitemapEntry] = []
+        while data and not self.truncated:
+            try:
+                plain = self._inflater.decompress(data, _INFLATE_STEP)
+            except zlib.error as exc:
+                logger.warning(f"Corrupt gzip sitemap stream: {exc}")
+                self.truncated = True
+                break
+            data = self._inflater.unconsumed_tail
+            found.extend(self._consume(plain))
+        return found
+
+    def close(self) -> List[SitemapEntry]:
+        """Flush buffered input and return the final records."""
+        if self._closed:
+            return []
+        found: List[SitemapEntry] = []
+        if self._head:
+            data, self._head = self._head, b""
+            found.extend(self._consume(data))
+        if self._inflater is not None and not self.truncated:
+            found.extend(self._consume(self._inflater.flush()))
+        if self._xml is not None:
+            try:
+                self._xml.close()
+            except etree.XMLSyntaxError:
+                pass
+            found.extend(self._drain())
+        if self._mode == "text" and self._line_tail:
+            found.extend(self._read_lines(self._line_tail))
+            self._line_tail = ""
+        if not self.entries and self._fallback:
+            found.extend(self._regex_fallback())
+        self._fallback = None
+        self._closed = True
+        return found
+
+    # -- internals -----------------------------------------------------------
+
+    def _consume(self, data: Union[str, bytes]) -> List[SitemapEntry]:
+        if not data:
+            return []
+        if self.bytes_out + len(data) > self.max_bytes:
+            data = data[: max(0, self.max_bytes - self.bytes_out)]
+            self.truncated = True
+            logger.warning(
+                f"Sitemap exceeds {self.max_bytes} bytes; ignoring the remainder."
+            )
+        self.bytes_out += len(data)
+        if self._fallback is not None:
+            if self.entries or self._fallback_size + len(data) > _FALLBACK_BUFFER_BYTES:
+                self._fallback = None
+            else:
+                self._fallback.append(data)
+                self._fallback_size += len(data)
+        if self._mode is None:
+            if isinstance(data, str):
+                sample = data.lstrip("\ufeff \t\r\n")
+                is_markup = sample.startswith("<")
+            else:
+                sample = data.lstrip(b"\xef\xbb\xbf \t\r\n")
+                is_markup = sample.startswith(b"<")
+            if not sample:
+                return []
+            self._mode = "xml" if is_markup else "text"
+            if self._mode == "xml":
+                self._xml = etree.XMLPullParser(
+                    events=("end",),
+                    tag=_EVENT_TAGS,
+                    recover=True,
+                    huge_tree=True,
+                    resolve_entities=False,
+                    no_network=True,
+                    remove_comments=True,
+                    remove_pis=True,
+                )
+            else:
+                self.kind = "text"
+        if self._mode == "text":
+            text = data if isinstance(data, str) else data.decode("utf-8", "replace")
+            text, _, self._line_tail = (self._line_tail + text).rpartition("\n")
+            return self._read_lines(text)
+        assert self._xml is not None
+        try:
+            self._xml.feed(data)
+        except etree.XMLSyntaxError as exc:
+            logger.debug(f"Sitemap XML error (recovering): {exc}")
+        return self._drain()
 
-    cleaned_urls = []
-    for raw in raw_matches:
-        cleaned = raw.strip()
+    def _drain(self) -> List[SitemapEntry]:
+        assert self._xml is not None
+        found: List[SitemapEntry] = []
+        for _, element in self._xml.read_events():
+            name = _local_name(element.tag)
+            if name in ("sitemapindex", "urlset") and self.kind == "unknown":
+                self.kind = "index" if name == "sitemapindex" else "urlset"
+            kind = _RECORD_TAGS.get(name)
+            if kind is None:
+                continue
+            entry = _read_record(element, kind)
+            # Free the record and everything parsed before it.
+            element.clear()
+            parent = element.getparent()
+            if parent is not None:
+                while element.getprevious() is not None:
+                    del parent[0]
+            if entry is not None:
+                if kind == "sitemap":
+                    self.kind = "index"
+                elif self.kind == "unknown":
+                    self.kind = "urlset"
+                found.append(entry)
+        self.entries += len(found)
+        return found
 
-        # Robustly remove CDATA wrapper if present (case insensitive)
-        if "<![CDATA[" in cleaned.upper():
-            # Use regex for case-insensitive replacement to be safe
-            cleaned = re.sub(r"<!\[CDATA\[", "", cleaned, flags=re.IGNORECASE)
-            cleaned = re.sub(r"\]\]>", "", cleaned, flags=re.IGNORECASE)
+    def _read_lines(self, text: str) -> List[SitemapEntry]:
+        found = [
+            SitemapEntry(loc=line.strip())
+            for line in text.splitlines()
+            if line.strip().lower().startswith(("http://", "https://"))
+        ]
+        self.entries += len(found)
+        return found
 
-        cleaned_urls.append(cleaned.strip())
+    def _regex_fallback(self) -> List[SitemapEntry]:
+        assert self._fallback is not None
+        content = "".join(
+            part if isinstance(part, str) else part.decode("utf-8", "replace")
+            for part in self._fallback
+        )
+        kind = "sitemap" if _ESCAPED_INDEX_RE.search(content) else "url"
+        found = []
+        for raw in _ESCAPED_LOC_RE.findall(content):
+            loc = _CDATA_RE.sub("", raw).strip()
+            if loc:
+                found.append(SitemapEntry(loc=loc, kind=kind))
+        if found:
+            self.kind = "index" if kind == "sitemap" else "urlset"
+        self.entries += len(found)
+        return found
 
-    return [u for u in cleaned_urls if u]
+
+def parse_sitemap_entries(
+    content: Union[str, bytes], max_bytes: int = MAX_SITEMAP_BYTES
+) -> Iterator[SitemapEntry]:
+    """
+    Parse a complete sitemap document (XML, gzip bytes, or plain text).
+    Records are yielded as the parser completes them.
+    """
+    parser = SitemapStreamParser(max_bytes=max_bytes)
+    step = 1024 * 1024
+    for start in range(0, len(content), step):
+        yield from parser.feed(content[start : start + step])
+    yield from parser.close()
+
+
+def parse_sitemap_urls(content: str) -> List[str]:
+    """
+    Extract URLs from sitemap content.
+    Handles <loc> records (urlset and sitemapindex), RSS <link>, CDATA,
+    gzip bytes, plain-text sitemaps and HTML-escaped XML from browser viewers.
+    """
+    return [entry.loc for entry in parse_sitemap_entries(content)]
@@ -13,6 +13,7 @@ from concurrent.futures import Future
 from threading import Thread
 from typing import Any, Coroutine, Optional, TypeVar
 
+from ...core.http_client import closing_shared_session
 from .detection import find_sitemap_urls
 from .fetching import extract_sitemap_tree, peek_sitemap_index
 
@@ -22,6 +23,8 @@ T = TypeVar("T")
 
 def _run_coro_sync(coro: Coroutine[Any, Any, T]) -> T:
     """Run coroutine from synchronous context without loop re-entrancy deadlocks."""
+    # Each call runs on a fresh loop; release that loop's pooled session.
+    coro = closing_shared_session(coro)
     try:
         asyncio.get_running_loop()
     except RuntimeError:
@@ -7,7 +7,10 @@ Expertly crafted for robust, secure, and high-performance proxy rotation and hop
 
 from .models import Proxy, ProxyStatus, ProxyProtocol
 from .config import ProxieConfig
-from .manager import ProxyManager, SecurityStopIteration
+from .manager import ProxyManager, SecurityStopIteration, ValidationStats
+from .pool import ProxyIndex
+from .scoring import ProxyScorer, TargetStats
+from .store import ProxyHealthStore
 
 __all__ = [
     "Proxy",
@@ -16,4 +19,9 @@ __all__ = [
     "ProxieConfig",
     "ProxyManager",
     "SecurityStopIteration",
+    "ValidationStats",
+    "ProxyIndex",
+    "ProxyScorer",
+    "TargetStats",
+    "ProxyHealthStore",
 ]
@@ -21,7 +21,7 @@ class ProxieConfig:
 
     # Manager Settings
     max_concurrent_checks: int = 50  # Speed of validation
-    rotation_strategy: str = "round_robin"  # or 'random', 'health_weighted'
+    rotation_strategy: str = "round_robin"  # or random/health_weighted/latency
 
     # Kill-Switch
     enforce_secure_ip: bool = True  # If True, stops if Real IP is detected
@@ -30,6 +30,23 @@ class ProxieConfig:
     max_retries: int = 3
     cooldown_seconds: int = 300  # Time to wait before retrying a 'COOLDOWN' proxy
 
+    # Background Revalidation (DEAD proxies are re-checked off the request path)
+    revalidation_interval_seconds: int = 60
+    revalidation_jitter: float = 0.2  # +/- fraction applied to each interval
+    revalidation_concurrency: int = 10
+
+    # Latency-aware routing (per target site)
+    latency_ewma_alpha: float = 0.3  # Weight of the newest sample
+    score_sample_size: int = 8  # Candidates compared per pick
+    domain_ban_seconds: int = 600  # First 403/429 ban on a site; doubles on repeat
+    max_domain_ban_seconds: int = 3600
+    affinity_ttl_seconds: int = 300  # Sticky proxy per site (0 disables)
+    affinity_max_requests: int = 50  # Re-pick after N uses (0 = no cap)
+
+    # Persistent Health (empty path disables; see ProxyHealthStore)
+    health_store_path: str = ""
+    health_ttl_seconds: int = 3600  # Re-validate only proxies older than this
+
     @classmethod
     def from_dict(cls, data: dict) -> "ProxieConfig":
         """Creates a config object from a dictionary, using defaults for missing keys."""
@@ -41,6 +58,19 @@ class ProxieConfig:
             enforce_secure_ip=data.get("enforce_secure_ip", True),
             max_retries=int(data.get("max_retries", 3)),
             cooldown_seconds=int(data.get("cooldown_seconds", 300)),
+            revalidation_interval_seconds=int(
+                data.get("revalidation_interval_seconds", 60)
+            ),
+            revalidation_jitter=float(data.get("revalidation_jitter", 0.2)),
+            revalidation_concurrency=int(data.get("revalidation_concurrency", 10)),
+            latency_ewma_alpha=float(data.get("latency_ewma_alpha", 0.3)),
+            score_sample_size=int(data.get("score_sample_size", 8)),
+            domain_ban_seconds=int(data.get("domain_ban_seconds", 600)),
+            max_domain_ban_seconds=int(data.get("max_domain_ban_seconds", 3600)),
+            affinity_ttl_seconds=int(data.get("affinity_ttl_seconds", 300)),
+            affinity_max_requests=int(data.get("affinity_max_requests", 50)),
+            health_store_path=str(data.get("health_store_path", "") or ""),
+            health_ttl_seconds=int(data.get("health_ttl_seconds", 3600)),
         )
 
     def to_dict(self) -> dict:
@@ -53,6 +83,17 @@ class ProxieConfig:
             "enforce_secure_ip": self.enforce_secure_ip,
             "max_retries": self.max_retries,
             "cooldown_seconds": self.cooldown_seconds,
+            "revalidation_interval_seconds": self.revalidation_interval_seconds,
+            "revalidation_jitter": self.revalidation_jitter,
+            "revalidation_concurrency": self.revalidation_concurrency,
+            "latency_ewma_alpha": self.latency_ewma_alpha,
+            "score_sample_size": self.score_sample_size,
+            "domain_ban_seconds": self.domain_ban_seconds,
+            "max_domain_ban_seconds": self.max_domain_ban_seconds,
+            "affinity_ttl_seconds": self.affinity_ttl_seconds,
+            "affinity_max_requests": self.affinity_max_requests,
+            "health_store_path": self.health_store_path,
+            "health_ttl_seconds": self.health_ttl_seconds,
         }
 
     def __str__(self) -> str:
@@ -66,5 +107,12 @@ class ProxieConfig:
             f"  Kill-Switch: {'ENABLED' if self.enforce_secure_ip else 'DISABLED'}\n"
             f"  Max Retries: {self.max_retries}\n"
             f"  Cooldown: {self.cooldown_seconds}s\n"
+            f"  Revalidation: every {self.revalidation_interval_seconds}s "
+            f"(x{self.revalidation_concurrency})\n"
+            f"  Site Affinity: {self.affinity_ttl_seconds}s / "
+            f"{self.affinity_max_requests} requests\n"
+            f"  Site Ban: {self.domain_ban_seconds}s\n"
+            f"  Health Store: {self.health_store_path or 'DISABLED'} "
+            f"(TTL {self.health_ttl_seconds}s)\n"
             f")"
         )
@@ -4,15 +4,33 @@ Proxy Manager.
 
 Handles the lifecycle, rotation, and validation of proxies.
 Includes a Kill-Switch to prevent IP leaks.
+
+Background work runs in at most two tasks per manager: a cooldown scheduler
+driven by a min-heap of expiries, and a jittered revalidation loop for DEAD
+proxies. Selection never waits on either.
+
+When the caller passes the target URL, selection is site-aware: proxies banned
+for that site are skipped, a sticky proxy is reused per site, and new picks go
+to the lowest expected latency (see ProxyScorer).
+
+With `health_store_path` set, learned state is restored as proxies are loaded
+and saved after validation passes and on close, so startup only re-validates
+proxies whose last check is older than `health_ttl_seconds`.
+
+Validation streams through a fixed worker pool (no chunk barriers) and each
+proxy joins the active set the moment it passes; per-check timings feed the
+scorer and the cumulative `validation_stats`.
 """
 
 import logging
 import asyncio
 import aiohttp
+import heapq
 import json
 import random
 import time
-from typing import List, Optional
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
 from aiohttp_socks import (
     ProxyConnector,
     ProxyType,
@@ -20,9 +38,13 @@ from aiohttp_socks import (
     ProxyTimeoutError,
     ProxyConnectionError,
 )
+from yarl import URL
 
 from .models import Proxy, ProxyStatus, ProxyProtocol
 from .config import ProxieConfig
+from .pool import ProxyIndex
+from .scoring import ProxyScorer, domain_key
+from .store import ProxyHealthStore
 
 logger = logging.getLogger(__name__)
 
@@ -33,27 +55,181 @@ class SecurityStopIteration(Exception):
     pass
 
 
+@dataclass
+class ValidationStats:
+    """Timing totals for proxy validation checks."""
+
+    checked: int = 0
+    passed: int = 0
+    failed: int = 0
+    total_check_ms: float = 0.0
+    slowest_check_ms: float = 0.0
+    wall_ms: float = 0.0
+
+    @property
+    def mean_check_ms(self) -> float:
+        return self.total_check_ms / self.checked if self.checked else 0.0
+
+    def add_check(self, ok: bool, elapsed_ms: float) -> None:
+        self.checked += 1
+        if ok:
+            self.passed += 1
+        else:
+            self.failed += 1
+        self.total_check_ms += elapsed_ms
+        self.slowest_check_ms = max(self.slowest_check_ms, elapsed_ms)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["mean_check_ms"] = round(self.mean_check_ms, 1)
+        return data
+
+
 class ProxyManager:
     def __init__(self, config: ProxieConfig, proxies: Optional[List[Proxy]] = None):
         self.config = config
         self.proxies: List[Proxy] = proxies or []
         self._lock = asyncio.Lock()
-        self._current_index = 0
-        self._last_revival_time: float = 0.0
+        # Active set maintained on status transitions (no per-call pool scans)
+        self._index = ProxyIndex(self.proxies)
+        self._indexed_count = len(self.proxies)
+        self._dead: Dict[int, Proxy] = {}  # id(proxy) -> proxy awaiting revival
+        for proxy in self.proxies:
+            self._track_dead(proxy)
+
+        # Cooldown min-heap of (expires_at, seq, proxy); one scheduler task drains it
+        self._cooldowns: List[Tuple[float, int, Proxy]] = []
+        self._cooldown_until: Dict[int, float] = {}
+        self._cooldown_seq = 0
+        self._cooldown_wakeup = asyncio.Event()
+        self._cooldown_task: Optional[asyncio.Task] = None
+
+        self._revalidate_now = asyncio.Event()
+        self._revalidation_task: Optional[asyncio.Task] = None
+
+        self.validation_stats = ValidationStats()  # Cumulative across passes
+        self._last_check_ms: Dict[int, float] = {}
+        self._validation_task: Optional[asyncio.Task] = None
+        self._has_active = asyncio.Event()
+
+        self.scorer = ProxyScorer(
+            alpha=config.latency_ewma_alpha,
+            ban_seconds=config.domain_ban_seconds,
+            max_ban_seconds=config.max_domain_ban_seconds,
+            affinity_ttl_seconds=config.affinity_ttl_seconds,
+            affinity_max_requests=config.affinity_max_requests,
+        )
+
+        self.health_store: Optional[ProxyHealthStore] = (
+            ProxyHealthStore(config.health_store_path)
+            if config.health_store_path
+            else None
+        )
+        if self.proxies:
+            self._restore_health(self.proxies)
 
         self._real_ip: Optional[str] = None
 
-    async def initialize(self) -> None:
+    async def initialize(self, wait_for_all: bool = True) -> None:
         """
         Initializes the manager:
         1. Determines Real IP (if enforcement is on).
-        2. Validates initial proxy pool.
+        2. Validates proxies with no fresh health record (all, without a store).
+
+        Args:
+            wait_for_all: If False, return as soon as one proxy is ACTIVE and
+                let the rest of the validation pass continue in the background.
         """
         if self.config.enforce_secure_ip:
             await self._determine_real_ip()
 
-        if self.proxies:
-            await self.validate_all()
+        stale = self.stale_proxies()
+        if not stale:
+            if self.proxies:
+                logger.info(
+                    f"All {len(self.proxies)} proxies have fresh health records; "
+                    "skipping startup validation."
+                )
+            self.save_health()
+        elif wait_for_all:
+            await self.validate_all(stale)
+            self.save_health()
+        else:
+            self._validation_task = asyncio.create_task(self._validate_and_save(stale))
+            self._validation_task.add_done_callback(self._log_validation_failure)
+            first_active = asyncio.ensure_future(self._has_active.wait())
+            try:
+                await asyncio.wait(
+                    {self._validation_task, first_active},
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+            finally:
+                first_active.cancel()
+            if self._validation_task.done():
+                self._validation_task.result()  # Surface Kill-Switch stops
+        self._ensure_background_tasks()
+
+    async def _validate_and_save(self, proxies: List[Proxy]) -> None:
+        await self.validate_all(proxies)
+        self.save_health()
+
+    @staticmethod
+    def _log_validation_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.critical(f"Background proxy validation stopped: {task.exception()}")
+
+    def stale_proxies(self, now: Optional[float] = None) -> List[Proxy]:
+        """Proxies never validated or last validated over `health_ttl_seconds` ago."""
+        now = time.time() if now is None else now
+        ttl = self.config.health_ttl_seconds
+        return [
+            p
+            for p in self.proxies
+            if p.status == ProxyStatus.UNTESTED
+            or (p.status != ProxyStatus.COOLDOWN and now - p.last_validated_ts > ttl)
+        ]
+
+    def _restore_health(self, proxies: List[Proxy]) -> None:
+        if self.health_store is None:
+            return
+        cooldowns = self.health_store.restore(proxies, self.scorer)
+        now = time.time()
+        for proxy in proxies:
+            if id(proxy) in cooldowns:
+                self._schedule_cooldown(proxy, cooldowns[id(proxy)] - now)
+            self._sync(proxy)
+
+    def save_health(self) -> None:
+        """Persist learned proxy state (no-op without a health store)."""
+        if self.health_store is None:
+            return
+        offset = time.time() - time.monotonic()
+        cooldown_until = {
+            key: expires_at + offset for key, expires_at in self._cooldown_until.items()
+        }
+        try:
+            self.health_store.save(self.proxies, self.scorer, cooldown_until)
+        except OSError as e:
+            logger.warning(f"Failed to save proxy health store: {e}")
+
+    async def close(self) -> None:
+        """Stops background tasks and persists proxy health."""
+        tasks = [
+            t
+            for t in (
+                self._cooldown_task,
+                self._revalidation_task,
+                self._validation_task,
+            )
+            if t is not None
+        ]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._cooldown_task = None
+        self._revalidation_task = None
+        self._validation_task = None
+        self.save_health()
 
     async def _determine_real_ip(self) -> None:
         """Fetches the machine's real IP address for the Kill-Switch."""
@@ -80,55 +256,84 @@ class ProxyManager:
                 "Could not determine Real IP. Aborting for safety."
             )
 
-    async def validate_proxy(self, proxy: Proxy) -> bool:
+    def reindex(self) -> None:
+        """Rebuild the active index after bulk external changes to `proxies`."""
+        self._index.rebuild(self.proxies)
+        self._dead = {}
+        for proxy in self.proxies:
+            self._track_dead(proxy)
+        self._indexed_count = len(self.proxies)
+
+    def _track_dead(self, proxy: Proxy) -> None:
+        if proxy.status == ProxyStatus.DEAD:
+            self._dead[id(proxy)] = proxy
+        else:
+            self._dead.pop(id(proxy), None)
+
+    def _sync(self, proxy: Proxy) -> None:
+        """Propagates a status/health change to the active index and dead set."""
+        self._index.sync(proxy)
+        self._track_dead(proxy)
+        if proxy.status == ProxyStatus.ACTIVE:
+            self._has_active.set()
+
+    async def validate_proxy(
+        self, proxy: Proxy, session: Optional[aiohttp.ClientSession] = None
+    ) -> bool:
         """
         Validates a single proxy.
         Checks connection and ensures IP is not the Real IP.
-        """
-        connector = ProxyConnector(
-            proxy_type=ProxyType.SOCKS5
-            if proxy.protocol == ProxyProtocol.SOCKS5
-            else ProxyType.HTTP,
-            host=proxy.hostname,
-            port=proxy.port,
-            username=proxy.username,
-            password=proxy.password,
-            rdns=True,
-        )
 
+        Args:
+            session: Optional shared session reused for HTTP(S) proxies.
+        """
+        started = time.perf_counter()
+        ok = False
         try:
-            start_time = time.time()
-            async with aiohttp.ClientSession(connector=connector) as session:
-                async with session.get(
-                    self.config.validation_url,
-                    timeout=aiohttp.ClientTimeout(total=self.config.timeout_seconds),
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        remote_ip = data.get("origin", "").split(",")[0].strip()
-
-                        if self.config.enforce_secure_ip and remote_ip == self._real_ip:
-                            proxy.status = ProxyStatus.LEAKING
-                            proxy.health_score = 0.0
-                            logger.critical(
-                                f"KILL-SWITCH: Proxy {proxy.hostname} leaked Real IP! Banning."
-                            )
-                            return False
-
-                        proxy.status = ProxyStatus.ACTIVE
-                        latency = (time.time() - start_time) * 1000
-                        # Simple health update: reduce score if slow (> 2000ms)
-                        proxy.health_score = max(
-                            0.0, 100.0 - (max(0, latency - 500) / 50)
-                        )
-                        logger.debug(
-                            f"Proxy {proxy.hostname} Valid. IP: {remote_ip}. Latency: {latency:.0f}ms"
-                        )
-                        return True
-                    else:
-                        proxy.status = ProxyStatus.DEAD
-                        proxy.health_score -= 10
-                        return False
+            ok = await self._check_proxy(proxy, session)
+            return ok
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            proxy.last_validated_ts = time.time()
+            self.validation_stats.add_check(ok, elapsed_ms)
+            self._last_check_ms[id(proxy)] = elapsed_ms
+            self.scorer.record(proxy, ok, latency_ms=elapsed_ms if ok else None)
+            self._sync(proxy)
+
+    async def _check_proxy(
+        self, proxy: Proxy, session: Optional[aiohttp.ClientSession] = None
+    ) -> bool:
+        try:
+            if session is not None and proxy.protocol in (
+                ProxyProtocol.HTTP,
+                ProxyProtocol.HTTPS,
+            ):
+                # HTTP proxies ride the shared session; SOCKS needs its own connector.
+                # Credentials in the proxy URL become Proxy-Authorization for
+                # both plain and CONNECT requests.
+                request_kwargs: Dict[str, Any] = {
+                    "proxy": URL.build(
+                        scheme=proxy.protocol.value,
+                        host=proxy.hostname,
+                        port=proxy.port,
+                        user=proxy.username or None,
+                        password=proxy.password if proxy.username else None,
+                    )
+                }
+                return await self._probe_proxy(proxy, session, request_kwargs)
+
+            connector = ProxyConnector(
+                proxy_type=ProxyType.SOCKS5
+                if proxy.protocol == ProxyProtocol.SOCKS5
+                else ProxyType.HTTP,
+                host=proxy.hostname,
+                port=proxy.port,
+                username=proxy.username,
+                password=proxy.password,
+                rdns=True,
+            )
+            async with aiohttp.ClientSession(connector=connector) as own_session:
+                return await self._probe_proxy(proxy, own_session)
 
         except (ProxyError, ProxyConnectionError, ProxyTimeoutError) as e:
             proxy.status = ProxyStatus.DEAD
@@ -140,18 +345,106 @@ class ProxyManager:
             logger.debug(f"Proxy {proxy.hostname} Unexpected Error: {e}")
             return False
 
-    async def validate_all(self) -> None:
-        """Validates all proxies concurrently."""
-        logger.info(f"Validating {len(self.proxies)} proxies...")
-        tasks = [self.validate_proxy(p) for p in self.proxies]
-        # Chunk tasks to respect max_concurrent_checks
-        for i in range(0, len(tasks), self.config.max_concurrent_checks):
-            chunk = tasks[i : i + self.config.max_concurrent_checks]
-            await asyncio.gather(*chunk)
+    async def _probe_proxy(
+        self,
+        proxy: Proxy,
+        session: aiohttp.ClientSession,
+        request_kwargs: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        start_time = time.time()
+        async with session.get(
+            self.config.validation_url,
+            timeout=aiohttp.ClientTimeout(total=self.config.timeout_seconds),
+            **(request_kwargs or {}),
+        ) as response:
+            if response.status == 200:
+                data = await response.json()
+                remote_ip = data.get("origin", "").split(",")[0].strip()
+
+                if self.config.enforce_secure_ip and remote_ip == self._real_ip:
+                    proxy.status = ProxyStatus.LEAKING
+                    proxy.health_score = 0.0
+                    logger.critical(
+                        f"KILL-SWITCH: Proxy {proxy.hostname} leaked Real IP! Banning."
+                    )
+                    return False
+
+                proxy.status = ProxyStatus.ACTIVE
+                latency = (time.time() - start_time) * 1000
+                # Simple health update: reduce score if slow (> 2000ms)
+                proxy.health_score = max(0.0, 100.0 - (max(0, latency - 500) / 50))
+                logger.debug(
+                    f"Proxy {proxy.hostname} Valid. IP: {remote_ip}. Latency: {latency:.0f}ms"
+                )
+                return True
+            else:
+                proxy.status = ProxyStatus.DEAD
+                proxy.health_score -= 10
+                return False
+
+    async def iter_validate(
+        self,
+        proxies: Optional[Iterable[Proxy]] = None,
+        concurrency: Optional[int] = None,
+    ) -> AsyncIterator[Tuple[Proxy, bool]]:
+        """
+        Validate proxies with a fixed worker pool, yielding each as it finishes.
+
+        Workers pull the next proxy as soon as they are free, so one slow check
+        never holds up the others, and a passing proxy is selectable before
+        this yields it. HTTP(S) proxies share one session for the whole pass.
+        """
+        targets = list(self.proxies if proxies is None else proxies)
+        if not targets:
+            return
+        limit = concurrency or self.config.max_concurrent_checks
+        pending = iter(targets)
+        finished: asyncio.Queue = asyncio.Queue()
+
+        async with aiohttp.ClientSession() as session:
+
+            async def worker() -> None:
+                for proxy in pending:  # Shared iterator: continuous refill
+                    ok = False
+                    try:
+                        ok = await self.validate_proxy(proxy, session)
+                    finally:
+                        finished.put_nowait((proxy, ok))
+
+            workers = [
+                asyncio.ensure_future(worker())
+                for _ in range(max(1, min(limit, len(targets))))
+            ]
+            try:
+                for _ in range(len(targets)):
+                    yield await finished.get()
+            finally:
+                for task in workers:
+                    task.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+
+    async def validate_all(
+        self, proxies: Optional[List[Proxy]] = None
+    ) -> ValidationStats:
+        """
+        Validates all proxies (or the given subset) concurrently.
+
+        Wall time is roughly total check time / max_concurrent_checks. Returns
+        this pass's timings; `validation_stats` accumulates across passes.
+        """
+        targets = self.proxies if proxies is None else proxies
+        logger.info(f"Validating {len(targets)} proxies...")
+        stats = ValidationStats()
+        started = time.perf_counter()
+        async for proxy, ok in self.iter_validate(targets):
+            stats.add_check(ok, self._last_check_ms.get(id(proxy), 0.0))
+        stats.wall_ms = (time.perf_counter() - started) * 1000
+        self.validation_stats.wall_ms += stats.wall_ms
 
         active_count = sum(1 for p in self.proxies if p.status == ProxyStatus.ACTIVE)
         logger.info(
-            f"Validation Complete. {active_count}/{len(self.proxies)} Proxies Active."
+            f"Validation Complete. {active_count}/{len(self.proxies)} Proxies Active "
+            f"({stats.wall_ms:.0f}ms wall, {stats.mean_check_ms:.0f}ms mean check)."
         )
 
         if active_count == 0:
@@ -162,6 +455,7 @@ class ProxyManager:
                     "ALL proxies are either Dead or Leaking. Halting."
                 )
             # If just dead, we might not raise SecurityStopIteration yet, but get_next will fail.
+        return stats
 
     def load_proxies_from_json(self, file_path: str) -> None:
         """Loads proxies from a JSON file."""
@@ -185,96 +479,214 @@ class ProxyManager:
                         )
                     )
                 self.proxies.extend(new_proxies)
+                self._restore_health(new_proxies)
+                for proxy in new_proxies:
+                    self._sync(proxy)
+                self._indexed_count = len(self.proxies)
                 logger.info(f"Loaded {len(new_proxies)} proxies from {file_path}")
         except Exception as e:
             logger.error(f"Failed to load proxies from {file_path}: {e}")
 
-    async def get_next_proxy(self) -> Proxy:
+    async def get_next_proxy(self, url: Optional[str] = None) -> Proxy:
         """
         Gets the next active proxy based on rotation strategy.
-        Thread-safe (async lock).
+        Thread-safe (async lock). Never waits on validation: when the pool is
+        exhausted, revival is scheduled in the background and this raises.
+
+        Args:
+            url: Optional fetch target. When given, the pick is sticky per
+                site, skips proxies banned there, and favors low latency.
         """
         async with self._lock:
-            active_proxies = [p for p in self.proxies if p.status == ProxyStatus.ACTIVE]
+            if len(self.proxies) != self._indexed_count:
+                self.reindex()  # Pool was extended directly
+            if self._cooldowns and self._cooldown_task is None:
+                self._ensure_background_tasks()  # Restored before a loop existed
 
-            if not active_proxies:
-                # Hail Mary: Try to revive dead proxies if we haven't tried recently (e.g. last 60s)
-                # or just try once per exhaustion event.
-                if time.time() - self._last_revival_time > 60:
+            if url:
+                proxy = self._select_for_url(url)
+            else:
+                proxy = self._select_proxy()
+            if proxy is None and url and len(self._index):
+                raise SecurityStopIteration(
+                    f"All active proxies are banned for {domain_key(url)}."
+                )
+            if proxy is None:
+                if self._dead:
                     logger.warning(
-                        "No active proxies! Attempting to revive DEAD proxies..."
+                        "No active proxies! Scheduling background revival of "
+                        f"{len(self._dead)} DEAD proxies."
                     )
-                    await self._attempt_revival()
-                    active_proxies = [
-                        p for p in self.proxies if p.status == ProxyStatus.ACTIVE
-                    ]
-                    self._last_revival_time = time.time()
-
-                if not active_proxies:
-                    raise SecurityStopIteration(
-                        "No active proxies available (Revival failed)."
-                    )
-
-            if self.config.rotation_strategy == "random":
-                return random.choice(active_proxies)
-            elif self.config.rotation_strategy == "health_weighted":
-                # Basic weighted random
-                total_health = sum(p.health_score for p in active_proxies)
-                if total_health == 0:
-                    return random.choice(active_proxies)
-                pick = random.uniform(0, total_health)
-                current = 0.0
-                for p in active_proxies:
-                    current += p.health_score
-                    if current >= pick:
-                        return p
-                return active_proxies[-1]
-            else:  # Round Robin
-                # Find current index in active list
-                proxy = active_proxies[self._current_index % len(active_proxies)]
-                self._current_index += 1
-                return proxy
+                    self._revalidate_now.set()
+                    self._ensure_background_tasks()
+                raise SecurityStopIteration(
+                    "No active proxies available (revival scheduled)."
+                )
+            return proxy
+
+    def _select_proxy(self) -> Optional[Proxy]:
+        """O(1) round-robin/random or O(log n) health-weighted pick."""
+        if self.config.rotation_strategy == "random":
+            return self._index.next_random()
+        elif self.config.rotation_strategy == "health_weighted":
+            return self._index.next_weighted()
+        elif self.config.rotation_strategy == "latency":
+            return self.scorer.best(self._index.sample(self.config.score_sample_size))
+        else:  # Round Robin
+            return self._index.next_round_robin()
+
+    def _select_for_url(self, url: str) -> Optional[Proxy]:
+        """Sticky, ban-aware, lowest-expected-latency pick for one site."""
+        now = time.time()
+        pinned = self.scorer.sticky(url, now)
+        if (
+            pinned is not None
+            and pinned.status == ProxyStatus.ACTIVE
+            and not self.scorer.is_banned(pinned, url, now)
+        ):
+            return pinned
+
+        # Best of a small random sample keeps picks O(k) on large pools.
+        proxy = self.scorer.best(
+            self._index.sample(self.config.score_sample_size), url, now
+        )
+        if proxy is None and len(self._index) > self.config.score_sample_size:
+            proxy = self.scorer.best(self._index.active, url, now)  # Sample all banned
+        if proxy is not None:
+            self.scorer.pin(url, proxy, now)
+        return proxy
 
     def report_status(
-        self, proxy: Proxy, success: bool, status_code: Optional[int] = None
+        self,
+        proxy: Proxy,
+        success: bool,
+        status_code: Optional[int] = None,
+        *,
+        url: Optional[str] = None,
+        latency_ms: Optional[float] = None,
     ) -> None:
-        """Updates proxy health based on request outcome."""
+        """
+        Updates proxy health based on request outcome.
+
+        With `url`, a 403/429 bans the proxy for that site only (instead of a
+        global cooldown) and latency/success feed the per-site scores.
+        """
         proxy.total_calls += 1
         proxy.last_used_ts = time.time()
+        self.scorer.record(
+            proxy,
+            success,
+            latency_ms=latency_ms,
+            url=url,
+            status_code=status_code,
+            now=proxy.last_used_ts,
+        )
 
         if success:
             proxy.health_score = min(100.0, proxy.health_score + 1)
         else:
             proxy.failed_calls += 1
-            if status_code == 403 or status_code == 429:
+            if url and status_code in (403, 429):
+                logger.warning(
+                    f"Proxy {proxy.hostname} banned for {domain_key(url)} "
+                    f"(Status {status_code})"
+                )
+            elif status_code == 403 or status_code == 429:
                 proxy.status = ProxyStatus.COOLDOWN
                 logger.warning(
                     f"Proxy {proxy.hostname} cooling down (Status {status_code})"
                 )
-                # Scheduled task to re-activate could go here,
-                # for now rely on re-validation or manual reset if needed.
-                # Ideally we spawn a background timer to reset it.
-                asyncio.create_task(self._cooldown_timer(proxy))
+                self._schedule_cooldown(proxy)
             else:
                 proxy.health_score -= 5
                 if proxy.health_score < 30:
                     proxy.status = ProxyStatus.DEAD
+        self._sync(proxy)
 
-    async def _cooldown_timer(self, proxy: Proxy) -> None:
-        await asyncio.sleep(self.config.cooldown_seconds)
-        async with self._lock:
+    def _ensure_background_tasks(self) -> None:
+        """Starts the scheduler/revalidation tasks if a loop is running."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._cooldown_task is None or self._cooldown_task.done():
+            self._cooldown_task = loop.create_task(self._cooldown_scheduler())
+        if self._revalidation_task is None or self._revalidation_task.done():
+            self._revalidation_task = loop.create_task(self._revalidation_loop())
+
+    def _schedule_cooldown(self, proxy: Proxy, seconds: Optional[float] = None) -> None:
+        if seconds is None:
+            seconds = self.config.cooldown_seconds
+        expires_at = time.monotonic() + max(0.0, seconds)
+        self._cooldown_seq += 1
+        # A repeat cooldown supersedes the earlier heap entry (left stale).
+        self._cooldown_until[id(proxy)] = expires_at
+        heapq.heappush(self._cooldowns, (expires_at, self._cooldown_seq, proxy))
+        self._cooldown_wakeup.set()
+        self._ensure_background_tasks()
+
+    def _release_due_cooldowns(self, now: float) -> None:
+        while self._cooldowns and self._cooldowns[0][0] <= now:
+            expires_at, _, proxy = heapq.heappop(self._cooldowns)
+            if self._cooldown_until.get(id(proxy)) != expires_at:
+                continue  # Superseded by a later cooldown
+            del self._cooldown_until[id(proxy)]
+            if proxy.status != ProxyStatus.COOLDOWN:
+                continue  # Changed state meanwhile (e.g. leak/dead)
             proxy.status = ProxyStatus.ACTIVE
             proxy.health_score = 50.0  # Reset to mid health
+            self._sync(proxy)
             logger.info(f"Proxy {proxy.hostname} returned from cooldown.")
 
-    async def _attempt_revival(self) -> None:
-        """Resets DEAD proxies to UNTESTED and triggers validation."""
-        dead_proxies = [p for p in self.proxies if p.status == ProxyStatus.DEAD]
-        if not dead_proxies:
-            return
+    async def _cooldown_scheduler(self) -> None:
+        """Single task that reactivates proxies as their cooldowns expire."""
+        while True:
+            self._cooldown_wakeup.clear()
+            self._release_due_cooldowns(time.monotonic())
+            timeout = (
+                max(0.0, self._cooldowns[0][0] - time.monotonic())
+                if self._cooldowns
+                else None
+            )
+            try:
+                await asyncio.wait_for(self._cooldown_wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
 
-        for p in dead_proxies:
-            p.status = ProxyStatus.UNTESTED
+    async def revalidate_dead(self) -> int:
+        """
+        Re-checks DEAD proxies with bounded concurrency.
 
-        logger.info(f"Reviving {len(dead_proxies)} dead proxies for re-validation.")
-        await self.validate_all()
+        Returns the number of proxies that came back ACTIVE.
+        """
+        candidates = list(self._dead.values())
+        if not candidates:
+            return 0
+        logger.info(f"Revalidating {len(candidates)} dead proxies in background.")
+        revived = 0
+        async for _, ok in self.iter_validate(
+            candidates, concurrency=max(1, self.config.revalidation_concurrency)
+        ):
+            revived += ok
+        if revived:
+            logger.info(f"Revived {revived}/{len(candidates)} proxies.")
+        return revived
+
+    async def _revalidation_loop(self) -> None:
+        """Jittered periodic revival; woken early when the pool runs dry."""
+        while True:
+            interval = self.config.revalidation_interval_seconds
+            jitter = max(0.0, min(1.0, self.config.revalidation_jitter))
+            delay = interval * random.uniform(1.0 - jitter, 1.0 + jitter)
+            try:
+                await asyncio.wait_for(self._revalidate_now.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            self._revalidate_now.clear()
+            try:
+                if await self.revalidate_dead():
+                    self.save_health()
+            except SecurityStopIteration as e:
+                logger.critical(f"Security Stop during revalidation: {e}")
+            except Exception as e:
+                logger.error(f"Proxy revalidation pass failed: {e}")
@@ -40,6 +40,12 @@ class Proxy:
     total_calls: int = 0
     failed_calls: int = 0
     last_used_ts: float = 0.0
+    last_validated_ts: float = 0.0
+
+    # Observed performance (EWMA over validation and real requests)
+    latency_ewma_ms: float = 0.0
+    latency_samples: int = 0
+    success_ewma: float = 1.0
 
     @property
     def url(self) -> str:
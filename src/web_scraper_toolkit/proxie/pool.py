@@ -0,0 +1,194 @@
+# ./src/web_scraper_toolkit/proxie/pool.py
+"""
+Indexed active-proxy set for constant-time rotation and log-time weighted picks.
+Used by ProxyManager so selection cost does not grow with the pool size.
+Run: imported as a library module; not a direct CLI entry point.
+Inputs: Proxy objects and their status/health transitions.
+Outputs: round-robin, uniform-random, and health-weighted proxy selections.
+Side effects: none beyond in-memory index state.
+Operational notes: the active set is a dense array with swap-remove, and
+weights live in a Fenwick tree aligned with that array, so add/remove/reweight
+are O(log n) and selection never scans the pool.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Dict, List, Optional
+
+from .models import Proxy, ProxyStatus
+
+
+class _FenwickTree:
+    """Binary indexed tree of non-negative float weights."""
+
+    __slots__ = ("_tree", "_values")
+
+    def __init__(self, capacity: int = 16) -> None:
+        self._tree: List[float] = [0.0] * (capacity + 1)
+        self._values: List[float] = [0.0] * capacity
+
+    @property
+    def capacity(self) -> int:
+        return len(self._values)
+
+    def grow(self, capacity: int) -> None:
+        values = self._values + [0.0] * (capacity - len(self._values))
+        self._values = values
+        # O(n) rebuild: push each node's sum to its parent once.
+        tree = [0.0] + list(values)
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def set(self, index: int, value: float) -> None:
+        delta = value - self._values[index]
+        if delta == 0.0:
+            return
+        self._values[index] = value
+        i = index + 1
+        size = len(self._tree)
+        while i < size:
+            self._tree[i] += delta
+            i += i & -i
+
+    def get(self, index: int) -> float:
+        return self._values[index]
+
+    def total(self, count: int) -> float:
+        """Sum of the first `count` weights."""
+        result = 0.0
+        i = count
+        while i > 0:
+            result += self._tree[i]
+            i -= i & -i
+        return result
+
+    def find(self, target: float, count: int) -> int:
+        """Smallest index whose prefix sum exceeds `target` (clamped to count-1)."""
+        pos = 0
+        step = 1 << (len(self._tree) - 1).bit_length()
+        remaining = target
+        while step:
+            nxt = pos + step
+            if nxt < len(self._tree) and self._tree[nxt] <= remaining:
+                pos = nxt
+                remaining -= self._tree[nxt]
+            step >>= 1
+        return min(pos, count - 1)
+
+
+class ProxyIndex:
+    """
+    Incrementally maintained set of ACTIVE proxies.
+
+    Call `sync(proxy)` after any status or health change; selection methods
+    also drop entries that were deactivated behind the index's back.
+    """
+
+    def __init__(self, proxies: Optional[List[Proxy]] = None) -> None:
+        self._active: List[Proxy] = []
+        self._positions: Dict[int, int] = {}  # id(proxy) -> index in _active
+        self._weights = _FenwickTree()
+        self._cursor = 0
+        for proxy in proxies or []:
+            self.sync(proxy)
+
+    def __len__(self) -> int:
+        return len(self._active)
+
+    def __contains__(self, proxy: Proxy) -> bool:
+        return id(proxy) in self._positions
+
+    @property
+    def active(self) -> List[Proxy]:
+        """Snapshot of the active proxies (order is unspecified)."""
+        return list(self._active)
+
+    def rebuild(self, proxies: List[Proxy]) -> None:
+        """Re-index from scratch (e.g. after bulk external mutation)."""
+        self._active = []
+        self._positions = {}
+        self._weights = _FenwickTree()
+        for proxy in proxies:
+            self.sync(proxy)
+
+    @staticmethod
+    def _weight(proxy: Proxy) -> float:
+        return max(0.0, float(proxy.health_score))
+
+    def sync(self, proxy: Proxy) -> None:
+        """Reflect the proxy's current status and health in the index."""
+        if proxy.status == ProxyStatus.ACTIVE:
+            position = self._positions.get(id(proxy))
+            if position is None:
+                self._add(proxy)
+            else:
+                self._weights.set(position, self._weight(proxy))
+        else:
+            self._remove(proxy)
+
+    def _add(self, proxy: Proxy) -> None:
+        position = len(self._active)
+        if position >= self._weights.capacity:
+            self._weights.grow(max(16, self._weights.capacity * 2))
+        self._active.append(proxy)
+        self._positions[id(proxy)] = position
+        self._weights.set(position, self._weight(proxy))
+
+    def _remove(self, proxy: Proxy) -> None:
+        position = self._positions.pop(id(proxy), None)
+        if position is None:
+            return
+        last = len(self._active) - 1
+        if position != last:
+            moved = self._active[last]
+            self._active[position] = moved
+            self._positions[id(moved)] = position
+            self._weights.set(position, self._weights.get(last))
+        self._weights.set(last, 0.0)
+        self._active.pop()
+
+    def _checked(self, proxy: Proxy) -> bool:
+        if proxy.status == ProxyStatus.ACTIVE:
+            return True
+        self._remove(proxy)  # Deactivated without a sync() call
+        return False
+
+    def next_round_robin(self) -> Optional[Proxy]:
+        while self._active:
+            self._cursor %= len(self._active)
+            proxy = self._active[self._cursor]
+            self._cursor += 1
+            if self._checked(proxy):
+                return proxy
+        return None
+
+    def next_random(self) -> Optional[Proxy]:
+        while self._active:
+            proxy = random.choice(self._active)
+            if self._checked(proxy):
+                return proxy
+        return None
+
+    def sample(self, count: int) -> List[Proxy]:
+        """Up to `count` distinct active proxies chosen uniformly at random."""
+        if count >= len(self._active):
+            picks = list(self._active)
+        else:
+            picks = random.sample(self._active, count)
+        return [proxy for proxy in picks if self._checked(proxy)]
+
+    def next_weighted(self) -> Optional[Proxy]:
+        """Pick with probability proportional to health_score."""
+        while self._active:
+            count = len(self._active)
+            total = self._weights.total(count)
+            if total <= 0.0:
+                return self.next_random()
+            proxy = self._active[self._weights.find(random.uniform(0.0, total), count)]
+            if self._checked(proxy):
+                return proxy
+        return None
@@ -0,0 +1,208 @@
+# ./src/web_scraper_toolkit/proxie/scoring.py
+"""
+Latency-aware proxy scoring with per-target ban state and sticky host affinity.
+Used by ProxyManager to route a fetch to the proxy with the best expected
+latency for the target site instead of rotating blindly.
+Run: imported as a library module; not a direct CLI entry point.
+Inputs: per-request outcomes (latency, success, status code) keyed by proxy
+and target URL.
+Outputs: expected-cost estimates, domain ban checks, and affinity lookups.
+Side effects: none beyond in-memory statistics.
+Operational notes: targets are keyed by registrable domain (eTLD+1) so a ban
+on one subdomain covers its siblings; statistics are exponentially weighted
+moving averages so old observations fade without storing history.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .models import Proxy
+
+# Expected latency assumed for a proxy/site pair with no observations yet.
+_DEFAULT_LATENCY_MS = 1000.0
+_MIN_SUCCESS_RATE = 0.05
+
+
+@lru_cache(maxsize=4096)
+def domain_key(url: str) -> str:
+    """Registrable domain for a URL or host (the unit of ban state)."""
+    from ..browser.domain_identity import registrable_domain
+
+    return registrable_domain(url)
+
+
+def proxy_key(proxy: Proxy) -> str:
+    """Stable identity for a proxy (protocol, endpoint, and user)."""
+    user = f"{proxy.username}@" if proxy.username else ""
+    return f"{proxy.protocol.value}://{user}{proxy.hostname}:{proxy.port}"
+
+
+@dataclass
+class TargetStats:
+    """EWMA outcome statistics for one (proxy, domain) pair."""
+
+    latency_ms: float = 0.0
+    success_rate: float = 1.0
+    samples: int = 0
+    banned_until: float = 0.0
+    bans: int = 0
+
+
+@dataclass
+class _Affinity:
+    proxy: Proxy
+    expires_at: float
+    uses: int = 0
+
+
+class ProxyScorer:
+    """
+    Tracks observed proxy performance and picks the best proxy per target.
+
+    Expected cost is latency divided by success rate, i.e. the expected time
+    to a successful response when failures are retried.
+    """
+
+    def __init__(
+        self,
+        alpha: float = 0.3,
+        ban_seconds: float = 600.0,
+        max_ban_seconds: float = 3600.0,
+        affinity_ttl_seconds: float = 300.0,
+        affinity_max_requests: int = 50,
+    ) -> None:
+        self.alpha = min(1.0, max(0.01, float(alpha)))
+        self.ban_seconds = max(0.0, float(ban_seconds))
+        self.max_ban_seconds = max(self.ban_seconds, float(max_ban_seconds))
+        self.affinity_ttl_seconds = max(0.0, float(affinity_ttl_seconds))
+        self.affinity_max_requests = max(0, int(affinity_max_requests))
+        self._targets: Dict[str, Dict[str, TargetStats]] = {}  # proxy -> domain
+        self._affinity: Dict[str, _Affinity] = {}
+
+    def _ewma(self, current: float, sample: float, samples: int) -> float:
+        if samples == 0:
+            return sample
+        return current + self.alpha * (sample - current)
+
+    def target_stats(self, proxy: Proxy, url: str) -> Optional[TargetStats]:
+        sites = self._targets.get(proxy_key(proxy))
+        return sites.get(domain_key(url)) if sites else None
+
+    def targets_for(self, proxy: Proxy) -> List[Tuple[str, TargetStats]]:
+        """(domain, stats) pairs recorded for one proxy."""
+        return list(self._targets.get(proxy_key(proxy), {}).items())
+
+    def restore_target(self, proxy: Proxy, domain: str, stats: TargetStats) -> None:
+        """Install previously persisted stats for a (proxy, domain) pair."""
+        self._targets.setdefault(proxy_key(proxy), {})[domain] = stats
+
+    def record(
+        self,
+        proxy: Proxy,
+        success: bool,
+        latency_ms: Optional[float] = None,
+        url: Optional[str] = None,
+        status_code: Optional[int] = None,
+        now: Optional[float] = None,
+    ) -> None:
+        """Fold one request outcome into the proxy and (proxy, domain) stats."""
+        now = time.time() if now is None else now
+        outcome = 1.0 if success else 0.0
+        if latency_ms is not None and latency_ms >= 0:
+            proxy.latency_ewma_ms = self._ewma(
+                proxy.latency_ewma_ms, latency_ms, proxy.latency_samples
+            )
+            proxy.latency_samples += 1
+        proxy.success_ewma += self.alpha * (outcome - proxy.success_ewma)
+
+        if not url:
+            return
+        stats = self._targets.setdefault(proxy_key(proxy), {}).setdefault(
+            domain_key(url), TargetStats()
+        )
+        if latency_ms is not None and latency_ms >= 0:
+            stats.latency_ms = self._ewma(stats.latency_ms, latency_ms, stats.samples)
+        stats.success_rate = self._ewma(stats.success_rate, outcome, stats.samples)
+        stats.samples += 1
+
+        if status_code in (403, 429):
+            # Escalate repeat bans on the same site, capped.
+            duration = min(self.max_ban_seconds, self.ban_seconds * (2**stats.bans))
+            stats.banned_until = now + duration
+            stats.bans += 1
+            self.drop_affinity(url, proxy)
+        elif success:
+            stats.bans = 0
+        else:
+            self.drop_affinity(url, proxy)
+
+    def is_banned(self, proxy: Proxy, url: str, now: Optional[float] = None) -> bool:
+        stats = self.target_stats(proxy, url)
+        if stats is None:
+            return False
+        return stats.banned_until > (time.time() if now is None else now)
+
+    def expected_cost(self, proxy: Proxy, url: Optional[str] = None) -> float:
+        """Expected milliseconds to a successful response (lower is better)."""
+        latency = proxy.latency_ewma_ms or _DEFAULT_LATENCY_MS
+        success = proxy.success_ewma
+        if url:
+            stats = self.target_stats(proxy, url)
+            if stats is not None and stats.samples:
+                latency = stats.latency_ms or latency
+                success = stats.success_rate
+        return latency / max(_MIN_SUCCESS_RATE, success)
+
+    def best(
+        self,
+        candidates: Iterable[Proxy],
+        url: Optional[str] = None,
+        now: Optional[float] = None,
+    ) -> Optional[Proxy]:
+        """Lowest expected-cost candidate not banned for the URL's domain."""
+        now = time.time() if now is None else now
+        chosen: Optional[Proxy] = None
+        chosen_cost = float("inf")
+        for proxy in candidates:
+            if url and self.is_banned(proxy, url, now):
+                continue
+            cost = self.expected_cost(proxy, url)
+            if cost < chosen_cost:
+                chosen, chosen_cost = proxy, cost
+        return chosen
+
+    def sticky(self, url: str, now: Optional[float] = None) -> Optional[Proxy]:
+        """Proxy pinned to the URL's host, if the pin is still valid."""
+        if self.affinity_ttl_seconds <= 0:
+            return None
+        host = domain_key(url)
+        pin = self._affinity.get(host)
+        if pin is None:
+            return None
+        now = time.time() if now is None else now
+        if pin.expires_at <= now or (
+            self.affinity_max_requests and pin.uses >= self.affinity_max_requests
+        ):
+            del self._affinity[host]
+            return None
+        pin.uses += 1
+        return pin.proxy
+
+    def pin(self, url: str, proxy: Proxy, now: Optional[float] = None) -> None:
+        if self.affinity_ttl_seconds <= 0:
+            return
+        now = time.time() if now is None else now
+        self._affinity[domain_key(url)] = _Affinity(
+            proxy, now + self.affinity_ttl_seconds, uses=1
+        )
+
+    def drop_affinity(self, url: str, proxy: Optional[Proxy] = None) -> None:
+        """Unpin the URL's host (only if pinned to `proxy`, when given)."""
+        host = domain_key(url)
+        pin = self._affinity.get(host)
+        if pin is not None and (proxy is None or pin.proxy is proxy):
+            del self._affinity[host]
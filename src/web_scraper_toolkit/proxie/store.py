@@ -0,0 +1,207 @@
+# ./src/web_scraper_toolkit/proxie/store.py
+"""
+Persistent proxy health store shared across runs and processes.
+Used by ProxyManager so learned health, latency, per-site bans, and cooldowns
+survive restarts and startup only re-validates proxies whose data is stale.
+Run: imported as a library module; not a direct CLI entry point.
+Inputs: Proxy objects plus the ProxyScorer's per-site statistics.
+Outputs: restored proxy state and the list of proxies that need validation.
+Side effects: reads/writes one compact JSON file using atomic replace writes.
+Operational notes: records are keyed by proxy identity (protocol, user,
+endpoint), so reordering or extending the proxy list keeps history; timestamps
+are wall-clock so they stay meaningful in the next process. Concurrent writers
+are last-writer-wins per file. Malformed records or site entries are skipped
+with a warning instead of aborting pool startup.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from .models import Proxy, ProxyStatus
+from .scoring import ProxyScorer, TargetStats, proxy_key
+
+logger = logging.getLogger(__name__)
+
+STORE_VERSION = 1
+
+# Statuses worth carrying over; UNTESTED proxies have nothing to restore.
+_PERSISTED_STATUSES = {
+    ProxyStatus.ACTIVE,
+    ProxyStatus.DEAD,
+    ProxyStatus.COOLDOWN,
+    ProxyStatus.DENIED,
+    ProxyStatus.LEAKING,
+}
+
+
+def _parse_record(record: Dict[str, Any], proxy: Proxy) -> Dict[str, Any]:
+    """Convert one stored record, raising before anything is applied."""
+    try:
+        status = ProxyStatus[record.get("status", "UNTESTED")]
+    except KeyError:
+        status = ProxyStatus.UNTESTED
+    sites = record.get("sites") or {}
+    if not isinstance(sites, dict):
+        raise TypeError(f"sites must be an object, got {type(sites).__name__}")
+    return {
+        "status": status,
+        "health_score": float(record.get("health", proxy.health_score)),
+        "latency_ewma_ms": float(record.get("latency_ms", 0.0)),
+        "latency_samples": int(record.get("latency_samples", 0)),
+        "success_ewma": float(record.get("success", 1.0)),
+        "total_calls": int(record.get("calls", 0)),
+        "failed_calls": int(record.get("failed", 0)),
+        "last_validated_ts": float(record.get("validated_at", 0.0)),
+        "cooldown_until": float(record.get("cooldown_until", 0.0)),
+        "sites": sites,
+    }
+
+
+class ProxyHealthStore:
+    """
+    Compact JSON file of per-proxy health records.
+
+    Usage:
+        store = ProxyHealthStore("./cache/proxy_health.json")
+        store.restore(proxies, scorer)      # at startup
+        store.save(proxies, scorer)         # after validation / on close
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = Path(path).expanduser()
+        self._records: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._records is not None:
+            return self._records
+        records: Dict[str, Dict[str, Any]] = {}
+        try:
+            with self.path.open("r", encoding="utf-8") as handle:
+                raw = json.load(handle)
+            if isinstance(raw, dict) and raw.get("version") == STORE_VERSION:
+                loaded = raw.get("proxies", {})
+                if isinstance(loaded, dict):
+                    records = loaded
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable proxy health store {self.path}: {e}")
+        self._records = records
+        return records
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def restore(
+        self,
+        proxies: Iterable[Proxy],
+        scorer: ProxyScorer,
+        now: Optional[float] = None,
+    ) -> Dict[int, float]:
+        """
+        Apply stored records to matching proxies.
+
+        Returns {id(proxy): cooldown_until} for cooldowns still in effect so the
+        caller can reschedule them; expired cooldowns come back ACTIVE.
+        """
+        now = time.time() if now is None else now
+        records = self._load()
+        cooldowns: Dict[int, float] = {}
+        for proxy in proxies:
+            key = proxy_key(proxy)
+            record = records.get(key)
+            if not record:
+                continue
+            try:
+                fields = _parse_record(record, proxy)
+            except (AttributeError, TypeError, ValueError) as e:
+                logger.warning(f"Skipping malformed proxy health record {key}: {e}")
+                continue
+            status = fields.pop("status")
+            cooldown_until = fields.pop("cooldown_until")
+            sites = fields.pop("sites")
+            for name, value in fields.items():
+                setattr(proxy, name, value)
+
+            if status == ProxyStatus.COOLDOWN:
+                if cooldown_until > now:
+                    cooldowns[id(proxy)] = cooldown_until
+                else:
+                    status = ProxyStatus.ACTIVE
+                    proxy.health_score = 50.0  # Same reset as a live cooldown
+            proxy.status = status
+
+            for domain, values in sites.items():
+                try:
+                    latency, success, samples, banned_until, bans = values
+                    stats = TargetStats(
+                        latency_ms=float(latency),
+                        success_rate=float(success),
+                        samples=int(samples),
+                        banned_until=float(banned_until),
+                        bans=int(bans),
+                    )
+                except (TypeError, ValueError) as e:
+                    logger.warning(
+                        f"Skipping malformed site stats {domain!r} for {key}: {e}"
+                    )
+                    continue
+                scorer.restore_target(proxy, domain, stats)
+        return cooldowns
+
+    def save(
+        self,
+        proxies: Iterable[Proxy],
+        scorer: ProxyScorer,
+        cooldown_until: Optional[Dict[int, float]] = None,
+        now: Optional[float] = None,
+    ) -> None:
+        """Write the current state of `proxies`; other stored proxies are kept."""
+        now = time.time() if now is None else now
+        cooldown_until = cooldown_until or {}
+        records = dict(self._load())
+        for proxy in proxies:
+            if proxy.status not in _PERSISTED_STATUSES:
+                continue
+            sites = {
+                domain: [
+                    round(stats.latency_ms, 1),
+                    round(stats.success_rate, 4),
+                    stats.samples,
+                    stats.banned_until if stats.banned_until > now else 0.0,
+                    stats.bans,
+                ]
+                for domain, stats in scorer.targets_for(proxy)
+            }
+            record: Dict[str, Any] = {
+                "status": proxy.status.name,
+                "health": round(proxy.health_score, 2),
+                "latency_ms": round(proxy.latency_ewma_ms, 1),
+                "latency_samples": proxy.latency_samples,
+                "success": round(proxy.success_ewma, 4),
+                "calls": proxy.total_calls,
+                "failed": proxy.failed_calls,
+                "validated_at": proxy.last_validated_ts,
+            }
+            if proxy.status == ProxyStatus.COOLDOWN:
+                record["cooldown_until"] = cooldown_until.get(id(proxy), now)
+            if sites:
+                record["sites"] = sites
+            records[proxy_key(proxy)] = record
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f"{self.path.suffix}.{os.getpid()}.tmp")
+        with tmp_path.open("w", encoding="utf-8") as handle:
+            json.dump(
+                {"version": STORE_VERSION, "saved_at": now, "proxies": records},
+                handle,
+                separators=(",", ":"),
+            )
+        tmp_path.replace(self.path)
+        self._records = records
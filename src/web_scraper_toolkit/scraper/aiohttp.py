@@ -8,6 +8,7 @@ Ensures requests are routed through valid proxies and retries on failure.
 
 import asyncio
 import logging
+import time
 import aiohttp
 from typing import Any, Dict, Optional
 from aiohttp_socks import (
@@ -20,19 +21,52 @@ from aiohttp_socks import (
 
 from ..proxie.manager import ProxyManager, SecurityStopIteration
 from ..core.user_agents import get_stealth_headers
+from ..core.automation.rate_limit import shared_host_slot
+from ..core.automation.retry import get_circuit_breakers, get_retry_budget
+from ..core.state.cache import (
+    conditional_headers,
+    get_cache,
+    normalize_response_cache_mode,
+)
 
 logger = logging.getLogger(__name__)
 
+# Background stale-while-revalidate refreshes, held until they finish. At most
+# `CacheConfig.revalidation_concurrency` run per event loop; stale hits past
+# that are served without one (a later hit revalidates).
+_REVALIDATING: Dict[str, "asyncio.Task[Any]"] = {}
+
 
 class ProxyScraper:
-    def __init__(self, manager: Optional[ProxyManager] = None):
+    def __init__(
+        self, manager: Optional[ProxyManager] = None, retry_delay_seconds: float = 1.0
+    ):
         self.manager = manager
+        self.retry_delay_seconds = retry_delay_seconds
+
+    def _schedule_revalidation(
+        self, url: str, headers: Optional[Dict[str, str]]
+    ) -> None:
+        """Conditionally refetch a stale cached URL in the background (once)."""
+        if url in _REVALIDATING:
+            return
+        loop = asyncio.get_running_loop()
+        limit = max(1, int(get_cache().config.revalidation_concurrency))
+        if sum(t.get_loop() is loop for t in _REVALIDATING.values()) >= limit:
+            return
+        task = loop.create_task(
+            self.secure_fetch(url, headers=headers, cache_mode="refresh")
+        )
+        _REVALIDATING[url] = task
+        task.add_done_callback(lambda _t: _REVALIDATING.pop(url, None))
 
     async def secure_fetch(
         self,
         url: str,
         method: str = "GET",
         headers: Optional[Dict[str, str]] = None,
+        *,
+        cache_mode: Optional[str] = None,
         **kwargs: Any,
     ) -> Optional[str]:
         """
@@ -43,22 +77,53 @@ class ProxyScraper:
             url: Target URL.
             method: HTTP method (GET, POST).
             headers: HTTP headers (will be merged with stealth defaults).
+            cache_mode: "use", "refresh", or "bypass" (default) for the shared
+                ResponseCache; only GET responses are cached. Stale entries
+                inside their revalidation window are returned immediately
+                and revalidated in the background with If-None-Match /
+                If-Modified-Since.
             **kwargs: Additional args passed to aiohttp (e.g., json, data).
 
         Returns:
-            Response text if successful, None if all retries failed.
+            Response text if successful, None if all retries failed or the
+            target host's circuit breaker is open.
         """
         # Determine Retries (Config or Default)
         retries = self.manager.config.max_retries if self.manager else 2
+        breakers = get_circuit_breakers()
+        budget = get_retry_budget()
+        mode = normalize_response_cache_mode(cache_mode)
+        if method.upper() != "GET":
+            mode = "bypass"
+        cache = get_cache() if mode != "bypass" else None
+        entry = None
+        if cache is not None:
+            entry = cache.get_entry(url, allow_stale=True)
+            if mode == "use" and entry is not None:
+                if cache.is_stale(entry):
+                    self._schedule_revalidation(url, headers)
+                return entry.content
+
+        if not breakers.allow_request(url):
+            logger.warning(
+                f"Circuit open for {url}; skipping for "
+                f"{breakers.retry_after(url):.0f}s."
+            )
+            return None
+        budget.record_request()
 
         for attempt in range(retries + 1):  # +1 to ensure at least one try
+            if attempt > 0 and not budget.try_acquire():
+                logger.warning(f"Retry budget exhausted; giving up on {url}.")
+                break
             proxy = None
             connector = None
+            started = time.perf_counter()
 
             try:
                 # 1. Get Proxy (if Manager exists)
                 if self.manager:
-                    proxy = await self.manager.get_next_proxy()
+                    proxy = await self.manager.get_next_proxy(url)
 
                     # Build Proxy Connector
                     connector = ProxyConnector(
@@ -87,8 +152,14 @@ class ProxyScraper:
 
                 # Merge user headers with stealth defaults
                 request_headers = get_stealth_headers(headers)
+                if entry is not None:
+                    request_headers.update(conditional_headers(entry))
 
-                async with aiohttp.ClientSession(connector=connector) as session:
+                async with (
+                    shared_host_slot(url),
+                    aiohttp.ClientSession(connector=connector) as session,
+                ):
+                    started = time.perf_counter()
                     async with session.request(
                         method,
                         url,
@@ -98,11 +169,16 @@ class ProxyScraper:
                     ) as response:
                         content = await response.text()
                         status = response.status
+                        response_headers = response.headers
+                        latency_ms = (time.perf_counter() - started) * 1000
 
                         # Success
                         if status == 200:
+                            breakers.record_success(url)
                             if self.manager and proxy:
-                                self.manager.report_status(proxy, success=True)
+                                self.manager.report_status(
+                                    proxy, success=True, url=url, latency_ms=latency_ms
+                                )
 
                             # Basic check for "Javascript Required" bodies
                             if (
@@ -115,24 +191,56 @@ class ProxyScraper:
                                 return None  # Signal caller to try Playwright
 
                             logger.info(f"Success: {url} fetched.")
+                            if cache is not None:
+                                cache.store_response(url, content, response_headers)
                             return content
 
+                        # Revalidated: the cached body is still current
+                        elif status == 304 and entry is not None:
+                            breakers.record_success(url)
+                            if self.manager and proxy:
+                                self.manager.report_status(
+                                    proxy, success=True, url=url, latency_ms=latency_ms
+                                )
+                            cache.touch(url, response_headers)
+                            logger.info(f"Not modified: {url} served from cache.")
+                            return entry.content
+
                         # Handle Blocks/Errors
                         elif status in [403, 429]:
+                            # Blocks are not host failures (is_host_failure).
                             if self.manager and proxy:
+                                # Likely aimed at the exit IP: free the
+                                # half-open trial for the next caller.
+                                breakers.release_trial(url)
                                 self.manager.report_status(
-                                    proxy, success=False, status_code=status
+                                    proxy,
+                                    success=False,
+                                    status_code=status,
+                                    url=url,
+                                    latency_ms=latency_ms,
                                 )
                                 logger.warning(
                                     f"Blocked ({status}) on {url} via {proxy.hostname}. Rotating."
                                 )
                             else:
+                                breakers.record_success(url)
                                 logger.warning(f"Blocked ({status}) on {url} (Direct).")
                                 return None  # Direct fail -> Try Playwright
                         else:
+                            # 5xx means the host is struggling; other codes
+                            # prove it is reachable.
+                            if status >= 500:
+                                breakers.record_failure(url)
+                            else:
+                                breakers.record_success(url)
                             if self.manager and proxy:
                                 self.manager.report_status(
-                                    proxy, success=False, status_code=status
+                                    proxy,
+                                    success=False,
+                                    status_code=status,
+                                    url=url,
+                                    latency_ms=latency_ms,
                                 )
                             logger.warning(f"Failed ({status}) on {url}.")
                             if not self.manager:
@@ -142,15 +250,24 @@ class ProxyScraper:
                 logger.critical(f"Security Stop: {e}")
                 raise
             except (ProxyError, ProxyConnectionError, ProxyTimeoutError) as e:
+                breakers.release_trial(url)
                 if self.manager and proxy:
-                    self.manager.report_status(proxy, success=False)
+                    self.manager.report_status(
+                        proxy,
+                        success=False,
+                        url=url,
+                        latency_ms=(time.perf_counter() - started) * 1000,
+                    )
                 logger.warning(f"Proxy Error: {e}")
             except Exception as e:
                 if self.manager and proxy:
                     self.manager.report_status(proxy, success=False)
+                else:
+                    # Direct transport failure is attributable to the host.
+                    breakers.record_failure(url)
                 logger.error(f"Error fetching {url}: {e}")
 
             # Wait before retry
-            await asyncio.sleep(1)
+            await asyncio.sleep(self.retry_delay_seconds)
 
         return None
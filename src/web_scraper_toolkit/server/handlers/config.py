@@ -15,6 +15,8 @@ from ...browser.config import BrowserConfig
 from ...browser.host_profiles import HostProfileStore, normalize_host
 from ...core.runtime import RuntimeSettings, load_runtime_settings
 from ...crawler.config import CrawlerConfig
+from ...parsers.sitemap import SitemapIndexConfig, set_sitemap_index
+
 
 # Global State (Shared across tools)
 GLOBAL_BROWSER_CONFIG = BrowserConfig(headless=True)
@@ -152,18 +154,30 @@ def refresh_runtime_config(
 ) -> dict:
     """Reload runtime settings from config sources."""
     global GLOBAL_RUNTIME_SETTINGS
+    previous_index = GLOBAL_RUNTIME_SETTINGS.sitemap_index
     GLOBAL_RUNTIME_SETTINGS = load_runtime_settings(
         config_json_path=config_json_path,
         local_cfg_path=local_cfg_path,
     )
+    _reopen_sitemap_index_if_changed(previous_index)
     return GLOBAL_RUNTIME_SETTINGS.as_dict()
 
 
+def _reopen_sitemap_index_if_changed(previous: Any) -> None:
+    if GLOBAL_RUNTIME_SETTINGS.sitemap_index != previous:
+        set_sitemap_index(None)  # Reopened with the new settings on next use
+
+
 def get_runtime_config() -> RuntimeSettings:
     """Get shared runtime settings object."""
     return GLOBAL_RUNTIME_SETTINGS
 
 
+def get_sitemap_index_config() -> SitemapIndexConfig:
+    """Persistent sitemap index settings from the runtime config."""
+    return SitemapIndexConfig.from_dict(GLOBAL_RUNTIME_SETTINGS.sitemap_index.as_dict())
+
+
 def update_runtime_overrides(overrides: dict) -> dict:
     """
     Apply runtime overrides on top of existing settings.
@@ -175,12 +189,14 @@ def update_runtime_overrides(overrides: dict) -> dict:
     if not isinstance(overrides, dict):
         return GLOBAL_RUNTIME_SETTINGS.as_dict()
 
+    previous_index = GLOBAL_RUNTIME_SETTINGS.sitemap_index
     merged = {"runtime": GLOBAL_RUNTIME_SETTINGS.as_dict()}
     runtime_updates = overrides.get("runtime", overrides)
     if isinstance(runtime_updates, dict):
         _merge_nested(merged["runtime"], runtime_updates)
 
     GLOBAL_RUNTIME_SETTINGS = load_runtime_settings(overrides=merged)
+    _reopen_sitemap_index_if_changed(previous_index)
     return GLOBAL_RUNTIME_SETTINGS.as_dict()
 
 
@@ -1,29 +1,26 @@
 # ./src/web_scraper_toolkit/server/handlers/extraction.py
 """
-Implement MCP-facing extraction handlers for sitemap and contact workflows.
-Used by discovery MCP tools to power sitemap discovery and contact extraction actions.
+Implement MCP-facing extraction handlers for sitemap, contact and metadata workflows.
+Used by discovery/scraping MCP tools to power sitemap discovery, contact
+extraction and page metadata actions.
 Run: Imported by server tool registration modules; not executed directly.
 Inputs: URL targets, optional keyword filters, and result limits.
-Outputs: Structured dictionaries for sitemap/contact results.
-Side effects: Performs network access and HTML parsing on target pages.
+Outputs: Structured dictionaries for sitemap/contact/metadata results.
+Side effects: Performs network access and HTML parsing on target pages;
+sitemap discovery records sitemaps in the persistent sitemap index.
 Operational notes: Contact extraction uses parser-level normalization helpers.
 """
 
 from __future__ import annotations
 
-from bs4 import BeautifulSoup
-from ...parsers.scraping_tools import (
-    read_website_content,
-    get_sitemap_urls,
-)
+from ...core.automation.cpu_pool import get_cpu_pool
+from ...parsers.scraping_tools import get_sitemap_urls
 from ...parsers.discovery import smart_discover_urls
-from ...parsers.extraction.contacts import (
-    extract_emails,
-    extract_phones,
-    extract_socials,
-    extract_heuristic_names,
-)
+from ...parsers.sitemap import get_sitemap_index
+from ...parsers.extraction.contacts import extract_contacts_from_html
+from ...parsers.extraction.metadata import fetch_page_metadata, format_metadata_report
 from ...parsers.config import ParserConfig
+from .config import GLOBAL_BROWSER_CONFIG, get_sitemap_index_config
 
 GLOBAL_PARSER_CONFIG = ParserConfig()
 
@@ -39,6 +36,7 @@ async def discover_sitemap(
         max_priority=limit,
         max_general=limit,
         priority_keywords=priority_kw,
+        sitemap_index=get_sitemap_index(get_sitemap_index_config()),
     )
 
     priority = [item["url"] for item in result.get("priority_urls", [])]
@@ -61,22 +59,40 @@ async def get_sitemap_plain(url: str) -> str:
 
 
 async def get_contacts(url: str) -> dict[str, object]:
-    """Extracts contact info from a URL."""
-    html_content = read_website_content(url, config=GLOBAL_PARSER_CONFIG)
-    if not html_content:
-        return {"error": "Failed to retrieve content"}
+    """
+    Extracts contact info from a URL (browser fetch, parse in the CPU pool).
+
+    Results carry the fetch `status` and `block_reason` (`classify_bot_block`)
+    so batch callers can feed them to per-host concurrency limits.
+    """
+    from ...browser.playwright_handler import PlaywrightManager, classify_bot_block
+
+    manager = PlaywrightManager(config=GLOBAL_BROWSER_CONFIG)
+    await manager.start()
+    try:
+        content, final_url, status = await manager.smart_fetch(url=url)
+    finally:
+        await manager.stop()
+    outcome = {
+        "status": status,
+        "block_reason": classify_bot_block(
+            status=status, final_url=final_url or url, content_html=content
+        ),
+    }
+    if status != 200 or not content:
+        return {"error": "Failed to retrieve content", **outcome}
 
-    soup = BeautifulSoup(html_content, "lxml")
-    text = soup.get_text(separator=" ", strip=True)
+    contacts = await get_cpu_pool().run(extract_contacts_from_html, content, url)
+    contacts["names"] = contacts["names"] or None
+    contacts.update(outcome)
+    return contacts
 
-    emails = extract_emails(html_content, url)
-    phones = extract_phones(text, url)
-    socials = extract_socials(soup, url)
-    names = extract_heuristic_names(soup)
 
-    return {
-        "emails": emails,
-        "phones": phones,
-        "socials": socials,
-        "names": names or None,
-    }
+async def get_page_metadata(
+    url: str, format: str = "text", head_only: bool = False
+) -> dict[str, object] | str:
+    """Page metadata over plain HTTP (browser only for JS-built heads)."""
+    data = await fetch_page_metadata(
+        url, config=GLOBAL_BROWSER_CONFIG, head_only=head_only
+    )
+    return data if format == "json" else format_metadata_report(data)
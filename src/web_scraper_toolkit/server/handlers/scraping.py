@@ -11,8 +11,11 @@ Operational notes: Keeps stealth/browser behavior delegated to parser/browser mo
 
 from __future__ import annotations
 
+import time
+
+from ...core.state.history import get_history_manager
+from ...parsers.content import aread_website_markdown_result
 from ...parsers.scraping_tools import (
-    read_website_markdown,
     read_website_content,
     capture_screenshot,
     save_as_pdf,
@@ -27,15 +30,27 @@ async def scrape_single_url(
     format: str = "markdown",
     selector: str | None = None,
     max_length: int = 20000,
+    cache_mode: str | None = None,
 ) -> str:
     """Scrapes a single URL to text/markdown."""
     if format == "markdown":
-        return read_website_markdown(
+        started = time.perf_counter()
+        result = await aread_website_markdown_result(
             url,
             config=GLOBAL_BROWSER_CONFIG,
             selector=selector,
             max_length=max_length,
+            cache_mode=cache_mode,
+        )
+        get_history_manager().log_scrape(
+            url,
+            status="success" if result.status_code == 200 else "error",
+            duration_ms=int((time.perf_counter() - started) * 1000),
+            cached=bool(result.metadata.get("cached", False)),
+            content_type="markdown",
+            error=None if result.status_code == 200 else result.markdown[:200],
         )
+        return result.markdown
     return read_website_content(url, config=GLOBAL_BROWSER_CONFIG)
 
 
@@ -35,6 +35,11 @@ from ..core.runtime import (
     load_runtime_settings,
     resolve_worker_count,
 )
+from ..core.automation.rate_limit import (
+    SharedHostLimiter,
+    install_shared_limiter,
+    set_shared_limiter,
+)
 from .handlers.config import get_runtime_config, refresh_runtime_config
 
 try:
@@ -116,11 +121,49 @@ def _runtime_to_inflight_limit(settings: RuntimeSettings) -> int:
     )
 
 
+def _create_shared_limiter(settings: RuntimeSettings) -> SharedHostLimiter | None:
+    """Build the cross-process per-host limiter shared by all pool workers."""
+    concurrency = settings.concurrency
+    if concurrency.host_requests_per_second <= 0 and concurrency.host_max_inflight <= 0:
+        return None
+    try:
+        return SharedHostLimiter.create(
+            requests_per_second=concurrency.host_requests_per_second,
+            burst=concurrency.host_burst,
+            max_inflight=concurrency.host_max_inflight,
+        )
+    except Exception as exc:
+        logger.warning("Shared host rate limiter unavailable: %s", exc)
+        return None
+
+
+def _host_limits(settings: RuntimeSettings) -> tuple[float, int, int]:
+    concurrency = settings.concurrency
+    return (
+        concurrency.host_requests_per_second,
+        concurrency.host_burst,
+        concurrency.host_max_inflight,
+    )
+
+
+def _create_executor(
+    workers: int, limiter: SharedHostLimiter | None
+) -> ProcessPoolExecutor:
+    # Parent-process coroutine tools use the same store as pool workers.
+    set_shared_limiter(limiter)
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=install_shared_limiter,
+        initargs=(limiter.handle() if limiter is not None else None,),
+    )
+
+
 RUNTIME_SETTINGS: RuntimeSettings = load_runtime_settings()
 PROCESS_WORKERS = _runtime_to_worker_count(RUNTIME_SETTINGS)
 INFLIGHT_LIMIT = _runtime_to_inflight_limit(RUNTIME_SETTINGS)
 
-executor = ProcessPoolExecutor(max_workers=PROCESS_WORKERS)
+shared_limiter = _create_shared_limiter(RUNTIME_SETTINGS)
+executor = _create_executor(PROCESS_WORKERS, shared_limiter)
 _loop_semaphores: "WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
     WeakKeyDictionary()
 )
@@ -128,20 +171,25 @@ _loop_semaphores: "WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphor
 
 def _set_runtime_settings(settings: RuntimeSettings) -> None:
     """Apply runtime settings and rebuild process/runtime controls."""
-    global RUNTIME_SETTINGS, PROCESS_WORKERS, INFLIGHT_LIMIT, executor
+    global RUNTIME_SETTINGS, PROCESS_WORKERS, INFLIGHT_LIMIT, executor, shared_limiter
 
     RUNTIME_SETTINGS = settings
     PROCESS_WORKERS = _runtime_to_worker_count(settings)
     INFLIGHT_LIMIT = _runtime_to_inflight_limit(settings)
 
     existing_executor = executor
-    executor = ProcessPoolExecutor(max_workers=PROCESS_WORKERS)
+    existing_limiter = shared_limiter
+    shared_limiter = _create_shared_limiter(settings)
+    executor = _create_executor(PROCESS_WORKERS, shared_limiter)
     _loop_semaphores.clear()
 
     try:
         existing_executor.shutdown(wait=False)
     except Exception:
         logger.warning("Failed to gracefully shutdown previous process pool.")
+    if existing_limiter is not None:
+        # Draining workers keep their mapping; only the name is released.
+        existing_limiter.close()
 
     logger.info(
         "Runtime updated: workers=%s inflight_limit=%s timeout_profile=%s",
@@ -156,7 +204,11 @@ def _sync_runtime_state_if_needed() -> None:
     desired_workers = _runtime_to_worker_count(settings)
     desired_limit = _runtime_to_inflight_limit(settings)
 
-    if desired_workers != PROCESS_WORKERS or desired_limit != INFLIGHT_LIMIT:
+    if (
+        desired_workers != PROCESS_WORKERS
+        or desired_limit != INFLIGHT_LIMIT
+        or _host_limits(settings) != _host_limits(RUNTIME_SETTINGS)
+    ):
         _set_runtime_settings(settings)
 
 
@@ -385,6 +437,8 @@ async def get_registered_tools() -> Dict[str, Any]:
 def signal_handler(sig: int, frame: Any) -> None:
     logger.info("Shutdown signal received")
     executor.shutdown(wait=False)
+    if shared_limiter is not None:
+        shared_limiter.close()
     sys.exit(0)
 
 
@@ -11,6 +11,7 @@ import logging
 from typing import Optional
 
 from ...core.runtime import resolve_worker_count
+from ...core.automation.concurrency import AdaptiveConcurrencyController
 from ..handlers.search import perform_search, perform_deep_research
 from ..handlers.config import get_runtime_config
 from ..handlers.extraction import discover_sitemap, get_contacts, get_sitemap_plain
@@ -89,7 +90,8 @@ def register_discovery_tools(mcp, create_envelope, format_error, run_in_process)
         """
         Extract contacts from multiple URLs in parallel.
 
-        Uses hardware-limited concurrency (CPU cores - 1) for optimal performance.
+        Uses hardware-limited concurrency (CPU cores - 1) for optimal performance,
+        with adaptive per-host limits so one slow host cannot absorb every worker.
         """
         try:
             logger.info(f"Tool Call: batch_contacts for {len(urls)} URLs")
@@ -104,9 +106,12 @@ def register_discovery_tools(mcp, create_envelope, format_error, run_in_process)
                 fallback=4,
             )
             semaphore = asyncio.Semaphore(max_workers)
+            host_limiter = AdaptiveConcurrencyController(max_limit=max_workers)
 
             async def process_url(url: str) -> dict:
-                async with semaphore:
+                # Host slot first: waiting on a throttled host must not pin a worker.
+                async with host_limiter.slot(url) as host_slot, semaphore:
+                    host_slot.mark_sent()
                     try:
                         data = await run_in_process(
                             get_contacts,
@@ -114,8 +119,14 @@ def register_discovery_tools(mcp, create_envelope, format_error, run_in_process)
                             timeout_profile=timeout_profile,
                             work_units=1,
                         )
+                        host_slot.report(
+                            status=data.get("status"),
+                            block_reason=data.get("block_reason"),
+                            error="error" in data,
+                        )
                         return {"url": url, **data}
                     except Exception as e:
+                        host_slot.report(error=True)
                         return {"url": url, "error": str(e)}
 
             tasks = [process_url(url) for url in urls]
@@ -127,6 +138,10 @@ def register_discovery_tools(mcp, create_envelope, format_error, run_in_process)
                 meta={
                     "count": len(results),
                     "workers": max_workers,
+                    "host_limits": {
+                        host: stats["limit"]
+                        for host, stats in host_limiter.snapshot().items()
+                    },
                     "timeout_profile": timeout_profile,
                 },
             )
@@ -137,6 +152,7 @@ def register_discovery_tools(mcp, create_envelope, format_error, run_in_process)
     async def extract_links(
         url: str,
         filter_external: bool = False,
+        include_anchors: bool = False,
         timeout_profile: str = "standard",
     ) -> str:
         """
@@ -145,6 +161,8 @@ def register_discovery_tools(mcp, create_envelope, format_error, run_in_process)
         Args:
             url: Target webpage URL
             filter_external: If True, only return internal links (same domain)
+            include_anchors: If True, add an `anchors` table with parallel
+                url/text/rel/nofollow/internal lists
 
         Returns structured JSON with links, internal_count, external_count.
         """
@@ -154,6 +172,7 @@ def register_discovery_tools(mcp, create_envelope, format_error, run_in_process)
                 _extract_links,
                 url,
                 filter_external=filter_external,
+                include_anchors=include_anchors,
                 timeout_profile=timeout_profile,
             )
             return create_envelope("success", data, meta={"url": url})
@@ -20,6 +20,8 @@ from ...core.automation.utilities import (
     validate_url as _validate_url,
     detect_content_type as _detect_content_type,
     download_file as _download_file,
+    validate_urls as _validate_urls,
+    detect_content_types as _detect_content_types,
 )
 from ..handlers.config import get_runtime_config
 from ..path_safety import resolve_safe_output_path
@@ -155,6 +157,48 @@ def register_form_tools(mcp, create_envelope, format_error, run_in_process):
         except Exception as e:
             return format_error("detect_content_type", e)
 
+    @mcp.tool()
+    async def validate_urls(urls: list[str], timeout_profile: str = "fast") -> str:
+        """
+        Validate many URLs in one call (HEAD with ranged-GET fallback).
+
+        Requests are pipelined over a shared connection pool with per-host
+        limits; recent results are served from a short-lived cache.
+        """
+        try:
+            logger.info(f"Tool Call: validate_urls for {len(urls)} URLs")
+            result = await run_in_process(
+                _validate_urls,
+                urls,
+                timeout_profile=timeout_profile,
+                work_units=max(1, len(urls) // 25),
+            )
+            reachable = sum(1 for item in result if item.get("reachable"))
+            return create_envelope(
+                "success",
+                result,
+                meta={"count": len(result), "reachable": reachable},
+            )
+        except Exception as e:
+            return format_error("validate_urls", e)
+
+    @mcp.tool()
+    async def detect_content_types(
+        urls: list[str], timeout_profile: str = "fast"
+    ) -> str:
+        """Detect content types for many URLs in one call (HTML, PDF, image, etc.)."""
+        try:
+            logger.info(f"Tool Call: detect_content_types for {len(urls)} URLs")
+            result = await run_in_process(
+                _detect_content_types,
+                urls,
+                timeout_profile=timeout_profile,
+                work_units=max(1, len(urls) // 25),
+            )
+            return create_envelope("success", result, meta={"count": len(result)})
+        except Exception as e:
+            return format_error("detect_content_types", e)
+
     @mcp.tool()
     async def download_file(
         url: str,
@@ -181,4 +225,4 @@ def register_form_tools(mcp, create_envelope, format_error, run_in_process):
         except Exception as e:
             return format_error("download_file", e)
 
-    logger.info("Registered: form/utility tools (7)")
+    logger.info("Registered: form/utility tools (9)")
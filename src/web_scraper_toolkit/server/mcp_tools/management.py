@@ -67,7 +67,7 @@ async def _batch_contacts_job(urls: list[str]) -> list[dict[str, Any]]:
     async def _process(url: str) -> dict[str, Any]:
         async with semaphore:
             try:
-                data = await asyncio.to_thread(get_contacts, url)
+                data = await get_contacts(url)
                 if isinstance(data, dict):
                     return {"url": url, **data}
                 return {"url": url, "data": data}
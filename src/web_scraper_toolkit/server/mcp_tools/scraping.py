@@ -16,8 +16,8 @@ from ..handlers.scraping import (
     save_url_pdf,
 )
 from ..handlers.config import get_runtime_config
+from ..handlers.extraction import get_page_metadata
 from ..path_safety import resolve_safe_output_path
-from ...parsers.extraction.metadata import extract_metadata as _extract_metadata
 
 logger = logging.getLogger("mcp_server")
 
@@ -32,10 +32,13 @@ def register_scraping_tools(mcp, create_envelope, format_error, run_in_process):
         max_length: int = 50000,
         format: str = "markdown",
         timeout_profile: str = "standard",
+        cache: Optional[str] = None,
     ) -> str:
         """
         Scrape a URL and return its content.
         Primary tool for content acquisition.
+        cache: "use" serves a fresh cached copy when available, "refresh"
+        refetches and updates the cache, "bypass" skips it (default: config).
         """
         try:
             logger.info(f"Tool Call: scrape_url {url}")
@@ -45,6 +48,7 @@ def register_scraping_tools(mcp, create_envelope, format_error, run_in_process):
                 selector=selector,
                 format=format,
                 max_length=max_length,
+                cache_mode=cache,
                 timeout_profile=timeout_profile,
                 work_units=max(1, max_length // 15000),
             )
@@ -131,17 +135,29 @@ def register_scraping_tools(mcp, create_envelope, format_error, run_in_process):
             return format_error("save_pdf", e)
 
     @mcp.tool()
-    async def get_metadata(url: str, timeout_profile: str = "standard") -> str:
-        """Extract semantic metadata (JSON-LD, OpenGraph, TwitterCards)."""
+    async def get_metadata(
+        url: str,
+        format: str = "text",
+        head_only: bool = False,
+        timeout_profile: str = "standard",
+    ) -> str:
+        """
+        Extract semantic metadata (JSON-LD, OpenGraph, TwitterCards).
+        format: "text" for the report, "json" for structured fields with
+        decoded JSON-LD objects. head_only (opt-in, faster) stops reading at
+        </head> when the head already has metadata; body JSON-LD is then skipped.
+        """
         try:
             logger.info(f"Tool Call: get_metadata {url}")
             data = await run_in_process(
-                _extract_metadata,
+                get_page_metadata,
                 url,
+                format=format,
+                head_only=head_only,
                 timeout_profile=timeout_profile,
                 work_units=1,
             )
-            return create_envelope("success", data, meta={"url": url})
+            return create_envelope("success", data, meta={"url": url, "format": format})
         except Exception as e:
             return format_error("get_metadata", e)
 
@@ -12,3 +12,16 @@ from pathlib import Path
 SRC_PATH = Path(__file__).resolve().parents[1] / "src"
 if str(SRC_PATH) not in sys.path:
     sys.path.insert(0, str(SRC_PATH))
+
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _reset_circuit_breakers():
+    """Keep per-host circuit breaker state from leaking between tests."""
+    from web_scraper_toolkit.core.automation.retry import get_circuit_breakers
+
+    get_circuit_breakers().reset()
+    yield
+    get_circuit_breakers().reset()
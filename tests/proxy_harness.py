@@ -0,0 +1,420 @@
+# ./tests/proxy_harness.py
+"""
+Local proxy and target-site stand-ins for offline proxy-path tests and benchmarks.
+Used by the proxy pool/scoring/store/validation tests, proxy-path benchmark
+tests, and `scripts/bench_proxy_path.py`.
+Run: imported as a helper module; not collected by pytest.
+Inputs: latency, error-rate, and block-injection knobs per stand-in.
+Outputs: running SOCKS5 / HTTP proxy servers, an aiohttp target site, and
+request counters for assertions and reports.
+Side effects: binds loopback ports (ephemeral) for the lifetime of the harness.
+Operational notes: proxies tunnel raw TCP, so the target sees the proxy's
+outbound address; `source_host` (e.g. 127.0.0.2 on Linux) lets the target tell
+proxies apart for per-proxy 403/429 injection. Randomness is seeded.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import ipaddress
+import random
+import socket
+import struct
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from aiohttp import web
+
+from web_scraper_toolkit.proxie import Proxy, ProxyProtocol, ProxyStatus
+
+_PIPE_CHUNK = 64 * 1024
+
+
+def loopback_alias_available(host: str = "127.0.0.2") -> bool:
+    """True if the OS routes extra 127.0.0.0/8 addresses (Linux does)."""
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+            probe.bind((host, 0))
+        return True
+    except OSError:
+        return False
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile (0 for no samples)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+def make_proxies(count: int, status: ProxyStatus = ProxyStatus.ACTIVE) -> List[Proxy]:
+    """`count` unreachable SOCKS5 records (10.0.0.0, 10.0.0.1, ...) for pool tests."""
+    return [
+        Proxy(hostname=f"10.0.0.{i}", port=1080, status=status) for i in range(count)
+    ]
+
+
+async def _pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        while True:
+            chunk = await reader.read(_PIPE_CHUNK)
+            if not chunk:
+                break
+            writer.write(chunk)
+            await writer.drain()
+    except (ConnectionError, asyncio.CancelledError):
+        pass
+    finally:
+        try:
+            writer.close()
+        except Exception:
+            pass
+
+
+async def _splice(
+    client_reader: asyncio.StreamReader,
+    client_writer: asyncio.StreamWriter,
+    upstream_reader: asyncio.StreamReader,
+    upstream_writer: asyncio.StreamWriter,
+) -> None:
+    await asyncio.gather(
+        _pipe(client_reader, upstream_writer),
+        _pipe(upstream_reader, client_writer),
+    )
+
+
+class _ProxyStandIn:
+    """Shared lifecycle, fault injection, and counters for proxy stand-ins."""
+
+    protocol = ProxyProtocol.SOCKS5
+
+    def __init__(
+        self,
+        *,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        handshake_latency_ms: float = 0.0,
+        failure_rate: float = 0.0,
+        source_host: Optional[str] = None,
+        seed: int = 0,
+    ) -> None:
+        self.username = username
+        self.password = password
+        self.handshake_latency_ms = handshake_latency_ms
+        self.failure_rate = failure_rate
+        self.source_host = source_host
+        self._random = random.Random(seed)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._tasks: set[asyncio.Task] = set()
+        self.port = 0
+        self.connections = 0
+        self.failures_injected = 0
+        self.auth_failures = 0
+
+    async def start(self) -> "_ProxyStandIn":
+        self._server = await asyncio.start_server(self._on_client, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def as_proxy(self, status: ProxyStatus = ProxyStatus.UNTESTED) -> Proxy:
+        return Proxy(
+            hostname="127.0.0.1",
+            port=self.port,
+            username=self.username,
+            password=self.password,
+            protocol=self.protocol,
+            status=status,
+        )
+
+    def _inject_failure(self) -> bool:
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            self.failures_injected += 1
+            return True
+        return False
+
+    async def _open_upstream(
+        self, host: str, port: int
+    ) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        local_addr = (self.source_host, 0) if self.source_host else None
+        return await asyncio.open_connection(host, port, local_addr=local_addr)
+
+    async def _on_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.connections += 1
+        task = asyncio.current_task()
+        if task is not None:
+            self._tasks.add(task)
+        try:
+            if self.handshake_latency_ms:
+                await asyncio.sleep(self.handshake_latency_ms / 1000)
+            await self._serve(reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            if task is not None:
+                self._tasks.discard(task)
+            try:
+                writer.close()
+            except Exception:
+                pass
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        raise NotImplementedError
+
+
+class Socks5ProxyStandIn(_ProxyStandIn):
+    """Minimal RFC 1928 SOCKS5 server (CONNECT only, optional RFC 1929 auth)."""
+
+    protocol = ProxyProtocol.SOCKS5
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        version, count = await reader.readexactly(2)
+        methods = await reader.readexactly(count)
+        if version != 5:
+            return
+        wanted = 0x02 if self.username else 0x00
+        if wanted not in methods:
+            writer.write(b"\x05\xff")
+            await writer.drain()
+            return
+        writer.write(bytes([5, wanted]))
+        await writer.drain()
+
+        if wanted == 0x02:
+            _, ulen = await reader.readexactly(2)
+            user = (await reader.readexactly(ulen)).decode()
+            (plen,) = await reader.readexactly(1)
+            password = (await reader.readexactly(plen)).decode()
+            ok = user == self.username and password == self.password
+            writer.write(b"\x01\x00" if ok else b"\x01\x01")
+            await writer.drain()
+            if not ok:
+                self.auth_failures += 1
+                return
+
+        _, command, _, address_type = await reader.readexactly(4)
+        if address_type == 0x01:
+            host = str(ipaddress.IPv4Address(await reader.readexactly(4)))
+        elif address_type == 0x03:
+            (length,) = await reader.readexactly(1)
+            host = (await reader.readexactly(length)).decode()
+        elif address_type == 0x04:
+            host = str(ipaddress.IPv6Address(await reader.readexactly(16)))
+        else:
+            return
+        (port,) = struct.unpack("!H", await reader.readexactly(2))
+
+        reply_tail = b"\x00\x01" + b"\x00" * 6
+        if command != 0x01:
+            writer.write(b"\x05\x07" + reply_tail)  # Command not supported
+            await writer.drain()
+            return
+        if self._inject_failure():
+            writer.write(b"\x05\x01" + reply_tail)  # General failure
+            await writer.drain()
+            return
+        try:
+            upstream_reader, upstream_writer = await self._open_upstream(host, port)
+        except OSError:
+            writer.write(b"\x05\x05" + reply_tail)  # Connection refused
+            await writer.drain()
+            return
+        writer.write(b"\x05\x00" + reply_tail)
+        await writer.drain()
+        await _splice(reader, writer, upstream_reader, upstream_writer)
+
+
+class HttpProxyStandIn(_ProxyStandIn):
+    """HTTP proxy supporting CONNECT tunnels and absolute-form forwarding."""
+
+    protocol = ProxyProtocol.HTTP
+
+    def _authorized(self, headers: List[Tuple[str, str]]) -> bool:
+        if not self.username:
+            return True
+        token = base64.b64encode(f"{self.username}:{self.password}".encode()).decode()
+        return any(
+            name.lower() == "proxy-authorization" and value == f"Basic {token}"
+            for name, value in headers
+        )
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        head = await reader.readuntil(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        method, target, version = lines[0].split(" ", 2)
+        headers = [
+            (name.strip(), value.strip())
+            for name, _, value in (line.partition(":") for line in lines[1:] if line)
+        ]
+        if not self._authorized(headers):
+            self.auth_failures += 1
+            writer.write(b"HTTP/1.1 407 Proxy Authentication Required\r\n\r\n")
+            await writer.drain()
+            return
+        if self._inject_failure():
+            writer.write(b"HTTP/1.1 502 Bad Gateway\r\nContent-Length: 0\r\n\r\n")
+            await writer.drain()
+            return
+
+        if method == "CONNECT":
+            host, _, port = target.rpartition(":")
+            try:
+                upstream = await self._open_upstream(host.strip("[]"), int(port))
+            except OSError:
+                writer.write(b"HTTP/1.1 502 Bad Gateway\r\n\r\n")
+                await writer.drain()
+                return
+            writer.write(b"HTTP/1.1 200 Connection established\r\n\r\n")
+            await writer.drain()
+            await _splice(reader, writer, *upstream)
+            return
+
+        # Absolute-form request: rewrite to origin-form, one request per connection.
+        parts = urlsplit(target)
+        try:
+            upstream_reader, upstream_writer = await self._open_upstream(
+                parts.hostname or "", parts.port or 80
+            )
+        except OSError:
+            writer.write(b"HTTP/1.1 502 Bad Gateway\r\n\r\n")
+            await writer.drain()
+            return
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        forwarded = [f"{method} {path} {version}"]
+        forwarded += [
+            f"{name}: {value}"
+            for name, value in headers
+            if not name.lower().startswith("proxy-") and name.lower() != "connection"
+        ]
+        forwarded.append("Connection: close")
+        upstream_writer.write(("\r\n".join(forwarded) + "\r\n\r\n").encode("latin-1"))
+        await upstream_writer.drain()
+        await _splice(reader, writer, upstream_reader, upstream_writer)
+
+
+class TargetSite:
+    """
+    aiohttp stand-in for a scraped site with injected latency and failures.
+
+    Routes: `/ip` echoes the caller address as {"origin": ...} (validation
+    endpoint); every other path returns a small HTML page.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        block_rate: float = 0.0,
+        block_status: int = 403,
+        blocked_sources: Iterable[str] = (),
+        seed: int = 0,
+    ) -> None:
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.block_rate = block_rate
+        self.block_status = block_status
+        self.blocked_sources = set(blocked_sources)
+        self._random = random.Random(seed)
+        self._runner: Optional[web.AppRunner] = None
+        self.port = 0
+        self.statuses: Counter = Counter()
+        self.sources: Counter = Counter()
+
+    @property
+    def requests(self) -> int:
+        return sum(self.statuses.values())
+
+    def url(self, path: str = "/") -> str:
+        return f"http://127.0.0.1:{self.port}{path}"
+
+    async def start(self) -> "TargetSite":
+        app = web.Application()
+        app.router.add_get("/ip", self._ip)
+        app.router.add_route("*", "/{tail:.*}", self._page)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _delay(self) -> None:
+        delay = self.latency_ms
+        if self.jitter_ms:
+            delay += self._random.uniform(0, self.jitter_ms)
+        if delay:
+            await asyncio.sleep(delay / 1000)
+
+    def _respond(self, status: int, response: web.StreamResponse, source: str):
+        self.statuses[status] += 1
+        self.sources[source] += 1
+        return response
+
+    async def _ip(self, request: web.Request) -> web.StreamResponse:
+        source = request.remote or ""
+        await self._delay()
+        return self._respond(200, web.json_response({"origin": source}), source)
+
+    async def _page(self, request: web.Request) -> web.StreamResponse:
+        source = request.remote or ""
+        await self._delay()
+        if source in self.blocked_sources or (
+            self.block_rate and self._random.random() < self.block_rate
+        ):
+            status = self.block_status
+            return self._respond(status, web.Response(status=status), source)
+        if self.error_rate and self._random.random() < self.error_rate:
+            return self._respond(500, web.Response(status=500), source)
+        body = (
+            "<html><head><title>Stand-in</title></head><body>"
+            f"<h1>{request.path}</h1><p>served at {time.time():.3f}</p>"
+            "</body></html>"
+        )
+        return self._respond(
+            200, web.Response(text=body, content_type="text/html"), source
+        )
+
+
+@asynccontextmanager
+async def running(*servers) -> AsyncIterator[tuple]:
+    """Start stand-ins together and always close them."""
+    started = []
+    try:
+        for server in servers:
+            started.append(await server.start())
+        yield tuple(started)
+    finally:
+        for server in reversed(started):
+            await server.close()
@@ -0,0 +1,134 @@
+# ./tests/test_adaptive_concurrency.py
+"""
+Adaptive per-host concurrency (AIMD) controller tests.
+Run: `pytest tests/test_adaptive_concurrency.py -q`.
+Inputs: synthetic URLs, reported request outcomes, and a patched browser.
+Outputs: assertions on per-host limits, slot gating, and fairness across hosts.
+Side effects: none.
+Operational notes: no network access; latency is injected explicitly.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from web_scraper_toolkit.core.automation.concurrency import (
+    AdaptiveConcurrencyConfig,
+    AdaptiveConcurrencyController,
+)
+from web_scraper_toolkit.server.handlers.extraction import get_contacts
+
+
+def _controller(**overrides) -> AdaptiveConcurrencyController:
+    settings = {"initial_limit": 2, "max_limit": 6, "decrease_cooldown_seconds": 0.0}
+    settings.update(overrides)
+    cfg = AdaptiveConcurrencyConfig(**settings)
+    return AdaptiveConcurrencyController(cfg)
+
+
+def test_limit_grows_on_fast_successes_and_respects_cap() -> None:
+    controller = _controller()
+    for _ in range(200):
+        controller.record_outcome(
+            "https://a.example.com/x", status=200, latency_seconds=0.05
+        )
+    assert controller.current_limit("a.example.com") == 6
+
+
+def test_limit_cut_on_throttle_status_and_block_reason() -> None:
+    controller = _controller(initial_limit=6)
+    controller.record_outcome("a.example.com", status=429, latency_seconds=0.1)
+    assert controller.current_limit("a.example.com") == 3
+    controller.record_outcome(
+        "a.example.com", status=200, block_reason="cf_challenge", latency_seconds=0.1
+    )
+    assert controller.current_limit("a.example.com") == 1
+    controller.record_outcome("a.example.com", status=503, latency_seconds=0.1)
+    assert controller.current_limit("a.example.com") == 1  # floor
+
+
+def test_latency_spike_cuts_limit_and_neutral_errors_do_not() -> None:
+    controller = _controller(initial_limit=4)
+    controller.record_outcome("b.example.com", status=200, latency_seconds=0.1)
+    baseline = controller.current_limit("b.example.com")
+    controller.record_outcome("b.example.com", status=404, latency_seconds=0.1)
+    controller.record_outcome("b.example.com", error=True, latency_seconds=0.1)
+    assert controller.current_limit("b.example.com") == baseline
+    controller.record_outcome("b.example.com", status=200, latency_seconds=5.0)
+    assert controller.current_limit("b.example.com") == baseline // 2
+
+
+@pytest.mark.asyncio
+async def test_slow_host_does_not_block_other_hosts() -> None:
+    controller = _controller(initial_limit=1, max_limit=1)
+    release_slow = asyncio.Event()
+    fast_done: list[str] = []
+
+    async def slow(url: str) -> None:
+        async with controller.slot(url):
+            await release_slow.wait()
+
+    async def fast(url: str) -> None:
+        async with controller.slot(url):
+            fast_done.append(url)
+
+    slow_tasks = [asyncio.create_task(slow(f"https://slow.test/{i}")) for i in range(3)]
+    await asyncio.sleep(0)
+    await asyncio.wait_for(
+        asyncio.gather(*(fast(f"https://fast.test/{i}") for i in range(3))),
+        timeout=1.0,
+    )
+    assert len(fast_done) == 3
+    assert controller.snapshot()["slow.test"]["waiting"] == 2
+
+    release_slow.set()
+    await asyncio.wait_for(asyncio.gather(*slow_tasks), timeout=1.0)
+    assert controller.snapshot()["slow.test"]["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_releases_its_place() -> None:
+    controller = _controller(initial_limit=1, max_limit=1)
+    first = await controller.acquire("https://h.test/1")
+    waiter = asyncio.create_task(controller.acquire("https://h.test/2"))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    controller.release(first)
+    second = await asyncio.wait_for(controller.acquire("https://h.test/3"), 1.0)
+    controller.release(second)
+    assert controller.snapshot()["h.test"]["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_latency_is_timed_from_mark_sent() -> None:
+    controller = _controller()
+    async with controller.slot("https://queued.test/a") as slot:
+        await asyncio.sleep(0.2)  # Global queue / politeness delay
+        slot.mark_sent()
+        slot.report(status=200)
+    assert controller.snapshot()["queued.test"]["latency_ewma_ms"] < 100
+
+
+@pytest.mark.asyncio
+async def test_get_contacts_reports_status_and_block_reason() -> None:
+    challenge = "<html><title>Just a moment...</title></html>"
+    with patch(
+        "web_scraper_toolkit.browser.playwright_handler.PlaywrightManager"
+    ) as manager_cls:
+        manager = manager_cls.return_value
+        manager.start = AsyncMock()
+        manager.stop = AsyncMock()
+        manager.smart_fetch = AsyncMock(
+            return_value=(challenge, "https://cf.test/", 403)
+        )
+        data = await get_contacts("https://cf.test/")
+
+    assert data["status"] == 403
+    assert data["block_reason"] == "cf_challenge"
+    assert "error" in data
+    manager.stop.assert_awaited_once()
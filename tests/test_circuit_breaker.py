@@ -0,0 +1,181 @@
+# ./tests/test_circuit_breaker.py
+"""
+Per-host circuit breaker, retry budget, and frontier parking tests.
+Run: `pytest tests/test_circuit_breaker.py -q`.
+Inputs: synthetic hosts, failing async operations, and injected clock values.
+Outputs: assertions on breaker state transitions, budget exhaustion, and parking.
+Side effects: none.
+Operational notes: no network access; time is injected where transitions matter.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from web_scraper_toolkit.core.automation.retry import (
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+    RetryBudget,
+    RetryBudgetConfig,
+    RetryConfig,
+    get_circuit_breakers,
+    retry_operation,
+    set_circuit_breakers,
+    set_retry_budget,
+    set_retry_config,
+)
+from web_scraper_toolkit.crawler.frontier import Frontier
+from web_scraper_toolkit.scraper import ProxyScraper
+
+
+def test_breaker_opens_then_half_open_trial_closes_it() -> None:
+    breaker = CircuitBreaker(
+        CircuitBreakerConfig(failure_threshold=3, recovery_timeout_seconds=10)
+    )
+    for _ in range(3):
+        assert breaker.allow_request(now=0.0)
+        breaker.record_failure(now=0.0)
+    assert breaker.state == "open"
+    assert not breaker.allow_request(now=5.0)
+    assert breaker.retry_after(now=5.0) == pytest.approx(5.0)
+
+    assert breaker.allow_request(now=10.0)  # Trial request
+    assert breaker.state == "half_open"
+    assert not breaker.allow_request(now=10.5)  # Only one trial at a time
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow_request(now=11.0)
+
+
+def test_failed_trial_reopens_with_longer_timeout() -> None:
+    breaker = CircuitBreaker(
+        CircuitBreakerConfig(
+            failure_threshold=1,
+            recovery_timeout_seconds=10,
+            max_recovery_timeout_seconds=15,
+        )
+    )
+    breaker.record_failure(now=0.0)
+    assert breaker.allow_request(now=10.0)
+    breaker.record_failure(now=10.0)
+    assert breaker.state == "open"
+    assert breaker.retry_after(now=10.0) == pytest.approx(15.0)  # Capped doubling
+
+
+def test_registry_keys_by_host() -> None:
+    registry = CircuitBreakerRegistry(CircuitBreakerConfig(failure_threshold=2))
+    registry.record_failure("https://www.down.test/a")
+    registry.record_failure("https://down.test/b")
+    assert registry.state("down.test") == "open"
+    assert not registry.allow_request("https://down.test/c")
+    assert registry.allow_request("https://up.test/")
+    assert set(registry.snapshot()) == {"down.test"}
+
+
+def test_retry_budget_caps_retries_to_request_ratio() -> None:
+    budget = RetryBudget(RetryBudgetConfig(retry_ratio=0.5, min_retries_per_second=0.0))
+    budget._balance = 0.0
+    for _ in range(4):
+        budget.record_request()
+    assert budget.try_acquire()
+    assert budget.try_acquire()
+    assert not budget.try_acquire()
+    assert budget.stats()["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_retry_operation_stops_when_circuit_opens() -> None:
+    set_retry_config(
+        RetryConfig(max_attempts=10, initial_delay_seconds=0.0, jitter=False)
+    )
+    set_retry_budget(RetryBudget())
+    calls = 0
+
+    async def failing() -> None:
+        nonlocal calls
+        calls += 1
+        raise ConnectionError("boom")
+
+    try:
+        with pytest.raises(CircuitOpenError):
+            await retry_operation(failing, circuit_key="https://flaky.test/x")
+        threshold = get_circuit_breakers().config.failure_threshold
+        assert calls == threshold
+
+        with pytest.raises(CircuitOpenError) as exc_info:
+            await retry_operation(failing, circuit_key="https://flaky.test/y")
+        assert exc_info.value.host == "flaky.test"
+        assert calls == threshold
+    finally:
+        set_retry_config(RetryConfig())
+
+
+class _Forbidden(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        self.send_response(403)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def test_released_trial_lets_the_next_caller_probe() -> None:
+    breaker = CircuitBreaker(
+        CircuitBreakerConfig(failure_threshold=1, recovery_timeout_seconds=10)
+    )
+    breaker.record_failure(now=0.0)
+    assert breaker.allow_request(now=10.0)
+    assert not breaker.allow_request(now=10.5)
+    breaker.release_trial()
+    assert breaker.state == "half_open"
+    assert breaker.allow_request(now=10.5)
+
+
+@pytest.mark.asyncio
+async def test_direct_blocks_settle_the_breaker_without_opening_it() -> None:
+    registry = CircuitBreakerRegistry(
+        CircuitBreakerConfig(failure_threshold=1, recovery_timeout_seconds=0.05)
+    )
+    set_circuit_breakers(registry)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Forbidden)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/"
+    try:
+        registry.record_failure(url)
+        await asyncio.sleep(0.06)
+        assert await ProxyScraper().secure_fetch(url) is None
+        # The blocked trial closed the half-open breaker, and repeated
+        # blocks leave it closed for the Playwright fallback.
+        assert registry.state(url) == "closed"
+        for _ in range(2):
+            assert await ProxyScraper().secure_fetch(url) is None
+        assert registry.allow_request(url)
+    finally:
+        server.shutdown()
+        server.server_close()
+        set_circuit_breakers(CircuitBreakerRegistry())
+
+
+@pytest.mark.asyncio
+async def test_frontier_parks_items_until_ready() -> None:
+    frontier = Frontier()
+    await frontier.add_url("https://a.test/", priority=1)
+    item = await frontier.get_next()
+    assert item is not None
+
+    await frontier.park(item, 0.05)
+    assert not frontier.is_empty()
+    assert await frontier.get_next() is None
+    assert 0 < frontier.next_ready_in() <= 0.05
+
+    await asyncio.sleep(0.06)
+    promoted = await frontier.get_next()
+    assert promoted is not None and promoted.url == "https://a.test/"
+    assert frontier.is_empty()
@@ -7,6 +7,9 @@ from web_scraper_toolkit.parsers import (
     extract_phones,
     extract_socials,
 )
+from web_scraper_toolkit.parsers.extraction.contacts import (
+    extract_contacts_from_html,
+)
 from bs4 import BeautifulSoup
 
 
@@ -82,6 +85,71 @@ class TestContactExtraction(unittest.TestCase):
         self.assertIn("https://www.linkedin.com/in/roy", urls)
         self.assertNotIn("/internal-link", urls)
 
+    def test_phone_prefilter_skips_digit_tables(self):
+        """Dates, prices and order numbers never reach phonenumbers."""
+        rows = "".join(
+            f"<tr><td>$1{i:03d}.50</td><td>2024-05-{i % 28 + 1:02d}</td>"
+            f"<td>Order #{3100000 + i}</td></tr>"
+            for i in range(300)
+        )
+        html = (
+            f"<html><body><table>{rows}</table>"
+            "<p>Questions? Call (212) 555-0147 or write to help@acme.example.</p>"
+            '<a href="tel:+16465550100">Call us</a>'
+            '<a href="https://github.com/acme">GitHub</a>'
+            "</body></html>"
+        )
+        result = extract_contacts_from_html(html, "http://acme.example")
+
+        phones = [r["value"] for r in result["phones"]]
+        self.assertEqual(phones, ["(212) 555-0147", "(646) 555-0100"])
+        self.assertIn("Questions? Call", result["phones"][0]["context"])
+        self.assertEqual(result["phones"][1]["context"], "Call us")
+
+        email = result["emails"][0]
+        self.assertEqual(email["value"], "help@acme.example")
+        self.assertIn("or write to", email["context"])
+        self.assertEqual(
+            [r["value"] for r in result["socials"]], ["https://github.com/acme"]
+        )
+
+    def test_adjacent_phone_cells(self):
+        """Numbers in neighbouring list items and table cells are all found."""
+        html = (
+            "<html><body><ul><li>(212) 555-0100</li><li>(212) 555-0175</li>"
+            "<li>1 (415) 733-4964</li><li>+1 646 220 4815</li>"
+            "<li>1 (312) 321-0724</li></ul><table><tr><td>617.305.8307</td>"
+            "<td>312.849.3893</td><td>617-485-8280</td></tr></table>"
+            "</body></html>"
+        )
+        result = extract_contacts_from_html(html, "http://acme.example")
+
+        self.assertEqual(
+            [r["value"] for r in result["phones"]],
+            [
+                "(212) 555-0100",
+                "(212) 555-0175",
+                "(415) 733-4964",
+                "(646) 220-4815",
+                "(312) 321-0724",
+                "(617) 305-8307",
+                "(312) 849-3893",
+                "(617) 485-8280",
+            ],
+        )
+
+    def test_joined_phone_fax_numbers(self):
+        """Numbers joined by "/" or "-" without spaces are both found."""
+        for text in (
+            "Phone/Fax: 212-555-0100/212-555-0101",
+            "Phone/Fax: (212)555-0100-(212)555-0101",
+        ):
+            with self.subTest(text=text):
+                self.assertEqual(
+                    [r["value"] for r in extract_phones(text, "http://acme.example")],
+                    ["(212) 555-0100", "(212) 555-0101"],
+                )
+
 
 if __name__ == "__main__":
     unittest.main()
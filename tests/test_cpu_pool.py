@@ -0,0 +1,94 @@
+# ./tests/test_cpu_pool.py
+"""
+CPU offload pool tests: routing (inline, pickled, shared memory) and recovery.
+Run: `pytest tests/test_cpu_pool.py -q`.
+Inputs: synthetic HTML pages and module-level worker functions.
+Outputs: assertions on results, routing counters, segment cleanup, and
+inline fallback after a worker dies.
+Side effects: starts short-lived worker processes; creates and unlinks
+`multiprocessing.shared_memory` segments.
+Operational notes: worker functions live at module level so they pickle.
+"""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from web_scraper_toolkit.core.automation.cpu_pool import SHM_MIN_BYTES, CpuPool
+from web_scraper_toolkit.parsers.extraction.contacts import (
+    extract_contacts_from_html,
+)
+
+
+def _describe(html: str, suffix: str = "") -> tuple:
+    return len(html), html[-3:] + suffix, os.getpid()
+
+
+def _exit_in_worker(html: str, parent_pid: int) -> str:
+    if os.getpid() != parent_pid:
+        os._exit(1)
+    return "inline"
+
+
+@pytest.fixture
+def pool():
+    pool = CpuPool(workers=2, min_offload_bytes=1024)
+    yield pool
+    pool.shutdown()
+
+
+def _shm_names() -> set:
+    return set(os.listdir("/dev/shm")) if os.path.isdir("/dev/shm") else set()
+
+
+@pytest.mark.asyncio
+async def test_pages_are_routed_by_size(pool) -> None:
+    before = _shm_names()
+
+    small = await pool.run(_describe, "<p>hi</p>")
+    assert small[2] == os.getpid()
+    assert pool._executor is None  # Small pages never start workers
+
+    medium_html = "<p>medium</p>" * 1000
+    medium = await pool.run(_describe, medium_html, suffix="!")
+    assert medium[:2] == (len(medium_html), "/p>!")
+    assert medium[2] != os.getpid()
+
+    # Multi-byte text crosses shared memory intact.
+    large_html = "<p>café ☕</p>" * (SHM_MIN_BYTES // 10)
+    large = await pool.run(_describe, large_html)
+    assert large[:2] == (len(large_html), "/p>")
+
+    assert pool.stats.as_dict() == {
+        "inline": 1,
+        "offloaded": 2,
+        "shm_transfers": 1,
+        "shm_bytes": len(large_html.encode("utf-8")),
+        "pool_restarts": 0,
+    }
+    assert _shm_names() == before  # Segment unlinked after the call
+
+
+@pytest.mark.asyncio
+async def test_contacts_match_inline_extraction(pool) -> None:
+    html = (
+        "<html><head><meta property='og:site_name' content='Acme'></head><body>"
+        + "<p>filler text</p>" * 200
+        + "<p>Mail sales@acme-example.com or call (212) 555-0100.</p>"
+        + "<a href='https://www.linkedin.com/company/acme?x=1'>in</a></body></html>"
+    )
+    offloaded = await pool.run(extract_contacts_from_html, html, "https://acme.test")
+    assert pool.stats.offloaded == 1
+    assert offloaded == extract_contacts_from_html(html, "https://acme.test")
+    assert offloaded["names"] == {"business_name": "Acme"}
+    assert offloaded["socials"][0]["value"] == "https://www.linkedin.com/company/acme"
+
+
+@pytest.mark.asyncio
+async def test_dead_worker_falls_back_inline_and_pool_recovers(pool) -> None:
+    html = "x" * 4096
+    assert await pool.run(_exit_in_worker, html, os.getpid()) == "inline"
+    assert pool.stats.pool_restarts == 1
+    assert (await pool.run(_describe, html))[2] != os.getpid()
@@ -1,4 +1,5 @@
 # ./tests/test_discovery.py
+import asyncio
 import unittest
 from unittest.mock import patch
 # sys.path handled by run_tests.py or discovery
@@ -6,52 +7,82 @@ from unittest.mock import patch
 from web_scraper_toolkit.parsers.discovery import smart_discover_urls
 
 
+def _serve(documents, fetched):
+    """Stand-in for the sitemap byte stream backed by a dict of documents."""
+
+    async def _chunks(url, **kwargs):
+        fetched.append(url)
+        await asyncio.sleep(0.01)  # Network latency lets the consumer keep up
+        content = documents.get(url)
+        if content:
+            yield content.encode("utf-8")
+
+    return _chunks
+
+
+def _index(*locs):
+    return "<sitemapindex>%s</sitemapindex>" % "".join(
+        f"<sitemap><loc>{loc}</loc></sitemap>" for loc in locs
+    )
+
+
+def _urlset(*locs):
+    return "<urlset>%s</urlset>" % "".join(
+        f"<url><loc>{loc}</loc></url>" for loc in locs
+    )
+
+
 class TestSmartDiscovery(unittest.IsolatedAsyncioTestCase):
     @patch("web_scraper_toolkit.parsers.discovery.find_sitemap_urls")
-    @patch("web_scraper_toolkit.parsers.discovery.peek_sitemap_index")
-    @patch("web_scraper_toolkit.parsers.discovery.extract_sitemap_tree")
-    async def test_smart_discover_urls_basics(self, mock_extract, mock_peek, mock_find):
-        # Setup Mocks
+    async def test_smart_discover_urls_basics(self, mock_find):
         mock_find.return_value = ["http://test.com/sitemap.xml"]
-
-        # Mock peek to return an index
-        mock_peek.return_value = {
-            "type": "index",
-            "sitemaps": [
-                {"url": "http://test.com/post-sitemap.xml", "count": 10},
-                {"url": "http://test.com/product-sitemap.xml", "count": 50},
-            ],
+        documents = {
+            "http://test.com/sitemap.xml": _index(
+                "http://test.com/post-sitemap.xml",
+                "http://test.com/product-sitemap.xml",
+            ),
+            "http://test.com/post-sitemap.xml": _urlset(
+                "http://test.com/about-us", "http://test.com/random-stuff"
+            ),
+            "http://test.com/product-sitemap.xml": _urlset("http://test.com/product/1"),
         }
+        fetched = []
 
-        # Mock extract side effect
-        async def extract_side_effect(url, depth, *args, **kwargs):
-            if "post-sitemap" in url:
-                return ["http://test.com/about-us", "http://test.com/random-stuff"]
-            return []
+        with patch(
+            "web_scraper_toolkit.parsers.sitemap.fetching.iter_sitemap_chunks",
+            new=_serve(documents, fetched),
+        ):
+            results = await smart_discover_urls("http://test.com")
 
-        mock_extract.side_effect = extract_side_effect
-
-        # Execute
-        results = await smart_discover_urls("http://test.com")
+        priority_urls = [u["url"] for u in results["priority_urls"]]
+        general_urls = [u["url"] for u in results["general_urls"]]
+        self.assertEqual(priority_urls, ["http://test.com/about-us"])
+        self.assertEqual(general_urls, ["http://test.com/random-stuff"])
+        # "product" is an exclude keyword: that child is never fetched.
+        self.assertNotIn("http://test.com/product-sitemap.xml", fetched)
 
-        # Verify Results
-        priority = results["priority_urls"]
-        general = results["general_urls"]
-
-        # Check priority classification
-        priority_urls = [u["url"] for u in priority]
-        self.assertIn("http://test.com/about-us", priority_urls)
+    @patch("web_scraper_toolkit.parsers.discovery.find_sitemap_urls")
+    async def test_stops_fetching_once_quotas_are_filled(self, mock_find):
+        mock_find.return_value = ["http://test.com/sitemap.xml"]
+        children = [f"http://test.com/part-{i}.xml" for i in range(40)]
+        documents = {"http://test.com/sitemap.xml": _index(*children)}
+        for i, child in enumerate(children):
+            documents[child] = _urlset(
+                f"http://test.com/about/{i}", f"http://test.com/misc/{i}"
+            )
+        fetched = []
 
-        # Check general classification
-        general_urls = [u["url"] for u in general]
-        self.assertIn("http://test.com/random-stuff", general_urls)
+        with patch(
+            "web_scraper_toolkit.parsers.sitemap.fetching.iter_sitemap_chunks",
+            new=_serve(documents, fetched),
+        ):
+            results = await smart_discover_urls(
+                "http://test.com", max_priority=2, max_general=2, concurrency=2
+            )
 
-        # Verify product-sitemap content was NOT returned (since it returns [] in default side effect unless post-sitemap)
-        # But wait, logic says "product" in default exclude keywords.
-        # So "product-sitemap" loop should continue before calling extract.
-        # So extract is NEVER CALLED for product-sitemap.
-        # We can check that implicitly by ensuring no "product" URLs if we had them.
-        pass
+        self.assertEqual(len(results["priority_urls"]), 2)
+        self.assertEqual(len(results["general_urls"]), 2)
+        self.assertLess(len(fetched), len(children))
 
     @patch("web_scraper_toolkit.parsers.discovery.find_sitemap_urls")
     async def test_no_sitemaps_found(self, mock_find):
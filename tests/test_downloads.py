@@ -0,0 +1,175 @@
+# ./tests/test_downloads.py
+"""
+Ranged/resumable download engine tests against a local aiohttp server.
+Run: `pytest tests/test_downloads.py -q`.
+Inputs: an in-process HTTP server serving a deterministic payload.
+Outputs: assertions on parallel segments, resume from sidecar, 200 and unusable
+206 fallbacks, and zero-length resources.
+Side effects: writes files under pytest's tmp_path only.
+Operational notes: binds 127.0.0.1 on an ephemeral port; no external network.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+
+import pytest
+from aiohttp import web
+
+from web_scraper_toolkit.core.automation.downloads import DownloadConfig
+from web_scraper_toolkit.core.automation.utilities import download_file
+from web_scraper_toolkit.core.http_client import SharedHttpClient
+
+PAYLOAD = bytes(range(256)) * 2048  # 512 KiB
+RANGE_RE = re.compile(r"bytes=(\d+)-(\d*)")
+
+
+def _config() -> DownloadConfig:
+    return DownloadConfig(
+        parallel_segments=4,
+        min_segment_bytes=64 * 1024,
+        buffer_bytes=16 * 1024,
+        segment_retries=0,
+        state_flush_bytes=1,
+    )
+
+
+async def _serve(handler):
+    app = web.Application()
+    app.router.add_get("/file.bin", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/file.bin"
+
+
+def _range_handler(stats: dict, fail_after: dict):
+    async def handler(request: web.Request) -> web.StreamResponse:
+        match = RANGE_RE.match(request.headers.get("Range", ""))
+        if not match:
+            return web.Response(body=PAYLOAD)
+        start = int(match.group(1))
+        end = int(match.group(2) or len(PAYLOAD) - 1)
+        stats.setdefault("ranges", []).append((start, end))
+        body = PAYLOAD[start : end + 1]
+        response = web.StreamResponse(
+            status=206,
+            headers={
+                "Content-Range": f"bytes {start}-{end}/{len(PAYLOAD)}",
+                "Content-Length": str(len(body)),
+                "Accept-Ranges": "bytes",
+                "ETag": '"v1"',
+            },
+        )
+        await response.prepare(request)
+        cutoff = fail_after.pop(start, None) if start > 0 else None
+        if cutoff is not None:
+            await response.write(body[:cutoff])
+            request.transport.close()  # Simulated network blip
+            return response
+        await response.write(body)
+        return response
+
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_parallel_ranged_download(tmp_path) -> None:
+    stats: dict = {}
+    runner, url = await _serve(_range_handler(stats, {}))
+    try:
+        target = tmp_path / "out.bin"
+        result = await download_file(url, str(target), config=_config())
+        assert result["saved"] is True
+        assert result["ranged"] is True
+        assert result["segments"] == 4
+        assert target.read_bytes() == PAYLOAD
+        assert not os.path.exists(f"{target}.part.json")
+        assert len(stats["ranges"]) == 5  # probe + 4 segments
+    finally:
+        await SharedHttpClient.close()
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_interrupted_download_resumes_from_sidecar(tmp_path) -> None:
+    stats: dict = {}
+    # Cut the second segment (starts at 128 KiB) after 40 KiB on first try.
+    runner, url = await _serve(_range_handler(stats, {128 * 1024: 40 * 1024}))
+    try:
+        target = tmp_path / "out.bin"
+        first = await download_file(url, str(target), config=_config())
+        assert first["saved"] is False
+        assert first["resumable"] is True
+        assert os.path.exists(f"{target}.part")
+
+        second = await download_file(url, str(target), config=_config())
+        assert second["saved"] is True
+        assert second["resumed_bytes"] > 0
+        assert target.read_bytes() == PAYLOAD
+        assert not os.path.exists(f"{target}.part")
+    finally:
+        await SharedHttpClient.close()
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_server_without_ranges_streams_full_body(tmp_path) -> None:
+    async def handler(request: web.Request) -> web.Response:
+        return web.Response(body=PAYLOAD)
+
+    runner, url = await _serve(handler)
+    try:
+        target = tmp_path / "out.bin"
+        result = await download_file(url, str(target), config=_config())
+        assert result["saved"] is True
+        assert result["ranged"] is False
+        assert target.read_bytes() == PAYLOAD
+    finally:
+        await SharedHttpClient.close()
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("content_range", ["bytes 0-0/*", None, "bytes 0-0/unknown"])
+async def test_unusable_partial_probe_refetches_full_body(
+    tmp_path, content_range
+) -> None:
+    async def handler(request: web.Request) -> web.Response:
+        if "Range" not in request.headers:
+            return web.Response(body=PAYLOAD)
+        headers = {"Content-Range": content_range} if content_range else {}
+        return web.Response(status=206, body=PAYLOAD[:1], headers=headers)
+
+    runner, url = await _serve(handler)
+    try:
+        target = tmp_path / "out.bin"
+        result = await download_file(url, str(target), config=_config())
+        assert result["saved"] is True
+        assert result["ranged"] is False
+        assert target.read_bytes() == PAYLOAD
+    finally:
+        await SharedHttpClient.close()
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_zero_length_resource_saves_empty_file(tmp_path) -> None:
+    async def handler(request: web.Request) -> web.Response:
+        if "Range" in request.headers:
+            return web.Response(status=416, headers={"Content-Range": "bytes */0"})
+        return web.Response(body=b"")
+
+    runner, url = await _serve(handler)
+    try:
+        target = tmp_path / "out.bin"
+        result = await download_file(url, str(target), config=_config())
+        assert result["saved"] is True
+        assert result["size_bytes"] == 0
+        assert target.read_bytes() == b""
+    finally:
+        await SharedHttpClient.close()
+        await runner.cleanup()
@@ -0,0 +1,356 @@
+# ./tests/test_fetch_cache.py
+"""
+Response-cache integration tests for smart_fetch and the markdown pipeline.
+Run: `pytest tests/test_fetch_cache.py -q`.
+Inputs: a stub manager whose live fetch is scripted, plus synthetic headers.
+Outputs: assertions on cache hits/misses, `cached` metadata, header rules,
+stale-while-revalidate refreshes, conditional (304) revalidation, and how
+in-page content extraction reports are threaded and cached.
+Side effects: the global ResponseCache is swapped for one under tmp_path.
+Operational notes: no browser is launched; only the cache wrapper is real. The
+secure_fetch test binds a 127.0.0.1 aiohttp server on an ephemeral port.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from web_scraper_toolkit.browser import playwright_handler
+from web_scraper_toolkit.browser._playwright_handler import artifacts
+from web_scraper_toolkit.browser._playwright_handler.artifacts import (
+    PlaywrightSmartFetchArtifactsMixin,
+)
+from web_scraper_toolkit.core.automation.rate_limit import (
+    get_shared_limiter,
+    set_shared_limiter,
+)
+from web_scraper_toolkit.core.state import cache as cache_module
+from web_scraper_toolkit.core.state.cache import (
+    CacheConfig,
+    ResponseCache,
+    header_ttl,
+)
+from web_scraper_toolkit.parsers.content import aread_website_markdown_result
+from web_scraper_toolkit.scraper.aiohttp import ProxyScraper
+
+
+class _StubManager(PlaywrightSmartFetchArtifactsMixin):
+    def __init__(self, mode: str = "bypass", headers=None) -> None:
+        self.response_cache_mode = mode
+        self.headers = dict(headers or {})
+        self.live_calls = 0
+        self._last_fetch_metadata = {}
+        self._last_response_headers = {}
+
+    async def _smart_fetch_live(self, url, **kwargs):
+        self.live_calls += 1
+        self._last_response_headers = dict(self.headers)
+        self._last_fetch_metadata = {"attempt_profile": "baseline"}
+        return f"<html><body><p>Page {url}</p></body></html>", url + "#final", 200
+
+    async def _refresh_cached_page(self, url, **fetch_kwargs):
+        await self.smart_fetch(url, cache_mode="refresh", **fetch_kwargs)
+
+    def get_last_fetch_metadata(self):
+        return dict(self._last_fetch_metadata)
+
+
+class _ExtractingStub(_StubManager):
+    """Live fetch that mimics `fetch_page_content`'s in-page extraction."""
+
+    def __init__(self, mode: str = "bypass", selector_found: bool = True) -> None:
+        super().__init__(mode)
+        self.selector_found = selector_found
+        self.live_kwargs = []
+
+    async def _smart_fetch_live(self, url, **kwargs):
+        self.live_kwargs.append(kwargs)
+        if kwargs.get("content_extraction") != "main":
+            return await super()._smart_fetch_live(url, **kwargs)
+        self.live_calls += 1
+        self._last_fetch_metadata = {"attempt_profile": "baseline"}
+        selector = kwargs.get("extract_selector")
+        report = {"mode": "main", "applied": True, "strategy": "semantic"}
+        if selector:
+            report.update(selector=selector, selector_matched=self.selector_found)
+            if self.selector_found:
+                report["strategy"] = "selector"
+        report.update(full_bytes=50_000, returned_bytes=80, bytes_saved=49_920)
+        self._last_content_extraction = report
+        return f"<html><body><p>Main {url}</p></body></html>", url, 200
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path, monkeypatch):
+    cache = ResponseCache(
+        CacheConfig(directory=str(tmp_path), sweep_interval_seconds=0)
+    )
+    monkeypatch.setattr(cache_module, "_global_cache", cache)
+    yield cache
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_use_mode_serves_repeat_fetches_from_cache() -> None:
+    manager = _StubManager(mode="use")
+    url = "https://example.com/a"
+
+    first = await manager.smart_fetch(url)
+    assert manager.get_last_fetch_metadata()["cached"] is False
+    second = await manager.smart_fetch(url)
+    metadata = manager.get_last_fetch_metadata()
+
+    assert manager.live_calls == 1
+    assert second == first
+    assert metadata["cached"] is True
+    assert metadata["final_url"] == url + "#final"
+
+    # Per-call bypass and refresh both go back to the network.
+    await manager.smart_fetch(url, cache_mode="bypass")
+    await manager.smart_fetch(url, cache_mode="refresh")
+    assert manager.live_calls == 3
+
+
+@pytest.mark.asyncio
+async def test_default_is_opt_in_and_no_store_is_respected(_isolated_cache) -> None:
+    bypassing = _StubManager()
+    await bypassing.smart_fetch("https://example.com/b")
+    await bypassing.smart_fetch("https://example.com/b")
+    assert bypassing.live_calls == 2
+    assert _isolated_cache.get_stats()["disk_entries"] == 0
+
+    private = _StubManager(mode="use", headers={"Cache-Control": "no-store"})
+    await private.smart_fetch("https://example.com/c")
+    await private.smart_fetch("https://example.com/c")
+    assert private.live_calls == 2
+
+    short = _StubManager(mode="use", headers={"cache-control": "max-age=5"})
+    await short.smart_fetch("https://example.com/d")
+    assert _isolated_cache.get_entry("https://example.com/d").ttl_seconds == 5
+
+
+@pytest.mark.asyncio
+async def test_markdown_result_reports_cached_flag() -> None:
+    manager = _StubManager(mode="bypass")
+    url = "https://example.com/e"
+    miss = await aread_website_markdown_result(
+        url, playwright_manager=manager, cache_mode="use"
+    )
+    hit = await aread_website_markdown_result(
+        url, playwright_manager=manager, cache_mode="use"
+    )
+    assert miss.metadata["cached"] is False
+    assert hit.metadata["cached"] is True
+    assert hit.markdown == miss.markdown
+    assert manager.live_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_markdown_result_truncates_to_max_length() -> None:
+    manager = _StubManager()
+    result = await aread_website_markdown_result(
+        "https://example.com/long", playwright_manager=manager, max_length=8
+    )
+    assert result.markdown.endswith("Page htt\n\n... [Truncated due to max_length]")
+
+
+@pytest.mark.asyncio
+async def test_main_extraction_is_reported_and_cached_per_mode() -> None:
+    manager = _ExtractingStub(mode="use")
+    url = "https://example.com/article"
+
+    content, _, _ = await manager.smart_fetch(url, content_extraction="main")
+    report = manager.get_last_fetch_metadata()["content_extraction"]
+    assert content.startswith("<html><body><p>Main")
+    assert manager.live_kwargs[-1] == {"content_extraction": "main"}
+    assert report["applied"] is True and report["bytes_saved"] == 49_920
+
+    # The extracted body answers later "main" reads but never full reads.
+    await manager.smart_fetch(url, content_extraction="main")
+    assert manager.get_last_fetch_metadata()["cached"] is True
+    assert manager.get_last_fetch_metadata()["content_extraction"]["applied"]
+    await manager.smart_fetch(url, extract_selector="#story")
+    assert manager.live_calls == 2
+    assert manager.live_kwargs[-1] == {}
+    assert "content_extraction" not in manager.get_last_fetch_metadata()
+
+    # Once the full page is cached it serves every mode.
+    await manager.smart_fetch(url, content_extraction="main", extract_selector="#x")
+    metadata = manager.get_last_fetch_metadata()
+    assert manager.live_calls == 2
+    assert metadata["content_extraction"] == {"mode": "main", "applied": False}
+
+
+@pytest.mark.asyncio
+async def test_markdown_result_uses_in_page_selector() -> None:
+    manager = _ExtractingStub()
+    result = await aread_website_markdown_result(
+        "https://example.com/story",
+        playwright_manager=manager,
+        selector="#story",
+        content_extraction="main",
+    )
+    # The stub body has no #story; the in-page match is trusted as is.
+    assert "Main https://example.com/story" in result.markdown
+    assert manager.live_kwargs[-1]["extract_selector"] == "#story"
+    assert result.metadata["content_extraction"]["bytes_saved"] == 49_920
+
+    missing = await aread_website_markdown_result(
+        "https://example.com/story",
+        playwright_manager=_ExtractingStub(selector_found=False),
+        selector="#story",
+        content_extraction="main",
+    )
+    assert missing.markdown.startswith("Error: Selector '#story' not found")
+
+
+def test_header_ttl_follows_cache_control_and_expires() -> None:
+    assert header_ttl({}) is None
+    assert header_ttl({"Cache-Control": "public, max-age=120"}) == 120
+    assert header_ttl({"Cache-Control": "s-maxage=30, max-age=120"}) == 30
+    assert header_ttl({"Cache-Control": "no-cache"}) == 0
+    assert header_ttl({"Expires": "Thu, 01 Jan 1970 00:00:00 GMT"}) == 0
+    assert header_ttl({"Expires": "garbage"}) == 0
+
+
+@pytest.mark.asyncio
+async def test_stale_page_is_served_while_refreshing(_isolated_cache) -> None:
+    manager = _StubManager(
+        mode="use",
+        headers={"Cache-Control": "max-age=0.05, stale-while-revalidate=60"},
+    )
+    url = "https://example.com/stale"
+    await manager.smart_fetch(url)
+    await asyncio.sleep(0.1)
+
+    served = await manager.smart_fetch(url)
+    assert manager.get_last_fetch_metadata()["cache_stale"] is True
+    assert served[0] and manager.live_calls == 1
+    for _ in range(50):  # Let the background refresh land
+        if manager.live_calls == 2:
+            break
+        await asyncio.sleep(0.01)
+    assert manager.live_calls == 2
+    assert not _isolated_cache.is_stale(_isolated_cache.get_entry(url))
+
+
+class _RefreshBrowser:
+    """Stands in for the private PlaywrightManager a refresh runs on."""
+
+    launched: list = []
+    active: list = []
+    peak = 0
+
+    def __init__(self, config=None, proxy_manager=None) -> None:
+        self.config = config
+        self.proxy_manager = proxy_manager
+        self.fetches = []
+        self.stopped = False
+        _RefreshBrowser.launched.append(self)
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        self.stopped = True
+
+    async def smart_fetch(self, url, **kwargs):
+        _RefreshBrowser.active.append(url)
+        _RefreshBrowser.peak = max(_RefreshBrowser.peak, len(self.active))
+        await asyncio.sleep(0.01)
+        _RefreshBrowser.active.remove(url)
+        self.fetches.append((url, kwargs))
+        return "<html></html>", url, 200
+
+
+class _PooledStub(_StubManager):
+    _refresh_cached_page = PlaywrightSmartFetchArtifactsMixin._refresh_cached_page
+
+    def __init__(self) -> None:
+        super().__init__(mode="use")
+        self.config = {"headless": True}
+
+
+@pytest.mark.asyncio
+async def test_stale_refreshes_are_capped_and_share_a_browser(
+    _isolated_cache, monkeypatch
+) -> None:
+    monkeypatch.setattr(playwright_handler, "PlaywrightManager", _RefreshBrowser)
+    urls = [f"https://example.com/swr/{i}" for i in range(4)]
+    for url in urls:
+        _isolated_cache.store_response(
+            url,
+            "<html><body>old</body></html>",
+            {"Cache-Control": "max-age=0.01, stale-while-revalidate=60"},
+        )
+    await asyncio.sleep(0.05)
+
+    manager = _PooledStub()
+    for url in urls:
+        await manager.smart_fetch(url, content_extraction="main")
+    for _ in range(100):
+        if not artifacts._REFRESH_TASKS:
+            break
+        await asyncio.sleep(0.01)
+
+    assert manager.live_calls == 0
+    assert len(_RefreshBrowser.launched) == 1 and _RefreshBrowser.peak == 1
+    browser = _RefreshBrowser.launched[0]
+    assert [url for url, _ in browser.fetches] == urls
+    assert browser.fetches[0][1] == {
+        "cache_mode": "refresh",
+        "content_extraction": "main",
+    }
+    assert browser.stopped and not artifacts._REFRESHING
+
+
+@pytest.mark.asyncio
+async def test_secure_fetch_revalidates_with_etag() -> None:
+    seen = []
+
+    async def page(request: web.Request) -> web.Response:
+        seen.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304, headers={"Cache-Control": "max-age=60"})
+        return web.Response(
+            text="<html>v1</html>",
+            headers={"ETag": '"v1"', "Cache-Control": "max-age=0, must-revalidate"},
+        )
+
+    app = web.Application()
+    app.router.add_get("/doc", page)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    previous = get_shared_limiter()
+    set_shared_limiter(None)
+    try:
+        url = f"http://127.0.0.1:{port}/doc"
+        scraper = ProxyScraper(retry_delay_seconds=0)
+        cache_module.get_cache().store_response(
+            url,
+            "<html>v1</html>",
+            {
+                "ETag": '"v1"',
+                "Cache-Control": "max-age=0.01, stale-while-revalidate=60",
+            },
+        )
+        await asyncio.sleep(0.05)
+        # Stale copy comes back at once; the conditional refetch runs behind it.
+        assert await scraper.secure_fetch(url, cache_mode="use") == "<html>v1</html>"
+        for _ in range(100):
+            if seen:
+                break
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+        assert seen == ['"v1"']
+        entry = cache_module.get_cache().get_entry(url)
+        assert entry is not None and entry.ttl_seconds == 60
+    finally:
+        set_shared_limiter(previous)
+        await runner.cleanup()
@@ -4,6 +4,30 @@ import re
 
 # sys.path handled by run_tests.py
 from web_scraper_toolkit.parsers.html_to_markdown import MarkdownConverter
+from web_scraper_toolkit.parsers.markdown_engine import html_to_markdown
+
+# Shapes where the lxml engine must reproduce the soup converter exactly.
+PARITY_FIXTURES = [
+    "<h1>Title</h1><p>Body text.</p>",
+    "<div><p>Paragraph <b>Bold</b></p><p></p><em></em></div>",
+    "<ul><li>a<ul><li>b</li><li>c<ol><li>d</li></ol></li></ul></li>x<li>e</li></ul>",
+    "<div><li>stray item</li><ol><p>skipped</p><li>one</li><li>two</li></ol></div>",
+    '<a href="/x"><span><div><h2>T</h2><p>d <i>e</i></p></div></span> tail</a>',
+    '<a href="/x"><section>block</section></a><a href="#top">anchor</a>',
+    '<a href="javascript:void(0)">js</a><a href="">empty</a><a href="/i"><img src="p.png"></a>',
+    "<p>a<!-- comment -->b<!---->c<?php echo 1 ?></p>",
+    "<p>x <script>bad()</script> y<style>p{}</style>z</p><nav>menu</nav>after",
+    "<blockquote>line one<br>line two<p>three</p>  </blockquote>",
+    "<pre>  keep\n   spacing <b>bold</b>\n</pre><pre><span><code>x = 1\n</code></span></pre>",
+    "<p>inline <code>a  <b>b</b>\n <i></i>   c</code> code</p>",
+    "<table><tr><th>A</th><th>B</th></tr><tr><td> 1 </td><td>2<!-- c --></td></tr></table>",
+    "<table><thead><tr><td>h</td></tr></thead><tr><td>r</td></tr></table>",
+    "<table><tbody><tr><td>o<table><tr><td>inner</td></tr></table></td></tr></tbody></table>",
+    "<table><tr><td>漢<ruby>字<rt>ji</rt></ruby></td><td><template>t</template>v</td></tr></table>",
+    "<div>\xa0&nbsp;x\t\ty&amp;z</div><div>   </div><hr><div>\u200b</div>",
+    "<main><article><header>h</header><p>Story</p><footer>f</footer></article></main>",
+    "<html><head><title>Ignored</title></head><body><p>Body</p></body></html>",
+]
 
 
 class TestMarkdownConverter(unittest.TestCase):
@@ -94,6 +118,70 @@ class TestMarkdownConverter(unittest.TestCase):
         md = MarkdownConverter.to_markdown(html).strip()
         self.assertEqual(md, "[![Alt](pic.jpg)](/img)")
 
+    def test_lxml_engine_matches_soup_converter(self):
+        for html in PARITY_FIXTURES:
+            with self.subTest(html=html):
+                fast = html_to_markdown(html)
+                self.assertIsNotNone(fast)
+                self.assertEqual(fast, MarkdownConverter._to_markdown_soup(html))
+
+    def test_declined_documents_fall_back_to_soup(self):
+        for html in ("<title>Only head</title>", "<p>a</p><!DOCTYPE html><p>b</p>"):
+            with self.subTest(html=html):
+                self.assertIsNone(html_to_markdown(html))
+                self.assertEqual(
+                    MarkdownConverter.to_markdown(html),
+                    MarkdownConverter._to_markdown_soup(html),
+                )
+
+    def test_deep_dom_does_not_recurse(self):
+        depth = 1500  # Far past the soup walker's recursion limit
+        html = (
+            "<div>" * depth
+            + '<a href="/deep"><span>'
+            + "<p>leaf</p>"
+            + "</span></a>"
+            + "</div>" * depth
+        )
+        self.assertEqual(MarkdownConverter.to_markdown(html), "[leaf](/deep)")
+
+    def test_budget_cuts_walk_without_changing_prefix(self):
+        html = "".join(
+            f"<div><h2>Part {i}</h2><p>Text <b>{i}</b></p><ul><li>a</li></ul></div>"
+            for i in range(40)
+        )
+        full = MarkdownConverter.to_markdown(html)
+        for budget in (0, 7, 100, len(full) - 1, len(full), len(full) + 50):
+            with self.subTest(budget=budget):
+                self.assertEqual(
+                    MarkdownConverter.to_markdown_limited(html, max_chars=budget),
+                    (full[:budget], len(full) > budget),
+                )
+
+    def test_budget_is_spent_on_main_content_first(self):
+        html = (
+            "<body><div>" + "<p>sidebar filler</p>" * 200 + "</div>"
+            "<main><h1>Story</h1><p>The actual article.</p></main></body>"
+        )
+        md, truncated = MarkdownConverter.to_markdown_limited(html, max_chars=200)
+        self.assertTrue(truncated)
+        self.assertTrue(md.startswith("# Story\n\nThe actual article."))
+        self.assertIn("sidebar filler", md)  # Leftover budget goes to the rest
+        self.assertEqual(len(md), 200)
+
+        # Pages that fit keep document order.
+        small = "<div><p>side</p></div><main><p>main</p></main>"
+        self.assertEqual(
+            MarkdownConverter.to_markdown_limited(small, max_chars=1000),
+            (MarkdownConverter.to_markdown(small), False),
+        )
+
+    def test_token_budget_converts_through_char_ratio(self):
+        html = "<p>" + "word " * 500 + "</p>"
+        md, truncated = MarkdownConverter.to_markdown_limited(html, max_tokens=10)
+        self.assertTrue(truncated)
+        self.assertEqual(len(md), 40)  # 10 tokens * 4.0 chars/token
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,91 @@
+# ./tests/test_links.py
+"""
+Link extraction tests: resolution, registrable-domain classification, anchors.
+Run: `pytest tests/test_links.py -q`.
+Inputs: inline HTML snippets.
+Outputs: assertions on resolved links, counts and the anchors table.
+Side effects: none.
+Operational notes: no network or browser; `extract_links_from_html` and the
+crawler's link pass only.
+"""
+
+from __future__ import annotations
+
+from urllib.parse import urljoin
+
+from web_scraper_toolkit.parsers.extraction import extract_links_from_html
+
+BASE = "https://www.shop.example/catalog/index.html"
+
+PAGE = """<html><body>
+<a href="/about">About</a>
+<a href=" item-2.html ">Item <b>2</b></a>
+<a href="../legal/./terms">Terms</a>
+<a href="//blog.shop.example/post#top" rel="nofollow ugc">Blog</a>
+<a href="https://shop.example/about">About again</a>
+<a href="http://other.test/x?q=1" rel="noopener">Other</a>
+<a href="#reviews">Reviews</a>
+<a href="mailto:hi@shop.example">Mail</a>
+<a href="javascript:void(0)">JS</a>
+<a href="index.html">Self</a>
+<a>No href</a>
+</body></html>"""
+
+
+def test_links_are_resolved_and_classified_by_registrable_domain():
+    result = extract_links_from_html(PAGE, BASE)
+
+    assert result["links"] == [
+        "http://other.test/x?q=1",
+        "https://blog.shop.example/post",
+        "https://shop.example/about",
+        "https://www.shop.example/about",
+        "https://www.shop.example/catalog/item-2.html",
+        "https://www.shop.example/legal/terms",
+    ]
+    # Subdomains and the bare domain share the registrable domain.
+    assert result["internal_count"] == 5
+    assert result["external_count"] == 1
+
+    with_fragments = extract_links_from_html(PAGE, BASE, include_fragments=True)
+    assert urljoin(BASE, "#reviews") in with_fragments["links"]
+    assert "https://blog.shop.example/post#top" in with_fragments["links"]
+
+
+def test_anchor_table_and_internal_filter():
+    result = extract_links_from_html(
+        PAGE, BASE, filter_external=True, include_anchors=True
+    )
+    anchors = result["anchors"]
+
+    assert "http://other.test/x?q=1" not in result["links"]
+    assert all(anchors["internal"])
+    assert anchors["url"][:2] == [
+        "https://www.shop.example/about",
+        "https://www.shop.example/catalog/item-2.html",
+    ]
+    assert anchors["text"][1] == "Item 2"
+    blog = anchors["url"].index("https://blog.shop.example/post")
+    assert anchors["rel"][blog] == "nofollow ugc"
+    assert anchors["nofollow"] == [i == blog for i in range(len(anchors["url"]))]
+    assert "anchors" not in extract_links_from_html(PAGE, BASE)
+    assert extract_links_from_html("", BASE)["total_count"] == 0
+
+
+def test_crawler_follows_links_in_document_order(tmp_path) -> None:
+    from web_scraper_toolkit.crawler.engine import AutonomousCrawler
+    from web_scraper_toolkit.playbook.models import Playbook
+
+    playbook = Playbook(name="order", base_urls=[BASE], rules=[])
+    crawler = AutonomousCrawler(playbook, state_file=str(tmp_path / "state.json"))
+    html = (
+        '<a href="/zebra">Z</a><a href="/apple">A</a>'
+        '<a href="/zebra">Z again</a><a href="mailto:x@shop.example">M</a>'
+        '<a href="https://b.example/">B</a>'
+    )
+
+    assert crawler._extract_links(html, BASE) == [
+        "https://www.shop.example/zebra",
+        "https://www.shop.example/apple",
+        "https://b.example/",
+    ]
@@ -0,0 +1,203 @@
+# ./tests/test_metadata.py
+"""
+Metadata extraction tests: head-only fast path, browser fallback, JSON-LD.
+Run: `pytest tests/test_metadata.py -q`.
+Inputs: in-memory HTML served through a stand-in byte stream or a loopback
+HTTP server.
+Outputs: assertions on structured metadata, bytes read and the source used.
+Side effects: none.
+Operational notes: no network; `iter_document_chunks` and PlaywrightManager
+are patched.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import AsyncMock, patch
+
+from web_scraper_toolkit.parsers.extraction import (
+    extract_metadata,
+    extract_metadata_json,
+    fetch_page_metadata,
+    format_metadata_report,
+    parse_metadata,
+)
+
+URL = "https://shop.example/p/1"
+
+HEAD = """<!DOCTYPE html><html lang="en"><head>
+<title>Blue Kettle</title>
+<meta property="og:title" content="Blue Kettle">
+<meta property="og:image" content="https://shop.example/k.jpg">
+<meta name="twitter:card" content="summary">
+<link rel="canonical" href="https://shop.example/p/1">
+<script type="application/ld+json">
+<!--
+{"@context": "https://schema.org", "@type": "Product", "name": "Blue
+Kettle"}
+-->
+</script>
+</head>"""
+
+
+def _serve(body: str, served: list):
+    async def chunks(url, info):
+        info.update(status=200, final_url=url, charset="utf-8")
+        data = body.encode("utf-8")
+        for start in range(0, len(data), 4096):
+            served.append(start)
+            yield data[start : start + 4096]
+
+    return patch(
+        "web_scraper_toolkit.parsers.extraction.metadata.iter_document_chunks",
+        new=chunks,
+    )
+
+
+def _browser(html: str):
+    manager = patch("web_scraper_toolkit.browser.playwright_handler.PlaywrightManager")
+    mock = manager.start()
+    instance = mock.return_value
+    instance.start = AsyncMock()
+    instance.stop = AsyncMock()
+    instance.smart_fetch = AsyncMock(return_value=(html, URL, 200))
+    return manager, mock
+
+
+def test_stops_reading_at_head_end():
+    page = HEAD + "<body>" + "<p>filler</p>" * 100_000 + "</body></html>"
+    served: list = []
+    manager, browser = _browser("")
+    try:
+        with _serve(page, served):
+            data = asyncio.run(fetch_page_metadata(URL, head_only=True))
+    finally:
+        manager.stop()
+
+    assert data["source"] == "head"
+    assert data["bytes_read"] < 16 * 1024 < len(page)
+    assert len(served) == 1
+    assert not browser.called
+    assert data["title"] == "Blue Kettle"
+    assert data["lang"] == "en"
+    assert data["canonical"] == "https://shop.example/p/1"
+    assert data["opengraph"] == {
+        "title": "Blue Kettle",
+        "image": "https://shop.example/k.jpg",
+    }
+    assert data["twitter"] == {"card": "summary"}
+    assert data["json_ld"][0]["name"] == "Blue\nKettle"
+    assert data["json_ld_types"] == ["Product"]
+
+
+def test_default_report_keeps_body_json_ld():
+    page = HEAD + (
+        '<body><script type="application/ld+json">'
+        '{"@type": "Offer", "price": "19.00"}</script></body></html>'
+    )
+    served: list = []
+    manager, browser = _browser("")
+    try:
+        with _serve(page, served):
+            data = asyncio.run(fetch_page_metadata(URL))
+            report = extract_metadata(URL)
+    finally:
+        manager.stop()
+
+    assert data["source"] == "document"
+    assert data["json_ld_types"] == ["Product", "Offer"]
+    assert '"price": "19.00"' in report
+    assert not browser.called
+
+
+def test_js_generated_head_falls_back_to_browser():
+    shell = (
+        "<html><head><title>App</title><script src='/app.js'></script></head>"
+        "<body><div id='root'></div></body></html>"
+    )
+    served: list = []
+    manager, browser = _browser(HEAD + "<body></body></html>")
+    try:
+        with _serve(shell, served):
+            data = asyncio.run(fetch_page_metadata(URL))
+    finally:
+        manager.stop()
+
+    assert browser.called
+    assert data["source"] == "browser"
+    assert data["json_ld_types"] == ["Product"]
+    assert "og:title: Blue Kettle" in format_metadata_report(data)
+
+
+def test_parse_metadata_json_ld_shapes():
+    html = """<html><head>
+    <script type="application/ld+json">[{"@type": "Organization"},
+      {"@graph": [{"@type": ["WebPage", "ItemPage"]}]}]</script>
+    <script type="Application/LD+JSON ">{"@type": "BreadcrumbList",}</script>
+    <meta name="description" content="Kettles">
+    </head><body>
+    <script type="application/ld+json">{"@type": "Offer"}</script>
+    </body></html>"""
+    data = parse_metadata(html, URL)
+
+    assert len(data["json_ld"]) == 3
+    assert data["json_ld_types"] == ["Organization", "WebPage", "ItemPage", "Offer"]
+    assert data["json_ld_errors"] == ['{"@type": "BreadcrumbList",}']
+    assert data["description"] == "Kettles"
+    assert parse_metadata("", URL)["json_ld"] == []
+
+
+class _HeadPage(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = (HEAD + "<body></body></html>").encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_repeated_sync_calls_stay_on_plain_http():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _HeadPage)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/p/1"
+    manager, browser = _browser("")
+    try:
+        first = extract_metadata_json(url)
+        second = extract_metadata_json(url)
+    finally:
+        manager.stop()
+        server.shutdown()
+        server.server_close()
+
+    assert first["source"] == second["source"] == "document"
+    assert first["json_ld_types"] == second["json_ld_types"] == ["Product"]
+    assert not browser.called
+
+
+def test_proxy_settings_never_send_a_direct_request():
+    served: list = []
+    manager, browser = _browser(HEAD + "<body></body></html>")
+    scraper = patch("web_scraper_toolkit.scraper.ProxyScraper")
+    proxy_scraper = scraper.start()
+    proxy_scraper.return_value.secure_fetch = AsyncMock(return_value=HEAD)
+    pool = object()
+    try:
+        with _serve(HEAD, served):
+            tiered = asyncio.run(fetch_page_metadata(URL, {"proxy_tier": "mobile"}))
+            proxied = asyncio.run(fetch_page_metadata(URL, proxy_manager=pool))
+    finally:
+        scraper.stop()
+        manager.stop()
+
+    assert served == []
+    assert tiered["source"] == "browser"
+    assert proxied["source"] == "proxy"
+    assert proxied["json_ld_types"] == ["Product"]
+    proxy_scraper.assert_called_once_with(manager=pool)
+    assert browser.call_count == 1
@@ -56,9 +56,19 @@ class TestMultimodal(unittest.TestCase):
         </html>
         """
 
-        with patch(
-            "web_scraper_toolkit.browser.playwright_handler.PlaywrightManager"
-        ) as MockManager:
+        async def no_plain_http(url, info):
+            raise OSError("offline")
+            yield b""
+
+        with (
+            patch(
+                "web_scraper_toolkit.browser.playwright_handler.PlaywrightManager"
+            ) as MockManager,
+            patch(
+                "web_scraper_toolkit.parsers.extraction.metadata.iter_document_chunks",
+                new=no_plain_http,
+            ),
+        ):
             instance = MockManager.return_value
             instance.start = AsyncMock()
             instance.stop = AsyncMock()
@@ -256,6 +256,41 @@ class TestPlaywrightManager(unittest.TestCase):
         with self.assertRaises(asyncio.CancelledError):
             self.loop.run_until_complete(_run())
 
+    def test_main_content_extraction_reads_subtree_or_falls_back(self) -> None:
+        pm = PlaywrightManager(BrowserConfig.from_dict({"content_extraction": "main"}))
+        self.assertEqual(pm.content_extraction_mode, "main")
+        page = AsyncMock()
+        page.url = "https://example.com/story"
+        page.content = AsyncMock(return_value="<html><body>full page</body></html>")
+        page.evaluate = AsyncMock(
+            return_value={
+                "applied": True,
+                "strategy": "selector",
+                "html": "<html><body><article>story</article></body></html>",
+                "full_bytes": 90_000,
+                "selector_matched": True,
+            }
+        )
+
+        html = self.loop.run_until_complete(
+            pm._read_page_for_extraction(page, "main", "article")
+        )
+        self.assertIn("<article>story</article>", html)
+        report = pm._last_content_extraction
+        self.assertEqual(report["selector"], "article")
+        self.assertEqual(report["returned_bytes"], len(html))
+        self.assertEqual(report["bytes_saved"], 90_000 - len(html))
+        page.content.assert_not_awaited()
+
+        # Small documents come back whole so challenge checks still see them.
+        page.evaluate = AsyncMock(
+            return_value={"applied": False, "reason": "small_document"}
+        )
+        html = self.loop.run_until_complete(pm._read_page_for_extraction(page, "main"))
+        self.assertEqual(html, "<html><body>full page</body></html>")
+        self.assertEqual(pm._last_content_extraction["reason"], "small_document")
+        self.assertFalse(pm._last_content_extraction["applied"])
+
     def test_fetch_page_content_short_circuits_direct_document_url(self) -> None:
         pm = PlaywrightManager(BrowserConfig())
         page = AsyncMock()
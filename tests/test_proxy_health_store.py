@@ -0,0 +1,121 @@
+# ./tests/test_proxy_health_store.py
+"""
+Persistent proxy health store and incremental startup validation tests.
+Run: `pytest tests/test_proxy_health_store.py -q`.
+Inputs: synthetic Proxy objects, scripted outcomes, and a temp store file.
+Outputs: assertions on round-tripped state, cooldown carry-over, and TTL skips.
+Side effects: writes the store file under pytest's tmp_path only.
+Operational notes: no network access; validation is stubbed per instance.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+
+import pytest
+
+from web_scraper_toolkit.proxie import (
+    ProxieConfig,
+    Proxy,
+    ProxyManager,
+    ProxyStatus,
+)
+
+from .proxy_harness import make_proxies
+
+
+def _config(path, **overrides) -> ProxieConfig:
+    return ProxieConfig(
+        enforce_secure_ip=False, health_store_path=str(path), **overrides
+    )
+
+
+@pytest.mark.asyncio
+async def test_state_round_trips_by_proxy_identity(tmp_path) -> None:
+    path = tmp_path / "proxy_health.json"
+    first = ProxyManager(
+        _config(path, cooldown_seconds=600), make_proxies(3, ProxyStatus.UNTESTED)
+    )
+    url = "https://example.com/a"
+    for proxy in first.proxies:
+        proxy.status = ProxyStatus.ACTIVE
+        proxy.last_validated_ts = time.time()
+    first.reindex()
+    first.report_status(first.proxies[0], success=True, url=url, latency_ms=120.0)
+    first.report_status(first.proxies[1], success=False, status_code=403, url=url)
+    first.report_status(first.proxies[2], success=False, status_code=429)
+    await first.close()
+
+    raw = json.loads(path.read_text())
+    assert raw["version"] == 1 and len(raw["proxies"]) == 3
+
+    # Reordered list: records follow identity, not position.
+    restored = list(reversed(make_proxies(3, ProxyStatus.UNTESTED)))
+    second = ProxyManager(_config(path), restored)
+    by_host = {p.hostname: p for p in restored}
+    assert by_host["10.0.0.0"].latency_ewma_ms == 120.0
+    assert second.scorer.is_banned(by_host["10.0.0.1"], "https://www.example.com")
+    assert by_host["10.0.0.2"].status == ProxyStatus.COOLDOWN
+    assert 590 < second._cooldown_until[id(by_host["10.0.0.2"])] - time.monotonic()
+    assert second.stale_proxies() == []
+    await second.close()
+
+
+@pytest.mark.asyncio
+async def test_initialize_only_validates_stale_records(tmp_path) -> None:
+    path = tmp_path / "proxy_health.json"
+    proxies = make_proxies(3)
+    proxies[0].last_validated_ts = time.time()
+    proxies[1].last_validated_ts = time.time() - 7200  # Older than the TTL
+    ProxyManager(_config(path), proxies).save_health()
+
+    fresh = make_proxies(4, ProxyStatus.UNTESTED)  # 10.0.0.3 has no record yet
+    manager = ProxyManager(_config(path, health_ttl_seconds=3600), fresh)
+    checked: list[str] = []
+
+    async def fake_check(proxy: Proxy, session=None) -> bool:
+        checked.append(proxy.hostname)
+        proxy.status = ProxyStatus.ACTIVE
+        return True
+
+    manager._check_proxy = fake_check
+    await manager.initialize()
+    assert sorted(checked) == ["10.0.0.1", "10.0.0.2", "10.0.0.3"]
+    await manager.close()
+
+    again = ProxyManager(_config(path), make_proxies(4, ProxyStatus.UNTESTED))
+    assert again.stale_proxies() == []
+    assert len(again._index) == 4
+
+
+def test_malformed_records_are_skipped(tmp_path, caplog) -> None:
+    path = tmp_path / "proxy_health.json"
+    good, bad_site, bad_record = make_proxies(3, ProxyStatus.UNTESTED)
+    now = time.time()
+    site = [80.0, 1.0, 3, now + 600, 1]
+    records = {
+        "socks5://10.0.0.0:1080": {
+            "status": "ACTIVE",
+            "latency_ms": 90.0,
+            "validated_at": now,
+            "sites": {"example.com": site},
+        },
+        "socks5://10.0.0.1:1080": {
+            "status": "ACTIVE",
+            "latency_ms": 70.0,
+            "sites": {"example.com": [1.0, 2.0], "example.org": site},
+        },
+        "socks5://10.0.0.2:1080": {"status": "ACTIVE", "latency_ms": "fast"},
+    }
+    path.write_text(json.dumps({"version": 1, "proxies": records}))
+
+    manager = ProxyManager(_config(path), [good, bad_site, bad_record])
+
+    assert good.latency_ewma_ms == 90.0
+    assert manager.scorer.is_banned(good, "https://example.com")
+    assert bad_site.latency_ewma_ms == 70.0
+    assert not manager.scorer.is_banned(bad_site, "https://example.com")
+    assert manager.scorer.is_banned(bad_site, "https://example.org")
+    assert bad_record.status == ProxyStatus.UNTESTED
+    assert "malformed" in caplog.text
@@ -0,0 +1,171 @@
+# ./tests/test_proxy_path_benchmarks.py
+"""
+Offline proxy hot-path benchmarks against local SOCKS5/HTTP proxies and a target.
+Run: `pytest tests/test_proxy_path_benchmarks.py -q` (or `-m benchmark`).
+Inputs: stand-ins from `tests/proxy_harness.py` with injected latency/failures.
+Outputs: pass/fail assertions on correctness plus generous throughput budgets.
+Side effects: binds loopback ports for the duration of each test.
+Operational notes: budgets are regression tripwires sized for slow CI runners;
+use `scripts/bench_proxy_path.py` for the detailed numbers.
+"""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from web_scraper_toolkit.core.automation.rate_limit import (
+    get_shared_limiter,
+    set_shared_limiter,
+)
+from web_scraper_toolkit.proxie import (
+    ProxieConfig,
+    Proxy,
+    ProxyManager,
+    ProxyStatus,
+)
+from web_scraper_toolkit.scraper.aiohttp import ProxyScraper
+
+from .proxy_harness import (
+    HttpProxyStandIn,
+    Socks5ProxyStandIn,
+    TargetSite,
+    loopback_alias_available,
+    percentile,
+    running,
+)
+
+
+@pytest.fixture(autouse=True)
+def _no_host_rate_limit():
+    # The process-wide politeness limiter would dominate loopback timings.
+    previous = get_shared_limiter()
+    set_shared_limiter(None)
+    yield
+    set_shared_limiter(previous)
+
+
+def _config(target: TargetSite, **overrides) -> ProxieConfig:
+    return ProxieConfig(
+        enforce_secure_ip=False,
+        validation_url=target.url("/ip"),
+        timeout_seconds=5,
+        **overrides,
+    )
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+@pytest.mark.parametrize("strategy", ["round_robin", "health_weighted", "latency"])
+async def test_selection_throughput_on_large_pool(strategy: str) -> None:
+    proxies = [
+        Proxy(
+            hostname=f"10.{i // 256}.{i % 256}.1", port=1080, status=ProxyStatus.ACTIVE
+        )
+        for i in range(20_000)
+    ]
+    manager = ProxyManager(
+        ProxieConfig(enforce_secure_ip=False, rotation_strategy=strategy), proxies
+    )
+    started = time.perf_counter()
+    for i in range(20_000):
+        await manager.get_next_proxy(
+            f"https://site{i % 50}.example/" if i % 2 else None
+        )
+    elapsed = time.perf_counter() - started
+    assert elapsed < 5.0, f"{strategy} selection regression: elapsed={elapsed:.3f}s"
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_validation_and_fetch_through_each_proxy_type() -> None:
+    async with running(
+        TargetSite(latency_ms=2),
+        Socks5ProxyStandIn(),
+        Socks5ProxyStandIn(username="bench", password="secret"),
+        HttpProxyStandIn(),
+        HttpProxyStandIn(username="bench", password="secret"),
+    ) as (target, *stand_ins):
+        manager = ProxyManager(_config(target), [s.as_proxy() for s in stand_ins])
+        stats = await manager.validate_all()
+        assert stats.passed == 4, [p.status for p in manager.proxies]
+        assert stats.wall_ms < 2000
+
+        for stand_in in stand_ins:
+            single = ProxyManager(
+                _config(target), [stand_in.as_proxy(ProxyStatus.ACTIVE)]
+            )
+            scraper = ProxyScraper(single, retry_delay_seconds=0)
+            latencies = []
+            for i in range(20):
+                started = time.perf_counter()
+                body = await scraper.secure_fetch(target.url(f"/page/{i}"))
+                latencies.append((time.perf_counter() - started) * 1000)
+                assert body and "Stand-in" in body
+            assert stand_in.connections >= 20
+            assert stand_in.auth_failures == 0
+            assert percentile(latencies, 95) < 500, (stand_in, latencies)
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_same_site_fetches_stick_to_one_exit() -> None:
+    async with running(
+        TargetSite(), Socks5ProxyStandIn(), Socks5ProxyStandIn(), HttpProxyStandIn()
+    ) as (target, *stand_ins):
+        manager = ProxyManager(
+            _config(target), [s.as_proxy(ProxyStatus.ACTIVE) for s in stand_ins]
+        )
+        scraper = ProxyScraper(manager, retry_delay_seconds=0)
+        for i in range(30):
+            assert await scraper.secure_fetch(target.url(f"/page/{i}"))
+        # Affinity keeps one site on one exit instead of spraying the pool.
+        assert sorted(s.connections for s in stand_ins) == [0, 0, 30]
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_failover_skips_failing_and_blocked_proxies() -> None:
+    async with running(
+        TargetSite(),
+        Socks5ProxyStandIn(),
+        Socks5ProxyStandIn(failure_rate=1.0),
+        HttpProxyStandIn(failure_rate=1.0),
+    ) as (target, healthy, broken_socks, broken_http):
+        proxies = [
+            s.as_proxy(ProxyStatus.ACTIVE) for s in (healthy, broken_socks, broken_http)
+        ]
+        manager = ProxyManager(_config(target, max_retries=3), proxies)
+        scraper = ProxyScraper(manager, retry_delay_seconds=0)
+
+        started = time.perf_counter()
+        results = [await scraper.secure_fetch(target.url(f"/p/{i}")) for i in range(20)]
+        elapsed = time.perf_counter() - started
+
+        assert all(results), "every fetch should fail over to the healthy proxy"
+        assert target.statuses[200] == 20
+        # Broken proxies are demoted, so later fetches stop paying for them.
+        assert broken_socks.connections + broken_http.connections < 20
+        assert elapsed < 10.0
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(
+    not loopback_alias_available(), reason="needs 127.0.0.2 loopback alias"
+)
+async def test_per_proxy_site_ban_routes_around_blocked_exit() -> None:
+    async with running(
+        TargetSite(blocked_sources={"127.0.0.2"}),
+        Socks5ProxyStandIn(source_host="127.0.0.2"),
+        Socks5ProxyStandIn(source_host="127.0.0.3"),
+    ) as (target, blocked, clean):
+        proxies = [s.as_proxy(ProxyStatus.ACTIVE) for s in (blocked, clean)]
+        manager = ProxyManager(_config(target, max_retries=2), proxies)
+        scraper = ProxyScraper(manager, retry_delay_seconds=0)
+
+        for i in range(10):
+            assert await scraper.secure_fetch(target.url(f"/item/{i}"))
+        assert target.statuses[403] == 1  # Banned for this site after one block
+        assert manager.scorer.is_banned(proxies[0], target.url())
+        assert proxies[0].status == ProxyStatus.ACTIVE  # Still usable elsewhere
@@ -0,0 +1,147 @@
+# ./tests/test_proxy_pool.py
+"""
+Indexed active-proxy set, ProxyManager selection, and background scheduling tests.
+Run: `pytest tests/test_proxy_pool.py -q`.
+Inputs: synthetic Proxy objects with scripted status and health transitions.
+Outputs: assertions on rotation order, weighted sampling, index upkeep,
+cooldown expiry, and non-blocking revival.
+Side effects: none.
+Operational notes: no network access; validation is stubbed per instance.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+
+import pytest
+
+from web_scraper_toolkit.proxie import (
+    ProxieConfig,
+    Proxy,
+    ProxyIndex,
+    ProxyManager,
+    ProxyStatus,
+    SecurityStopIteration,
+)
+
+from .proxy_harness import make_proxies
+
+
+def test_round_robin_cycles_and_skips_removed() -> None:
+    proxies = make_proxies(3)
+    index = ProxyIndex(proxies)
+    assert [index.next_round_robin() for _ in range(3)] == proxies
+
+    proxies[1].status = ProxyStatus.DEAD
+    index.sync(proxies[1])
+    picks = {index.next_round_robin().hostname for _ in range(4)}
+    assert picks == {"10.0.0.0", "10.0.0.2"}
+    assert len(index) == 2
+
+
+def test_unsynced_deactivation_is_dropped_lazily() -> None:
+    proxies = make_proxies(2)
+    index = ProxyIndex(proxies)
+    proxies[0].status = ProxyStatus.COOLDOWN  # No sync() call
+    for _ in range(5):
+        assert index.next_round_robin() is proxies[1]
+    assert proxies[0] not in index
+
+
+def test_weighted_pick_follows_health_and_reweights() -> None:
+    random.seed(7)
+    proxies = make_proxies(40)
+    for proxy in proxies:
+        proxy.health_score = 0.0
+    proxies[5].health_score = 90.0
+    proxies[33].health_score = 10.0
+    index = ProxyIndex(proxies)
+
+    picks = [index.next_weighted() for _ in range(2000)]
+    share = sum(1 for p in picks if p is proxies[5]) / len(picks)
+    assert {p.hostname for p in picks} == {"10.0.0.5", "10.0.0.33"}
+    assert 0.85 < share < 0.95
+
+    proxies[5].status = ProxyStatus.DEAD
+    index.sync(proxies[5])
+    assert {index.next_weighted().hostname for _ in range(50)} == {"10.0.0.33"}
+
+
+@pytest.mark.asyncio
+async def test_manager_tracks_status_transitions() -> None:
+    proxies = make_proxies(3)
+    manager = ProxyManager(ProxieConfig(enforce_secure_ip=False), proxies)
+
+    manager.report_status(proxies[0], success=False, status_code=500)
+    proxies[0].health_score = 20.0
+    manager.report_status(proxies[0], success=False, status_code=500)
+    assert proxies[0].status == ProxyStatus.DEAD
+
+    picks = {(await manager.get_next_proxy()).hostname for _ in range(4)}
+    assert picks == {"10.0.0.1", "10.0.0.2"}
+
+    late = Proxy(hostname="10.0.0.9", port=1080, status=ProxyStatus.ACTIVE)
+    manager.proxies.append(late)  # Direct extension is picked up on next call
+    picks = {(await manager.get_next_proxy()).hostname for _ in range(3)}
+    assert "10.0.0.9" in picks
+
+
+@pytest.mark.asyncio
+async def test_cooldowns_share_one_scheduler_and_expire_in_order() -> None:
+    proxies = make_proxies(3)
+    manager = ProxyManager(
+        ProxieConfig(enforce_secure_ip=False, cooldown_seconds=0), proxies
+    )
+    manager.config.cooldown_seconds = 0.05
+    try:
+        manager.report_status(proxies[0], success=False, status_code=429)
+        scheduler = manager._cooldown_task
+        manager.config.cooldown_seconds = 0.15
+        manager.report_status(proxies[1], success=False, status_code=403)
+        assert manager._cooldown_task is scheduler
+        picks = {(await manager.get_next_proxy()).hostname for _ in range(3)}
+        assert picks == {"10.0.0.2"}
+
+        await asyncio.sleep(0.1)
+        assert proxies[0].status == ProxyStatus.ACTIVE
+        assert proxies[0].health_score == 50.0
+        assert proxies[1].status == ProxyStatus.COOLDOWN
+
+        await asyncio.sleep(0.1)
+        assert proxies[1].status == ProxyStatus.ACTIVE
+        assert len(manager._index) == 3
+    finally:
+        await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_exhausted_pool_raises_without_waiting_on_revival() -> None:
+    proxies = make_proxies(2, status=ProxyStatus.DEAD)
+    manager = ProxyManager(
+        ProxieConfig(enforce_secure_ip=False, revalidation_concurrency=1), proxies
+    )
+    release = asyncio.Event()
+    checked: list[str] = []
+
+    async def slow_check(proxy: Proxy, session=None) -> bool:
+        checked.append(proxy.hostname)
+        await release.wait()
+        proxy.status = ProxyStatus.ACTIVE
+        return True
+
+    manager._check_proxy = slow_check
+    try:
+        with pytest.raises(SecurityStopIteration):
+            await asyncio.wait_for(manager.get_next_proxy(), timeout=0.5)
+        await asyncio.sleep(0.05)
+        assert checked == ["10.0.0.0"]  # Bounded to one in-flight check
+        with pytest.raises(SecurityStopIteration):
+            await asyncio.wait_for(manager.get_next_proxy(), timeout=0.5)
+
+        release.set()
+        await asyncio.sleep(0.05)
+        assert (await manager.get_next_proxy()).status == ProxyStatus.ACTIVE
+        assert not manager._dead
+    finally:
+        await manager.close()
@@ -0,0 +1,84 @@
+# ./tests/test_proxy_scoring.py
+"""
+Latency-aware proxy routing, per-site bans, and sticky affinity tests.
+Run: `pytest tests/test_proxy_scoring.py -q`.
+Inputs: synthetic Proxy objects and scripted request outcomes.
+Outputs: assertions on EWMA updates, latency-ordered picks, ban scoping, and pins.
+Side effects: none.
+Operational notes: no network access; timestamps are passed explicitly.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from web_scraper_toolkit.proxie import (
+    ProxieConfig,
+    ProxyManager,
+    ProxyScorer,
+    ProxyStatus,
+    SecurityStopIteration,
+)
+
+from .proxy_harness import make_proxies
+
+
+def test_ewma_tracks_latency_and_success() -> None:
+    scorer = ProxyScorer(alpha=0.5)
+    proxy = make_proxies(1)[0]
+    scorer.record(proxy, True, latency_ms=100.0, url="https://a.example.com/x")
+    scorer.record(proxy, True, latency_ms=300.0, url="https://b.example.com/y")
+    assert proxy.latency_ewma_ms == 200.0
+
+    scorer.record(proxy, False, latency_ms=200.0, url="https://example.com/")
+    stats = scorer.target_stats(proxy, "https://www.example.com/")
+    assert stats is not None and stats.samples == 3  # Keyed by eTLD+1
+    assert stats.success_rate == 0.5
+    assert scorer.expected_cost(proxy, "https://example.com/") == 200.0 / 0.5
+
+
+def test_bans_are_scoped_to_one_site_and_escalate() -> None:
+    scorer = ProxyScorer(ban_seconds=10, max_ban_seconds=15)
+    proxy = make_proxies(1)[0]
+    scorer.record(proxy, False, url="https://shop.example.com", status_code=403, now=0)
+    assert scorer.is_banned(proxy, "https://example.com/cart", now=5)
+    assert not scorer.is_banned(proxy, "https://other.org/", now=5)
+    assert not scorer.is_banned(proxy, "https://example.com/", now=11)
+
+    scorer.record(proxy, False, url="https://example.com", status_code=429, now=20)
+    assert scorer.is_banned(proxy, "https://example.com", now=34)  # 2x, capped at 15
+    assert not scorer.is_banned(proxy, "https://example.com", now=36)
+
+
+@pytest.mark.asyncio
+async def test_manager_routes_by_latency_with_sticky_affinity() -> None:
+    proxies = make_proxies(3)
+    config = ProxieConfig(
+        enforce_secure_ip=False, affinity_ttl_seconds=60, affinity_max_requests=3
+    )
+    manager = ProxyManager(config, proxies)
+    url = "https://example.com/page"
+    for proxy, latency in zip(proxies, (900.0, 150.0, 600.0)):
+        manager.report_status(proxy, success=True, url=url, latency_ms=latency)
+
+    picks = [await manager.get_next_proxy(url) for _ in range(3)]
+    assert picks == [proxies[1]] * 3
+
+    # 403 bans the pinned proxy for this site only and drops the pin.
+    manager.report_status(proxies[1], success=False, status_code=403, url=url)
+    assert proxies[1].status == ProxyStatus.ACTIVE
+    assert await manager.get_next_proxy(url) is proxies[2]
+    assert await manager.get_next_proxy("https://other.org/") is proxies[1]
+
+
+@pytest.mark.asyncio
+async def test_all_banned_for_site_raises_without_global_cooldown() -> None:
+    proxies = make_proxies(2)
+    manager = ProxyManager(ProxieConfig(enforce_secure_ip=False), proxies)
+    url = "https://blocked.example/"
+    for proxy in proxies:
+        manager.report_status(proxy, success=False, status_code=429, url=url)
+    with pytest.raises(SecurityStopIteration, match="banned"):
+        await manager.get_next_proxy(url)
+    assert (await manager.get_next_proxy()).status == ProxyStatus.ACTIVE
+    assert manager._cooldown_task is None
@@ -0,0 +1,113 @@
+# ./tests/test_proxy_validation.py
+"""
+Streaming proxy validation tests: worker-pool refill, early publish, timings.
+Run: `pytest tests/test_proxy_validation.py -q`.
+Inputs: synthetic proxies with stubbed checks plus a local HTTP "proxy" server.
+Outputs: assertions on wall time, early availability, shared-session HTTP
+checks, and timing stats feeding the scorer.
+Side effects: none outside the in-process server.
+Operational notes: binds 127.0.0.1 on an ephemeral port; no external network.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+
+from web_scraper_toolkit.proxie import (
+    ProxieConfig,
+    Proxy,
+    ProxyManager,
+    ProxyProtocol,
+    ProxyStatus,
+)
+
+from .proxy_harness import make_proxies
+
+
+def _stub_checks(manager: ProxyManager, delays: dict[str, float]) -> None:
+    async def check(proxy: Proxy, session=None) -> bool:
+        await asyncio.sleep(delays.get(proxy.hostname, 0.01))
+        proxy.status = ProxyStatus.ACTIVE
+        return True
+
+    manager._check_proxy = check
+
+
+@pytest.mark.asyncio
+async def test_slow_checks_do_not_stall_other_workers() -> None:
+    manager = ProxyManager(
+        ProxieConfig(enforce_secure_ip=False, max_concurrent_checks=2),
+        make_proxies(10, ProxyStatus.UNTESTED),
+    )
+    # Chunked gather would wait 0.2s twice (chunks 1 and 2); refill overlaps them.
+    _stub_checks(manager, {"10.0.0.0": 0.2, "10.0.0.2": 0.2})
+    started = time.perf_counter()
+    stats = await manager.validate_all()
+    assert time.perf_counter() - started < 0.35
+    assert stats.checked == stats.passed == 10
+    assert stats.slowest_check_ms >= 200
+    assert manager.validation_stats.checked == 10
+
+
+@pytest.mark.asyncio
+async def test_initialize_can_return_on_first_healthy_proxy() -> None:
+    manager = ProxyManager(
+        ProxieConfig(enforce_secure_ip=False, max_concurrent_checks=3),
+        make_proxies(3, ProxyStatus.UNTESTED),
+    )
+    _stub_checks(manager, {"10.0.0.0": 0.01, "10.0.0.1": 5.0, "10.0.0.2": 5.0})
+    try:
+        await asyncio.wait_for(manager.initialize(wait_for_all=False), timeout=1.0)
+        assert (await manager.get_next_proxy()).hostname == "10.0.0.0"
+        assert not manager._validation_task.done()
+    finally:
+        await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_http_proxies_share_session_and_feed_scorer() -> None:
+    seen: list[tuple[str, str]] = []
+
+    async def forward(request: web.Request) -> web.Response:
+        # Absolute-form request line means the client treated us as its proxy.
+        seen.append((str(request.url), request.headers.get("Proxy-Authorization", "")))
+        return web.json_response({"origin": "203.0.113.7"})
+
+    app = web.Application()
+    app.router.add_get("/ip", forward)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        proxies = [
+            Proxy(hostname="127.0.0.1", port=port, protocol=ProxyProtocol.HTTP),
+            Proxy(
+                hostname="127.0.0.1",
+                port=port,
+                protocol=ProxyProtocol.HTTP,
+                username="user",
+                password="pass",
+            ),
+        ]
+        manager = ProxyManager(
+            ProxieConfig(
+                enforce_secure_ip=False,
+                validation_url="http://validation.invalid/ip",
+                timeout_seconds=5,
+            ),
+            proxies,
+        )
+        stats = await manager.validate_all()
+        assert stats.passed == 2
+        assert all(p.status == ProxyStatus.ACTIVE for p in proxies)
+        assert all(p.latency_samples == 1 and p.latency_ewma_ms > 0 for p in proxies)
+        assert {url for url, _ in seen} == {"http://validation.invalid/ip"}
+        assert sorted(auth for _, auth in seen) == ["", "Basic dXNlcjpwYXNz"]
+    finally:
+        await runner.cleanup()
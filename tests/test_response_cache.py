@@ -0,0 +1,216 @@
+# ./tests/test_response_cache.py
+"""
+Bounded ResponseCache tests: memory LRU, disk size cap, TTL sweep, dedup, SWR.
+Run: `pytest tests/test_response_cache.py -q`.
+Inputs: synthetic URLs and payloads sized to cross the configured bounds.
+Outputs: assertions on byte accounting, eviction order, sweeper removal,
+content-addressed storage, and HTTP freshness / stale-window rules.
+Side effects: writes the cache store under pytest's tmp_path only.
+Operational notes: bounds are fractions of a MB so tests stay small and fast.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import time
+
+import pytest
+
+from web_scraper_toolkit.core.state import cache_store
+from web_scraper_toolkit.core.state.cache import CacheConfig, ResponseCache
+from web_scraper_toolkit.core.state.cache_store import SqliteCacheStore
+
+
+def _cache(tmp_path, **overrides) -> ResponseCache:
+    options = {"directory": str(tmp_path), "sweep_interval_seconds": 0}
+    options.update(overrides)
+    return ResponseCache(CacheConfig(**options))
+
+
+def test_memory_tier_is_byte_bounded_lru(tmp_path) -> None:
+    cache = _cache(tmp_path, max_memory_mb=0.05)  # ~52 KB
+    payload = "x" * 10_000
+    for i in range(10):
+        cache.set(f"https://example.com/{i}", payload)
+        cache.get("https://example.com/0")  # Keep the first entry hot
+
+    stats = cache.get_stats()
+    assert stats["memory_size_mb"] <= 0.05
+    assert 0 < stats["memory_entries"] < 10
+    assert stats["evictions"] > 0
+    assert cache._get_cache_key("https://example.com/0") in cache._memory_cache
+    assert cache._get_cache_key("https://example.com/1") not in cache._memory_cache
+    # Evicted from memory but still served (and promoted) from disk.
+    assert cache.get("https://example.com/1") == payload
+
+
+def test_disk_tier_evicts_least_recently_used_entries(tmp_path) -> None:
+    cache = _cache(tmp_path, max_size_mb=0.05, max_memory_mb=0)
+    # Distinct, poorly compressible bodies so the byte bound actually binds.
+    payloads = {i: os.urandom(8_000).hex() for i in range(8)}
+    for i in range(4):
+        cache.set(f"https://example.com/{i}", payloads[i])
+    cache.get("https://example.com/0")  # Refresh LRU position
+    for i in range(4, 8):
+        cache.set(f"https://example.com/{i}", payloads[i])
+
+    stats = cache.get_stats()
+    assert stats["disk_size_mb"] <= 0.05
+    assert stats["evictions"] > 0
+    assert cache.get("https://example.com/0") == payloads[0]
+    assert cache.get("https://example.com/1") is None
+    cache.close()
+
+    # A restart reloads counters from the single store file.
+    reopened = _cache(tmp_path, max_size_mb=0.05)
+    assert reopened.get_stats()["disk_entries"] == stats["disk_entries"]
+    assert reopened.get("https://example.com/7") == payloads[7]
+    assert list(tmp_path.glob("*.json")) == []
+    reopened.close()
+
+
+def test_identical_bodies_are_stored_once_and_compressed(tmp_path) -> None:
+    cache = _cache(tmp_path, max_memory_mb=0)
+    body = "<html><body>" + "Not found. " * 2_000 + "</body></html>"
+    for i in range(50):
+        cache.set(f"https://example.com/missing/{i}", body)
+    cache.set("https://example.com/other", body + "!")
+
+    stats = cache.get_stats()
+    assert stats["disk_entries"] == 51
+    assert stats["disk_unique_bodies"] == 2
+    assert stats["disk_size_mb"] < stats["disk_uncompressed_mb"]
+    assert cache.get("https://example.com/missing/7") == body
+
+    # Replacing the only reference to a body frees its blob.
+    cache.set("https://example.com/other", "replaced")
+    assert cache.get_stats()["disk_unique_bodies"] == 2
+    cache.close()
+
+
+def test_store_counters_follow_commits_and_resync(tmp_path, monkeypatch) -> None:
+    store = SqliteCacheStore(str(tmp_path))
+    store.put("a", "https://example.com/a", "body a", "text/html", 1.0)
+    before = (store.entries, store.bytes, store.unique_blobs, store.raw_bytes)
+
+    # Fails after the blob insert: the rollback must not move the counters.
+    with pytest.raises(TypeError):
+        store.put("b", "https://example.com/b", "body b", "text/html", 1.0, {1j: 0})
+    assert (store.entries, store.bytes, store.unique_blobs, store.raw_bytes) == before
+
+    # Another process writing the same file is picked up on the next resync.
+    other = SqliteCacheStore(str(tmp_path))
+    other.put("c", "https://example.com/c", "body c", "text/html", 1.0)
+    other.close()
+    assert store.entries == 1
+    monkeypatch.setattr(cache_store, "_RESYNC_SECONDS", 0.0)
+    store.evict_to(1 << 30)
+    assert (store.entries, store.unique_blobs) == (2, 2)
+    store.close()
+
+
+def test_eviction_stops_when_another_process_emptied_the_store(tmp_path) -> None:
+    store = SqliteCacheStore(str(tmp_path))
+    for i in range(5):
+        store.put(str(i), f"https://example.com/{i}", f"body {i}", "text/html", 1.0)
+    other = sqlite3.connect(str(store.path))
+    with other:
+        other.execute("DELETE FROM entries")
+    other.close()
+
+    assert store.evict_to(100) == []
+    assert store.entries == 0
+    store.close()
+
+
+def test_sweeper_removes_expired_entries_from_both_tiers(tmp_path) -> None:
+    cache = _cache(tmp_path, ttl_seconds=0.05, sweep_interval_seconds=0.02)
+    try:
+        for i in range(5):
+            cache.set(f"https://example.com/{i}", "content")
+        deadline = time.time() + 2.0
+        while cache.get_stats()["disk_entries"] and time.time() < deadline:
+            time.sleep(0.02)
+        stats = cache.get_stats()
+        assert stats["memory_entries"] == stats["disk_entries"] == 0
+        assert stats["expired"] == 5
+    finally:
+        cache.close()
+
+
+def test_freshness_follows_headers_and_host_overrides(tmp_path) -> None:
+    cache = _cache(
+        tmp_path,
+        ttl_seconds=300,
+        max_ttl_seconds=3600,
+        stale_while_revalidate_seconds=30,
+        host_overrides={
+            "news.example": {"ttl_seconds": 10, "stale_seconds": 600},
+            "raw.example": {"honor_cache_headers": False},
+        },
+    )
+    url = "https://example.com/"
+    assert cache.freshness_for(url) == (300, 30)
+    assert cache.freshness_for(url, {"Cache-Control": "max-age=60", "Age": "20"}) == (
+        40,
+        30,
+    )
+    assert cache.freshness_for(url, {"Cache-Control": "max-age=99999"}) == (3600, 30)
+    assert cache.freshness_for(
+        url, {"Cache-Control": "max-age=60, stale-while-revalidate=120"}
+    ) == (60, 120)
+    assert cache.freshness_for(
+        url, {"Cache-Control": "max-age=60, must-revalidate"}
+    ) == (60, 0)
+    assert cache.freshness_for(url, {"Cache-Control": "no-store"}) is None
+    # Stale on arrival, but kept for stale serving and revalidation.
+    assert cache.freshness_for(
+        url, {"Cache-Control": "max-age=0, stale-while-revalidate=600"}
+    ) == (0, 600)
+    assert cache.freshness_for(url, {"Cache-Control": "no-cache"}) == (0, 30)
+    # Overrides apply to subdomains and beat the response headers.
+    assert cache.freshness_for(
+        "https://www.news.example/a", {"Cache-Control": "no-store"}
+    ) == (10, 600)
+    assert cache.freshness_for(
+        "https://raw.example/", {"Cache-Control": "max-age=5"}
+    ) == (300, 30)
+    cache.close()
+
+
+def test_stale_entries_are_servable_until_hard_expiry(tmp_path) -> None:
+    cache = _cache(tmp_path, max_memory_mb=0)
+    url = "https://example.com/swr"
+    headers = {"Cache-Control": "max-age=0.05, stale-while-revalidate=0.2"}
+    headers["ETag"] = '"v1"'
+    assert cache.store_response(url, "body", headers)
+    time.sleep(0.1)
+
+    assert cache.get(url) is None  # Plain lookups only accept fresh entries
+    entry = cache.get_entry(url, allow_stale=True)
+    assert entry is not None and cache.is_stale(entry)
+    assert entry.meta["etag"] == '"v1"'
+    assert cache.get_stats()["stale_hits"] == 1
+
+    # A 304 revalidation refreshes the entry in place.
+    assert cache.touch(url, {"Cache-Control": "max-age=60"}) is not None
+    assert cache.get(url) == "body"
+    assert cache.get_entry(url).ttl_seconds == 60
+
+    # Zero-freshness responses are stored stale with their validators, and
+    # a 304 carrying the same headers keeps them.
+    swr = {"Cache-Control": "max-age=0, stale-while-revalidate=600"}
+    assert cache.store_response(url, "swr", dict(swr, ETag='"v2"'))
+    entry = cache.get_entry(url, allow_stale=True)
+    assert entry.content == "swr" and cache.is_stale(entry)
+    assert entry.meta["etag"] == '"v2"'
+    assert cache.touch(url, swr) is not None
+    assert cache.get_entry(url, allow_stale=True).content == "swr"
+    assert not cache.store_response(url, "gone", {"Cache-Control": "no-store"})
+
+    cache.store_response(url, "short", {"Cache-Control": "max-age=0.01"})
+    time.sleep(0.05)
+    assert cache.sweep_expired() == 1
+    assert cache.get_entry(url, allow_stale=True) is None
+    cache.close()
@@ -63,6 +63,53 @@ def test_runtime_config_precedence(tmp_path: Path) -> None:
     assert settings.concurrency.cli_workers_default == "2"  # from config.json
 
 
+def test_sitemap_index_settings_follow_precedence(tmp_path: Path) -> None:
+    config_json = tmp_path / "config.json"
+    local_cfg = tmp_path / "settings.local.cfg"
+    config_json.write_text(
+        json.dumps(
+            {"sitemap": {"index": {"directory": "./from-json", "max_age_days": 7}}}
+        ),
+        encoding="utf-8",
+    )
+    local_cfg.write_text(
+        "[sitemap_index]\nenabled = false\nmax_age_days = 14\n", encoding="utf-8"
+    )
+
+    with patch.dict(
+        "os.environ", {"WST_SITEMAP_INDEX_MAX_AGE_DAYS": "21"}, clear=False
+    ):
+        settings = load_runtime_settings(
+            config_json_path=str(config_json),
+            local_cfg_path=str(local_cfg),
+        )
+
+    assert settings.sitemap_index.directory == "./from-json"  # from config.json
+    assert settings.sitemap_index.enabled is False  # local cfg wins
+    assert settings.sitemap_index.max_age_days == 21.0  # ENV wins
+
+
+def test_refresh_reopens_sitemap_index(tmp_path: Path) -> None:
+    from web_scraper_toolkit.parsers.sitemap import get_sitemap_index
+    from web_scraper_toolkit.server.handlers import config as handlers
+
+    config_json = tmp_path / "config.json"
+    missing_cfg = str(tmp_path / "none.cfg")
+    original = handlers.GLOBAL_RUNTIME_SETTINGS
+    try:
+        for name in ("first", "second"):
+            config_json.write_text(
+                json.dumps({"sitemap": {"index": {"directory": str(tmp_path / name)}}}),
+                encoding="utf-8",
+            )
+            handlers.refresh_runtime_config(str(config_json), missing_cfg)
+            index = get_sitemap_index(handlers.get_sitemap_index_config())
+            assert index.path.parent == tmp_path / name
+    finally:
+        handlers.GLOBAL_RUNTIME_SETTINGS = original
+        handlers.set_sitemap_index(None)
+
+
 def test_resolve_worker_count_dynamic() -> None:
     with patch("os.cpu_count", return_value=12):
         auto = resolve_worker_count("auto", cpu_reserve=2, max_workers=20, fallback=1)
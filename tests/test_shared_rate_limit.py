@@ -0,0 +1,84 @@
+# ./tests/test_shared_rate_limit.py
+"""
+Cross-process host rate limiter tests (shared-memory token buckets).
+Run: `pytest tests/test_shared_rate_limit.py -q`.
+Inputs: a SharedHostLimiter segment and a small ProcessPoolExecutor.
+Outputs: assertions that buckets and in-flight caps are shared across processes.
+Side effects: creates and unlinks a shared-memory segment; spawns worker processes.
+Operational notes: no network access; refill rate is near zero so counts are exact.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from web_scraper_toolkit.core.automation import rate_limit
+from web_scraper_toolkit.core.automation.rate_limit import (
+    SharedHostLimiter,
+    install_shared_limiter,
+    set_shared_limiter,
+    shared_host_slot,
+)
+
+
+def _take_tokens(url: str, attempts: int) -> int:
+    limiter = rate_limit.get_shared_limiter()
+    assert limiter is not None
+    return sum(1 for _ in range(attempts) if limiter.try_acquire(url) == 0.0)
+
+
+def test_token_bucket_is_shared_across_worker_processes() -> None:
+    limiter = SharedHostLimiter.create(
+        requests_per_second=0.001, burst=5, max_inflight=0
+    )
+    try:
+        with ProcessPoolExecutor(
+            max_workers=3,
+            initializer=install_shared_limiter,
+            initargs=(limiter.handle(),),
+        ) as pool:
+            granted = sum(
+                pool.map(_take_tokens, ["https://www.shared.test/a"] * 3, [4] * 3)
+            )
+            other = pool.submit(_take_tokens, "https://other.test/", 1).result()
+        assert granted == 5  # One bucket for the host, not one per worker
+        assert other == 1
+        assert limiter.try_acquire("shared.test") > 0
+    finally:
+        limiter.close()
+
+
+@pytest.mark.asyncio
+async def test_inflight_cap_blocks_until_release() -> None:
+    limiter = SharedHostLimiter.create(requests_per_second=0.0, burst=1, max_inflight=1)
+    set_shared_limiter(limiter)
+    try:
+        release = asyncio.Event()
+        order: list[str] = []
+
+        async def hold() -> None:
+            async with shared_host_slot("https://cap.test/1"):
+                order.append("first")
+                await release.wait()
+
+        async def wait_turn() -> None:
+            async with shared_host_slot("https://cap.test/2"):
+                order.append("second")
+
+        first = asyncio.create_task(hold())
+        await asyncio.sleep(0.01)
+        second = asyncio.create_task(wait_turn())
+        await asyncio.sleep(0.1)
+        assert order == ["first"]
+        assert limiter.inflight("cap.test") == 1
+
+        release.set()
+        await asyncio.wait_for(asyncio.gather(first, second), timeout=1.0)
+        assert order == ["first", "second"]
+        assert limiter.inflight("cap.test") == 0
+    finally:
+        set_shared_limiter(None)
+        limiter.close()
@@ -3,7 +3,10 @@
 Test suite for sitemap discovery logic.
 """
 
+import gzip
+import threading
 import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import patch, MagicMock, AsyncMock
 
 from web_scraper_toolkit.parsers.sitemap.detection import (
@@ -12,8 +15,15 @@ from web_scraper_toolkit.parsers.sitemap.detection import (
     _check_common_paths,
     _check_homepage_for_sitemap,
 )
-from web_scraper_toolkit.parsers.sitemap.fetching import extract_sitemap_tree
-from web_scraper_toolkit.parsers.sitemap.parsing import parse_sitemap_urls
+from web_scraper_toolkit.parsers.sitemap.fetching import (
+    extract_sitemap_tree,
+    iter_sitemap_entries,
+)
+from web_scraper_toolkit.parsers.sitemap.parsing import (
+    SitemapStreamParser,
+    parse_sitemap_urls,
+)
+from web_scraper_toolkit.parsers.sitemap.tools import get_sitemap_urls
 
 
 class TestSitemapDiscovery(unittest.IsolatedAsyncioTestCase):
@@ -133,37 +143,212 @@ class TestSitemapDiscovery(unittest.IsolatedAsyncioTestCase):
     async def test_extract_sitemap_tree_recursion(self):
         """Test recursive sitemap extraction"""
 
-        # Mock fetch_sitemap_content
-        with patch(
-            "web_scraper_toolkit.parsers.sitemap.fetching.fetch_sitemap_content",
-            new_callable=AsyncMock,
-        ) as mock_fetch:
-            # Use side_effect to return different content for different URLs
-            def fetch_side_effect(url, **kwargs):
-                if url == "https://example.com/index.xml":
-                    return """
-                    <sitemapindex>
-                        <sitemap>
-                            <loc>https://example.com/child1.xml</loc>
-                        </sitemap>
-                    </sitemapindex>
-                    """
-                elif url == "https://example.com/child1.xml":
-                    return """
-                    <urlset>
-                        <url>
-                            <loc>https://example.com/page1</loc>
-                        </url>
-                    </urlset>
-                    """
-                return None
-
-            mock_fetch.side_effect = fetch_side_effect
+        def fetch_side_effect(url, **kwargs):
+            if url == "https://example.com/index.xml":
+                return """
+                <sitemapindex>
+                    <sitemap>
+                        <loc>https://example.com/child1.xml</loc>
+                    </sitemap>
+                </sitemapindex>
+                """
+            elif url == "https://example.com/child1.xml":
+                return """
+                <urlset>
+                    <url>
+                        <loc>https://example.com/page1</loc>
+                    </url>
+                </urlset>
+                """
+            return None
 
+        with patch(
+            "web_scraper_toolkit.parsers.sitemap.fetching.iter_sitemap_chunks",
+            new=_chunked_source(fetch_side_effect),
+        ):
             urls = await extract_sitemap_tree("https://example.com/index.xml")
 
             self.assertEqual(urls, ["https://example.com/page1"])
 
+    async def test_stream_parser_gzip_fields_in_small_chunks(self):
+        """Gzip is inflated transparently and optional fields are captured."""
+        xml = (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+            'xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">'
+            "<url><loc>https://example.com/a</loc><lastmod>2025-01-02</lastmod>"
+            "<changefreq>Weekly</changefreq><priority>0.8</priority>"
+            "<image:image><image:loc>https://example.com/a.png</image:loc>"
+            "</image:image></url>"
+            "<url><loc>https://example.com/b</loc><priority>high</priority></url>"
+            "</urlset>"
+        )
+        data = gzip.compress(xml.encode("utf-8"))
+        parser = SitemapStreamParser()
+        entries = []
+        for start in range(0, len(data), 5):
+            entries.extend(parser.feed(data[start : start + 5]))
+        entries.extend(parser.close())
+
+        self.assertEqual(parser.kind, "urlset")
+        self.assertEqual(
+            [e.loc for e in entries],
+            [
+                "https://example.com/a",
+                "https://example.com/b",
+            ],
+        )
+        first = entries[0]
+        self.assertEqual(first.lastmod, "2025-01-02")
+        self.assertEqual(first.changefreq, "weekly")
+        self.assertEqual(first.priority, 0.8)
+        self.assertEqual(first.images, ["https://example.com/a.png"])
+        self.assertIsNone(entries[1].priority)
+
+    async def test_stream_parser_50k_urls_frees_records(self):
+        """A protocol-maximum 50k URL gzip file streams through in 64 KiB chunks."""
+        body = "".join(
+            f"<url><loc>https://example.com/p/{i}</loc></url>" for i in range(50_000)
+        )
+        data = gzip.compress(f"<urlset>{body}</urlset>".encode("utf-8"))
+        parser = SitemapStreamParser()
+        count = 0
+        for start in range(0, len(data), 64 * 1024):
+            count += len(parser.feed(data[start : start + 64 * 1024]))
+        count += len(parser.close())
+        self.assertEqual(count, 50_000)
+        self.assertEqual(parser.kind, "urlset")
+        self.assertFalse(parser.truncated)
+
+    async def test_parse_sitemap_urls_text_and_escaped_fallbacks(self):
+        """Plain-text sitemaps and HTML-escaped viewer output still parse."""
+        self.assertEqual(
+            parse_sitemap_urls(
+                "https://example.com/1\nnot-a-url\nhttps://example.com/2"
+            ),
+            ["https://example.com/1", "https://example.com/2"],
+        )
+        escaped = "<div>&lt;loc&gt;https://example.com/x&lt;/loc&gt;</div>"
+        self.assertEqual(parse_sitemap_urls(escaped), ["https://example.com/x"])
+
+    async def test_iter_sitemap_entries_walks_index_once_within_depth(self):
+        """Nested indexes are followed once each and depth-limited."""
+        documents = {
+            "https://example.com/index.xml": _index(
+                "https://example.com/a.xml",
+                "https://example.com/nested.xml",
+                "https://example.com/a.xml",
+            ),
+            "https://example.com/nested.xml": _index(
+                "https://example.com/index.xml", "https://example.com/b.xml.gz"
+            ),
+            "https://example.com/a.xml": _urlset("https://example.com/p/a"),
+            "https://example.com/b.xml.gz": gzip.compress(
+                _urlset("https://example.com/p/b").encode("utf-8")
+            ),
+        }
+        fetched = []
+
+        def source(url, **kwargs):
+            fetched.append(url)
+            return documents.get(url)
+
+        with patch(
+            "web_scraper_toolkit.parsers.sitemap.fetching.iter_sitemap_chunks",
+            new=_chunked_source(source),
+        ):
+            entries = [
+                e
+                async for e in iter_sitemap_entries(
+                    "https://example.com/index.xml", manager=MagicMock()
+                )
+            ]
+            shallow = [
+                e.loc
+                async for e in iter_sitemap_entries(
+                    "https://example.com/index.xml", manager=MagicMock(), max_depth=1
+                )
+            ]
+
+        self.assertEqual(
+            sorted(e.loc for e in entries),
+            ["https://example.com/p/a", "https://example.com/p/b"],
+        )
+        self.assertEqual(fetched.count("https://example.com/a.xml"), 2)
+        self.assertEqual(fetched.count("https://example.com/index.xml"), 2)
+        self.assertEqual(sorted(shallow), ["https://example.com/p/a"])
+
+
+class _SitemapSite(BaseHTTPRequestHandler):
+    def do_GET(self):
+        host = f"http://{self.headers['Host']}"
+        documents = {
+            "/robots.txt": f"Sitemap: {host}/sitemap.xml\n",
+            "/sitemap.xml": _urlset(f"{host}/a", f"{host}/b"),
+        }
+        body = documents.get(self.path)
+        self.send_response(200 if body else 404)
+        self.end_headers()
+        if body:
+            self.wfile.write(body.encode("utf-8"))
+
+    def do_HEAD(self):
+        self.send_response(404)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class TestSitemapSyncCalls(unittest.TestCase):
+    """Sync wrappers run a fresh event loop per call."""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _SitemapSite)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_repeated_sync_calls_stream_without_browser(self):
+        browser = AsyncMock(return_value=None)
+        with patch(
+            "web_scraper_toolkit.parsers.sitemap.fetching._fetch_with_browser",
+            new=browser,
+        ):
+            first = get_sitemap_urls(self.url)
+            second = get_sitemap_urls(self.url)
+
+        self.assertIn(f"{self.url}a", first)
+        self.assertEqual(first, second)
+        browser.assert_not_called()
+
+
+def _index(*locs):
+    body = "".join(f"<sitemap><loc>{loc}</loc></sitemap>" for loc in locs)
+    return f'<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{body}</sitemapindex>'
+
+
+def _urlset(*locs):
+    body = "".join(f"<url><loc>{loc}</loc></url>" for loc in locs)
+    return f"<urlset>{body}</urlset>"
+
+
+def _chunked_source(fetch, chunk_size=16):
+    """Stand-in for iter_sitemap_chunks serving documents in small pieces."""
+
+    async def _chunks(url, **kwargs):
+        content = fetch(url, **kwargs)
+        if content is None:
+            return
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        for start in range(0, len(data), chunk_size):
+            yield data[start : start + chunk_size]
+
+    return _chunks
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,169 @@
+# ./tests/test_sitemap_index.py
+"""
+Sitemap index tests: incremental walks and local "changed since" queries.
+Run: `pytest tests/test_sitemap_index.py -q`.
+Inputs: in-memory sitemap documents served through a stand-in byte stream
+that honours ETag validators.
+Outputs: assertions on which documents were downloaded, what was replayed
+from the index, and query results.
+Side effects: writes a SQLite file under pytest's tmp_path.
+Operational notes: no network; `iter_sitemap_chunks` is patched.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from unittest.mock import MagicMock, patch
+
+from web_scraper_toolkit.parsers.sitemap import (
+    SitemapEntry,
+    SitemapIndexConfig,
+    SitemapIndexStore,
+    get_sitemap_index,
+    iter_sitemap_entries,
+    set_sitemap_index,
+)
+
+ROOT = "https://shop.example/sitemap_index.xml"
+
+
+class _Site:
+    """Serves documents with ETags; records downloads and 304s."""
+
+    def __init__(self) -> None:
+        self.documents: dict = {}
+        self.downloads: list = []
+        self.not_modified: list = []
+
+    def put(self, url: str, body: str) -> None:
+        self.documents[url] = (body, f'"{hash(body) & 0xFFFF:x}"')
+
+    async def chunks(self, url, manager=None, state=None):
+        body, etag = self.documents[url]
+        if state is not None:
+            if state.etag == etag:
+                state.status = 304
+                self.not_modified.append(url)
+                return
+            state.status, state.etag = 200, etag
+        self.downloads.append(url)
+        data = body.encode("utf-8")
+        for start in range(0, len(data), 64):
+            yield data[start : start + 64]
+        if state is not None:
+            state.complete = True
+
+
+def _index(children):
+    body = "".join(
+        f"<sitemap><loc>{loc}</loc><lastmod>{lastmod}</lastmod></sitemap>"
+        for loc, lastmod in children
+    )
+    return f"<sitemapindex>{body}</sitemapindex>"
+
+
+def _urlset(urls):
+    body = "".join(
+        f"<url><loc>{loc}</loc><lastmod>{lastmod}</lastmod></url>"
+        for loc, lastmod in urls
+    )
+    return f"<urlset>{body}</urlset>"
+
+
+def _walk(site: _Site, index: SitemapIndexStore) -> list:
+    async def run():
+        return [
+            entry.loc
+            async for entry in iter_sitemap_entries(
+                ROOT, manager=MagicMock(), index=index
+            )
+        ]
+
+    with patch(
+        "web_scraper_toolkit.parsers.sitemap.fetching.iter_sitemap_chunks",
+        new=site.chunks,
+    ):
+        return sorted(asyncio.run(run()))
+
+
+def test_repeat_walk_only_downloads_changed_children(tmp_path):
+    site = _Site()
+    posts = "https://shop.example/posts.xml"
+    pages = "https://shop.example/pages.xml"
+    site.put(ROOT, _index([(posts, "2025-01-01"), (pages, "2025-01-01")]))
+    site.put(posts, _urlset([("https://shop.example/p/1", "2025-01-01")]))
+    site.put(pages, _urlset([("https://shop.example/about", "2024-06-01")]))
+    index = SitemapIndexStore(str(tmp_path))
+
+    first = _walk(site, index)
+    assert first == ["https://shop.example/about", "https://shop.example/p/1"]
+    assert sorted(site.downloads) == sorted([ROOT, posts, pages])
+
+    # Nothing changed: the index answers 304 and both children are replayed.
+    site.downloads.clear()
+    assert _walk(site, index) == first
+    assert site.downloads == []
+    assert site.not_modified == [ROOT]
+
+    # One child changes: only the index and that child are downloaded, and
+    # the URL it dropped disappears from the index.
+    site.put(ROOT, _index([(posts, "2025-02-01"), (pages, "2025-01-01")]))
+    site.put(posts, _urlset([("https://shop.example/p/2", "2025-02-01")]))
+    third = _walk(site, index)
+    assert third == ["https://shop.example/about", "https://shop.example/p/2"]
+    assert sorted(site.downloads) == sorted([ROOT, posts])
+    assert [e.loc for e in index.iter_entries(posts)] == ["https://shop.example/p/2"]
+    index.close()
+
+
+def test_changed_since_and_prune(tmp_path):
+    index = SitemapIndexStore(str(tmp_path))
+    sitemap = "https://a.example/sitemap.xml"
+    index.add_entries(
+        sitemap,
+        [
+            SitemapEntry(loc="https://a.example/old", lastmod="2024-01-01"),
+            SitemapEntry(loc="https://a.example/new", lastmod="2025-03-01T10:00:00Z"),
+            SitemapEntry(loc="https://a.example/undated"),
+        ],
+        seen_at=1_000.0,
+    )
+    index.finish(sitemap, kind="urlset", seen_at=1_000.0)
+    index.add_entries(
+        "https://b.example/sitemap.xml",
+        [SitemapEntry(loc="https://b.example/x", lastmod="2025-04-01")],
+        seen_at=1_000.0,
+    )
+
+    changed = [e.loc for e in index.changed_since("2025-01-01", host="a.example")]
+    assert changed == ["https://a.example/new"]
+    # Undated URLs count as changed from the moment they were first seen.
+    assert "https://a.example/undated" in [e.loc for e in index.changed_since(500.0)]
+
+    assert index.stats() == {"sitemaps": 1, "urls": 4}
+    assert index.prune(checked_before=float("inf")) == 1
+    assert list(index.iter_entries(sitemap)) == []
+    index.close()
+
+
+def test_opening_the_index_prunes_by_age(tmp_path):
+    config = SitemapIndexConfig.from_dict(
+        {"directory": str(tmp_path), "max_age_days": "7"}
+    )
+    assert config.to_dict()["max_age_days"] == 7.0
+    seed = SitemapIndexStore(str(tmp_path))
+    for url in ("https://a.example/old.xml", "https://a.example/fresh.xml"):
+        seed.add_entries(url, [SitemapEntry(loc=url + "#x")], seen_at=1_000.0)
+        seed.finish(url, kind="urlset", seen_at=1_000.0)
+    seed.touch("https://a.example/old.xml", now=time.time() - 8 * 86400)
+    seed.close()
+
+    set_sitemap_index(None)
+    try:
+        index = get_sitemap_index(config)
+        assert index.get("https://a.example/old.xml") is None
+        assert index.get("https://a.example/fresh.xml") is not None
+        assert get_sitemap_index(SitemapIndexConfig(enabled=False)) is None
+    finally:
+        set_sitemap_index(None)
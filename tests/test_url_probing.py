@@ -0,0 +1,87 @@
+# ./tests/test_url_probing.py
+"""
+Batched URL validation and content-type probing tests against a local server.
+Run: `pytest tests/test_url_probing.py -q`.
+Inputs: an in-process aiohttp server with HEAD-friendly and HEAD-hostile routes.
+Outputs: assertions on ranged-GET fallback, ordering/dedup, and TTL caching.
+Side effects: none outside the in-process server.
+Operational notes: binds 127.0.0.1 on an ephemeral port; no external network.
+"""
+
+from __future__ import annotations
+
+import pytest
+from aiohttp import web
+
+from web_scraper_toolkit.core.automation.utilities import (
+    clear_probe_cache,
+    detect_content_types,
+    iter_validate_urls,
+    validate_url,
+    validate_urls,
+)
+from web_scraper_toolkit.core.http_client import SharedHttpClient
+
+
+@pytest.fixture
+async def server():
+    hits = {"head": 0, "get": 0}
+
+    async def page(request: web.Request) -> web.Response:
+        hits["head" if request.method == "HEAD" else "get"] += 1
+        return web.Response(text="<html></html>", content_type="text/html")
+
+    async def no_head_pdf(request: web.Request) -> web.Response:
+        if request.method == "HEAD":
+            hits["head"] += 1
+            return web.Response(status=405)
+        hits["get"] += 1
+        return web.Response(
+            status=206,
+            body=b"%",
+            headers={
+                "Content-Type": "application/pdf",
+                "Content-Range": "bytes 0-0/4096",
+            },
+        )
+
+    app = web.Application()
+    app.router.add_route("*", "/page", page)
+    app.router.add_route("*", "/doc.pdf", no_head_pdf)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    clear_probe_cache()
+    yield f"http://127.0.0.1:{port}", hits
+    clear_probe_cache()
+    await SharedHttpClient.close()
+    await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_head_rejection_falls_back_to_ranged_get(server) -> None:
+    base, hits = server
+    result = await validate_url(f"{base}/doc.pdf", cache_ttl=0)
+    assert result["reachable"] is True
+    assert result["method"] == "GET"
+    assert result["content_length"] == 4096
+    assert hits == {"head": 1, "get": 1}
+
+
+@pytest.mark.asyncio
+async def test_batch_preserves_order_dedups_and_caches(server) -> None:
+    base, hits = server
+    urls = [f"{base}/doc.pdf", f"{base}/page", f"{base}/page"]
+    results = await validate_urls(urls)
+    assert [r["url"] for r in results] == urls
+    assert hits["head"] == 2  # Duplicate probed once
+
+    streamed = [r async for r in iter_validate_urls(urls)]
+    assert all(r.get("cached") for r in streamed)
+    assert hits["head"] == 2  # Served from the TTL cache
+
+    types = await detect_content_types([f"{base}/doc.pdf", f"{base}/page"])
+    assert types[0]["is_pdf"] and types[0]["size_bytes"] == 4096
+    assert types[1]["is_html"]
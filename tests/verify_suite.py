@@ -12,6 +12,7 @@ Usage:
     python tests/verify_suite.py
 """
 
+import asyncio
 import unittest
 import logging
 import os
@@ -31,6 +32,7 @@ from web_scraper_toolkit.proxie import (
     Proxy,
     ProxyStatus,
     ProxyProtocol,
+    SecurityStopIteration,
 )
 from web_scraper_toolkit.crawler import ProxieCrawler
 from web_scraper_toolkit.playbook.models import (
@@ -96,20 +98,29 @@ class TestVerificationSuite(unittest.IsolatedAsyncioTestCase):
         ]
         manager = ProxyManager(config, proxies)
 
-        # Mock _attempt_revival to "fix" one proxy
+        # Mock revalidate_dead to "fix" one proxy
 
         async def mock_revival():
             logger.info("  -> Revival Triggered!")
             # Revive one proxy
             proxies[0].status = ProxyStatus.ACTIVE
-
-        manager._attempt_revival = AsyncMock(side_effect=mock_revival)
-
-        # Action: Get proxy (should fail initially, trigger revival, then succeed)
+            manager.reindex()
+            return 1
+
+        manager.revalidate_dead = AsyncMock(side_effect=mock_revival)
+
+        # Action: Get proxy (fails fast, schedules background revival)
+        with self.assertRaises(SecurityStopIteration):
+            await manager.get_next_proxy()
+        for _ in range(50):
+            if manager.revalidate_dead.called:
+                break
+            await asyncio.sleep(0.01)
         proxy = await manager.get_next_proxy()
+        await manager.close()
 
         # Assertions
-        manager._attempt_revival.assert_called_once()
+        manager.revalidate_dead.assert_called_once()
         self.assertEqual(proxy.hostname, "1.1.1.1")
         console.print("[green]âœ” Proxy Revival Triggered and Succeeded[/green]")
 